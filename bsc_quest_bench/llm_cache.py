@@ -0,0 +1,84 @@
+"""
+BSC Quest LLM Cache - exact-match on-disk cache of LLM responses
+
+A response is reused only when the model, endpoint, sampling settings and every
+message are identical, so a rerun with the same prompts skips the network round-trip.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+# One JSON file per cached response, named by its key
+LLM_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'quest_bench', 'llm')
+
+
+class LLMResponseCache:
+    """Exact-match LLM response cache stored as one JSON file per key"""
+    
+    def __init__(self, cache_dir: str = LLM_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def make_key(model: str, messages: List[Any], settings: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Cache key for one LLM call
+        
+        Args:
+            model: Model name
+            messages: LangChain messages sent to the model
+            settings: Anything else that changes the answer (temperature, base_url, ...)
+        
+        Returns:
+            sha256 hex digest
+        """
+        payload = {
+            'model': model,
+            'messages': [[m.type, m.content] for m in messages],
+            'settings': settings or {},
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response
+        
+        Args:
+            key: Key from make_key
+        
+        Returns:
+            Cached response text, or None on a miss
+        """
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                content = json.load(f)['content']
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return content
+    
+    def put(self, key: str, content: str):
+        """
+        Store a response; failures only print a warning
+        
+        Args:
+            key: Key from make_key
+            content: Response text
+        """
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(key)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'content': content}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"  • ⚠️  Could not write LLM cache: {e}")
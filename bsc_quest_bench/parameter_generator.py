@@ -8,7 +8,7 @@ parameter types within reasonable and realistic ranges.
 import random
 from typing import Dict, Any, List
 from decimal import Decimal
-from eth_account import Account
+from eth_utils import to_checksum_address
 
 
 class ParameterGenerator:
@@ -19,11 +19,12 @@ class ParameterGenerator:
         Initialize parameter generator
         
         Args:
-            seed: Random seed for reproducibility (optional)
+            seed: Random seed for reproducibility (optional); draws then come from a
+                  private generator, so they do not depend on other users of random
             environment: QuestEnvironment instance for accessing deployed contracts
         """
-        if seed is not None:
-            random.seed(seed)
+        # random.Random and the random module share the methods used here
+        self.rng = random.Random(seed) if seed is not None else random
         self.environment = environment
     
     def generate_parameters(self, param_config: Dict[str, Any]) -> Dict[str, Any]:
@@ -57,6 +58,10 @@ class ParameterGenerator:
         
         return result
     
+    def _random_address(self) -> str:
+        """Random checksummed address drawn from self.rng (reproducible under a seed)"""
+        return to_checksum_address(self.rng.getrandbits(160).to_bytes(20, 'big'))
+    
     def _generate_address(self, config: Dict[str, Any]) -> str:
         """
         Generate a random Ethereum address
@@ -77,15 +82,14 @@ class ParameterGenerator:
             # Return fixed address value
             return config.get('value', '')
         elif method == 'random':
-            # Generate a new random account
-            account = Account.create()
-            return account.address
+            # Generate a new random address
+            return self._random_address()
         elif method == 'from_list':
             # Choose from predefined list
             addresses = config.get('addresses', [])
             if not addresses:
                 raise ValueError("No addresses provided in configuration")
-            return random.choice(addresses)
+            return self.rng.choice(addresses)
         elif method == 'from_env':
             # Get from environment (e.g., deployed contract address)
             env_key = config.get('env_key')
@@ -96,8 +100,7 @@ class ParameterGenerator:
             # This will be replaced later when environment is ready
             if not self.environment:
                 # Generate a placeholder address
-                placeholder = Account.create()
-                return placeholder.address
+                return self._random_address()
             
             # Get the address from environment
             address = getattr(self.environment, env_key, None)
@@ -110,8 +113,7 @@ class ParameterGenerator:
                 return self.environment.test_address
             else:
                 # Generate a placeholder if environment not available
-                placeholder = Account.create()
-                return placeholder.address
+                return self._random_address()
         else:
             raise ValueError(f"Unsupported address generation method: {method}")
     
@@ -149,7 +151,7 @@ class ParameterGenerator:
         max_decimal = Decimal(str(max_val))
         
         # Generate random decimal
-        random_decimal = min_decimal + (max_decimal - min_decimal) * Decimal(str(random.random()))
+        random_decimal = min_decimal + (max_decimal - min_decimal) * Decimal(str(self.rng.random()))
         
         # Round to specified decimals
         quantize_value = Decimal(10) ** -decimals
@@ -182,13 +184,13 @@ class ParameterGenerator:
             values = config.get('values', [])
             if not values:
                 raise ValueError("from_list method requires 'values' list")
-            return random.choice(values)
+            return self.rng.choice(values)
         
         # Random method
         min_val = config.get('min', 1)
         max_val = config.get('max', 100)
         
-        return random.randint(min_val, max_val)
+        return self.rng.randint(min_val, max_val)
     
     def _generate_string(self, config: Dict[str, Any]) -> str:
         """
@@ -213,7 +215,7 @@ class ParameterGenerator:
             values = config.get('values', [])
             if not values:
                 raise ValueError("No values provided in configuration")
-            return random.choice(values)
+            return self.rng.choice(values)
         elif method == 'random':
             length = config.get('length', 10)
             charset = config.get('charset', 'alphanumeric')
@@ -233,7 +235,7 @@ class ParameterGenerator:
             else:
                 chars = charset
             
-            return ''.join(random.choice(chars) for _ in range(length))
+            return ''.join(self.rng.choice(chars) for _ in range(length))
         else:
             raise ValueError(f"Unsupported string generation method: {method}")
     
@@ -257,7 +259,7 @@ class ParameterGenerator:
         else:
             # Random generation
             probability = config.get('probability', 0.5)
-            return random.random() < probability
+            return self.rng.random() < probability
 
 
 def format_parameter_value(value: Any, param_config: Dict[str, Any]) -> str:
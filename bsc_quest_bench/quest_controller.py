@@ -9,6 +9,7 @@ Responsibilities:
 """
 
 import json
+import random
 import re
 import socket
 import tempfile
@@ -23,9 +24,12 @@ from langchain_anthropic import ChatAnthropic
 from langchain_google_genai import ChatGoogleGenerativeAI
 
 from bsc_quest_bench.quest_env import QuestEnvironment
-from bsc_quest_bench.quest_executor import QuestExecutor
+from bsc_quest_bench.quest_executor import QuestExecutor, SnapshotSpec
 from bsc_quest_bench.parameter_generator import ParameterGenerator, format_parameter_value
 
+# Completion tokens assumed per LLM call when pacing requests against a tokens-per-minute budget
+COMPLETION_TOKEN_ESTIMATE = 1000
+
 
 def quick_anvil_health_check(port: int = 8545, timeout_seconds: float = 5.0) -> bool:
     """
@@ -64,6 +68,81 @@ def quick_anvil_health_check(port: int = 8545, timeout_seconds: float = 5.0) ->
         return False
 
 
+def create_llm(
+    model_name: str,
+    api_key: Optional[str] = None,
+    base_url: Optional[str] = None,
+    http_async_client=None
+):
+    """
+    Initialize LLM client
+    
+    The runner builds one client and shares it across controllers, so every question
+    reuses the same HTTP connection pool.
+    
+    Args:
+        model_name: Model name
+        api_key: API key
+        base_url: Custom API base URL
+        http_async_client: Optional httpx.AsyncClient for OpenAI-compatible APIs (ignored by other providers)
+        
+    Returns:
+        LLM client instance
+    """
+    if not model_name:
+        raise ValueError("Model name cannot be empty")
+    
+    llm_kwargs = {'model': model_name, 'temperature': 0.7}
+    openai_kwargs = {'http_async_client': http_async_client} if http_async_client is not None else {}
+    
+    # Priority 1: Custom base_url
+    if base_url:
+        print(f"🔄 Using custom API: {base_url}")
+        print(f"   Model: {model_name}")
+        if api_key:
+            llm_kwargs['api_key'] = api_key
+        llm_kwargs['base_url'] = base_url
+        return ChatOpenAI(**llm_kwargs, **openai_kwargs)
+    
+    # Priority 2: OpenRouter (model name contains '/')
+    if '/' in model_name:
+        print(f"🔄 Using OpenRouter")
+        print(f"   Model: {model_name}")
+        if api_key:
+            llm_kwargs['api_key'] = api_key
+            if not api_key.startswith('sk-or-v1-'):
+                print(f"⚠️  Warning: OpenRouter API key usually starts with 'sk-or-v1-'")
+                print(f"   Your key starts with: {api_key[:10]}...")
+        else:
+            print(f"⚠️  Warning: OpenRouter API key not provided")
+        
+        llm_kwargs['base_url'] = "https://openrouter.ai/api/v1"
+        llm_kwargs['default_headers'] = {
+            "HTTP-Referer": "https://github.com/bsc-quest-bench",
+            "X-Title": "BSC Quest Bench"
+        }
+        return ChatOpenAI(**llm_kwargs, **openai_kwargs)
+    
+    # Priority 3: Standard provider
+    if 'gpt' in model_name.lower() or 'openai' in model_name.lower():
+        if api_key:
+            llm_kwargs['openai_api_key'] = api_key
+        return ChatOpenAI(**llm_kwargs, **openai_kwargs)
+    elif 'claude' in model_name.lower() or 'anthropic' in model_name.lower():
+        if api_key:
+            llm_kwargs['anthropic_api_key'] = api_key
+        return ChatAnthropic(**llm_kwargs)
+    elif 'gemini' in model_name.lower() or 'google' in model_name.lower():
+        if api_key:
+            llm_kwargs['google_api_key'] = api_key
+        return ChatGoogleGenerativeAI(**llm_kwargs)
+    else:
+        if api_key:
+            llm_kwargs['openai_api_key'] = api_key
+        return ChatOpenAI(**llm_kwargs, **openai_kwargs)
+
+
+
 class QuestController:
     """Quest Controller - Coordinate single round transaction generation evaluation"""
     
@@ -80,7 +159,11 @@ class QuestController:
             env: Optional[QuestEnvironment] = None,
             naive_mode: bool = False,
             nl_difficulty: str = "random",
-            library: str = "ethers"
+            library: str = "ethers",
+            rate_limiter=None,
+            llm_cache=None,
+            llm=None,
+            seed: Optional[int] = None
     ):
         """
         Initialize controller
@@ -98,6 +181,10 @@ class QuestController:
             naive_mode: Naive mode, include question description in prompt (default False, controls difficulty)
             nl_difficulty: NL template difficulty: "random", "precise", "moderate", or "vague"
             library: JavaScript library to use: "ethers" or "viem"
+            rate_limiter: Optional shared limiter; every LLM call first awaits rate_limiter.acquire(estimated_tokens)
+            llm_cache: Optional LLMResponseCache; identical LLM calls are answered from it
+            llm: Optional prebuilt LLM client (see create_llm) shared with other controllers
+            seed: Optional seed for this question's parameters and NL template choice
         """
         self.model_name = model_name
         self.question_path = question_path
@@ -111,6 +198,10 @@ class QuestController:
         self.naive_mode = naive_mode  # Whether to use Naive mode
         self.nl_difficulty = nl_difficulty  # NL template difficulty
         self.library = library  # JavaScript library (ethers or viem)
+        self.rate_limiter = rate_limiter  # Paces LLM calls across concurrent controllers
+        self.llm_cache = llm_cache  # Exact-match response cache (None = always call the LLM)
+        # Private generator under a seed, so draws do not depend on other questions running first
+        self.rng = random.Random(seed) if seed is not None else random
         
         # Load system config
         self.system_config = self._load_system_config()
@@ -119,13 +210,16 @@ class QuestController:
         self.question = self._load_question()
         
         # Initialize parameter generator
-        self.param_generator = ParameterGenerator()
+        self.param_generator = ParameterGenerator(seed=seed)
         
         # Generate random parameter values
         self.generated_params = self._generate_parameters()
         
         # Initialize LLM
-        self.llm = self._init_llm(model_name, api_key, base_url)
+        self.llm = llm if llm is not None else create_llm(model_name, api_key, base_url)
+        
+        # System prompt built ahead of run() by build_system_prompt() (batch mode)
+        self.system_prompt: Optional[str] = None
         
         # Store results
         self.result = {
@@ -270,73 +364,28 @@ class QuestController:
         self.result['natural_language_prompt'] = self._generate_natural_language_prompt()
         print()
     
-    def _init_llm(
-        self,
-        model_name: str,
-        api_key: Optional[str] = None,
-        base_url: Optional[str] = None
-    ):
-        """
-        Initialize LLM client
-        
-        Args:
-            model_name: Model name
-            api_key: API key
-            base_url: Custom API base URL
-            
-        Returns:
-            LLM client instance
-        """
-        if not model_name:
-            raise ValueError("Model name cannot be empty")
-        
-        llm_kwargs = {'model': model_name, 'temperature': 0.7}
-        
-        # Priority 1: Custom base_url
-        if base_url:
-            print(f"🔄 Using custom API: {base_url}")
-            print(f"   Model: {model_name}")
-            if api_key:
-                llm_kwargs['api_key'] = api_key
-            llm_kwargs['base_url'] = base_url
-            return ChatOpenAI(**llm_kwargs)
-        
-        # Priority 2: OpenRouter (model name contains '/')
-        if '/' in model_name:
-            print(f"🔄 Using OpenRouter")
-            print(f"   Model: {model_name}")
-            if api_key:
-                llm_kwargs['api_key'] = api_key
-                if not api_key.startswith('sk-or-v1-'):
-                    print(f"⚠️  Warning: OpenRouter API key usually starts with 'sk-or-v1-'")
-                    print(f"   Your key starts with: {api_key[:10]}...")
-            else:
-                print(f"⚠️  Warning: OpenRouter API key not provided")
-            
-            llm_kwargs['base_url'] = "https://openrouter.ai/api/v1"
-            llm_kwargs['default_headers'] = {
-                "HTTP-Referer": "https://github.com/bsc-quest-bench",
-                "X-Title": "BSC Quest Bench"
-            }
-            return ChatOpenAI(**llm_kwargs)
-        
-        # Priority 3: Standard provider
-        if 'gpt' in model_name.lower() or 'openai' in model_name.lower():
-            if api_key:
-                llm_kwargs['openai_api_key'] = api_key
-            return ChatOpenAI(**llm_kwargs)
-        elif 'claude' in model_name.lower() or 'anthropic' in model_name.lower():
-            if api_key:
-                llm_kwargs['anthropic_api_key'] = api_key
-            return ChatAnthropic(**llm_kwargs)
-        elif 'gemini' in model_name.lower() or 'google' in model_name.lower():
-            if api_key:
-                llm_kwargs['google_api_key'] = api_key
-            return ChatGoogleGenerativeAI(**llm_kwargs)
-        else:
-            if api_key:
-                llm_kwargs['openai_api_key'] = api_key
-            return ChatOpenAI(**llm_kwargs)
+    async def _ainvoke(self, messages: List[Any]):
+        """Call the LLM (or answer from the response cache), waiting on the rate limiter first when one is set"""
+        cache_key = None
+        if self.llm_cache is not None:
+            cache_key = self.llm_cache.make_key(self.model_name, messages, {
+                'temperature': getattr(self.llm, 'temperature', None),
+                'base_url': self.base_url,
+            })
+            cached = self.llm_cache.get(cache_key)
+            if cached is not None:
+                print("♻️  Using cached LLM response")
+                return AIMessage(content=cached)
+        
+        if self.rate_limiter is not None:
+            # ~4 characters per token is close enough for pacing
+            prompt_tokens = sum(len(m.content) for m in messages) // 4
+            await self.rate_limiter.acquire(prompt_tokens + COMPLETION_TOKEN_ESTIMATE)
+        response = await self.llm.ainvoke(messages)
+        
+        if cache_key is not None and isinstance(response.content, str) and response.content:
+            self.llm_cache.put(cache_key, response.content)
+        return response
     
     def _generate_natural_language_prompt(self) -> str:
         """Generate natural language prompt with filled parameters"""
@@ -364,10 +413,9 @@ class QuestController:
                 print(f"Warning: Could not load template scores: {e}")
 
         # Choose template based on difficulty setting
-        import random
         if self.nl_difficulty == 'random' or not template_scores:
             # Random selection (original behavior)
-            template = random.choice(templates)
+            template = self.rng.choice(templates)
         else:
             # Filter templates by difficulty
             filtered_templates = [
@@ -376,11 +424,11 @@ class QuestController:
             ]
 
             if filtered_templates:
-                template = random.choice(filtered_templates)
+                template = self.rng.choice(filtered_templates)
             else:
                 # Fallback to random if no templates match the difficulty
                 print(f"Warning: No templates found for difficulty '{self.nl_difficulty}', using random selection")
-                template = random.choice(templates)
+                template = self.rng.choice(templates)
 
         # Fill in the parameters
         for param_name, param_value in self.generated_params.items():
@@ -501,10 +549,31 @@ class QuestController:
         
         return str(code_file)
     
-    async def run(self) -> Dict[str, Any]:
+    def build_system_prompt(self, env) -> str:
+        """
+        Resolve environment parameters and build the system prompt ahead of run()
+        
+        Used when the LLM is called outside the controller (e.g. through a batch API);
+        run_single_turn() then reuses this prompt and its parameters.
+        
+        Args:
+            env: QuestEnvironment instance the question will run on
+            
+        Returns:
+            System prompt
+        """
+        self._regenerate_env_parameters(env)
+        self.system_prompt = self._generate_system_prompt()
+        return self.system_prompt
+    
+    async def run(self, llm_response: Optional[str] = None) -> Dict[str, Any]:
         """
         Run evaluation (single-round for atomic, multi-round for composite)
         
+        Args:
+            llm_response: Pre-fetched LLM response for the prompt from build_system_prompt()
+                          (atomic problems only); the LLM is called when None
+        
         Returns:
             Evaluation result dictionary
         """
@@ -521,12 +590,15 @@ class QuestController:
             return await self.run_multi_turn()
         else:
             # Single-round evaluation for atomic problems
-            return await self.run_single_turn()
+            return await self.run_single_turn(llm_response)
     
-    async def run_single_turn(self) -> Dict[str, Any]:
+    async def run_single_turn(self, llm_response: Optional[str] = None) -> Dict[str, Any]:
         """
         Run single round evaluation (for atomic problems)
         
+        Args:
+            llm_response: Pre-fetched LLM response; the LLM is called when None
+        
         Returns:
             Evaluation result dictionary
         """
@@ -576,13 +648,15 @@ class QuestController:
             print()
         
         # 1.5 Regenerate parameters requiring environment (e.g. from_env)
-        self._regenerate_env_parameters(env)
+        # (already done if the prompt was built ahead of time)
+        if self.system_prompt is None:
+            self._regenerate_env_parameters(env)
         
         try:
             # 2. Display generated parameters
             print("📝 Generated Natural Language Prompt:")
             if not self.test_mode:
-                system_prompt = self._generate_system_prompt()
+                system_prompt = self.system_prompt or self._generate_system_prompt()
                 print(f"   \"{self.result['natural_language_prompt']}\"")
             else:
                 print(f"   [TEST MODE - Skipped]")
@@ -602,28 +676,30 @@ class QuestController:
                 print(f"✅ Test code loaded from: {self.test_code_path}")
                 print()
             else:
-                # Normal mode: Call LLM
-                print("🤖 Calling LLM to generate code...")
-                messages = [
-                    SystemMessage(content=system_prompt)
-                ]
-                
-                response = await self.llm.ainvoke(messages)
-                self.result['llm_response'] = response.content
+                # Normal mode: Call LLM (unless the response was fetched in a batch)
+                if llm_response is None:
+                    print("🤖 Calling LLM to generate code...")
+                    messages = [
+                        SystemMessage(content=system_prompt)
+                    ]
+                    
+                    response = await self._ainvoke(messages)
+                    llm_response = response.content
+                self.result['llm_response'] = llm_response
                 
-                print(f"✅ LLM response received ({len(response.content)} characters)")
+                print(f"✅ LLM response received ({len(llm_response)} characters)")
                 print()
                 
                 # 4. Extract code blocks
                 print("📝 Extracting code blocks...")
-                code_blocks = self.extract_code_blocks(response.content)
+                code_blocks = self.extract_code_blocks(llm_response)
                 
                 if not code_blocks:
                     error_msg = "TypeScript code block not found"
                     print(f"❌ {error_msg}")
-                    print(f"📄 LLM Response Content ({len(response.content)} chars):")
+                    print(f"📄 LLM Response Content ({len(llm_response)} chars):")
                     print("─"*60)
-                    print(response.content[:1000] if len(response.content) > 1000 else response.content)
+                    print(llm_response[:1000] if len(llm_response) > 1000 else llm_response)
                     print("─"*60)
                     self.result['error'] = error_msg
                     return self.result
@@ -912,7 +988,8 @@ class QuestController:
             print("🔗 Executing transaction...")
             executor = QuestExecutor(
                 w3=env.w3,
-                private_key=env_info['test_private_key']
+                private_key=env_info['test_private_key'],
+                poll_latency=0.1  # Anvil automines, receipts are available almost immediately
             )
             
             # Create validator
@@ -1348,9 +1425,7 @@ class QuestController:
             # Check if this is a query operation (read-only)
             is_query_operation = self.question.get('metadata', {}).get('operation_type') == 'query'
             
-            execution_result = executor.execute_transaction(
-                tx,
-                validator,
+            spec = SnapshotSpec(
                 token_address=token_address,
                 target_address_for_token=target_address_for_token,
                 token_out_address=token_out_address,
@@ -1367,7 +1442,12 @@ class QuestController:
                 implementation_address=implementation_address,
                 expected_value=expected_value,
                 from_address=from_address,
-                requires_contract=requires_contract,
+                requires_contract=requires_contract
+            )
+            execution_result = executor.execute_transaction(
+                tx,
+                validator,
+                spec=spec,
                 is_query_operation=is_query_operation
             )
             
@@ -1917,7 +1997,7 @@ Analyze the task and create the most efficient plan. Minimize the number of step
             
             print("🤖 Calling LLM for task planning...")
             planning_messages = [SystemMessage(content=planning_prompt)]
-            planning_response = await self.llm.ainvoke(planning_messages)
+            planning_response = await self._ainvoke(planning_messages)
             planning_content = planning_response.content
             
             print(f"✅ Planning response received ({len(planning_content)} characters)\n")
@@ -2058,7 +2138,7 @@ Generate TypeScript code to execute this subtask:"""
                 ]
                 
                 print(f"🤖 Calling LLM for execution...")
-                exec_response = await self.llm.ainvoke(exec_messages)
+                exec_response = await self._ainvoke(exec_messages)
                 exec_content = exec_response.content
                 
                 print(f"✅ Execution response received ({len(exec_content)} characters)\n")
@@ -2588,10 +2668,6 @@ Generate TypeScript code to execute this subtask:"""
             
             # Execute transaction
             tx = tx_result['tx_object']
-            executor = QuestExecutor(
-                w3=env.w3,
-                private_key=env_info['test_private_key']
-            )
             
             # Quick health check BEFORE any RPC calls (using 5s timeout socket, not 60s Web3)
             if not quick_anvil_health_check(port=env.anvil_port, timeout_seconds=5.0):
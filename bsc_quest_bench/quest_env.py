@@ -7,3935 +7,3396 @@ Responsibilities:
 3. Provide Web3 connection and on-chain state query
 """
 
+import logging
 import subprocess
 import time
 import socket
 import os
-from typing import Optional, Dict, Any
+import threading
+from typing import Optional, Dict, Any, List, Tuple
 from web3 import Web3
 from eth_account import Account
+from eth_abi import encode, decode
+from eth_utils import to_checksum_address
 
-class QuestEnvironment:
-    """Quest Environment Management Class"""
+logger = logging.getLogger(__name__)
 
-    def __init__(
-        self,
-        fork_url: str = None,
-        chain_id: int = 56,
-        anvil_port: int = 8545
-    ):
-        """
-        Initialize Quest environment
+# Function selectors used when talking to forked/deployed contracts via raw calldata
+SEL_BALANCE_OF = bytes.fromhex('70a08231')       # balanceOf(address)
+SEL_BALANCE_OF_1155 = bytes.fromhex('00fdd58e')  # balanceOf(address,uint256)
+SEL_ERC20_APPROVE = bytes.fromhex('095ea7b3')    # approve(address,uint256)
+SEL_TRANSFER_FROM = bytes.fromhex('23b872dd')    # transferFrom(address,address,uint256)
+SEL_OWNER_OF = bytes.fromhex('6352211e')         # ownerOf(uint256)
+SEL_GET_PAIR = bytes.fromhex('e6a43905')         # getPair(address,address)
+SEL_GET_RESERVES = bytes.fromhex('0902f1ac')     # getReserves()
+SEL_DEPOSIT = bytes.fromhex('b6b55f25')          # deposit(uint256)
+
+
+# Solidity compiler version for the test contracts deployed into the fork
+SOLC_VERSION = '0.8.20'
+_SOLC_READY = False
+
+# Compiled artifacts cache, keyed by source hash (see _ensure_compiled)
+SOLC_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'quest_bench', 'solc')
+
+# Post-setup Anvil state dumps (see QuestEnvironment._load_state_cache)
+STATE_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'quest_bench', 'state')
+
+
+def _ensure_solc():
+    """Install (if missing) and select SOLC_VERSION once per process"""
+    global _SOLC_READY
+    if _SOLC_READY:
+        return
+    import solcx
+    if SOLC_VERSION not in [str(v) for v in solcx.get_installed_solc_versions()]:
+        print(f"  • Installing Solidity compiler v{SOLC_VERSION}...")
+        solcx.install_solc(SOLC_VERSION)
+    solcx.set_solc_version(SOLC_VERSION)
+    _SOLC_READY = True
+
+
+# ABI word for type(uint256).max, used for unlimited approvals
+MAX_UINT256_HEX = 'f' * 64
+
+
+# keccak256 digest, using pycryptodome's C implementation when it is available
+try:
+    from Crypto.Hash import keccak as _pycryptodome_keccak
+    
+    def _keccak(data: bytes) -> bytes:
+        """keccak256 digest (pycryptodome)"""
+        return _pycryptodome_keccak.new(data=data, digest_bits=256).digest()
+except ImportError:
+    from eth_utils import keccak as _keccak
+
+
+def _pad_addr(address: str) -> str:
+    """Left-pad a 0x address to a 32-byte ABI word (hex, no prefix)"""
+    return address[2:].lower().rjust(64, '0')
+
+
+def _create_address(sender: str, nonce: int) -> str:
+    """
+    Address of a contract created by sender with a plain CREATE at the given nonce
+    
+    keccak256(rlp([sender, nonce]))[12:]; the list is always short, so the RLP is built inline.
+    """
+    if nonce == 0:
+        nonce_rlp = b'\x80'
+    elif nonce < 0x80:
+        nonce_rlp = bytes([nonce])
+    else:
+        nonce_bytes = nonce.to_bytes((nonce.bit_length() + 7) // 8, 'big')
+        nonce_rlp = bytes([0x80 + len(nonce_bytes)]) + nonce_bytes
+    payload = b'\x94' + bytes.fromhex(sender[2:]) + nonce_rlp
+    return to_checksum_address(_keccak(bytes([0xc0 + len(payload)]) + payload)[12:])
+
+
+def _seeded_account(seed: int, label: str):
+    """Deterministic account for a run seed; the label keeps the test and rich accounts apart"""
+    return Account.from_key(_keccak(f"bsc_quest_bench:{seed}:{label}".encode()))
+
+
+def _calldata(selector: bytes, types: list, values: list) -> str:
+    """Build '0x'-prefixed hex calldata from a 4-byte selector and ABI-encoded arguments"""
+    return '0x' + (selector + encode(types, values)).hex()
+
+
+# ERC1363 token (transferAndCall / approveAndCall + EIP-2612 permit)
+_ERC1363_TOKEN_SRC = """
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+interface IERC1363Receiver {
+    function onTransferReceived(address operator, address from, uint256 value, bytes calldata data) external returns (bytes4);
+}
+
+interface IERC1363Spender {
+    function onApprovalReceived(address owner, uint256 value, bytes calldata data) external returns (bytes4);
+}
+
+contract ERC1363Token {
+    string public name = "ERC1363";
+    string public symbol = "E1363";
+    uint8 public decimals = 18;
+    string public constant version = "1";
+    uint256 public totalSupply;
+    mapping(address => uint256) public balanceOf;
+    mapping(address => mapping(address => uint256)) public allowance;
+    
+    // EIP-2612 Permit support
+    mapping(address => uint256) public nonces;
+    bytes32 public DOMAIN_SEPARATOR;
+    bytes32 public constant PERMIT_TYPEHASH = keccak256("Permit(address owner,address spender,uint256 value,uint256 nonce,uint256 deadline)");
+    
+    event Transfer(address indexed from, address indexed to, uint256 value);
+    event Approval(address indexed owner, address indexed spender, uint256 value);
+    
+    constructor() {
+        totalSupply = 1000000 * 10**18;
+        balanceOf[msg.sender] = totalSupply;
+        emit Transfer(address(0), msg.sender, totalSupply);
         
-        Args:
-            fork_url: BSC RPC URL
-                     - None: Use default BSC Mainnet public RPC (suitable for open source/CI)
-                     - Custom URL: Use paid or private RPC (suitable for dev/prod)
-                     Can also set via BSC_FORK_URL environment variable
-            chain_id: Chain ID (56=BSC Mainnet, 97=BSC Testnet, default 56)
-            anvil_port: Anvil port
-        """
-        # Fork URL Priority:
-        # 1. Passed fork_url parameter
-        # 2. Environment variable BSC_FORK_URL
-        # 3. Default BSC Mainnet public RPC
-        if fork_url is None:
-            import os
-            fork_url = os.getenv('BSC_FORK_URL', 'https://bsc-dataseed.binance.org')
+        // Initialize DOMAIN_SEPARATOR for EIP-2612
+        uint256 chainId;
+        assembly { chainId := chainid() }
+        DOMAIN_SEPARATOR = keccak256(
+            abi.encode(
+                keccak256("EIP712Domain(string name,string version,uint256 chainId,address verifyingContract)"),
+                keccak256(bytes(name)),
+                keccak256(bytes("1")),
+                chainId,
+                address(this)
+            )
+        );
+    }
+    
+    function transfer(address to, uint256 value) public returns (bool) {
+        require(balanceOf[msg.sender] >= value, "Insufficient balance");
+        balanceOf[msg.sender] -= value;
+        balanceOf[to] += value;
+        emit Transfer(msg.sender, to, value);
+        return true;
+    }
+    
+    function approve(address spender, uint256 value) public returns (bool) {
+        allowance[msg.sender][spender] = value;
+        emit Approval(msg.sender, spender, value);
+        return true;
+    }
+    
+    function transferFrom(address from, address to, uint256 value) public returns (bool) {
+        require(balanceOf[from] >= value, "Insufficient balance");
+        require(allowance[from][msg.sender] >= value, "Insufficient allowance");
+        balanceOf[from] -= value;
+        balanceOf[to] += value;
+        allowance[from][msg.sender] -= value;
+        emit Transfer(from, to, value);
+        return true;
+    }
+    
+    function transferAndCall(address to, uint256 value) public returns (bool) {
+        return transferAndCall(to, value, "");
+    }
+    
+    function transferAndCall(address to, uint256 value, bytes memory data) public returns (bool) {
+        // Directly perform the transfer logic inline instead of calling transfer()
+        require(balanceOf[msg.sender] >= value, "Insufficient balance");
+        balanceOf[msg.sender] -= value;
+        balanceOf[to] += value;
+        emit Transfer(msg.sender, to, value);
         
-        self.fork_url = fork_url
-        self.chain_id = chain_id
-        self.anvil_port = anvil_port
-        self.anvil_process = None
-        self.anvil_cmd = None
+        // Check if recipient is a contract and call callback if needed
+        uint256 codeSize;
+        assembly { codeSize := extcodesize(to) }
+        if (codeSize > 0) {
+            try IERC1363Receiver(to).onTransferReceived(msg.sender, msg.sender, value, data) returns (bytes4 retval) {
+                require(retval == IERC1363Receiver.onTransferReceived.selector, "Receiver rejected");
+            } catch {}
+        }
+        return true;
+    }
+    
+    function approveAndCall(address spender, uint256 value) public returns (bool) {
+        return approveAndCall(spender, value, "");
+    }
+    
+    function approveAndCall(address spender, uint256 value, bytes memory data) public returns (bool) {
+        // Directly perform the approval logic inline
+        allowance[msg.sender][spender] = value;
+        emit Approval(msg.sender, spender, value);
         
-        self.w3: Optional[Web3] = None
-        self.test_account: Optional[Account] = None
-        self.test_address: Optional[str] = None
-        self.test_private_key: Optional[str] = None
-        self.initial_snapshot_id: Optional[str] = None  # Store initial snapshot for fast reset
+        // Check if spender is a contract and call callback if needed
+        uint256 codeSize;
+        assembly { codeSize := extcodesize(spender) }
+        if (codeSize > 0) {
+            try IERC1363Spender(spender).onApprovalReceived(msg.sender, value, data) returns (bytes4 retval) {
+                require(retval == IERC1363Spender.onApprovalReceived.selector, "Spender rejected");
+            } catch {}
+        }
+        return true;
+    }
+    
+    // EIP-2612 Permit function
+    function permit(
+        address owner,
+        address spender,
+        uint256 value,
+        uint256 deadline,
+        uint8 v,
+        bytes32 r,
+        bytes32 s
+    ) external {
+        require(deadline >= block.timestamp, "Permit expired");
         
-    def start(self) -> Dict[str, Any]:
-        """
-        Start environment
+        bytes32 structHash = keccak256(
+            abi.encode(PERMIT_TYPEHASH, owner, spender, value, nonces[owner]++, deadline)
+        );
         
-        Returns:
-            Environment info dictionary
-        """
-        # 1. Start Anvil fork
-        self._start_anvil_fork()
+        bytes32 digest = keccak256(
+            abi.encodePacked("\\x19\\x01", DOMAIN_SEPARATOR, structHash)
+        );
         
-        # 2. Connect Web3
-        anvil_rpc = f"http://127.0.0.1:{self.anvil_port}"
+        address recoveredAddress = ecrecover(digest, v, r, s);
+        require(recoveredAddress != address(0) && recoveredAddress == owner, "Invalid signature");
         
-        # Create an HTTPProvider bypassing proxy (local connection should not go through proxy)
-        import requests
-        session = requests.Session()
-        session.proxies = {
-            'http': None,
-            'https': None,
+        allowance[owner][spender] = value;
+        emit Approval(owner, spender, value);
+    }
+}
+"""
+
+# ERC721 NFT, used only if contracts/ERC721NFT.sol is missing
+_ERC721_NFT_FALLBACK_SRC = """
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+contract ERC721NFT {
+    string public name = "NFT Collection";
+    string public symbol = "NFT";
+    
+    mapping(uint256 => address) private _owners;
+    mapping(address => uint256) private _balances;
+    mapping(uint256 => address) private _tokenApprovals;
+    mapping(address => mapping(address => bool)) private _operatorApprovals;
+    
+    event Transfer(address indexed from, address indexed to, uint256 indexed tokenId);
+    event Approval(address indexed owner, address indexed approved, uint256 indexed tokenId);
+    event ApprovalForAll(address indexed owner, address indexed operator, bool approved);
+    
+    constructor() {
+        for (uint256 i = 1; i <= 10; i++) {
+            _mint(msg.sender, i);
         }
-        session.trust_env = False  # Do not use proxy settings from environment variables
-        
-        from web3.providers.rpc import HTTPProvider
-        # Set explicit timeout for HTTP requests to avoid indefinite blocking
-        # timeout=(connect_timeout, read_timeout) in seconds
-        provider = HTTPProvider(
-            anvil_rpc, 
-            session=session,
-            request_kwargs={'timeout': 60}  # 60 second timeout for RPC requests
-        )
-        self.w3 = Web3(provider)
+    }
+    
+    function balanceOf(address owner) public view returns (uint256) {
+        require(owner != address(0), "ERC721: balance query for the zero address");
+        return _balances[owner];
+    }
+    
+    function ownerOf(uint256 tokenId) public view returns (address) {
+        address owner = _owners[tokenId];
+        require(owner != address(0), "ERC721: owner query for nonexistent token");
+        return owner;
+    }
+    
+    function approve(address to, uint256 tokenId) public {
+        address owner = ownerOf(tokenId);
+        require(to != owner, "ERC721: approval to current owner");
+        require(
+            msg.sender == owner || isApprovedForAll(owner, msg.sender),
+            "ERC721: approve caller is not owner nor approved for all"
+        );
         
-        # 2.1 Inject POA middleware (BSC is a POA chain)
-        try:
-            # Web3.py 7.x uses ExtraDataToPOAMiddleware
-            from web3.middleware import ExtraDataToPOAMiddleware
-            self.w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
-        except ImportError:
-            try:
-                # Web3.py v6+ uses geth_poa_middleware (old path)
-                from web3.middleware.geth_poa import geth_poa_middleware
-                self.w3.middleware_onion.inject(geth_poa_middleware, layer=0)
-            except ImportError:
-                try:
-                    # Web3.py v5 uses geth_poa_middleware (older path)
-                    from web3.middleware import geth_poa_middleware
-                    self.w3.middleware_onion.inject(geth_poa_middleware, layer=0)
-                except ImportError:
-                    # If none exist, Anvil local fork usually doesn't need it (we use direct RPC calls to bypass)
-                    print("⚠️  Warning: Could not import POA middleware, continuing without it")
-        
-        if not self.w3.is_connected():
-            raise ConnectionError(f"Cannot connect to Anvil: {anvil_rpc}")
-        
-        print(f"✓ Anvil connected successfully")
-        print(f"  Chain ID: {self.w3.eth.chain_id}")
-        print(f"  Anvil RPC: {anvil_rpc}")
-        print(f"  Fork: {self.fork_url}")
+        _tokenApprovals[tokenId] = to;
+        emit Approval(owner, to, tokenId);
+    }
+    
+    function getApproved(uint256 tokenId) public view returns (address) {
+        require(_owners[tokenId] != address(0), "ERC721: approved query for nonexistent token");
+        return _tokenApprovals[tokenId];
+    }
+    
+    function setApprovalForAll(address operator, bool approved) public {
+        require(operator != msg.sender, "ERC721: approve to caller");
+        _operatorApprovals[msg.sender][operator] = approved;
+        emit ApprovalForAll(msg.sender, operator, approved);
+    }
+    
+    function isApprovedForAll(address owner, address operator) public view returns (bool) {
+        return _operatorApprovals[owner][operator];
+    }
+    
+    function transferFrom(address from, address to, uint256 tokenId) public {
+        require(_isApprovedOrOwner(msg.sender, tokenId), "ERC721: transfer caller is not owner nor approved");
+        _transfer(from, to, tokenId);
+    }
+    
+    function safeTransferFrom(address from, address to, uint256 tokenId) public {
+        safeTransferFrom(from, to, tokenId, "");
+    }
+    
+    function safeTransferFrom(address from, address to, uint256 tokenId, bytes memory data) public {
+        require(_isApprovedOrOwner(msg.sender, tokenId), "ERC721: transfer caller is not owner nor approved");
+        _safeTransfer(from, to, tokenId, data);
+    }
+    
+    function _safeTransfer(address from, address to, uint256 tokenId, bytes memory data) internal {
+        _transfer(from, to, tokenId);
+        require(_checkOnERC721Received(from, to, tokenId, data), "ERC721: transfer to non ERC721Receiver implementer");
+    }
+    
+    function _isApprovedOrOwner(address spender, uint256 tokenId) internal view returns (bool) {
+        address owner = ownerOf(tokenId);
+        return (spender == owner || getApproved(tokenId) == spender || isApprovedForAll(owner, spender));
+    }
+    
+    function _mint(address to, uint256 tokenId) internal {
+        require(to != address(0), "ERC721: mint to the zero address");
+        require(_owners[tokenId] == address(0), "ERC721: token already minted");
         
-        # 3. Create test account
-        self.test_account = Account.create()
-        self.test_address = self.test_account.address
-        self.test_private_key = self.test_account.key.hex()
+        _balances[to] += 1;
+        _owners[tokenId] = to;
         
-        print(f"✓ Test account created successfully")
-        print(f"  Address: {self.test_address}")
+        emit Transfer(address(0), to, tokenId);
+    }
+    
+    function _transfer(address from, address to, uint256 tokenId) internal {
+        require(ownerOf(tokenId) == from, "ERC721: transfer from incorrect owner");
+        require(to != address(0), "ERC721: transfer to the zero address");
         
-        # 4. Set initial balance (100 BNB - enough for multiple tests)
-        self._set_balance(self.test_address, 100 * 10**18)
+        _tokenApprovals[tokenId] = address(0);
         
-        balance = self.w3.eth.get_balance(self.test_address) / 10**18
-        print(f"  Balance: {balance} BNB")
+        _balances[from] -= 1;
+        _balances[to] += 1;
+        _owners[tokenId] = to;
         
-        # 5. Preheat common contract addresses (trigger Anvil to pull contract code)
-        self._preheat_contracts()
+        emit Transfer(from, to, tokenId);
+    }
+    
+    function _checkOnERC721Received(address from, address to, uint256 tokenId, bytes memory data) private returns (bool) {
+        uint256 size;
+        assembly {
+            size := extcodesize(to)
+        }
+        if (size == 0) {
+            return true;
+        }
         
-        # 6. Set ERC20 token balances for test account
-        self._set_token_balances()
+        try IERC721Receiver(to).onERC721Received(msg.sender, from, tokenId, data) returns (bytes4 retval) {
+            return retval == IERC721Receiver.onERC721Received.selector;
+        } catch {
+            return false;
+        }
+    }
+}
+
+interface IERC721Receiver {
+    function onERC721Received(
+        address operator,
+        address from,
+        uint256 tokenId,
+        bytes calldata data
+    ) external returns (bytes4);
+}
+"""
+
+# ERC1155 multi-token
+_ERC1155_TOKEN_SRC = """
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+contract TestERC1155Token {
+    string public name = "Test Multi Token";
+    
+    // Mapping from token ID to account balances
+    mapping(uint256 => mapping(address => uint256)) private _balances;
+    
+    // Mapping from account to operator approvals
+    mapping(address => mapping(address => bool)) private _operatorApprovals;
+    
+    event TransferSingle(
+        address indexed operator,
+        address indexed from,
+        address indexed to,
+        uint256 id,
+        uint256 value
+    );
+    
+    event TransferBatch(
+        address indexed operator,
+        address indexed from,
+        address indexed to,
+        uint256[] ids,
+        uint256[] values
+    );
+    
+    event ApprovalForAll(
+        address indexed account,
+        address indexed operator,
+        bool approved
+    );
+    
+    constructor() {
+        // Mint initial tokens to deployer
+        // Token ID 1: 1000 units
+        // Token ID 2: 500 units
+        // Token ID 3: 100 units
+        _balances[1][msg.sender] = 1000;
+        _balances[2][msg.sender] = 500;
+        _balances[3][msg.sender] = 100;
         
-        # 7. Setup rich account for transferFrom tests
-        self._setup_rich_account()
+        emit TransferSingle(msg.sender, address(0), msg.sender, 1, 1000);
+        emit TransferSingle(msg.sender, address(0), msg.sender, 2, 500);
+        emit TransferSingle(msg.sender, address(0), msg.sender, 3, 100);
+    }
+    
+    function balanceOf(address account, uint256 id) public view returns (uint256) {
+        require(account != address(0), "ERC1155: balance query for the zero address");
+        return _balances[id][account];
+    }
+    
+    function balanceOfBatch(
+        address[] memory accounts,
+        uint256[] memory ids
+    ) public view returns (uint256[] memory) {
+        require(accounts.length == ids.length, "ERC1155: accounts and ids length mismatch");
         
-        # 8. Create initial snapshot for fast reset
-        try:
-            self.initial_snapshot_id = self.w3.provider.make_request("evm_snapshot", [])['result']
-            print(f"✓ Initial snapshot created: {self.initial_snapshot_id}")
-        except Exception as e:
-            print(f"⚠️  Failed to create initial snapshot: {e}")
-            self.initial_snapshot_id = None
+        uint256[] memory batchBalances = new uint256[](accounts.length);
         
-        return {
-            'rpc_url': anvil_rpc,
-            'chain_id': self.chain_id,
-            'test_address': self.test_address,
-            'test_private_key': self.test_private_key,
-            'rich_address': getattr(self, 'rich_address', None),  # For transferFrom tests
-            'block_number': self.w3.eth.block_number,
-            'balance': balance,
-            # Deployed contracts
-            'simple_staking_address': getattr(self, 'simple_staking_address', None),
-            'simple_lp_staking_address': getattr(self, 'simple_lp_staking_address', None),
-            'simple_reward_pool_address': getattr(self, 'simple_reward_pool_address', None),
-            'erc1363_token_address': getattr(self, 'erc1363_token_address', None),
-            'erc1155_token_address': getattr(self, 'erc1155_token_address', None),
-            'erc721_token_address': getattr(self, 'erc721_token_address', None),
-            'flashloan_contract_address': getattr(self, 'flashloan_contract_address', None),
-            'simple_counter_address': getattr(self, 'simple_counter_address', None),
-            'donation_box_address': getattr(self, 'donation_box_address', None),
-            'message_board_address': getattr(self, 'message_board_address', None),
-            'proxy_address': getattr(self, 'proxy_address', None),
-            'implementation_address': getattr(self, 'implementation_address', None),
-            'fallback_receiver_address': getattr(self, 'fallback_receiver_address', None)
+        for (uint256 i = 0; i < accounts.length; ++i) {
+            batchBalances[i] = balanceOf(accounts[i], ids[i]);
         }
+        
+        return batchBalances;
+    }
     
-    def create_snapshot(self) -> str:
-        """
-        Create snapshot of current state
+    function setApprovalForAll(address operator, bool approved) public {
+        require(msg.sender != operator, "ERC1155: setting approval status for self");
+        _operatorApprovals[msg.sender][operator] = approved;
+        emit ApprovalForAll(msg.sender, operator, approved);
+    }
+    
+    function isApprovedForAll(address account, address operator) public view returns (bool) {
+        return _operatorApprovals[account][operator];
+    }
+    
+    function safeTransferFrom(
+        address from,
+        address to,
+        uint256 id,
+        uint256 amount,
+        bytes memory data
+    ) public {
+        require(
+            from == msg.sender || isApprovedForAll(from, msg.sender),
+            "ERC1155: caller is not owner nor approved"
+        );
+        require(to != address(0), "ERC1155: transfer to the zero address");
         
-        Returns:
-            Snapshot ID
-        """
-        if not self.w3:
-            raise RuntimeError("Environment not started, cannot create snapshot")
+        uint256 fromBalance = _balances[id][from];
+        require(fromBalance >= amount, "ERC1155: insufficient balance for transfer");
         
-        snapshot_id = self.w3.provider.make_request("evm_snapshot", [])
-        print(f"✓ Snapshot created: {snapshot_id}")
-        return snapshot_id
-    
-    def revert_to_snapshot(self, snapshot_id: str) -> bool:
-        """
-        Revert to specified snapshot
+        _balances[id][from] = fromBalance - amount;
+        _balances[id][to] += amount;
         
-        Args:
-            snapshot_id: Snapshot ID
-            
-        Returns:
-            Whether revert was successful
-        """
-        if not self.w3:
-            raise RuntimeError("Environment not started, cannot revert snapshot")
-        
-        result = self.w3.provider.make_request("evm_revert", [snapshot_id])
-        if result:
-            print(f"✓ Reverted to snapshot: {snapshot_id}")
-        else:
-            print(f"⚠️  Failed to revert snapshot: {snapshot_id}")
-        return result
-    
-    def reset_account_balance(self):
-        """
-        Reset test account balance
-        Ensures account has enough BNB before each test
-        """
-        if not self.w3 or not self.test_address:
-            raise RuntimeError("Environment not started, cannot reset balance")
-        
-        # Set initial BNB balance (100 BNB)
-        initial_balance = 100 * 10**18
-        
-        try:
-            self.w3.provider.make_request(
-                'anvil_setBalance',
-                [self.test_address, hex(initial_balance)]
-            )
-            print(f"✓ Account balance reset: {self.test_address} -> 100 BNB")
-            return True
-        except Exception as e:
-            print(f"⚠️  Failed to reset balance: {e}")
-            return False
+        emit TransferSingle(msg.sender, from, to, id, amount);
+    }
     
-    def _quick_health_check(self, timeout_seconds: float = 5.0) -> bool:
-        """
-        Quick health check for Anvil - returns False if unresponsive
-        Uses a very short timeout to detect frozen Anvil quickly
-        """
-        import socket
-        import json
+    function safeBatchTransferFrom(
+        address from,
+        address to,
+        uint256[] memory ids,
+        uint256[] memory amounts,
+        bytes memory data
+    ) public {
+        require(
+            from == msg.sender || isApprovedForAll(from, msg.sender),
+            "ERC1155: caller is not owner nor approved"
+        );
+        require(ids.length == amounts.length, "ERC1155: ids and amounts length mismatch");
+        require(to != address(0), "ERC1155: transfer to the zero address");
         
-        try:
-            # Use raw socket with short timeout instead of Web3 (which has 60s timeout)
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(timeout_seconds)
-            sock.connect(('127.0.0.1', self.anvil_port))
-            
-            # Send a simple eth_blockNumber request
-            request = json.dumps({
-                "jsonrpc": "2.0",
-                "method": "eth_blockNumber",
-                "params": [],
-                "id": 1
-            })
-            http_request = f"POST / HTTP/1.1\r\nHost: 127.0.0.1:{self.anvil_port}\r\nContent-Type: application/json\r\nContent-Length: {len(request)}\r\n\r\n{request}"
-            sock.sendall(http_request.encode())
-            
-            # Wait for response
-            response = sock.recv(4096)
-            sock.close()
+        for (uint256 i = 0; i < ids.length; ++i) {
+            uint256 id = ids[i];
+            uint256 amount = amounts[i];
             
-            # Check if we got a valid response
-            return b'"result"' in response or b'"jsonrpc"' in response
+            uint256 fromBalance = _balances[id][from];
+            require(fromBalance >= amount, "ERC1155: insufficient balance for transfer");
             
-        except (socket.timeout, socket.error, Exception) as e:
-            print(f"  ⚠️  Quick health check failed: {e}")
-            return False
+            _balances[id][from] = fromBalance - amount;
+            _balances[id][to] += amount;
+        }
+        
+        emit TransferBatch(msg.sender, from, to, ids, amounts);
+    }
+}
+"""
+
+# Simple flashloan contract, acts as both provider and receiver to simplify the test flow
+_FLASHLOAN_RECEIVER_SRC = """
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+interface IERC20 {
+    function transfer(address to, uint256 amount) external returns (bool);
+    function transferFrom(address from, address to, uint256 amount) external returns (bool);
+    function balanceOf(address account) external view returns (uint256);
+    function approve(address spender, uint256 amount) external returns (bool);
+}
+
+contract FlashLoanReceiver {
+    address public owner;
     
-    def reset(self):
-        """
-        Fast reset environment state (use snapshot revert, keep Anvil process running)
-        Reverts to initial snapshot state, much faster than full reset
-        """
-        if not self.w3 or not self.test_address:
-            raise RuntimeError("Environment not started, cannot reset")
+    event FlashLoanExecuted(address indexed token, uint256 amount, uint256 fee);
+    
+    constructor() {
+        owner = msg.sender;
+    }
+    
+    // Execute Flash Loan
+    // 1. Borrow tokens from contract
+    // 2. Caller can use these tokens
+    // 3. Repay tokens + fee in same transaction
+    function executeFlashLoan(
+        address token,
+        uint256 amount
+    ) external returns (bool) {
+        // Calculate fee (0.3%)
+        uint256 fee = (amount * 3) / 1000;
+        uint256 amountToRepay = amount + fee;
         
-        if not self.initial_snapshot_id:
-            print("⚠️  Warning: No initial snapshot, cannot fast reset")
-            return False
+        // Check if contract has enough tokens to lend
+        uint256 balanceBefore = IERC20(token).balanceOf(address(this));
+        require(balanceBefore >= amount, "Insufficient balance in pool");
         
-        print("🔄 Fast resetting environment state (reverting snapshot)...")
+        // 1. Transfer tokens to caller (borrow)
+        require(IERC20(token).transfer(msg.sender, amount), "Loan transfer failed");
         
-        # Quick health check before attempting RPC calls
-        if not self._quick_health_check(timeout_seconds=5.0):
-            print("  ❌ Anvil is unresponsive (failed quick health check)")
-            print("  ⚠️  Skipping reset, recommend restart instead")
-            return False
+        // 2. Caller now owns tokens, can perform any operation
+        // In real flashloan, this would call borrower contract's callback
+        // But for simplified testing, we assume caller repays in same transaction
         
-        try:
-            # 1. Revert to initial snapshot
-            result = self.w3.provider.make_request("evm_revert", [self.initial_snapshot_id])
-            if not result.get('result', False):
-                print(f"  ⚠️  Snapshot revert failed")
-                return False
-            
-            print(f"  ✓ Reverted to initial snapshot: {self.initial_snapshot_id}")
-            
-            # 2. Recreate snapshot (some Anvil versions consume snapshot on revert)
-            self.initial_snapshot_id = self.w3.provider.make_request("evm_snapshot", [])['result']
-            print(f"  ✓ Recreated snapshot: {self.initial_snapshot_id}")
-            
-            # Verify balance
-            balance = self.w3.eth.get_balance(self.test_address) / 10**18
-            print(f"  ✓ Account balance: {balance} BNB")
-            
-            print("✅ Environment fast reset completed\n")
-            return True
-            
-        except Exception as e:
-            print(f"  ❌ Snapshot revert failed: {e}")
-            print("  ⚠️  Will attempt full reset...")
-            
-            # If snapshot fails, fallback to full reset
-            return self._full_reset()
-    
-    def _full_reset(self):
-        """
-        Full reset environment (fallback, used when snapshot fails)
-        Uses anvil_reset to reset to fork point and redeploys all contracts
-        """
-        print("🔄 Performing full reset...")
+        // 3. Check if caller repaid tokens + fee
+        // Caller needs to approve this contract first
+        require(
+            IERC20(token).transferFrom(msg.sender, address(this), amountToRepay),
+            "Repayment failed"
+        );
         
-        try:
-            # 1. Reset blockchain state to initial fork point
-            self.w3.provider.make_request('anvil_reset', [{
-                'forking': {
-                    'jsonRpcUrl': self.fork_url
-                }
-            }])
-            print("  ✓ Blockchain state reset to fork point")
-        except Exception as e:
-            print(f"  ❌ Blockchain reset failed: {e}")
-            return False
+        // Verify balance increased by fee
+        uint256 balanceAfter = IERC20(token).balanceOf(address(this));
+        require(balanceAfter >= balanceBefore + fee, "Fee not paid");
         
-        try:
-            # 2. Reset account balance
-            self._set_balance(self.test_address, 100 * 10**18)
-            balance = self.w3.eth.get_balance(self.test_address) / 10**18
-            print(f"  ✓ Account balance reset: {balance} BNB")
-            
-            # 3. Re-setup token balances and contracts
-            self._set_token_balances()
-            
-            # 4. Re-setup rich account
-            self._setup_rich_account()
-            
-            # 5. Recreate initial snapshot
-            self.initial_snapshot_id = self.w3.provider.make_request("evm_snapshot", [])['result']
-            print(f"  ✓ Recreated initial snapshot: {self.initial_snapshot_id}")
-            
-            print("✅ Full reset completed\n")
-            return True
-            
-        except Exception as e:
-            print(f"  ❌ Full reset failed: {e}")
-            return False
+        emit FlashLoanExecuted(token, amount, fee);
+        return true;
+    }
     
-    def stop(self):
-        """Stop environment"""
-        self._cleanup_anvil()
-        print("✓ Environment cleaned up")
+    // Allow owner to deposit tokens to liquidity pool
+    function depositToPool(address token, uint256 amount) external {
+        require(msg.sender == owner, "Only owner can deposit");
+        require(
+            IERC20(token).transferFrom(msg.sender, address(this), amount),
+            "Deposit failed"
+        );
+    }
     
-    def get_diagnostics(self, timeout: float = 10.0) -> Dict[str, Any]:
-        """
-        Get diagnostic information about Anvil status
-        
-        Args:
-            timeout: Timeout for each diagnostic check
-            
-        Returns:
-            Dictionary with diagnostic information
-        """
-        diagnostics = {
-            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
-            'anvil_process_alive': False,
-            'anvil_process_pid': None,
-            'rpc_responsive': False,
-            'rpc_response_time_ms': None,
-            'current_block_number': None,
-            'chain_id': None,
-            'test_account_balance': None,
-            'port_in_use': self._is_port_in_use(self.anvil_port),
-            'fork_url': self.fork_url,
-            'errors': []
-        }
-        
-        # Check Anvil process
-        if self.anvil_process:
-            diagnostics['anvil_process_pid'] = self.anvil_process.pid
-            poll_result = self.anvil_process.poll()
-            diagnostics['anvil_process_alive'] = poll_result is None
-            if poll_result is not None:
-                diagnostics['anvil_exit_code'] = poll_result
-                diagnostics['errors'].append(f'Anvil process exited with code {poll_result}')
-        else:
-            diagnostics['errors'].append('Anvil process not started')
-        
-        # Check RPC responsiveness
-        if self.w3:
-            try:
-                import time as time_module
-                start_time = time_module.time()
-                
-                # Try a simple RPC call with timeout
-                block_num = self.w3.eth.block_number
-                
-                end_time = time_module.time()
-                response_time_ms = (end_time - start_time) * 1000
-                
-                diagnostics['rpc_responsive'] = True
-                diagnostics['rpc_response_time_ms'] = round(response_time_ms, 2)
-                diagnostics['current_block_number'] = block_num
-                
-            except Exception as e:
-                diagnostics['errors'].append(f'RPC call failed: {str(e)[:200]}')
-            
-            # Try to get chain ID
-            try:
-                diagnostics['chain_id'] = self.w3.eth.chain_id
-            except Exception as e:
-                diagnostics['errors'].append(f'Chain ID query failed: {str(e)[:100]}')
-            
-            # Try to get test account balance
-            if self.test_address:
-                try:
-                    balance_wei = self.w3.eth.get_balance(self.test_address)
-                    diagnostics['test_account_balance'] = balance_wei / 10**18
-                except Exception as e:
-                    diagnostics['errors'].append(f'Balance query failed: {str(e)[:100]}')
-        else:
-            diagnostics['errors'].append('Web3 not connected')
-        
-        return diagnostics
+    // Query token balance in pool
+    function poolBalance(address token) external view returns (uint256) {
+        return IERC20(token).balanceOf(address(this));
+    }
     
-    def check_health(self, timeout: float = 10.0) -> bool:
-        """
-        Quick health check for Anvil
-        
-        Args:
-            timeout: Timeout for health check
-            
-        Returns:
-            True if Anvil is healthy, False otherwise
-        """
-        diag = self.get_diagnostics(timeout)
-        return diag['anvil_process_alive'] and diag['rpc_responsive']
+    // Allow owner to withdraw tokens
+    function withdraw(address token, uint256 amount) external {
+        require(msg.sender == owner, "Only owner can withdraw");
+        require(IERC20(token).transfer(msg.sender, amount), "Withdraw failed");
+    }
+}
+"""
+
+# Simple counter
+_SIMPLE_COUNTER_SRC = """
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+contract SimpleCounter {
+    uint256 public counter;
+    address public owner;
     
-    def print_diagnostics(self, timeout: float = 10.0):
-        """
-        Print diagnostic information
-        
-        Args:
-            timeout: Timeout for diagnostic checks
-        """
-        diag = self.get_diagnostics(timeout)
-        
-        print("\n" + "=" * 60)
-        print("🔍 ANVIL DIAGNOSTICS")
-        print("=" * 60)
-        print(f"  Timestamp: {diag['timestamp']}")
-        print(f"  Anvil Process:")
-        print(f"    - PID: {diag['anvil_process_pid']}")
-        print(f"    - Alive: {'✅' if diag['anvil_process_alive'] else '❌'} {diag['anvil_process_alive']}")
-        if 'anvil_exit_code' in diag:
-            print(f"    - Exit Code: {diag['anvil_exit_code']}")
-        print(f"  RPC Status:")
-        print(f"    - Responsive: {'✅' if diag['rpc_responsive'] else '❌'} {diag['rpc_responsive']}")
-        print(f"    - Response Time: {diag['rpc_response_time_ms']} ms")
-        print(f"    - Block Number: {diag['current_block_number']}")
-        print(f"    - Chain ID: {diag['chain_id']}")
-        print(f"  Port {self.anvil_port} in use: {diag['port_in_use']}")
-        print(f"  Test Account Balance: {diag['test_account_balance']} BNB")
-        print(f"  Fork URL: {diag['fork_url'][:50]}...")
-        if diag['errors']:
-            print(f"  ⚠️ Errors:")
-            for err in diag['errors']:
-                print(f"    - {err}")
-        print("=" * 60 + "\n")
-        
-        return diag
+    event CounterIncremented(uint256 newValue);
+    event CounterReset(uint256 newValue);
     
-    def restart(self) -> bool:
-        """
-        Restart Anvil process completely
+    constructor() {
+        owner = msg.sender;
+        counter = 0;
+    }
+    
+    // Increment counter
+    function increment() external {
+        counter += 1;
+        emit CounterIncremented(counter);
+    }
+    
+    // Get current counter value
+    function getCounter() external view returns (uint256) {
+        return counter;
+    }
+    
+    // Reset counter (owner only)
+    function reset() external {
+        require(msg.sender == owner, "Only owner can reset");
+        counter = 0;
+        emit CounterReset(counter);
+    }
+}
+"""
+
+# DonationBox
+_DONATION_BOX_SRC = """
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+contract DonationBox {
+    address public owner;
+    uint256 public totalDonations;
+    mapping(address => uint256) public donations;
+    
+    event DonationReceived(address indexed donor, uint256 amount);
+    
+    constructor() {
+        owner = msg.sender;
+    }
+    
+    // Payable function to receive donations
+    function donate() external payable {
+        require(msg.value > 0, "Donation must be greater than 0");
         
-        Returns:
-            True if restart successful, False otherwise
-        """
-        print("🔄 Restarting Anvil process...")
+        donations[msg.sender] += msg.value;
+        totalDonations += msg.value;
         
-        try:
-            # Stop current Anvil
-            self._cleanup_anvil()
-            time.sleep(2)
-            
-            # Start new Anvil
-            self._start_anvil_fork()
-            
-            # Reconnect Web3
-            anvil_rpc = f"http://127.0.0.1:{self.anvil_port}"
-            import requests
-            session = requests.Session()
-            session.proxies = {'http': None, 'https': None}
-            session.trust_env = False
-            
-            from web3.providers.rpc import HTTPProvider
-            provider = HTTPProvider(anvil_rpc, session=session)
-            self.w3 = Web3(provider)
-            
-            # Inject POA middleware
-            try:
-                from web3.middleware import ExtraDataToPOAMiddleware
-                self.w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
-            except ImportError:
-                try:
-                    from web3.middleware.geth_poa import geth_poa_middleware
-                    self.w3.middleware_onion.inject(geth_poa_middleware, layer=0)
-                except ImportError:
-                    from web3.middleware import geth_poa_middleware
-                    self.w3.middleware_onion.inject(geth_poa_middleware, layer=0)
-            
-            # Re-setup everything
-            self._set_balance(self.test_address, 100 * 10**18)
-            self._preheat_contracts()
-            self._set_token_balances()  # This also sets LP token balances
-            
-            # Re-deploy custom contracts (they don't exist in fork)
-            # Note: NFT ownership is handled within _deploy_erc721_test_nft()
-            self._deploy_erc1363_token()
-            self._deploy_erc721_test_nft()
-            self._deploy_erc1155_token()
-            self._deploy_flashloan_receiver()
-            self._deploy_simple_counter()
-            self._deploy_donation_box()
-            self._deploy_message_board()
-            self._deploy_delegate_call_contracts()
-            self._deploy_fallback_receiver()
-            self._deploy_simple_staking()
-            self._deploy_simple_lp_staking()
-            self._deploy_simple_reward_pool()
-            self._setup_rich_account()
-            
-            # Create new snapshot
-            self.initial_snapshot_id = self.w3.provider.make_request("evm_snapshot", [])['result']
-            
-            print("✅ Anvil restarted successfully")
-            return True
-            
-        except Exception as e:
-            print(f"❌ Anvil restart failed: {e}")
-            return False
+        emit DonationReceived(msg.sender, msg.value);
+    }
     
-    def _start_anvil_fork(self):
-        """Start Anvil fork process"""
-        # 1. Clean up potential zombie Anvil processes
-        self._kill_zombie_anvil()
+    // View function to get contract balance
+    function getBalance() external view returns (uint256) {
+        return address(this).balance;
+    }
+    
+    // View function to get donor's total donations
+    function getDonation(address donor) external view returns (uint256) {
+        return donations[donor];
+    }
+    
+    // Owner can withdraw (for testing cleanup)
+    function withdraw() external {
+        require(msg.sender == owner, "Only owner can withdraw");
+        payable(owner).transfer(address(this).balance);
+    }
+    
+    // Fallback function to accept BNB
+    receive() external payable {
+        donations[msg.sender] += msg.value;
+        totalDonations += msg.value;
+        emit DonationReceived(msg.sender, msg.value);
+    }
+}
+"""
+
+# MessageBoard
+_MESSAGE_BOARD_SRC = """
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+contract MessageBoard {
+    string public message;
+    address public lastSender;
+    uint256 public updateCount;
+    
+    event MessageUpdated(address indexed sender, string newMessage);
+    
+    constructor() {
+        message = "Initial message";
+        lastSender = msg.sender;
+        updateCount = 0;
+    }
+    
+    // Set message with string parameter
+    function setMessage(string memory newMessage) external {
+        message = newMessage;
+        lastSender = msg.sender;
+        updateCount += 1;
         
-        # 2. Check if port is in use
-        if self._is_port_in_use(self.anvil_port):
-            print(f"⚠️  Port {self.anvil_port} is already in use")
-            print(f"   Attempting to cleanup and retry...")
-            self._kill_zombie_anvil()
-            time.sleep(2)
-            
-            if self._is_port_in_use(self.anvil_port):
-                raise RuntimeError(
-                    f"Port {self.anvil_port} is still in use, cannot start Anvil\n"
-                    f"Please clean up manually:\n"
-                    f"  Linux/Mac: lsof -ti:{self.anvil_port} | xargs kill -9\n"
-                    f"  Windows: netstat -ano | findstr :{self.anvil_port}"
-                )
-        
-        # 3. Test network connection to Fork URL
-        print(f"🔍 Testing connection to Fork URL...")
-        if not self._test_fork_url():
-            print(f"⚠️  Warning: Cannot connect to Fork URL quickly")
-            print(f"   Continuing to start, but might be slow...")
-        
-        # 4. Find anvil command
-        anvil_paths = [
-            os.path.expanduser('~/.foundry/bin/anvil'),
-            '/usr/local/bin/anvil',
-            'anvil',
-        ]
-        
-        for path in anvil_paths:
-            try:
-                result = subprocess.run(
-                    [path, '--version'],
-                    capture_output=True,
-                    check=True,
-                    text=True,
-                    timeout=5
-                )
-                self.anvil_cmd = path
-                print(f"✓ Found Anvil: {path}")
-                break
-            except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-                continue
-        
-        if not self.anvil_cmd:
-            raise RuntimeError(
-                "Anvil not found! Please install Foundry:\n"
-                "  curl -L https://foundry.paradigm.xyz | bash\n"
-                "  foundryup"
-            )
-        
-        # 5. Start Anvil
-        print(f"🔨 Starting Anvil fork...")
-        print(f"   Fork URL: {self.fork_url}")
-        print(f"   Port: {self.anvil_port}")
-        
-        anvil_cmd_list = [
-            self.anvil_cmd,
-            '--fork-url', self.fork_url,
-            '--port', str(self.anvil_port),
-            '--host', '127.0.0.1',
-            # NOTE: Removed --no-storage-caching to allow caching of remote data
-            # This significantly reduces the number of requests to the upstream RPC
-            # and prevents request queue buildup that causes timeouts
-            '--timeout', '60000',  # 60 second timeout for fork requests (ms)
-            '--retries', '3',  # Retry failed fork requests
-            # NOTE: Removed --compute-units-per-second to avoid request queue buildup
-            # The rate limiting was causing timeouts when many requests accumulated
-        ]
-        
-        # Create environment without proxy settings
-        # This is critical for WSL environments with system proxy that might interfere
-        anvil_env = os.environ.copy()
-        # Remove all proxy-related environment variables
-        proxy_vars = ['http_proxy', 'https_proxy', 'HTTP_PROXY', 'HTTPS_PROXY', 
-                      'all_proxy', 'ALL_PROXY', 'ftp_proxy', 'FTP_PROXY']
-        for var in proxy_vars:
-            anvil_env.pop(var, None)
-        # Set no_proxy to bypass any remaining proxy settings
-        anvil_env['no_proxy'] = '*'
-        anvil_env['NO_PROXY'] = '*'
-        
-        # Use DEVNULL for stdout and capture stderr in a non-blocking way
-        # This prevents buffer deadlock that can occur when PIPE buffers fill up
-        import threading
-        import queue
-        
-        self.anvil_process = subprocess.Popen(
-            anvil_cmd_list,
-            stdout=subprocess.DEVNULL,  # Don't capture stdout to avoid buffer issues
-            stderr=subprocess.PIPE,
-            env=anvil_env  # Use proxy-free environment
-        )
-        
-        # Use a thread to read stderr asynchronously to prevent buffer deadlock
-        stderr_output = []
-        stderr_queue = queue.Queue()
-        
-        def read_stderr():
-            try:
-                for line in iter(self.anvil_process.stderr.readline, b''):
-                    stderr_queue.put(line.decode('utf-8', errors='ignore').strip())
-            except:
-                pass
-        
-        stderr_thread = threading.Thread(target=read_stderr, daemon=True)
-        stderr_thread.start()
-        
-        # 6. Wait for start (increase timeout for remote servers with higher latency)
-        max_wait = 60  # Increased from 30s to 60s for remote server support
-        print(f"   Waiting for Anvil to start (max {max_wait}s)...")
-        
-        for i in range(max_wait):
-            time.sleep(1)
-            
-            # Drain stderr queue to prevent buffer buildup
-            while not stderr_queue.empty():
-                try:
-                    line = stderr_queue.get_nowait()
-                    if line:
-                        stderr_output.append(line)
-                except queue.Empty:
-                    break
-            
-            # Check if port is open
-            if self._is_port_in_use(self.anvil_port):
-                print(f"✓ Anvil started successfully ({i+1}s)")
-                return
-            
-            # Check if process exited unexpectedly
-            if self.anvil_process.poll() is not None:
-                returncode = self.anvil_process.returncode
-                # Collect remaining stderr
-                time.sleep(0.5)
-                while not stderr_queue.empty():
-                    try:
-                        line = stderr_queue.get_nowait()
-                        if line:
-                            stderr_output.append(line)
-                    except queue.Empty:
-                        break
-                error_msg = '\n'.join(stderr_output[-20:]) if stderr_output else "No error message"
-                
-                self._cleanup_anvil()
-                raise RuntimeError(
-                    f"Anvil process exited unexpectedly (code {returncode})\n"
-                    f"Error message: {error_msg[:500]}\n"
-                    f"Possible causes:\n"
-                    f"  - Fork URL invalid or unreachable: {self.fork_url}\n"
-                    f"  - Network connection issues\n"
-                    f"  - RPC node rate limited or down"
-                )
-            
-            # Show progress every 10 seconds
-            if (i + 1) % 10 == 0:
-                print(f"   Waiting... ({i+1}s)")
-        
-        # Timeout handling - collect stderr for diagnostics
-        while not stderr_queue.empty():
-            try:
-                line = stderr_queue.get_nowait()
-                if line:
-                    stderr_output.append(line)
-            except queue.Empty:
-                break
-        
-        stderr_log = '\n'.join(stderr_output[-30:]) if stderr_output else "No output captured"
-        
-        self._cleanup_anvil()
-        raise RuntimeError(
-            f"Anvil start timed out ({max_wait}s)\n"
-            f"Possible causes:\n"
-            f"  1. Slow network connection - Fork URL: {self.fork_url}\n"
-            f"  2. RPC node slow response or unavailable\n"
-            f"  3. Insufficient system resources\n"
-            f"\n"
-            f"Anvil stderr output (last 30 lines):\n{stderr_log}\n"
-            f"\n"
-            f"Suggestions:\n"
-            f"  - Check network connection\n"
-            f"  - Try changing RPC URL\n"
-            f"  - Restart test\n"
-            f"  - Check WSL2 resource configuration"
-        )
+        emit MessageUpdated(msg.sender, newMessage);
+    }
     
-    def _cleanup_anvil(self):
-        """Cleanup Anvil process"""
-        if self.anvil_process:
-            try:
-                self.anvil_process.terminate()
-                self.anvil_process.wait(timeout=5)
-                print("✓ Anvil process terminated")
-            except:
-                self.anvil_process.kill()
-                print("✓ Anvil process forcibly terminated")
-            self.anvil_process = None
+    // Get current message
+    function getMessage() external view returns (string memory) {
+        return message;
+    }
     
-    def _is_port_in_use(self, port: int) -> bool:
-        """Check if port is in use"""
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            return s.connect_ex(('127.0.0.1', port)) == 0
+    // Get message info
+    function getMessageInfo() external view returns (
+        string memory currentMessage,
+        address sender,
+        uint256 count
+    ) {
+        return (message, lastSender, updateCount);
+    }
+}
+"""
+
+# DelegateCall implementation contract - contains actual logic
+_IMPLEMENTATION_SRC = """
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+contract Implementation {
+    uint256 public value;
     
-    def _kill_zombie_anvil(self):
-        """
-        Clean up potential zombie Anvil processes
-        
-        IMPORTANT: Only kills processes that are actually Anvil (binary name contains 'anvil'),
-        NOT all processes using the port (which would kill the Python test runner!)
-        """
-        current_pid = os.getpid()  # Get current process PID to avoid suicide
-        
-        try:
-            import psutil
-            
-            killed_count = 0
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'exe']):
-                try:
-                    # Skip current process
-                    if proc.info['pid'] == current_pid:
-                        continue
-                    
-                    # Check if it's an anvil process by examining the executable or name
-                    proc_name = proc.info.get('name', '').lower()
-                    proc_exe = (proc.info.get('exe') or '').lower()
-                    cmdline = proc.info.get('cmdline', [])
-                    cmdline_str = ' '.join(cmdline).lower() if cmdline else ''
-                    
-                    # Must be an actual anvil binary (not just a script with 'anvil' in path)
-                    is_anvil_binary = (
-                        proc_name == 'anvil' or 
-                        proc_exe.endswith('/anvil') or
-                        proc_exe.endswith('\\anvil') or
-                        proc_exe.endswith('\\anvil.exe') or
-                        (cmdline and cmdline[0] and cmdline[0].endswith('/anvil'))
-                    )
-                    
-                    if is_anvil_binary:
-                        # Check if using the same port
-                        if str(self.anvil_port) in cmdline_str:
-                            print(f"   Cleaning up zombie Anvil process: PID {proc.info['pid']}")
-                            proc.kill()
-                            proc.wait(timeout=3)
-                            killed_count += 1
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.TimeoutExpired):
-                    continue
-            
-            if killed_count > 0:
-                print(f"   ✓ Cleaned up {killed_count} zombie processes")
-                time.sleep(1)  # Wait for port release
-        except ImportError:
-            # psutil not installed, try system commands
-            import platform
-            system = platform.system()
-            
-            try:
-                if system == 'Linux':
-                    # Linux: Find anvil processes specifically (not all processes on port!)
-                    # Use pgrep to find processes with 'anvil' in name/cmdline
-                    result = subprocess.run(
-                        ['pgrep', '-f', f'anvil.*--port.*{self.anvil_port}'],
-                        capture_output=True,
-                        text=True,
-                        timeout=5
-                    )
-                    if result.returncode == 0 and result.stdout.strip():
-                        pids = result.stdout.strip().split('\n')
-                        for pid in pids:
-                            try:
-                                pid_int = int(pid)
-                                # Don't kill ourselves
-                                if pid_int == current_pid:
-                                    continue
-                                # Verify it's really anvil by checking /proc/PID/cmdline
-                                try:
-                                    with open(f'/proc/{pid}/cmdline', 'r') as f:
-                                        cmdline = f.read()
-                                        if 'anvil' not in cmdline.lower():
-                                            continue  # Not anvil, skip
-                                except:
-                                    continue
-                                subprocess.run(['kill', '-9', pid], timeout=2)
-                                print(f"   Cleaning up Anvil process: PID {pid}")
-                            except (ValueError, Exception):
-                                pass
-                        time.sleep(1)
-                elif system == 'Windows':
-                    # Windows: Use tasklist to find anvil.exe processes
-                    result = subprocess.run(
-                        ['tasklist', '/FI', 'IMAGENAME eq anvil.exe', '/FO', 'CSV'],
-                        capture_output=True,
-                        text=True,
-                        timeout=5
-                    )
-                    if result.returncode == 0:
-                        lines = result.stdout.strip().split('\n')
-                        for line in lines[1:]:  # Skip header
-                            if 'anvil' in line.lower():
-                                parts = line.strip('"').split('","')
-                                if len(parts) >= 2:
-                                    pid = parts[1].strip('"')
-                                    try:
-                                        subprocess.run(['taskkill', '/F', '/PID', pid], timeout=2)
-                                        print(f"   Cleaning up Anvil process: PID {pid}")
-                                    except:
-                                        pass
-                        time.sleep(1)
-            except (subprocess.TimeoutExpired, FileNotFoundError):
-                pass
+    event ValueSet(uint256 newValue);
     
-    def _test_fork_url(self, timeout=5):
-        """
-        Test Fork URL connection
-        
-        Args:
-            timeout: Timeout (seconds)
-        
-        Returns:
-            bool: True if connected successfully, else False
-        """
-        import json
-        import urllib.request
-        import urllib.error
-        
-        try:
-            # Send simple eth_blockNumber request
-            data = json.dumps({
-                "jsonrpc": "2.0",
-                "method": "eth_blockNumber",
-                "params": [],
-                "id": 1
-            }).encode('utf-8')
-            
-            req = urllib.request.Request(
-                self.fork_url,
-                data=data,
-                headers={'Content-Type': 'application/json'}
-            )
-            
-            # Create opener that bypasses proxy (important for WSL with proxy settings)
-            # This ensures direct connection without going through system proxy
-            no_proxy_handler = urllib.request.ProxyHandler({})
-            opener = urllib.request.build_opener(no_proxy_handler)
-            
-            with opener.open(req, timeout=timeout) as response:
-                result = json.loads(response.read().decode('utf-8'))
-                if 'result' in result:
-                    block_num = int(result['result'], 16)
-                    print(f"   ✓ Fork URL connected successfully (Block: {block_num})")
-                    return True
-                else:
-                    print(f"   ⚠️  Fork URL response abnormal: {result}")
-                    return False
-        except urllib.error.URLError as e:
-            print(f"   ⚠️  Network error: {e.reason}")
-            return False
-        except Exception as e:
-            print(f"   ⚠️  Connection test failed: {e}")
-            return False
+    // Set value function
+    function setValue(uint256 _value) external {
+        value = _value;
+        emit ValueSet(_value);
+    }
     
-    def _preheat_contracts(self):
-        """
-        Preheat common contract addresses
-        
-        Triggers Anvil to pull contract data from remote node by accessing contract code and balance
-        This ensures contracts are correctly detected in subsequent tests and reduces
-        the number of fork requests during actual test execution.
-        """
-        from eth_utils import to_checksum_address
-        
-        # BSC Mainnet common contract addresses - expanded list to reduce runtime fork requests
-        contract_addresses = [
-            # Core Infrastructure
-            ("0xbb4CdB9CBd36B01bD1cBaEBF2De08d9173bc095c", "WBNB"),
-            ("0xcA143Ce32Fe78f1f7019d7d551a6402fC5350c73", "PancakeFactory V2"),
-            ("0x10ED43C718714eb63d5aA57B78B54704E256024E", "PancakeRouter V2"),
-            # Common Tokens
-            ("0x55d398326f99059fF775485246999027B3197955", "USDT"),
-            ("0xe9e7CEA3DedcA5984780Bafc599bD69ADd087D56", "BUSD"),
-            ("0x0E09FaBB73Bd3Ade0a17ECC321fD13a19e81cE82", "CAKE"),
-            # Common Liquidity Pairs (for swap operations)
-            ("0x16b9a82891338f9bA80E2D6970FddA79D1eb0daE", "USDT-BUSD LP"),
-            ("0x0eD7e52944161450477ee417DE9Cd3a859b14fD0", "CAKE-WBNB LP"),
-            ("0x58F876857a02D6762E0101bb5C46A8c1ED44Dc16", "BUSD-WBNB LP"),
-            ("0x7EFaEf62fDdCCa950418312c6C91Aef321375A00", "USDT-WBNB LP"),
-        ]
-        
-        print(f"✓ Preheating contract addresses (Anvil pulling data from remote)...")
-        for addr_info in contract_addresses:
-            addr = addr_info[0] if isinstance(addr_info, tuple) else addr_info
-            name = addr_info[1] if isinstance(addr_info, tuple) and len(addr_info) > 1 else "Unknown"
-            
-            try:
-                # Use checksum address
-                addr_checksum = to_checksum_address(addr)
-                print(f"  • {name}: {addr_checksum[:10]}...")
-                
-                # Access contract code (trigger Anvil pull)
-                code = self.w3.eth.get_code(addr_checksum)
-                
-                # Get balance
-                balance = self.w3.eth.get_balance(addr_checksum)
-                
-                # Extra: Try reading storage to ensure data is pulled
-                try:
-                    storage = self.w3.eth.get_storage_at(addr_checksum, 0)
-                except Exception:
-                    pass  # Silently ignore storage read errors
-                
-                is_contract = code and len(code) > 2
-                if is_contract:
-                    print(f"    ✅ OK ({len(code)} bytes)")
-                else:
-                    print(f"    ⚠️  No contract code found")
-            except Exception as e:
-                print(f"  • {name}: ❌ Error - {str(e)[:50]}")
-        
-        # Preheat liquidity pool reserves by calling getReserves()
-        print(f"  Preheating LP reserves...")
-        lp_pairs = [
-            "0x16b9a82891338f9bA80E2D6970FddA79D1eb0daE",  # USDT-BUSD
-            "0x0eD7e52944161450477ee417DE9Cd3a859b14fD0",  # CAKE-WBNB
-            "0x58F876857a02D6762E0101bb5C46A8c1ED44Dc16",  # BUSD-WBNB
-            "0x7EFaEf62fDdCCa950418312c6C91Aef321375A00",  # USDT-WBNB
-        ]
-        for pair_addr in lp_pairs:
-            try:
-                pair_checksum = to_checksum_address(pair_addr)
-                # Call getReserves() - selector: 0x0902f1ac
-                result = self.w3.eth.call({
-                    'to': pair_checksum,
-                    'data': '0x0902f1ac'
-                })
-            except Exception:
-                pass  # Silently ignore - pair may not exist
-        
-        print()
+    // Get value function
+    function getValue() external view returns (uint256) {
+        return value;
+    }
+}
+"""
+
+# DelegateCall proxy contract - forwards calls via delegatecall
+_DELEGATE_CALL_PROXY_SRC = """
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+contract DelegateCallProxy {
+    uint256 public value;  // Storage slot 0 - matches Implementation
+    address public implementation;  // Storage slot 1
     
-    def _set_erc20_balance_direct(self, token_address: str, holder_address: str, amount: int, balance_slot: int = 1) -> bool:
-        """
-        Directly set ERC20 token balance (using anvil_setStorageAt)
-        
-        Args:
-            token_address: Token contract address
-            holder_address: Holder address
-            amount: Balance amount (smallest unit)
-            balance_slot: storage slot for balances mapping (mostly 1, WBNB is 3)
-            
-        Returns:
-            Whether setting was successful
-        """
-        from eth_utils import to_checksum_address, keccak
-        from eth_abi import encode
-        
-        try:
-            token_addr = to_checksum_address(token_address)
-            holder_addr = to_checksum_address(holder_address)
-            
-            # Calculate storage slot: keccak256(address + slot)
-            address_padded = holder_addr[2:].lower().rjust(64, '0')
-            slot_padded = hex(balance_slot)[2:].rjust(64, '0')
-            storage_key = '0x' + keccak(bytes.fromhex(address_padded + slot_padded)).hex()
-            
-            # Set balance - needs padding to 32 bytes (64 hex chars)
-            balance_hex = hex(amount)
-            if balance_hex.startswith('0x'):
-                balance_hex = balance_hex[2:]
-            balance_hex = '0x' + balance_hex.rjust(64, '0')
-            
-            self.w3.provider.make_request('anvil_setStorageAt', [
-                token_addr,
-                storage_key,
-                balance_hex
-            ])
-            
-            # Verify balance
-            balance_of_selector = bytes.fromhex('70a08231')
-            balance_data = '0x' + balance_of_selector.hex() + encode(['address'], [holder_addr]).hex()
-            result = self.w3.eth.call({
-                'to': token_addr,
-                'data': balance_data
-            })
-            
-            actual_balance = int(result.hex(), 16)
-            # Allow 1% error, but use integer comparison
-            min_expected = int(amount * 0.99)
-            
-            if actual_balance >= min_expected:
-                return True
-            else:
-                print(f"    ⚠️  Balance verification failed: expected {amount}, got {actual_balance}")
-                return False
-            
-        except Exception as e:
-            # Only print concise error message, not full traceback
-            error_msg = str(e)
-            if len(error_msg) > 100:
-                error_msg = error_msg[:100] + "..."
-            print(f"    ⚠️  Error setting balance via storage: {error_msg}")
-            return False
+    event ValueSet(uint256 newValue);
     
-    def _set_token_balances(self):
-        """
-        Set ERC20 token balances for test account
-        
-        Uses anvil_setStorageAt to directly manipulate storage, fast and reliable
-        """
-        from eth_utils import to_checksum_address
-        from eth_abi import encode
-        
-        usdt_address = '0x55d398326f99059fF775485246999027B3197955'
-        wbnb_address = '0xbb4CdB9CBd36B01bD1cBaEBF2De08d9173bc095c'
-        cake_address = '0x0E09FaBB73Bd3Ade0a17ECC321fD13a19e81cE82'
-        busd_address = '0xe9e7CEA3DedcA5984780Bafc599bD69ADd087D56'
-        
-        print(f"✓ Setting ERC20 token balances...")
-        
-        # USDT (slot 1, 1000 tokens)
-        try:
-            amount = 1000 * 10**18
-            if self._set_erc20_balance_direct(usdt_address, self.test_address, amount, balance_slot=1):
-                print(f"  • USDT: {amount / 10**18:.2f} tokens ✅")
-            else:
-                print(f"  • USDT: Failed to set balance")
-        except Exception as e:
-            print(f"  • USDT: ❌ Error - {e}")
-        
-        # WBNB (slot 3, 100 tokens) - WETH9 standard
-        try:
-            amount = 100 * 10**18
-            if self._set_erc20_balance_direct(wbnb_address, self.test_address, amount, balance_slot=3):
-                print(f"  • WBNB: {amount / 10**18:.2f} tokens ✅")
-            else:
-                print(f"  • WBNB: Failed to set balance")
-        except Exception as e:
-            print(f"  • WBNB: ❌ Error - {e}")
-        
-        # CAKE (slot 1, 200 tokens) - OpenZeppelin standard
-        # Note: 100 CAKE will be transferred to SimpleRewardPool during deployment,
-        # so we set 200 CAKE initially to ensure test account has enough balance
-        try:
-            amount = 200 * 10**18
-            if self._set_erc20_balance_direct(cake_address, self.test_address, amount, balance_slot=1):
-                print(f"  • CAKE: {amount / 10**18:.2f} tokens ✅")
-            else:
-                print(f"  • CAKE: Failed to set balance")
-        except Exception as e:
-            print(f"  • CAKE: ❌ Error - {e}")
-        
-        # BUSD (slot 1, 1000 tokens) - OpenZeppelin standard
-        try:
-            amount = 1000 * 10**18
-            if self._set_erc20_balance_direct(busd_address, self.test_address, amount, balance_slot=1):
-                print(f"  • BUSD: {amount / 10**18:.2f} tokens ✅")
-            else:
-                print(f"  • BUSD: Failed to set balance")
-        except Exception as e:
-            print(f"  • BUSD: ❌ Error - {e}")
-        
-        # USDT/BUSD LP Token (slot 1, 5 LP tokens) - PancakeSwap LP tokens use slot 1 (OpenZeppelin ERC20 standard)
-        # These LP tokens are used for harvest_rewards, unstake_lp_tokens, remove_liquidity tests
-        try:
-            lp_token_address = '0x7EFaEf62fDdCCa950418312c6C91Aef321375A00'
-            amount = 5 * 10**18  # 5 LP tokens
-            if self._set_erc20_balance_direct(lp_token_address, self.test_address, amount, balance_slot=1):
-                print(f"  • USDT/BUSD LP: {amount / 10**18:.2f} tokens ✅")
-            else:
-                print(f"  • USDT/BUSD LP: Failed to set balance")
-        except Exception as e:
-            print(f"  • USDT/BUSD LP: ❌ Error - {e}")
-        
-        # WBNB/USDT LP Token (slot 1, 3 LP tokens) - Used for remove_liquidity_bnb_token test
-        try:
-            wbnb_usdt_lp_address = '0x16b9a82891338f9bA80E2D6970FddA79D1eb0daE'
-            amount = 3 * 10**18  # 3 LP tokens
-            if self._set_erc20_balance_direct(wbnb_usdt_lp_address, self.test_address, amount, balance_slot=1):
-                print(f"  • WBNB/USDT LP: {amount / 10**18:.2f} tokens ✅")
-            else:
-                print(f"  • WBNB/USDT LP: Failed to set balance")
-        except Exception as e:
-            print(f"  • WBNB/USDT LP: ❌ Error - {e}")
-        
-        # Set initial allowances (for revoke approval tests)
-        print(f"✓ Setting initial allowances...")
-        try:
-            usdt_addr = to_checksum_address(usdt_address)
-            test_addr = to_checksum_address(self.test_address)
-            
-            # Contract addresses requiring approval (PancakeSwap Router, Venus Protocol, etc)
-            spenders = [
-                '0x10ED43C718714eb63d5aA57B78B54704E256024E',  # PancakeSwap Router
-                '0x13f4EA83D0bd40E75C8222255bc855a974568Dd4',  # Venus Protocol
-                '0x1B81D678ffb9C0263b24A97847620C99d213eB14'   # PancakeSwap V3 Router
-            ]
-            
-            # Impersonate test account
-            self.w3.provider.make_request('anvil_impersonateAccount', [test_addr])
-            
-            for spender in spenders:
-                spender_addr = to_checksum_address(spender)
-                
-                # ERC20 approve function selector: 0x095ea7b3
-                approve_selector = bytes.fromhex('095ea7b3')
-                # Encode: approve(address spender, uint256 amount)
-                # Approve a large amount (1000 USDT)
-                approve_amount = 1000 * 10**18
-                approve_data = '0x' + approve_selector.hex() + encode(['address', 'uint256'], [spender_addr, approve_amount]).hex()
-            
-                # Send approve transaction
-                response = self.w3.provider.make_request(
-                'eth_sendTransaction',
-                [{
-                        'from': test_addr,
-                        'to': usdt_addr,
-                        'data': approve_data,
-                    'gas': hex(100000),
-                        'gasPrice': hex(3000000000)
-                }]
-                )
-                
-                # Check response
-                if 'result' not in response:
-                    print(f"  • Allowance for {spender[:10]}...: ❌ Failed - {response.get('error', 'Unknown error')}")
-                    continue
-                
-                tx_hash = response['result']
-            
-                # Wait for confirmation
-            max_attempts = 20
-            for i in range(max_attempts):
-                try:
-                    receipt = self.w3.provider.make_request('eth_getTransactionReceipt', [tx_hash])['result']
-                    if receipt and receipt.get('blockNumber'):
-                        break
-                except:
-                    pass
-                time.sleep(0.5)
-            
-            # Stop impersonate
-            self.w3.provider.make_request('anvil_stopImpersonatingAccount', [test_addr])
-            
-            print(f"  • USDT allowances set for {len(spenders)} spenders ✅")
-                
-        except Exception as e:
-            print(f"  • Allowances: ❌ Error - {e}")
-            import traceback
-            traceback.print_exc()
-        
-        # Set CAKE token allowances (for multi-hop swap tests)
-        try:
-            cake_address = '0x0E09FaBB73Bd3Ade0a17ECC321fD13a19e81cE82'  # CAKE token on BSC
-            cake_addr = to_checksum_address(cake_address)
-            test_addr = to_checksum_address(self.test_address)
-            
-            # PancakeSwap Router needs CAKE allowance
-            router_address = '0x10ED43C718714eb63d5aA57B78B54704E256024E'
-            router_addr = to_checksum_address(router_address)
-            
-            # Impersonate test account
-            self.w3.provider.make_request('anvil_impersonateAccount', [test_addr])
-            
-            # ERC20 approve function selector: 0x095ea7b3
-            approve_selector = bytes.fromhex('095ea7b3')
-            # Approve a large amount (200 CAKE to match balance)
-            approve_amount = 200 * 10**18
-            approve_data = '0x' + approve_selector.hex() + encode(['address', 'uint256'], [router_addr, approve_amount]).hex()
-            
-            # Send approve transaction
-            response = self.w3.provider.make_request(
-                'eth_sendTransaction',
-                [{
-                    'from': test_addr,
-                    'to': cake_addr,
-                    'data': approve_data,
-                    'gas': hex(100000),
-                    'gasPrice': hex(3000000000)
-                }]
-            )
-            
-            if 'result' in response:
-                tx_hash = response['result']
-            
-            # Wait for confirmation
-            max_attempts = 20
-            for i in range(max_attempts):
-                try:
-                    receipt = self.w3.provider.make_request('eth_getTransactionReceipt', [tx_hash])['result']
-                    if receipt and receipt.get('blockNumber'):
-                        break
-                except:
-                    pass
-                time.sleep(0.5)
-            
-            # Stop impersonate
-            self.w3.provider.make_request('anvil_stopImpersonatingAccount', [test_addr])
-            
-            print(f"  • CAKE allowances set for Router ✅")
-                
-        except Exception as e:
-            print(f"  • CAKE allowances: ❌ Error - {e}")
-            import traceback
-            traceback.print_exc()
-        
-        # CAKE allowances for SimpleStaking will be set after deployment in _deploy_simple_staking()
-        
-        # Set WBNB token allowances (for wrap-swap tests like composite_wrap_swap_wbnb)
-        try:
-            wbnb_address = '0xbb4CdB9CBd36B01bD1cBaEBF2De08d9173bc095c'  # WBNB token on BSC
-            wbnb_addr = to_checksum_address(wbnb_address)
-            test_addr = to_checksum_address(self.test_address)
-            
-            # PancakeSwap Router needs WBNB allowance
-            router_address = '0x10ED43C718714eb63d5aA57B78B54704E256024E'
-            router_addr = to_checksum_address(router_address)
-            
-            # Impersonate test account
-            self.w3.provider.make_request('anvil_impersonateAccount', [test_addr])
-            
-            # ERC20 approve function selector: 0x095ea7b3
-            approve_selector = bytes.fromhex('095ea7b3')
-            # Approve a large amount (100 WBNB to match balance)
-            approve_amount = 100 * 10**18
-            approve_data = '0x' + approve_selector.hex() + encode(['address', 'uint256'], [router_addr, approve_amount]).hex()
-            
-            # Send approve transaction
-            response = self.w3.provider.make_request(
-                'eth_sendTransaction',
-                [{
-                    'from': test_addr,
-                    'to': wbnb_addr,
-                    'data': approve_data,
-                    'gas': hex(100000),
-                    'gasPrice': hex(3000000000)
-                }]
-            )
-            
-            if 'result' in response:
-                tx_hash = response['result']
-                
-                # Wait for confirmation
-                max_attempts = 20
-                for i in range(max_attempts):
-                    try:
-                        receipt = self.w3.provider.make_request('eth_getTransactionReceipt', [tx_hash])['result']
-                        if receipt and receipt.get('blockNumber'):
-                            break
-                    except:
-                        pass
-                    time.sleep(0.5)
-            
-            # Stop impersonate
-            self.w3.provider.make_request('anvil_stopImpersonatingAccount', [test_addr])
-            
-            print(f"  • WBNB allowances set for Router ✅")
-                
-        except Exception as e:
-            print(f"  • WBNB allowances: ❌ Error - {e}")
-            import traceback
-            traceback.print_exc()
-        
-        # Set LP token allowances (for remove_liquidity and staking tests)
-        try:
-            # USDT/BUSD LP token
-            usdt_busd_lp_address = '0x7EFaEf62fDdCCa950418312c6C91Aef321375A00'
-            usdt_busd_lp_addr = to_checksum_address(usdt_busd_lp_address)
-            
-            # WBNB/USDT LP token
-            wbnb_usdt_lp_address = '0x16b9a82891338f9bA80E2D6970FddA79D1eb0daE'
-            wbnb_usdt_lp_addr = to_checksum_address(wbnb_usdt_lp_address)
-            
-            # PancakeSwap Router needs LP token allowances
-            router_address = '0x10ED43C718714eb63d5aA57B78B54704E256024E'
-            router_addr = to_checksum_address(router_address)
-            
-            # Impersonate test account
-            self.w3.provider.make_request('anvil_impersonateAccount', [test_addr])
-            
-            # Approve both LP tokens for Router
-            approve_selector = bytes.fromhex('095ea7b3')
-            approve_amount = 1000 * 10**18  # Large allowance
-            
-            for lp_name, lp_addr in [('USDT/BUSD LP', usdt_busd_lp_addr), ('WBNB/USDT LP', wbnb_usdt_lp_addr)]:
-                approve_data = '0x' + approve_selector.hex() + encode(['address', 'uint256'], [router_addr, approve_amount]).hex()
-                
-                response = self.w3.provider.make_request(
-                    'eth_sendTransaction',
-                    [{
-                        'from': test_addr,
-                        'to': lp_addr,
-                        'data': approve_data,
-                        'gas': hex(100000),
-                        'gasPrice': hex(3000000000)
-                    }]
-                )
-                
-                if 'result' in response:
-                    tx_hash = response['result']
-                    for i in range(10):
-                        try:
-                            receipt = self.w3.provider.make_request('eth_getTransactionReceipt', [tx_hash])['result']
-                            if receipt and receipt.get('blockNumber'):
-                                break
-                        except:
-                            pass
-                        time.sleep(0.3)
-            
-            # Stop impersonate
-            self.w3.provider.make_request('anvil_stopImpersonatingAccount', [test_addr])
-            
-            print(f"  • LP token allowances set for Router ✅")
-        except Exception as e:
-            print(f"  • LP token allowances: ❌ Error - {e}")
-            import traceback
-            traceback.print_exc()
+    constructor(address _implementation) {
+        implementation = _implementation;
+    }
+    
+    // Fallback function that delegates all calls to implementation
+    fallback() external payable {
+        address impl = implementation;
+        require(impl != address(0), "No implementation");
         
-        # Set BUSD token allowances (for liquidity operations)
-        try:
-            busd_address = '0xe9e7CEA3DedcA5984780Bafc599bD69ADd087D56'  # BUSD token on BSC
-            busd_addr = to_checksum_address(busd_address)
-            test_addr = to_checksum_address(self.test_address)
-            
-            # PancakeSwap Router needs BUSD allowance
-            router_address = '0x10ED43C718714eb63d5aA57B78B54704E256024E'
-            router_addr = to_checksum_address(router_address)
-            
-            # Impersonate test account
-            self.w3.provider.make_request('anvil_impersonateAccount', [test_addr])
-            
-            # ERC20 approve function selector: 0x095ea7b3
-            approve_selector = bytes.fromhex('095ea7b3')
-            # Approve a large amount (1000 BUSD)
-            approve_amount = 1000 * 10**18
-            approve_data = '0x' + approve_selector.hex() + encode(['address', 'uint256'], [router_addr, approve_amount]).hex()
-            
-            # Send approve transaction
-            response = self.w3.provider.make_request(
-                'eth_sendTransaction',
-                [{
-                    'from': test_addr,
-                    'to': busd_addr,
-                    'data': approve_data,
-                    'gas': hex(100000),
-                    'gasPrice': hex(3000000000)
-                }]
-            )
+        assembly {
+            // Copy calldata to memory
+            calldatacopy(0, 0, calldatasize())
             
-            if 'result' in response:
-                tx_hash = response['result']
-                
-                # Wait for confirmation
-                max_attempts = 20
-                for i in range(max_attempts):
-                    try:
-                        receipt = self.w3.provider.make_request('eth_getTransactionReceipt', [tx_hash])['result']
-                        if receipt and receipt.get('blockNumber'):
-                            break
-                    except:
-                        pass
-                    time.sleep(0.5)
+            // Delegate call to implementation
+            let result := delegatecall(gas(), impl, 0, calldatasize(), 0, 0)
             
-            # Stop impersonate
-            self.w3.provider.make_request('anvil_stopImpersonatingAccount', [test_addr])
+            // Copy return data to memory
+            returndatacopy(0, 0, returndatasize())
             
-            print(f"  • BUSD allowances set for Router ✅")
-                
-        except Exception as e:
-            print(f"  • BUSD allowances: ❌ Error - {e}")
-            import traceback
-            traceback.print_exc()
-        
-        # Set LP tokens (for remove_liquidity tests)
-        print(f"✓ Setting LP tokens...")
+            // Return or revert based on result
+            switch result
+            case 0 { revert(0, returndatasize()) }
+            default { return(0, returndatasize()) }
+        }
+    }
+    
+    // Allow contract to receive BNB
+    receive() external payable {}
+}
+"""
+
+# FallbackReceiver
+_FALLBACK_RECEIVER_SRC = """
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+contract FallbackReceiver {
+    uint256 public receivedCount;
+    uint256 public totalReceived;
+    address public owner;
+    
+    event BNBReceived(address indexed sender, uint256 amount);
+    
+    constructor() {
+        owner = msg.sender;
+        receivedCount = 0;
+        totalReceived = 0;
+    }
+    
+    // Receive function - called when BNB is sent with empty calldata
+    receive() external payable {
+        receivedCount += 1;
+        totalReceived += msg.value;
+        emit BNBReceived(msg.sender, msg.value);
+    }
+    
+    // Fallback function - called when function doesn't exist
+    fallback() external payable {
+        receivedCount += 1;
+        totalReceived += msg.value;
+        emit BNBReceived(msg.sender, msg.value);
+    }
+    
+    // Get contract balance
+    function getBalance() external view returns (uint256) {
+        return address(this).balance;
+    }
+    
+    // Get received count
+    function getReceivedCount() external view returns (uint256) {
+        return receivedCount;
+    }
+    
+    // Owner can withdraw (for cleanup)
+    function withdraw() external {
+        require(msg.sender == owner, "Only owner can withdraw");
+        payable(owner).transfer(address(this).balance);
+    }
+}
+"""
+
+# Inline test contract sources keyed by virtual filename (solc standard-JSON input)
+_INLINE_CONTRACT_SOURCES = {
+    'ERC1363Token.sol': _ERC1363_TOKEN_SRC,
+    'TestERC1155Token.sol': _ERC1155_TOKEN_SRC,
+    'FlashLoanReceiver.sol': _FLASHLOAN_RECEIVER_SRC,
+    'SimpleCounter.sol': _SIMPLE_COUNTER_SRC,
+    'DonationBox.sol': _DONATION_BOX_SRC,
+    'MessageBoard.sol': _MESSAGE_BOARD_SRC,
+    'Implementation.sol': _IMPLEMENTATION_SRC,
+    'DelegateCallProxy.sol': _DELEGATE_CALL_PROXY_SRC,
+    'FallbackReceiver.sol': _FALLBACK_RECEIVER_SRC,
+}
+
+# Directory with Solidity sources for the file-based test contracts
+CONTRACTS_DIR = os.path.join(os.path.dirname(__file__), 'contracts')
+_CONTRACT_FILES = ('ERC721NFT.sol', 'SimpleStaking.sol', 'SimpleLPStaking.sol', 'SimpleRewardPool.sol')
+
+
+def _load_contract_sources() -> Dict[str, str]:
+    """Collect every test contract source as {filename: content} for a single solc run"""
+    sources = dict(_INLINE_CONTRACT_SOURCES)
+    for filename in _CONTRACT_FILES:
+        path = os.path.join(CONTRACTS_DIR, filename)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                sources[filename] = f.read()
+        elif filename == 'ERC721NFT.sol':
+            print(f"  • ⚠️  Contract file not found: {path}")
+            print(f"  • Using inline contract source")
+            sources[filename] = _ERC721_NFT_FALLBACK_SRC
+        else:
+            print(f"  • ⚠️  Contract file not found: {path}")
+    return sources
+
+
+# Compiled test contracts, contract name -> {'abi': [...], 'bin': '...', 'bin-runtime': '...'}; filled once per process
+_SOLC_OUTPUT_SELECTION = ['abi', 'evm.bytecode.object', 'evm.deployedBytecode.object']
+_COMPILED_ARTIFACTS: Dict[str, Dict[str, Any]] = {}
+# Serializes the first load/compile when several environments start in parallel threads
+_COMPILE_LOCK = threading.Lock()
+
+
+def _sources_digest(sources: Dict[str, str]) -> str:
+    """sha256 over solc version, output selection and every source; keys the compile cache"""
+    import hashlib
+    import json
+    
+    digest = hashlib.sha256(SOLC_VERSION.encode())
+    digest.update(json.dumps(_SOLC_OUTPUT_SELECTION).encode())
+    for filename in sorted(sources):
+        digest.update(filename.encode())
+        digest.update(sources[filename].encode())
+    return digest.hexdigest()
+
+
+def _compile_sources(sources: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Compile all sources in a single solc invocation
+    
+    Args:
+        sources: {filename: content}
+        
+    Returns:
+        Dict mapping contract name -> {'abi': [...], 'bin': '...', 'bin-runtime': '...'}
+    """
+    import solcx
+    _ensure_solc()
+    output = solcx.compile_standard({
+        'language': 'Solidity',
+        'sources': {filename: {'content': content} for filename, content in sources.items()},
+        'settings': {
+            'outputSelection': {'*': {'*': _SOLC_OUTPUT_SELECTION}}
+        }
+    }, solc_version=SOLC_VERSION)
+    
+    # Flatten to contract name -> artifact, skipping interfaces (no bytecode)
+    artifacts = {}
+    for filename, contracts in output['contracts'].items():
+        for contract_name, contract_output in contracts.items():
+            bytecode = contract_output['evm']['bytecode']['object']
+            if bytecode:
+                artifacts[contract_name] = {
+                    'abi': contract_output['abi'],
+                    'bin': bytecode,
+                    'bin-runtime': contract_output['evm']['deployedBytecode']['object'],
+                }
+    return artifacts
+
+
+def _ensure_compiled() -> Dict[str, Dict[str, Any]]:
+    """
+    Compile every test contract once per process and return the artifacts
+    
+    All sources (inline constants + contracts/*.sol) go into one standard-JSON input,
+    so solc starts once instead of once per contract. The flattened artifacts are
+    cached on disk keyed by sha256(solc version + all sources), so warm runs skip solc.
+    Later calls (including from other QuestEnvironment instances) return the same dict.
+    
+    Returns:
+        Dict mapping contract name -> {'abi': [...], 'bin': '...', 'bin-runtime': '...'}
+    """
+    if _COMPILED_ARTIFACTS:
+        return _COMPILED_ARTIFACTS
+    
+    with _COMPILE_LOCK:
+        if not _COMPILED_ARTIFACTS:
+            _load_or_compile_artifacts()
+    return _COMPILED_ARTIFACTS
+
+
+def _load_or_compile_artifacts():
+    """Fill _COMPILED_ARTIFACTS from the disk cache or solc (see _ensure_compiled)"""
+    import json
+    
+    sources = _load_contract_sources()
+    key = _sources_digest(sources)
+    
+    cache_path = os.path.join(SOLC_CACHE_DIR, f"{key}.json")
+    if os.path.exists(cache_path):
         try:
-            from eth_utils import keccak
-            
-            factory_address = '0xcA143Ce32Fe78f1f7019d7d551a6402fC5350c73'  # PancakeSwap Factory
-            router_address = '0x10ED43C718714eb63d5aA57B78B54704E256024E'  # PancakeSwap Router
-            usdt_address = '0x55d398326f99059fF775485246999027B3197955'
-            busd_address = '0xe9e7CEA3DedcA5984780Bafc599bD69ADd087D56'
-            
-            test_addr = to_checksum_address(self.test_address)
-            
-            # Get LP token address using Factory.getPair()
-            # getPair(address tokenA, address tokenB) returns (address pair)
-            get_pair_selector = bytes.fromhex('e6a43905')
-            get_pair_data = '0x' + get_pair_selector.hex() + encode(['address', 'address'], [usdt_address, busd_address]).hex()
-            
-            result = self.w3.eth.call({
-                'to': factory_address,
-                'data': get_pair_data
-            })
-            
-            lp_token_address = '0x' + result.hex()[-40:]  # Last 20 bytes
-            lp_token_addr = to_checksum_address(lp_token_address)
-            
-            print(f"  • LP Token (USDT/BUSD): {lp_token_addr}")
-            
-            # Set LP token balance (2.0 LP tokens) using direct storage manipulation
-            # Uniswap V2 LP tokens use OpenZeppelin ERC20, balances at slot 1
-            lp_amount = 2 * 10**18  # 2.0 LP tokens
-            if self._set_erc20_balance_direct(lp_token_addr, test_addr, lp_amount, balance_slot=1):
-                print(f"  • LP Token balance: {lp_amount / 10**18:.2f} LP tokens ✅")
-            else:
-                print(f"  • LP Token balance: Failed to set")
-                
-            # Approve LP tokens for Router (for remove liquidity)
-            self.w3.provider.make_request('anvil_impersonateAccount', [test_addr])
-            
-            approve_selector = bytes.fromhex('095ea7b3')
-            approve_amount = 1000 * 10**18  # Large approval
-            approve_data = '0x' + approve_selector.hex() + encode(['address', 'uint256'], [router_address, approve_amount]).hex()
-            
-            response = self.w3.provider.make_request(
-                'eth_sendTransaction',
-                [{
-                    'from': test_addr,
-                    'to': lp_token_addr,
-                    'data': approve_data,
-                    'gas': hex(100000),
-                    'gasPrice': hex(3000000000)
-                }]
-            )
-            
-            if 'result' in response:
-                tx_hash = response['result']
-                # Wait for confirmation
-                for i in range(10):
-                    try:
-                        receipt = self.w3.provider.make_request('eth_getTransactionReceipt', [tx_hash])['result']
-                        if receipt and receipt.get('blockNumber'):
-                            break
-                    except:
-                        pass
-                    time.sleep(0.3)
-                print(f"  • LP Token approved for Router ✅")
-            
-            self.w3.provider.make_request('anvil_stopImpersonatingAccount', [test_addr])
-            
-            # Also set up WBNB/USDT LP token (for remove_liquidity_bnb_token)
-            wbnb_address = '0xbb4CdB9CBd36B01bD1cBaEBF2De08d9173bc095c'
-            
-            # Get WBNB/USDT LP token address
-            get_pair_data_wbnb_usdt = '0x' + get_pair_selector.hex() + encode(['address', 'address'], [wbnb_address, usdt_address]).hex()
-            
-            result_wbnb_usdt = self.w3.eth.call({
-                'to': factory_address,
-                'data': get_pair_data_wbnb_usdt
-            })
-            
-            lp_token_wbnb_usdt = '0x' + result_wbnb_usdt.hex()[-40:]
-            lp_token_wbnb_usdt_addr = to_checksum_address(lp_token_wbnb_usdt)
-            
-            print(f"  • LP Token (WBNB/USDT): {lp_token_wbnb_usdt_addr}")
-            
-            # Set WBNB/USDT LP token balance (2.0 LP tokens)
-            if self._set_erc20_balance_direct(lp_token_wbnb_usdt_addr, test_addr, lp_amount, balance_slot=1):
-                print(f"  • LP Token (WBNB/USDT) balance: {lp_amount / 10**18:.2f} LP tokens ✅")
-            else:
-                print(f"  • LP Token (WBNB/USDT) balance: Failed to set")
-            
-            # Approve WBNB/USDT LP tokens for Router
-            self.w3.provider.make_request('anvil_impersonateAccount', [test_addr])
-            
-            approve_data_wbnb_usdt = '0x' + approve_selector.hex() + encode(['address', 'uint256'], [router_address, approve_amount]).hex()
-            
-            response_wbnb_usdt = self.w3.provider.make_request(
-                'eth_sendTransaction',
-                [{
-                    'from': test_addr,
-                    'to': lp_token_wbnb_usdt_addr,
-                    'data': approve_data_wbnb_usdt,
-                    'gas': hex(100000),
-                    'gasPrice': hex(3000000000)
-                }]
-            )
-            
-            if 'result' in response_wbnb_usdt:
-                tx_hash_wbnb_usdt = response_wbnb_usdt['result']
-                # Wait for confirmation
-                for i in range(10):
-                    try:
-                        receipt_wbnb_usdt = self.w3.provider.make_request('eth_getTransactionReceipt', [tx_hash_wbnb_usdt])['result']
-                        if receipt_wbnb_usdt and receipt_wbnb_usdt.get('blockNumber'):
-                            break
-                    except:
-                        pass
-                    time.sleep(0.3)
-                print(f"  • LP Token (WBNB/USDT) approved for Router ✅")
-            
-            self.w3.provider.make_request('anvil_stopImpersonatingAccount', [test_addr])
-                
-        except Exception as e:
-            print(f"  • LP tokens: ❌ Error - {e}")
-            import traceback
-            traceback.print_exc()
+            with open(cache_path, 'r') as f:
+                _COMPILED_ARTIFACTS.update(json.load(f))
+            return
+        except (OSError, ValueError) as e:
+            print(f"  • ⚠️  Ignoring unreadable compile cache {cache_path}: {e}")
+    
+    artifacts = _compile_sources(sources)
+    
+    try:
+        os.makedirs(SOLC_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(artifacts, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"  • ⚠️  Could not write compile cache: {e}")
+    
+    _COMPILED_ARTIFACTS.update(artifacts)
+
+
+# Attributes set during setup that a cached state dump must restore
+_STATE_CACHE_ATTRS = (
+    'rich_address',
+    'erc1363_token_address',
+    'erc721_token_address',
+    'erc1155_token_address',
+    'flashloan_receiver_address',
+    'simple_counter_address',
+    'donation_box_address',
+    'message_board_address',
+    'fallback_receiver_address',
+    'delegate_call_implementation_address',
+    'delegate_call_proxy_address',
+    'simple_staking_address',
+    'simple_lp_staking_address',
+    'simple_reward_pool_address',
+)
+
+
+def _argv_uses_port(argv: List[str], port: int) -> bool:
+    """True if an Anvil command line passes exactly this port (--port N, --port=N or -p N)"""
+    port_str = str(port)
+    for i, arg in enumerate(argv):
+        if arg in ('--port', '-p') and i + 1 < len(argv) and argv[i + 1] == port_str:
+            return True
+        if arg == f'--port={port_str}':
+            return True
+    return False
+
+
+def _free_port() -> int:
+    """Ask the OS for a currently unused local TCP port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+class QuestEnvironment:
+    """Quest Environment Management Class"""
+
+    def __init__(
+        self,
+        fork_url: str = None,
+        chain_id: int = 56,
+        anvil_port: Optional[int] = 8545,
+        verify_deployment: bool = False,
+        state_cache: bool = False,
+        fork_block_number: Optional[int] = None,
+        account_seed: Optional[int] = None
+    ):
+        """
+        Initialize Quest environment
+        
+        Args:
+            fork_url: BSC RPC URL
+                     - None: Use default BSC Mainnet public RPC (suitable for open source/CI)
+                     - Custom URL: Use paid or private RPC (suitable for dev/prod)
+                     Can also set via BSC_FORK_URL environment variable
+            chain_id: Chain ID (56=BSC Mainnet, 97=BSC Testnet, default 56)
+            anvil_port: Anvil port (None: pick a free port, for running several forks side by side)
+            verify_deployment: Read back the initial state of the self-deployed test contracts
+                     after setup (one batched eth_call); receipt status / setCode results
+                     already confirm the deployments, so this is off by default
+            state_cache: Reuse a dumped post-setup Anvil state (accounts, balances, deployed
+                     contracts) from an earlier run instead of redoing setup. Requires
+                     fork_block_number, so the dump is only loaded into a fork of the
+                     block it was taken on.
+            fork_block_number: Fork at this block instead of the latest one. Every fork
+                     then sees the same chain state, and Anvil keeps the fetched state
+                     in its on-disk RPC cache, so later starts and resets skip most
+                     upstream requests.
+            account_seed: Derive the test and rich accounts from this seed instead of
+                     creating fresh ones, so addresses in prompts repeat across runs
+        """
+        # Fork URL Priority:
+        # 1. Passed fork_url parameter
+        # 2. Environment variable BSC_FORK_URL
+        # 3. Default BSC Mainnet public RPC
+        if fork_url is None:
+            import os
+            fork_url = os.getenv('BSC_FORK_URL', 'https://bsc-dataseed.binance.org')
         
-        # Setup NFT (for ERC721 tests)
-        print(f"✓ Setting NFT ownership...")
-        try:
-            # PancakeSquad NFT on BSC Mainnet
-            pancake_squad_address = '0x0a8901b0E25DEb55A87524f0cC164E9644020EBA'
-            nft_addr = to_checksum_address(pancake_squad_address)
-            test_addr = to_checksum_address(self.test_address)
-            token_id = 1  # NFT ID to transfer
-            
-            # Query current owner first
-            owner_of_selector = bytes.fromhex('6352211e')  # ownerOf(uint256)
-            token_id_hex = format(token_id, '064x')
-            owner_data = '0x' + owner_of_selector.hex() + token_id_hex
-            
-            result = self.w3.eth.call({
-                'to': nft_addr,
-                'data': owner_data
-            })
-            
-            current_owner_hex = result.hex()
-            if len(current_owner_hex) >= 42:
-                current_owner = '0x' + current_owner_hex[-40:]
-                current_owner_addr = to_checksum_address(current_owner)
-                print(f"  • NFT #{token_id} current owner: {current_owner_addr}")
-                
-                # Impersonate current owner
-                self.w3.provider.make_request('anvil_impersonateAccount', [current_owner_addr])
-                
-                # ERC721 transferFrom function selector: 0x23b872dd
-                # transferFrom(address from, address to, uint256 tokenId)
-                transfer_selector = bytes.fromhex('23b872dd')
-                # Encode: from (32 bytes) + to (32 bytes) + tokenId (32 bytes)
-                transfer_data = '0x' + transfer_selector.hex() + encode(['address', 'address', 'uint256'], [current_owner_addr, test_addr, token_id]).hex()
-                
-                # Send transferFrom transaction
-                response = self.w3.provider.make_request(
-                    'eth_sendTransaction',
-                    [{
-                        'from': current_owner_addr,
-                        'to': nft_addr,
-                        'data': transfer_data,
-                        'gas': hex(150000),
-                        'gasPrice': hex(3000000000)
-                    }]
-                )
-                
-                # Check response
-                if 'result' not in response:
-                    print(f"  • NFT: ❌ Transaction failed - {response.get('error', 'Unknown error')}")
-                    raise Exception(f"NFT transfer failed: {response}")
-                
-                tx_hash = response['result']
-                
-                # Wait for confirmation
-                max_attempts = 20
-                for i in range(max_attempts):
-                    try:
-                        receipt = self.w3.provider.make_request('eth_getTransactionReceipt', [tx_hash])['result']
-                        if receipt and receipt.get('blockNumber'):
-                            break
-                    except:
-                        pass
-                    time.sleep(0.5)
-                
-                # Stop impersonate
-                self.w3.provider.make_request('anvil_stopImpersonatingAccount', [current_owner_addr])
-                
-                # Verify NFT owner
-                result = self.w3.eth.call({
-                    'to': nft_addr,
-                    'data': owner_data
-                })
-                
-                new_owner_hex = result.hex()
-                if len(new_owner_hex) >= 42:
-                    new_owner = '0x' + new_owner_hex[-40:]
-                    new_owner_addr = to_checksum_address(new_owner)
-                    
-                    receipt_status = int(receipt.get('status', '0x0'), 16)
-                    
-                    if receipt_status == 1 and new_owner_addr.lower() == test_addr.lower():
-                        print(f"  • PancakeSquad NFT #{token_id}: ✅ Transferred to test account")
-                    else:
-                        print(f"  • PancakeSquad NFT #{token_id}: ❌ Transfer failed or owner mismatch")
-            else:
-                print(f"  • PancakeSquad NFT: ⚠️  Could not determine owner")
-                
-        except Exception as e:
-            print(f"  • PancakeSquad NFT: ❌ Error - {e}")
-            import traceback
-            traceback.print_exc()
+        if state_cache and fork_block_number is None:
+            raise ValueError("state_cache requires fork_block_number: a dump from another block would mix stale fork state into the fork")
         
-        print()
+        self.fork_url = fork_url
+        self.chain_id = chain_id
+        self.anvil_port = anvil_port if anvil_port is not None else _free_port()
+        self.verify_deployment = verify_deployment
+        self.state_cache = state_cache
+        self.fork_block_number = fork_block_number
+        self.account_seed = account_seed
+        self.anvil_process = None
+        self.anvil_cmd = None
         
-        # 7. Deploy ERC1363 test token
-        self._deploy_erc1363_token()
+        self.w3: Optional[Web3] = None
+        self.test_account: Optional[Account] = None
+        self.test_address: Optional[str] = None
+        self.test_private_key: Optional[str] = None
+        self._rich_account: Optional[Account] = None  # Created once, kept across restart() and _full_reset()
+        self.initial_snapshot_id: Optional[str] = None  # Store initial snapshot for fast reset
+        self._automine: Optional[bool] = None  # Anvil auto-mining state, queried lazily
+        self._cached_gas_price: Optional[int] = None  # Fork gas price, constant for the Anvil session
+        self._pending_cheats: List[Tuple[str, list]] = []  # Queued Anvil cheatcodes, sent by flush_setup()
         
-        # 8. Deploy ERC721 test NFT
-        self._deploy_erc721_test_nft()
+    def start(self) -> Dict[str, Any]:
+        """
+        Start environment
         
-        # 9. Deploy ERC1155 test token
-        self._deploy_erc1155_token()
+        Returns:
+            Environment info dictionary
+        """
+        # 1. Start Anvil fork
+        self._start_anvil_fork()
         
-        # 9. Deploy Flashloan receiver contract
-        self._deploy_flashloan_receiver()
+        # 2. Connect Web3
+        anvil_rpc = f"http://127.0.0.1:{self.anvil_port}"
+        self._connect_web3(anvil_rpc)
+        
+        if not self.w3.is_connected():
+            raise ConnectionError(f"Cannot connect to Anvil: {anvil_rpc}")
+        
+        print(f"✓ Anvil connected successfully")
+        print(f"  Chain ID: {self.w3.eth.chain_id}")
+        print(f"  Anvil RPC: {anvil_rpc}")
+        print(f"  Fork: {self.fork_url}")
         
-        # 10. Deploy SimpleCounter test contract
-        self._deploy_simple_counter()
+        # 3-7. Restore the whole post-setup state from an earlier run when possible
+        if not (self.state_cache and self._load_state_cache()):
+            self._run_setup()
+            if self.state_cache:
+                self._save_state_cache()
+        
+        # 8. Create initial snapshot for fast reset
+        try:
+            self.initial_snapshot_id = self.w3.provider.make_request("evm_snapshot", [])['result']
+            print(f"✓ Initial snapshot created: {self.initial_snapshot_id}")
+        except Exception as e:
+            print(f"⚠️  Failed to create initial snapshot: {e}")
+            self.initial_snapshot_id = None
         
-        # 11. Deploy DonationBox test contract
-        self._deploy_donation_box()
+        return self._env_info(anvil_rpc)
+    
+    def _run_setup(self):
+        """Create the test account, fund it and deploy all test contracts (start() steps 3-7)"""
+        # 3. Create test account
+        if self.account_seed is not None:
+            self.test_account = _seeded_account(self.account_seed, 'test')
+        else:
+            self.test_account = Account.create()
+        self.test_address = self.test_account.address
+        self.test_private_key = self.test_account.key.hex()
         
-        # 12. Deploy MessageBoard test contract
-        self._deploy_message_board()
+        print(f"✓ Test account created successfully")
+        print(f"  Address: {self.test_address}")
         
-        # 13. Deploy DelegateCall test contracts
-        self._deploy_delegate_call_contracts()
+        # 4. Set initial balance (100 BNB - enough for multiple tests)
+        # Queued: sent together with the token balance writes by flush_setup() in step 6
+        self._set_balance(self.test_address, 100 * 10**18, defer=True)
+        print(f"  Balance: 100.0 BNB (queued)")
         
-        # 14. Deploy FallbackReceiver test contract
-        self._deploy_fallback_receiver()
+        # 5. Preheat common contract addresses (trigger Anvil to pull contract code)
+        self._preheat_contracts()
         
-        # 15. Deploy SimpleStaking test contract
-        self._deploy_simple_staking()
+        # 5.1 Compile all test contracts in one solc run (once per process, shared by all envs)
+        if not _COMPILED_ARTIFACTS:
+            print(f"✓ Compiling test contracts...")
+            try:
+                compiled = _ensure_compiled()
+                print(f"  • {len(compiled)} contracts ready ✅")
+            except Exception as e:
+                print(f"  • ⚠️  Contract compilation failed: {e}")
+                print(f"  • Solc is required on a cold cache: pip install py-solc-x")
         
-        # 16. Deploy SimpleLPStaking test contract
-        self._deploy_simple_lp_staking()
+        # 6. Set ERC20 token balances for test account
+        self._set_token_balances()
         
-        # 17. Deploy SimpleRewardPool test contract
-        self._deploy_simple_reward_pool()
+        # 7. Setup rich account for transferFrom tests
+        self._setup_rich_account()
     
-    def _deploy_erc1363_token(self):
+    def _state_cache_path(self) -> str:
         """
-        Deploy ERC1363 test token and allocate tokens to test account
+        State dump location, keyed by everything that shapes the post-setup state
         
-        ERC1363 is an extension of ERC20, supporting transferAndCall and approveAndCall
+        Returns:
+            Path of the JSON dump for this fork / chain / contract sources / setup code
         """
-        from eth_utils import to_checksum_address
-        from eth_abi import encode
+        import hashlib
         
-        print(f"✓ Deploying ERC1363 test token...")
+        digest = hashlib.sha256(f"{self.fork_url}|{self.chain_id}|{self.fork_block_number}|{self.account_seed}".encode())
+        digest.update(_sources_digest(_load_contract_sources()).encode())
+        with open(__file__, 'rb') as f:
+            digest.update(f.read())
+        return os.path.join(STATE_CACHE_DIR, f"{digest.hexdigest()}.json")
+    
+    def _save_state_cache(self):
+        """Dump the post-setup Anvil state plus the account keys and contract addresses"""
+        import json
         
         try:
-            test_addr = to_checksum_address(self.test_address)
-            
-            # Read contract source code and compile with py-solc-x
-            contract_source = """
-// SPDX-License-Identifier: MIT
-pragma solidity ^0.8.0;
-
-interface IERC1363Receiver {
-    function onTransferReceived(address operator, address from, uint256 value, bytes calldata data) external returns (bytes4);
-}
-
-interface IERC1363Spender {
-    function onApprovalReceived(address owner, uint256 value, bytes calldata data) external returns (bytes4);
-}
-
-contract ERC1363Token {
-    string public name = "ERC1363";
-    string public symbol = "E1363";
-    uint8 public decimals = 18;
-    string public constant version = "1";
-    uint256 public totalSupply;
-    mapping(address => uint256) public balanceOf;
-    mapping(address => mapping(address => uint256)) public allowance;
-    
-    // EIP-2612 Permit support
-    mapping(address => uint256) public nonces;
-    bytes32 public DOMAIN_SEPARATOR;
-    bytes32 public constant PERMIT_TYPEHASH = keccak256("Permit(address owner,address spender,uint256 value,uint256 nonce,uint256 deadline)");
-    
-    event Transfer(address indexed from, address indexed to, uint256 value);
-    event Approval(address indexed owner, address indexed spender, uint256 value);
+            state = self.w3.provider.make_request('anvil_dumpState', [])['result']
+            cache_path = self._state_cache_path()
+            os.makedirs(STATE_CACHE_DIR, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({
+                    'state': state,
+                    'test_private_key': self.test_private_key,
+                    'attributes': {attr: getattr(self, attr, None) for attr in _STATE_CACHE_ATTRS},
+                }, f)
+            os.replace(tmp_path, cache_path)
+            print(f"✓ Setup state cached: {cache_path}")
+        except Exception as e:
+            print(f"  • ⚠️  Could not cache setup state: {e}")
     
-    constructor() {
-        totalSupply = 1000000 * 10**18;
-        balanceOf[msg.sender] = totalSupply;
-        emit Transfer(address(0), msg.sender, totalSupply);
+    def _load_state_cache(self) -> bool:
+        """
+        Restore a dumped post-setup state with a single anvil_loadState
         
-        // Initialize DOMAIN_SEPARATOR for EIP-2612
-        uint256 chainId;
-        assembly { chainId := chainid() }
-        DOMAIN_SEPARATOR = keccak256(
-            abi.encode(
-                keccak256("EIP712Domain(string name,string version,uint256 chainId,address verifyingContract)"),
-                keccak256(bytes(name)),
-                keccak256(bytes("1")),
-                chainId,
-                address(this)
-            )
-        );
-    }
-    
-    function transfer(address to, uint256 value) public returns (bool) {
-        require(balanceOf[msg.sender] >= value, "Insufficient balance");
-        balanceOf[msg.sender] -= value;
-        balanceOf[to] += value;
-        emit Transfer(msg.sender, to, value);
-        return true;
-    }
-    
-    function approve(address spender, uint256 value) public returns (bool) {
-        allowance[msg.sender][spender] = value;
-        emit Approval(msg.sender, spender, value);
-        return true;
-    }
-    
-    function transferFrom(address from, address to, uint256 value) public returns (bool) {
-        require(balanceOf[from] >= value, "Insufficient balance");
-        require(allowance[from][msg.sender] >= value, "Insufficient allowance");
-        balanceOf[from] -= value;
-        balanceOf[to] += value;
-        allowance[from][msg.sender] -= value;
-        emit Transfer(from, to, value);
-        return true;
-    }
+        Returns:
+            True if the state was restored and setup can be skipped
+        """
+        import json
+        
+        cache_path = self._state_cache_path()
+        if not os.path.exists(cache_path):
+            return False
+        
+        try:
+            with open(cache_path, 'r') as f:
+                cached = json.load(f)
+            response = self.w3.provider.make_request('anvil_loadState', [cached['state']])
+            if not response.get('result'):
+                raise Exception(response.get('error', response))
+        except Exception as e:
+            print(f"  • ⚠️  Ignoring cached setup state {cache_path}: {e}")
+            return False
+        
+        self.test_account = Account.from_key(cached['test_private_key'])
+        self.test_address = self.test_account.address
+        self.test_private_key = cached['test_private_key']
+        for attr, value in cached['attributes'].items():
+            setattr(self, attr, value)
+        
+        print(f"✓ Setup state restored from cache: {cache_path}")
+        print(f"  Address: {self.test_address}")
+        return True
     
-    function transferAndCall(address to, uint256 value) public returns (bool) {
-        return transferAndCall(to, value, "");
-    }
+    def _env_info(self, anvil_rpc: str) -> Dict[str, Any]:
+        """
+        Environment info dictionary returned by start()
+        
+        Args:
+            anvil_rpc: Anvil RPC URL
+        """
+        return {
+            'rpc_url': anvil_rpc,
+            'chain_id': self.chain_id,
+            'test_address': self.test_address,
+            'test_private_key': self.test_private_key,
+            'rich_address': getattr(self, 'rich_address', None),  # For transferFrom tests
+            'block_number': self.w3.eth.block_number,
+            'balance': self.w3.eth.get_balance(self.test_address) / 10**18,
+            # Deployed contracts
+            'simple_staking_address': getattr(self, 'simple_staking_address', None),
+            'simple_lp_staking_address': getattr(self, 'simple_lp_staking_address', None),
+            'simple_reward_pool_address': getattr(self, 'simple_reward_pool_address', None),
+            'erc1363_token_address': getattr(self, 'erc1363_token_address', None),
+            'erc1155_token_address': getattr(self, 'erc1155_token_address', None),
+            'erc721_token_address': getattr(self, 'erc721_token_address', None),
+            'flashloan_contract_address': getattr(self, 'flashloan_contract_address', None),
+            'simple_counter_address': getattr(self, 'simple_counter_address', None),
+            'donation_box_address': getattr(self, 'donation_box_address', None),
+            'message_board_address': getattr(self, 'message_board_address', None),
+            'proxy_address': getattr(self, 'proxy_address', None),
+            'implementation_address': getattr(self, 'implementation_address', None),
+            'fallback_receiver_address': getattr(self, 'fallback_receiver_address', None)
+        }
     
-    function transferAndCall(address to, uint256 value, bytes memory data) public returns (bool) {
-        // Directly perform the transfer logic inline instead of calling transfer()
-        require(balanceOf[msg.sender] >= value, "Insufficient balance");
-        balanceOf[msg.sender] -= value;
-        balanceOf[to] += value;
-        emit Transfer(msg.sender, to, value);
+    def _connect_web3(self, anvil_rpc: str, timeout: int = 60):
+        """
+        Create the Web3 connection to the local Anvil node
         
-        // Check if recipient is a contract and call callback if needed
-        uint256 codeSize;
-        assembly { codeSize := extcodesize(to) }
-        if (codeSize > 0) {
-            try IERC1363Receiver(to).onTransferReceived(msg.sender, msg.sender, value, data) returns (bytes4 retval) {
-                require(retval == IERC1363Receiver.onTransferReceived.selector, "Receiver rejected");
-            } catch {}
+        Uses a dedicated requests session with a keep-alive connection pool so the
+        hundreds of back-to-back setup RPCs reuse warm sockets instead of reconnecting.
+        
+        Args:
+            anvil_rpc: Anvil RPC URL
+            timeout: Per-request timeout in seconds
+        """
+        # Create an HTTPProvider bypassing proxy (local connection should not go through proxy)
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        session = requests.Session()
+        session.proxies = {
+            'http': None,
+            'https': None,
         }
-        return true;
-    }
-    
-    function approveAndCall(address spender, uint256 value) public returns (bool) {
-        return approveAndCall(spender, value, "");
-    }
+        session.trust_env = False  # Do not use proxy settings from environment variables
+        session.headers.update({'Connection': 'keep-alive'})
+        # Retry dropped connections briefly instead of failing the RPC; urllib3 never
+        # re-sends a POST whose request already reached the node
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.1),
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        
+        from web3.providers.rpc import HTTPProvider
+        # Set explicit timeout for HTTP requests to avoid indefinite blocking
+        provider = HTTPProvider(
+            anvil_rpc, 
+            session=session,
+            request_kwargs={'timeout': timeout}
+        )
+        self.w3 = Web3(provider)
+        self._automine = None
+        self._cached_gas_price = None
+        self._pending_cheats = []
+        
+        # Inject POA middleware (BSC is a POA chain)
+        try:
+            # Web3.py 7.x uses ExtraDataToPOAMiddleware
+            from web3.middleware import ExtraDataToPOAMiddleware
+            self.w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
+        except ImportError:
+            try:
+                # Web3.py v6+ uses geth_poa_middleware (old path)
+                from web3.middleware.geth_poa import geth_poa_middleware
+                self.w3.middleware_onion.inject(geth_poa_middleware, layer=0)
+            except ImportError:
+                try:
+                    # Web3.py v5 uses geth_poa_middleware (older path)
+                    from web3.middleware import geth_poa_middleware
+                    self.w3.middleware_onion.inject(geth_poa_middleware, layer=0)
+                except ImportError:
+                    # If none exist, Anvil local fork usually doesn't need it (we use direct RPC calls to bypass)
+                    print("⚠️  Warning: Could not import POA middleware, continuing without it")
     
-    function approveAndCall(address spender, uint256 value, bytes memory data) public returns (bool) {
-        // Directly perform the approval logic inline
-        allowance[msg.sender][spender] = value;
-        emit Approval(msg.sender, spender, value);
+    def create_snapshot(self) -> str:
+        """
+        Create snapshot of current state
         
-        // Check if spender is a contract and call callback if needed
-        uint256 codeSize;
-        assembly { codeSize := extcodesize(spender) }
-        if (codeSize > 0) {
-            try IERC1363Spender(spender).onApprovalReceived(msg.sender, value, data) returns (bytes4 retval) {
-                require(retval == IERC1363Spender.onApprovalReceived.selector, "Spender rejected");
-            } catch {}
-        }
-        return true;
-    }
+        Returns:
+            Snapshot ID
+        """
+        if not self.w3:
+            raise RuntimeError("Environment not started, cannot create snapshot")
+        
+        snapshot_id = self.w3.provider.make_request("evm_snapshot", [])
+        print(f"✓ Snapshot created: {snapshot_id}")
+        return snapshot_id
     
-    // EIP-2612 Permit function
-    function permit(
-        address owner,
-        address spender,
-        uint256 value,
-        uint256 deadline,
-        uint8 v,
-        bytes32 r,
-        bytes32 s
-    ) external {
-        require(deadline >= block.timestamp, "Permit expired");
+    def revert_to_snapshot(self, snapshot_id: str) -> bool:
+        """
+        Revert to specified snapshot
         
-        bytes32 structHash = keccak256(
-            abi.encode(PERMIT_TYPEHASH, owner, spender, value, nonces[owner]++, deadline)
-        );
+        Args:
+            snapshot_id: Snapshot ID
+            
+        Returns:
+            Whether revert was successful
+        """
+        if not self.w3:
+            raise RuntimeError("Environment not started, cannot revert snapshot")
         
-        bytes32 digest = keccak256(
-            abi.encodePacked("\\x19\\x01", DOMAIN_SEPARATOR, structHash)
-        );
+        result = self.w3.provider.make_request("evm_revert", [snapshot_id])
+        if result:
+            print(f"✓ Reverted to snapshot: {snapshot_id}")
+        else:
+            print(f"⚠️  Failed to revert snapshot: {snapshot_id}")
+        return result
+    
+    def reset_account_balance(self):
+        """
+        Reset test account balance
+        Ensures account has enough BNB before each test
+        """
+        if not self.w3 or not self.test_address:
+            raise RuntimeError("Environment not started, cannot reset balance")
         
-        address recoveredAddress = ecrecover(digest, v, r, s);
-        require(recoveredAddress != address(0) && recoveredAddress == owner, "Invalid signature");
+        # Set initial BNB balance (100 BNB)
+        initial_balance = 100 * 10**18
         
-        allowance[owner][spender] = value;
-        emit Approval(owner, spender, value);
-    }
-}
-"""
+        try:
+            self.w3.provider.make_request(
+                'anvil_setBalance',
+                [self.test_address, hex(initial_balance)]
+            )
+            print(f"✓ Account balance reset: {self.test_address} -> 100 BNB")
+            return True
+        except Exception as e:
+            print(f"⚠️  Failed to reset balance: {e}")
+            return False
+    
+    def _quick_health_check(self, timeout_seconds: float = 5.0) -> bool:
+        """
+        Quick health check for Anvil - returns False if unresponsive
+        Uses a very short timeout to detect frozen Anvil quickly
+        """
+        import socket
+        import json
+        
+        try:
+            # Use raw socket with short timeout instead of Web3 (which has 60s timeout)
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.settimeout(timeout_seconds)
+            sock.connect(('127.0.0.1', self.anvil_port))
             
-            # Compile contract using solcx
-            try:
-                from solcx import compile_source, install_solc, set_solc_version
-                
-                # Try to use installed solc, install if not available
-                try:
-                    set_solc_version('0.8.20')
-                except:
-                    print("  • Installing Solidity compiler v0.8.20...")
-                    install_solc('0.8.20')
-                    set_solc_version('0.8.20')
-                
-                # Compile contract
-                compiled_sol = compile_source(contract_source, output_values=['abi', 'bin'])
-                contract_interface = compiled_sol['<stdin>:ERC1363Token']
-                
-                bytecode = contract_interface['bin']
-                abi = contract_interface['abi']
-                
-            except Exception as e:
-                print(f"  • ⚠️  Solc not available: {e}")
-                print(f"  • Trying to install py-solc-x: pip install py-solc-x")
-                raise Exception("Cannot compile ERC1363 contract without solc. Please install: pip install py-solc-x")
+            # Send a simple eth_blockNumber request
+            request = json.dumps({
+                "jsonrpc": "2.0",
+                "method": "eth_blockNumber",
+                "params": [],
+                "id": 1
+            })
+            http_request = f"POST / HTTP/1.1\r\nHost: 127.0.0.1:{self.anvil_port}\r\nContent-Type: application/json\r\nContent-Length: {len(request)}\r\n\r\n{request}"
+            sock.sendall(http_request.encode())
             
-            # Deploy contract
-            # Impersonate test account to deploy contract
-            self.w3.provider.make_request('anvil_impersonateAccount', [test_addr])
+            # Wait for response
+            response = sock.recv(4096)
+            sock.close()
             
-            # Send deployment transaction
-            deploy_response = self.w3.provider.make_request(
-                'eth_sendTransaction',
-                [{
-                    'from': test_addr,
-                    'data': '0x' + bytecode if not bytecode.startswith('0x') else bytecode,
-                    'gas': hex(3000000),  # 3M gas for deployment
-                    'gasPrice': hex(3000000000)
-                }]
-            )
+            # Check if we got a valid response
+            return b'"result"' in response or b'"jsonrpc"' in response
+            
+        except (socket.timeout, socket.error, Exception) as e:
+            print(f"  ⚠️  Quick health check failed: {e}")
+            return False
+    
+    def reset(self):
+        """
+        Fast reset environment state (use snapshot revert, keep Anvil process running)
+        Reverts to initial snapshot state, much faster than full reset
+        """
+        if not self.w3 or not self.test_address:
+            raise RuntimeError("Environment not started, cannot reset")
+        
+        if not self.initial_snapshot_id:
+            print("⚠️  Warning: No initial snapshot, cannot fast reset")
+            return False
+        
+        print("🔄 Fast resetting environment state (reverting snapshot)...")
+        
+        # Quick health check before attempting RPC calls
+        if not self._quick_health_check(timeout_seconds=5.0):
+            print("  ❌ Anvil is unresponsive (failed quick health check)")
+            print("  ⚠️  Skipping reset, recommend restart instead")
+            return False
+        
+        try:
+            # 1. Revert to initial snapshot
+            result = self.w3.provider.make_request("evm_revert", [self.initial_snapshot_id])
+            if not result.get('result', False):
+                print(f"  ⚠️  Snapshot revert failed")
+                return False
             
-            if 'result' not in deploy_response:
-                raise Exception(f"Deployment failed: {deploy_response}")
+            print(f"  ✓ Reverted to initial snapshot: {self.initial_snapshot_id}")
             
-            tx_hash = deploy_response['result']
+            # 2. Recreate snapshot (some Anvil versions consume snapshot on revert)
+            self.initial_snapshot_id = self.w3.provider.make_request("evm_snapshot", [])['result']
+            print(f"  ✓ Recreated snapshot: {self.initial_snapshot_id}")
             
-            # Wait for deployment confirmation
-            max_attempts = 20
-            receipt = None
-            for i in range(max_attempts):
-                try:
-                    receipt_response = self.w3.provider.make_request('eth_getTransactionReceipt', [tx_hash])
-                    if receipt_response.get('result'):
-                        receipt = receipt_response['result']
-                        break
-                except:
-                    pass
-                time.sleep(0.5)
+            # Verify balance
+            balance = self.w3.eth.get_balance(self.test_address) / 10**18
+            print(f"  ✓ Account balance: {balance} BNB")
             
-            if not receipt or not receipt.get('contractAddress'):
-                raise Exception("Contract deployment failed - no contract address")
+            print("✅ Environment fast reset completed\n")
+            return True
             
-            # Get deployed contract address
-            erc1363_address = receipt['contractAddress']
-            erc1363_address = to_checksum_address(erc1363_address)
+        except Exception as e:
+            print(f"  ❌ Snapshot revert failed: {e}")
+            print("  ⚠️  Will attempt full reset...")
             
-            # Stop impersonate
-            self.w3.provider.make_request('anvil_stopImpersonatingAccount', [test_addr])
+            # If snapshot fails, fallback to full reset
+            return self._full_reset()
+    
+    def _full_reset(self):
+        """
+        Full reset environment (fallback, used when snapshot fails)
+        Uses anvil_reset to reset to fork point and redeploys all contracts
+        """
+        print("🔄 Performing full reset...")
+        
+        try:
+            # 1. Reset blockchain state to initial fork point
+            forking = {'jsonRpcUrl': self.fork_url}
+            if self.fork_block_number is not None:
+                forking['blockNumber'] = self.fork_block_number
+            self.w3.provider.make_request('anvil_reset', [{'forking': forking}])
+            print("  ✓ Blockchain state reset to fork point")
+        except Exception as e:
+            print(f"  ❌ Blockchain reset failed: {e}")
+            return False
+        
+        try:
+            # 2. Reset account balance
+            self._set_balance(self.test_address, 100 * 10**18)
+            balance = self.w3.eth.get_balance(self.test_address) / 10**18
+            print(f"  ✓ Account balance reset: {balance} BNB")
             
-            # Store contract address for later use
-            self.erc1363_token_address = erc1363_address
+            # 3. Re-setup token balances and contracts
+            self._set_token_balances()
             
-            # Verify deployment
-            balance_selector = bytes.fromhex('70a08231')  # balanceOf(address)
-            balance_data = '0x' + balance_selector.hex() + encode(['address'], [test_addr]).hex()
+            # 4. Re-setup rich account
+            self._setup_rich_account()
             
-            result = self.w3.eth.call({
-                'to': erc1363_address,
-                'data': balance_data
-            })
+            # 5. Recreate initial snapshot
+            self.initial_snapshot_id = self.w3.provider.make_request("evm_snapshot", [])['result']
+            print(f"  ✓ Recreated initial snapshot: {self.initial_snapshot_id}")
             
-            balance = int(result.hex(), 16)
-            balance_formatted = balance / 10**18
+            print("✅ Full reset completed\n")
+            return True
             
-            print(f"  • ERC1363 Token deployed: {erc1363_address}")
-            print(f"  • Test account balance: {balance_formatted:.2f} T1363 ✅")
+        except Exception as e:
+            print(f"  ❌ Full reset failed: {e}")
+            return False
+    
+    def stop(self):
+        """Stop environment"""
+        self._cleanup_anvil()
+        print("✓ Environment cleaned up")
+    
+    def get_diagnostics(self, timeout: float = 10.0) -> Dict[str, Any]:
+        """
+        Get diagnostic information about Anvil status
+        
+        Args:
+            timeout: Timeout for each diagnostic check
             
-            # Pre-approve test account to itself (for permit/transferFrom tests)
-            # approve(address spender, uint256 value)
+        Returns:
+            Dictionary with diagnostic information
+        """
+        diagnostics = {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'anvil_process_alive': False,
+            'anvil_process_pid': None,
+            'rpc_responsive': False,
+            'rpc_response_time_ms': None,
+            'current_block_number': None,
+            'chain_id': None,
+            'test_account_balance': None,
+            'port_in_use': self._is_port_in_use(self.anvil_port),
+            'fork_url': self.fork_url,
+            'errors': []
+        }
+        
+        # Check Anvil process
+        if self.anvil_process:
+            diagnostics['anvil_process_pid'] = self.anvil_process.pid
+            poll_result = self.anvil_process.poll()
+            diagnostics['anvil_process_alive'] = poll_result is None
+            if poll_result is not None:
+                diagnostics['anvil_exit_code'] = poll_result
+                diagnostics['errors'].append(f'Anvil process exited with code {poll_result}')
+        else:
+            diagnostics['errors'].append('Anvil process not started')
+        
+        # Check RPC responsiveness
+        if self.w3:
             try:
-                self.w3.provider.make_request('anvil_impersonateAccount', [test_addr])
+                import time as time_module
+                start_time = time_module.time()
                 
-                approve_selector = bytes.fromhex('095ea7b3')  # approve(address,uint256)
-                # Approve infinite amount: 2^256 - 1
-                max_uint256 = 2**256 - 1
-                approve_data = '0x' + approve_selector.hex() + encode(['address', 'uint256'], [test_addr, max_uint256]).hex()
+                # Try a simple RPC call with timeout
+                block_num = self.w3.eth.block_number
                 
-                approve_response = self.w3.provider.make_request(
-                    'eth_sendTransaction',
-                    [{
-                        'from': test_addr,
-                        'to': erc1363_address,
-                        'data': approve_data,
-                        'gas': hex(100000),
-                        'gasPrice': hex(3000000000)
-                    }]
-                )
+                end_time = time_module.time()
+                response_time_ms = (end_time - start_time) * 1000
                 
-                # Wait for approval transaction confirmation
-                if 'result' in approve_response:
-                    time.sleep(0.5)
+                diagnostics['rpc_responsive'] = True
+                diagnostics['rpc_response_time_ms'] = round(response_time_ms, 2)
+                diagnostics['current_block_number'] = block_num
                 
-                self.w3.provider.make_request('anvil_stopImpersonatingAccount', [test_addr])
-                print(f"  • Test account self-approved for permit testing ✅")
             except Exception as e:
-                print(f"  • ⚠️  Warning: Self-approval failed - {e}")
+                diagnostics['errors'].append(f'RPC call failed: {str(e)[:200]}')
             
-        except Exception as e:
-            print(f"  • ERC1363 Token: ❌ Deployment failed - {e}")
-            import traceback
-            traceback.print_exc()
-            # Set to None indicating not deployed
-            self.erc1363_token_address = None
+            # Try to get chain ID
+            try:
+                diagnostics['chain_id'] = self.w3.eth.chain_id
+            except Exception as e:
+                diagnostics['errors'].append(f'Chain ID query failed: {str(e)[:100]}')
+            
+            # Try to get test account balance
+            if self.test_address:
+                try:
+                    balance_wei = self.w3.eth.get_balance(self.test_address)
+                    diagnostics['test_account_balance'] = balance_wei / 10**18
+                except Exception as e:
+                    diagnostics['errors'].append(f'Balance query failed: {str(e)[:100]}')
+        else:
+            diagnostics['errors'].append('Web3 not connected')
         
-        print()
+        return diagnostics
     
-    def _deploy_erc721_test_nft(self):
-        """
-        Deploy ERC721 test NFT contract for NFT operation testing
-        
-        This deploys a simple ERC721 implementation that mints 10 tokens to the deployer
+    def check_health(self, timeout: float = 10.0) -> bool:
         """
-        from eth_utils import to_checksum_address
-        from eth_abi import encode
-        
-        print(f"✓ Deploying ERC721 Test NFT...")
+        Quick health check for Anvil
         
-        try:
-            test_addr = to_checksum_address(self.test_address)
-            
-            # Read contract source code from contracts/ERC721NFT.sol
-            import os
-            contract_path = os.path.join(os.path.dirname(__file__), 'contracts', 'ERC721NFT.sol')
+        Args:
+            timeout: Timeout for health check
             
-            if not os.path.exists(contract_path):
-                print(f"  • ⚠️  Contract file not found: {contract_path}")
-                print(f"  • Using inline contract source")
-                
-                # Inline contract source as fallback
-                contract_source = """
-// SPDX-License-Identifier: MIT
-pragma solidity ^0.8.0;
-
-contract ERC721NFT {
-    string public name = "NFT Collection";
-    string public symbol = "NFT";
-    
-    mapping(uint256 => address) private _owners;
-    mapping(address => uint256) private _balances;
-    mapping(uint256 => address) private _tokenApprovals;
-    mapping(address => mapping(address => bool)) private _operatorApprovals;
-    
-    event Transfer(address indexed from, address indexed to, uint256 indexed tokenId);
-    event Approval(address indexed owner, address indexed approved, uint256 indexed tokenId);
-    event ApprovalForAll(address indexed owner, address indexed operator, bool approved);
-    
-    constructor() {
-        for (uint256 i = 1; i <= 10; i++) {
-            _mint(msg.sender, i);
-        }
-    }
-    
-    function balanceOf(address owner) public view returns (uint256) {
-        require(owner != address(0), "ERC721: balance query for the zero address");
-        return _balances[owner];
-    }
-    
-    function ownerOf(uint256 tokenId) public view returns (address) {
-        address owner = _owners[tokenId];
-        require(owner != address(0), "ERC721: owner query for nonexistent token");
-        return owner;
-    }
-    
-    function approve(address to, uint256 tokenId) public {
-        address owner = ownerOf(tokenId);
-        require(to != owner, "ERC721: approval to current owner");
-        require(
-            msg.sender == owner || isApprovedForAll(owner, msg.sender),
-            "ERC721: approve caller is not owner nor approved for all"
-        );
-        
-        _tokenApprovals[tokenId] = to;
-        emit Approval(owner, to, tokenId);
-    }
-    
-    function getApproved(uint256 tokenId) public view returns (address) {
-        require(_owners[tokenId] != address(0), "ERC721: approved query for nonexistent token");
-        return _tokenApprovals[tokenId];
-    }
-    
-    function setApprovalForAll(address operator, bool approved) public {
-        require(operator != msg.sender, "ERC721: approve to caller");
-        _operatorApprovals[msg.sender][operator] = approved;
-        emit ApprovalForAll(msg.sender, operator, approved);
-    }
-    
-    function isApprovedForAll(address owner, address operator) public view returns (bool) {
-        return _operatorApprovals[owner][operator];
-    }
-    
-    function transferFrom(address from, address to, uint256 tokenId) public {
-        require(_isApprovedOrOwner(msg.sender, tokenId), "ERC721: transfer caller is not owner nor approved");
-        _transfer(from, to, tokenId);
-    }
-    
-    function safeTransferFrom(address from, address to, uint256 tokenId) public {
-        safeTransferFrom(from, to, tokenId, "");
-    }
-    
-    function safeTransferFrom(address from, address to, uint256 tokenId, bytes memory data) public {
-        require(_isApprovedOrOwner(msg.sender, tokenId), "ERC721: transfer caller is not owner nor approved");
-        _safeTransfer(from, to, tokenId, data);
-    }
-    
-    function _safeTransfer(address from, address to, uint256 tokenId, bytes memory data) internal {
-        _transfer(from, to, tokenId);
-        require(_checkOnERC721Received(from, to, tokenId, data), "ERC721: transfer to non ERC721Receiver implementer");
-    }
-    
-    function _isApprovedOrOwner(address spender, uint256 tokenId) internal view returns (bool) {
-        address owner = ownerOf(tokenId);
-        return (spender == owner || getApproved(tokenId) == spender || isApprovedForAll(owner, spender));
-    }
-    
-    function _mint(address to, uint256 tokenId) internal {
-        require(to != address(0), "ERC721: mint to the zero address");
-        require(_owners[tokenId] == address(0), "ERC721: token already minted");
-        
-        _balances[to] += 1;
-        _owners[tokenId] = to;
-        
-        emit Transfer(address(0), to, tokenId);
-    }
+        Returns:
+            True if Anvil is healthy, False otherwise
+        """
+        diag = self.get_diagnostics(timeout)
+        return diag['anvil_process_alive'] and diag['rpc_responsive']
     
-    function _transfer(address from, address to, uint256 tokenId) internal {
-        require(ownerOf(tokenId) == from, "ERC721: transfer from incorrect owner");
-        require(to != address(0), "ERC721: transfer to the zero address");
+    def print_diagnostics(self, timeout: float = 10.0):
+        """
+        Print diagnostic information
         
-        _tokenApprovals[tokenId] = address(0);
+        Args:
+            timeout: Timeout for diagnostic checks
+        """
+        diag = self.get_diagnostics(timeout)
         
-        _balances[from] -= 1;
-        _balances[to] += 1;
-        _owners[tokenId] = to;
+        print("\n" + "=" * 60)
+        print("🔍 ANVIL DIAGNOSTICS")
+        print("=" * 60)
+        print(f"  Timestamp: {diag['timestamp']}")
+        print(f"  Anvil Process:")
+        print(f"    - PID: {diag['anvil_process_pid']}")
+        print(f"    - Alive: {'✅' if diag['anvil_process_alive'] else '❌'} {diag['anvil_process_alive']}")
+        if 'anvil_exit_code' in diag:
+            print(f"    - Exit Code: {diag['anvil_exit_code']}")
+        print(f"  RPC Status:")
+        print(f"    - Responsive: {'✅' if diag['rpc_responsive'] else '❌'} {diag['rpc_responsive']}")
+        print(f"    - Response Time: {diag['rpc_response_time_ms']} ms")
+        print(f"    - Block Number: {diag['current_block_number']}")
+        print(f"    - Chain ID: {diag['chain_id']}")
+        print(f"  Port {self.anvil_port} in use: {diag['port_in_use']}")
+        print(f"  Test Account Balance: {diag['test_account_balance']} BNB")
+        print(f"  Fork URL: {diag['fork_url'][:50]}...")
+        if diag['errors']:
+            print(f"  ⚠️ Errors:")
+            for err in diag['errors']:
+                print(f"    - {err}")
+        print("=" * 60 + "\n")
         
-        emit Transfer(from, to, tokenId);
-    }
+        return diag
     
-    function _checkOnERC721Received(address from, address to, uint256 tokenId, bytes memory data) private returns (bool) {
-        uint256 size;
-        assembly {
-            size := extcodesize(to)
-        }
-        if (size == 0) {
-            return true;
-        }
+    def restart(self) -> bool:
+        """
+        Restart Anvil process completely
         
-        try IERC721Receiver(to).onERC721Received(msg.sender, from, tokenId, data) returns (bytes4 retval) {
-            return retval == IERC721Receiver.onERC721Received.selector;
-        } catch {
-            return false;
-        }
-    }
-}
-
-interface IERC721Receiver {
-    function onERC721Received(
-        address operator,
-        address from,
-        uint256 tokenId,
-        bytes calldata data
-    ) external returns (bytes4);
-}
-"""
-            else:
-                with open(contract_path, 'r', encoding='utf-8') as f:
-                    contract_source = f.read()
-            
-            # Compile contract using solcx
-            try:
-                from solcx import compile_source, install_solc, set_solc_version
-                
-                # Try to use installed solc, install if not available
-                try:
-                    set_solc_version('0.8.20')
-                except:
-                    print("  • Installing Solidity compiler v0.8.20...")
-                    install_solc('0.8.20')
-                    set_solc_version('0.8.20')
-                
-                # Compile contract
-                compiled_sol = compile_source(contract_source, output_values=['abi', 'bin'])
-                contract_interface = compiled_sol['<stdin>:ERC721NFT']
-                
-                bytecode = contract_interface['bin']
-                abi = contract_interface['abi']
-                
-            except Exception as e:
-                print(f"  • ⚠️  Solc not available: {e}")
-                raise Exception("Cannot compile ERC721 contract without solc. Please install: pip install py-solc-x")
-            
-            # Deploy contract
-            # Impersonate test account to deploy contract
-            self.w3.provider.make_request('anvil_impersonateAccount', [test_addr])
-            
-            # Send deployment transaction
-            deploy_response = self.w3.provider.make_request(
-                'eth_sendTransaction',
-                [{
-                    'from': test_addr,
-                    'data': '0x' + bytecode if not bytecode.startswith('0x') else bytecode,
-                    'gas': hex(3000000),  # 3M gas for deployment
-                    'gasPrice': hex(3000000000)
-                }]
-            )
-            
-            if 'result' not in deploy_response:
-                raise Exception(f"Deployment failed: {deploy_response}")
-            
-            tx_hash = deploy_response['result']
-            
-            # Wait for deployment confirmation
-            max_attempts = 20
-            receipt = None
-            for i in range(max_attempts):
-                try:
-                    receipt_response = self.w3.provider.make_request('eth_getTransactionReceipt', [tx_hash])
-                    if receipt_response.get('result'):
-                        receipt = receipt_response['result']
-                        break
-                except:
-                    pass
-                time.sleep(0.5)
-            
-            if not receipt or not receipt.get('contractAddress'):
-                raise Exception("Contract deployment failed - no contract address")
-            
-            # Get deployed contract address
-            erc721_address = receipt['contractAddress']
-            erc721_address = to_checksum_address(erc721_address)
+        Returns:
+            True if restart successful, False otherwise
+        """
+        print("🔄 Restarting Anvil process...")
+        
+        try:
+            # Stop current Anvil
+            self._cleanup_anvil()
+            time.sleep(2)
             
-            # Stop impersonate
-            self.w3.provider.make_request('anvil_stopImpersonatingAccount', [test_addr])
+            # Start new Anvil
+            self._start_anvil_fork()
             
-            # Store contract address for later use
-            self.erc721_token_address = erc721_address
+            # Reconnect Web3
+            self._connect_web3(f"http://127.0.0.1:{self.anvil_port}")
             
-            # Verify deployment - check balance
-            balance_selector = bytes.fromhex('70a08231')  # balanceOf(address)
-            balance_data = '0x' + balance_selector.hex() + encode(['address'], [test_addr]).hex()
+            # Re-setup everything (the balance write is flushed with the token balances)
+            self._set_balance(self.test_address, 100 * 10**18, defer=True)
+            self._preheat_contracts()
+            self._set_token_balances()  # This also sets LP token balances
             
-            result = self.w3.eth.call({
-                'to': erc721_address,
-                'data': balance_data
-            })
+            # Re-deploy custom contracts (they don't exist in fork)
+            # Note: NFT ownership is handled within _deploy_erc721_test_nft()
+            self._deploy_erc1363_token()
+            self._deploy_erc721_test_nft()
+            self._deploy_erc1155_token()
+            self._deploy_flashloan_receiver()
+            self._deploy_independent_contracts()
+            self._setup_rich_account()
             
-            balance = int(result.hex(), 16)
+            # Create new snapshot
+            self.initial_snapshot_id = self.w3.provider.make_request("evm_snapshot", [])['result']
             
-            print(f"  • ERC721 Test NFT deployed: {erc721_address}")
-            print(f"  • Test account owns {balance} NFTs (token IDs 1-10) ✅")
+            print("✅ Anvil restarted successfully")
+            return True
             
         except Exception as e:
-            print(f"  • ERC721 Test NFT: ❌ Deployment failed - {e}")
-            import traceback
-            traceback.print_exc()
-            # Set to None to indicate not deployed
-            self.erc721_token_address = None
-        
-        print()
+            print(f"❌ Anvil restart failed: {e}")
+            return False
     
-    def _deploy_erc1155_token(self):
-        """
-        Deploy ERC1155 test token and allocate tokens to test account
+    def _start_anvil_fork(self):
+        """Start Anvil fork process"""
+        # 1. Clean up potential zombie Anvil processes
+        self._kill_zombie_anvil()
         
-        ERC1155 is a multi-token standard, supporting management of multiple token types simultaneously
-        """
-        from eth_utils import to_checksum_address
-        from eth_abi import encode
+        # 2. Check if port is in use
+        if self._is_port_in_use(self.anvil_port):
+            print(f"⚠️  Port {self.anvil_port} is already in use")
+            print(f"   Attempting to cleanup and retry...")
+            self._kill_zombie_anvil()
+            time.sleep(2)
+            
+            if self._is_port_in_use(self.anvil_port):
+                raise RuntimeError(
+                    f"Port {self.anvil_port} is still in use, cannot start Anvil\n"
+                    f"Please clean up manually:\n"
+                    f"  Linux/Mac: lsof -ti:{self.anvil_port} | xargs kill -9\n"
+                    f"  Windows: netstat -ano | findstr :{self.anvil_port}"
+                )
         
-        print("✓ Deploying ERC1155 test token...")
+        # 3. Test network connection to Fork URL
+        print(f"🔍 Testing connection to Fork URL...")
+        if not self._test_fork_url():
+            print(f"⚠️  Warning: Cannot connect to Fork URL quickly")
+            print(f"   Continuing to start, but might be slow...")
         
-        try:
-            test_addr = self.test_address
-            
-            # ERC1155 contract source code
-            contract_source = """
-// SPDX-License-Identifier: MIT
-pragma solidity ^0.8.0;
-
-contract TestERC1155Token {
-    string public name = "Test Multi Token";
-    
-    // Mapping from token ID to account balances
-    mapping(uint256 => mapping(address => uint256)) private _balances;
-    
-    // Mapping from account to operator approvals
-    mapping(address => mapping(address => bool)) private _operatorApprovals;
-    
-    event TransferSingle(
-        address indexed operator,
-        address indexed from,
-        address indexed to,
-        uint256 id,
-        uint256 value
-    );
-    
-    event TransferBatch(
-        address indexed operator,
-        address indexed from,
-        address indexed to,
-        uint256[] ids,
-        uint256[] values
-    );
-    
-    event ApprovalForAll(
-        address indexed account,
-        address indexed operator,
-        bool approved
-    );
-    
-    constructor() {
-        // Mint initial tokens to deployer
-        // Token ID 1: 1000 units
-        // Token ID 2: 500 units
-        // Token ID 3: 100 units
-        _balances[1][msg.sender] = 1000;
-        _balances[2][msg.sender] = 500;
-        _balances[3][msg.sender] = 100;
+        # 4. Find anvil command
+        anvil_paths = [
+            os.path.expanduser('~/.foundry/bin/anvil'),
+            '/usr/local/bin/anvil',
+            'anvil',
+        ]
+        
+        for path in anvil_paths:
+            try:
+                result = subprocess.run(
+                    [path, '--version'],
+                    capture_output=True,
+                    check=True,
+                    text=True,
+                    timeout=5
+                )
+                self.anvil_cmd = path
+                print(f"✓ Found Anvil: {path}")
+                break
+            except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
+                continue
+        
+        if not self.anvil_cmd:
+            raise RuntimeError(
+                "Anvil not found! Please install Foundry:\n"
+                "  curl -L https://foundry.paradigm.xyz | bash\n"
+                "  foundryup"
+            )
+        
+        # 5. Start Anvil
+        print(f"🔨 Starting Anvil fork...")
+        print(f"   Fork URL: {self.fork_url}")
+        if self.fork_block_number is not None:
+            print(f"   Fork block: {self.fork_block_number}")
+        print(f"   Port: {self.anvil_port}")
+        
+        anvil_cmd_list = [
+            self.anvil_cmd,
+            '--fork-url', self.fork_url,
+            '--port', str(self.anvil_port),
+            '--host', '127.0.0.1',
+            # NOTE: Removed --no-storage-caching to allow caching of remote data
+            # This significantly reduces the number of requests to the upstream RPC
+            # and prevents request queue buildup that causes timeouts
+            '--timeout', '60000',  # 60 second timeout for fork requests (ms)
+            '--retries', '3',  # Retry failed fork requests
+            # NOTE: Removed --compute-units-per-second to avoid request queue buildup
+            # The rate limiting was causing timeouts when many requests accumulated
+        ]
+        if self.fork_block_number is not None:
+            anvil_cmd_list += ['--fork-block-number', str(self.fork_block_number)]
+        
+        # Create environment without proxy settings
+        # This is critical for WSL environments with system proxy that might interfere
+        anvil_env = os.environ.copy()
+        # Remove all proxy-related environment variables
+        proxy_vars = ['http_proxy', 'https_proxy', 'HTTP_PROXY', 'HTTPS_PROXY', 
+                      'all_proxy', 'ALL_PROXY', 'ftp_proxy', 'FTP_PROXY']
+        for var in proxy_vars:
+            anvil_env.pop(var, None)
+        # Set no_proxy to bypass any remaining proxy settings
+        anvil_env['no_proxy'] = '*'
+        anvil_env['NO_PROXY'] = '*'
+        
+        # Use DEVNULL for stdout and capture stderr in a non-blocking way
+        # This prevents buffer deadlock that can occur when PIPE buffers fill up
+        import threading
+        import queue
+        
+        self.anvil_process = subprocess.Popen(
+            anvil_cmd_list,
+            stdout=subprocess.DEVNULL,  # Don't capture stdout to avoid buffer issues
+            stderr=subprocess.PIPE,
+            env=anvil_env  # Use proxy-free environment
+        )
+        
+        # Use a thread to read stderr asynchronously to prevent buffer deadlock
+        stderr_output = []
+        stderr_queue = queue.Queue()
         
-        emit TransferSingle(msg.sender, address(0), msg.sender, 1, 1000);
-        emit TransferSingle(msg.sender, address(0), msg.sender, 2, 500);
-        emit TransferSingle(msg.sender, address(0), msg.sender, 3, 100);
-    }
-    
-    function balanceOf(address account, uint256 id) public view returns (uint256) {
-        require(account != address(0), "ERC1155: balance query for the zero address");
-        return _balances[id][account];
-    }
-    
-    function balanceOfBatch(
-        address[] memory accounts,
-        uint256[] memory ids
-    ) public view returns (uint256[] memory) {
-        require(accounts.length == ids.length, "ERC1155: accounts and ids length mismatch");
+        def read_stderr():
+            try:
+                for line in iter(self.anvil_process.stderr.readline, b''):
+                    stderr_queue.put(line.decode('utf-8', errors='ignore').strip())
+            except:
+                pass
         
-        uint256[] memory batchBalances = new uint256[](accounts.length);
+        stderr_thread = threading.Thread(target=read_stderr, daemon=True)
+        stderr_thread.start()
         
-        for (uint256 i = 0; i < accounts.length; ++i) {
-            batchBalances[i] = balanceOf(accounts[i], ids[i]);
-        }
+        # 6. Wait for start (increase timeout for remote servers with higher latency)
+        max_wait = 60  # Increased from 30s to 60s for remote server support
+        print(f"   Waiting for Anvil to start (max {max_wait}s)...")
         
-        return batchBalances;
-    }
+        for i in range(max_wait):
+            time.sleep(1)
+            
+            # Drain stderr queue to prevent buffer buildup
+            while not stderr_queue.empty():
+                try:
+                    line = stderr_queue.get_nowait()
+                    if line:
+                        stderr_output.append(line)
+                except queue.Empty:
+                    break
+            
+            # Check if port is open
+            if self._is_port_in_use(self.anvil_port):
+                print(f"✓ Anvil started successfully ({i+1}s)")
+                return
+            
+            # Check if process exited unexpectedly
+            if self.anvil_process.poll() is not None:
+                returncode = self.anvil_process.returncode
+                # Collect remaining stderr
+                time.sleep(0.5)
+                while not stderr_queue.empty():
+                    try:
+                        line = stderr_queue.get_nowait()
+                        if line:
+                            stderr_output.append(line)
+                    except queue.Empty:
+                        break
+                error_msg = '\n'.join(stderr_output[-20:]) if stderr_output else "No error message"
+                
+                self._cleanup_anvil()
+                raise RuntimeError(
+                    f"Anvil process exited unexpectedly (code {returncode})\n"
+                    f"Error message: {error_msg[:500]}\n"
+                    f"Possible causes:\n"
+                    f"  - Fork URL invalid or unreachable: {self.fork_url}\n"
+                    f"  - Network connection issues\n"
+                    f"  - RPC node rate limited or down"
+                )
+            
+            # Show progress every 10 seconds
+            if (i + 1) % 10 == 0:
+                print(f"   Waiting... ({i+1}s)")
+        
+        # Timeout handling - collect stderr for diagnostics
+        while not stderr_queue.empty():
+            try:
+                line = stderr_queue.get_nowait()
+                if line:
+                    stderr_output.append(line)
+            except queue.Empty:
+                break
+        
+        stderr_log = '\n'.join(stderr_output[-30:]) if stderr_output else "No output captured"
+        
+        self._cleanup_anvil()
+        raise RuntimeError(
+            f"Anvil start timed out ({max_wait}s)\n"
+            f"Possible causes:\n"
+            f"  1. Slow network connection - Fork URL: {self.fork_url}\n"
+            f"  2. RPC node slow response or unavailable\n"
+            f"  3. Insufficient system resources\n"
+            f"\n"
+            f"Anvil stderr output (last 30 lines):\n{stderr_log}\n"
+            f"\n"
+            f"Suggestions:\n"
+            f"  - Check network connection\n"
+            f"  - Try changing RPC URL\n"
+            f"  - Restart test\n"
+            f"  - Check WSL2 resource configuration"
+        )
     
-    function setApprovalForAll(address operator, bool approved) public {
-        require(msg.sender != operator, "ERC1155: setting approval status for self");
-        _operatorApprovals[msg.sender][operator] = approved;
-        emit ApprovalForAll(msg.sender, operator, approved);
-    }
+    def _cleanup_anvil(self):
+        """Cleanup Anvil process"""
+        if self.anvil_process:
+            try:
+                self.anvil_process.terminate()
+                self.anvil_process.wait(timeout=5)
+                print("✓ Anvil process terminated")
+            except:
+                self.anvil_process.kill()
+                print("✓ Anvil process forcibly terminated")
+            self.anvil_process = None
     
-    function isApprovedForAll(address account, address operator) public view returns (bool) {
-        return _operatorApprovals[account][operator];
-    }
+    def _is_port_in_use(self, port: int) -> bool:
+        """Check if port is in use"""
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            return s.connect_ex(('127.0.0.1', port)) == 0
     
-    function safeTransferFrom(
-        address from,
-        address to,
-        uint256 id,
-        uint256 amount,
-        bytes memory data
-    ) public {
-        require(
-            from == msg.sender || isApprovedForAll(from, msg.sender),
-            "ERC1155: caller is not owner nor approved"
-        );
-        require(to != address(0), "ERC1155: transfer to the zero address");
-        
-        uint256 fromBalance = _balances[id][from];
-        require(fromBalance >= amount, "ERC1155: insufficient balance for transfer");
+    def _kill_zombie_anvil(self):
+        """
+        Clean up potential zombie Anvil processes
         
-        _balances[id][from] = fromBalance - amount;
-        _balances[id][to] += amount;
+        IMPORTANT: Only kills processes that are actually Anvil (binary name contains 'anvil'),
+        NOT all processes using the port (which would kill the Python test runner!)
+        """
+        current_pid = os.getpid()  # Get current process PID to avoid suicide
         
-        emit TransferSingle(msg.sender, from, to, id, amount);
-    }
+        try:
+            import psutil
+            
+            killed_count = 0
+            for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'exe']):
+                try:
+                    # Skip current process
+                    if proc.info['pid'] == current_pid:
+                        continue
+                    
+                    # Check if it's an anvil process by examining the executable or name
+                    proc_name = proc.info.get('name', '').lower()
+                    proc_exe = (proc.info.get('exe') or '').lower()
+                    cmdline = proc.info.get('cmdline') or []
+                    
+                    # Must be an actual anvil binary (not just a script with 'anvil' in path)
+                    is_anvil_binary = (
+                        proc_name == 'anvil' or 
+                        proc_exe.endswith('/anvil') or
+                        proc_exe.endswith('\\anvil') or
+                        proc_exe.endswith('\\anvil.exe') or
+                        (cmdline and cmdline[0] and cmdline[0].endswith('/anvil'))
+                    )
+                    
+                    if is_anvil_binary:
+                        # Check if using the same port; compare the --port argument exactly, since
+                        # other args (--fork-block-number, --timeout) or a sibling's port may contain it
+                        if _argv_uses_port(cmdline, self.anvil_port):
+                            print(f"   Cleaning up zombie Anvil process: PID {proc.info['pid']}")
+                            proc.kill()
+                            proc.wait(timeout=3)
+                            killed_count += 1
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.TimeoutExpired):
+                    continue
+            
+            if killed_count > 0:
+                print(f"   ✓ Cleaned up {killed_count} zombie processes")
+                time.sleep(1)  # Wait for port release
+        except ImportError:
+            # psutil not installed, try system commands
+            import platform
+            system = platform.system()
+            
+            try:
+                if system == 'Linux':
+                    # Linux: Find anvil processes specifically (not all processes on port!)
+                    # Use pgrep to find processes with 'anvil' in name/cmdline
+                    result = subprocess.run(
+                        ['pgrep', '-f', f'anvil.*--port[ =]{self.anvil_port}( |$)'],
+                        capture_output=True,
+                        text=True,
+                        timeout=5
+                    )
+                    if result.returncode == 0 and result.stdout.strip():
+                        pids = result.stdout.strip().split('\n')
+                        for pid in pids:
+                            try:
+                                pid_int = int(pid)
+                                # Don't kill ourselves
+                                if pid_int == current_pid:
+                                    continue
+                                # Verify it's really anvil on this port by checking /proc/PID/cmdline
+                                try:
+                                    with open(f'/proc/{pid}/cmdline', 'r') as f:
+                                        argv = f.read().split('\0')
+                                        if 'anvil' not in argv[0].lower() or not _argv_uses_port(argv, self.anvil_port):
+                                            continue  # Not anvil on our port, skip
+                                except:
+                                    continue
+                                subprocess.run(['kill', '-9', pid], timeout=2)
+                                print(f"   Cleaning up Anvil process: PID {pid}")
+                            except (ValueError, Exception):
+                                pass
+                        time.sleep(1)
+                elif system == 'Windows':
+                    # Windows: Use tasklist to find anvil.exe processes
+                    result = subprocess.run(
+                        ['tasklist', '/FI', 'IMAGENAME eq anvil.exe', '/FO', 'CSV'],
+                        capture_output=True,
+                        text=True,
+                        timeout=5
+                    )
+                    if result.returncode == 0:
+                        lines = result.stdout.strip().split('\n')
+                        for line in lines[1:]:  # Skip header
+                            if 'anvil' in line.lower():
+                                parts = line.strip('"').split('","')
+                                if len(parts) >= 2:
+                                    pid = parts[1].strip('"')
+                                    try:
+                                        subprocess.run(['taskkill', '/F', '/PID', pid], timeout=2)
+                                        print(f"   Cleaning up Anvil process: PID {pid}")
+                                    except:
+                                        pass
+                        time.sleep(1)
+            except (subprocess.TimeoutExpired, FileNotFoundError):
+                pass
     
-    function safeBatchTransferFrom(
-        address from,
-        address to,
-        uint256[] memory ids,
-        uint256[] memory amounts,
-        bytes memory data
-    ) public {
-        require(
-            from == msg.sender || isApprovedForAll(from, msg.sender),
-            "ERC1155: caller is not owner nor approved"
-        );
-        require(ids.length == amounts.length, "ERC1155: ids and amounts length mismatch");
-        require(to != address(0), "ERC1155: transfer to the zero address");
+    def _test_fork_url(self, timeout=5):
+        """
+        Test Fork URL connection
         
-        for (uint256 i = 0; i < ids.length; ++i) {
-            uint256 id = ids[i];
-            uint256 amount = amounts[i];
-            
-            uint256 fromBalance = _balances[id][from];
-            require(fromBalance >= amount, "ERC1155: insufficient balance for transfer");
-            
-            _balances[id][from] = fromBalance - amount;
-            _balances[id][to] += amount;
-        }
+        Args:
+            timeout: Timeout (seconds)
         
-        emit TransferBatch(msg.sender, from, to, ids, amounts);
-    }
-}
-"""
-            
-            # Compile contract using solcx
-            try:
-                from solcx import compile_source, install_solc, set_solc_version
-                
-                # Try to use installed solc, install if not available
-                try:
-                    set_solc_version('0.8.20')
-                except:
-                    print("  • Installing Solidity compiler v0.8.20...")
-                    install_solc('0.8.20')
-                    set_solc_version('0.8.20')
-                
-                # Compile contract
-                compiled_sol = compile_source(contract_source, output_values=['abi', 'bin'])
-                contract_interface = compiled_sol['<stdin>:TestERC1155Token']
-                
-                bytecode = contract_interface['bin']
-                abi = contract_interface['abi']
-                
-            except Exception as e:
-                print(f"  • ⚠️  Solc compilation error: {e}")
-                raise Exception("Cannot compile ERC1155 contract")
-            
-            # Deploy contract
-            # Impersonate test account to deploy contract
-            self.w3.provider.make_request('anvil_impersonateAccount', [test_addr])
+        Returns:
+            bool: True if connected successfully, else False
+        """
+        import json
+        import urllib.request
+        import urllib.error
+        
+        try:
+            # Send simple eth_blockNumber request
+            data = json.dumps({
+                "jsonrpc": "2.0",
+                "method": "eth_blockNumber",
+                "params": [],
+                "id": 1
+            }).encode('utf-8')
             
-            # Send deployment transaction
-            deploy_response = self.w3.provider.make_request(
-                'eth_sendTransaction',
-                [{
-                    'from': test_addr,
-                    'data': '0x' + bytecode if not bytecode.startswith('0x') else bytecode,
-                    'gas': hex(3000000),  # 3M gas for deployment
-                    'gasPrice': hex(3000000000)
-                }]
+            req = urllib.request.Request(
+                self.fork_url,
+                data=data,
+                headers={'Content-Type': 'application/json'}
             )
             
-            if 'result' not in deploy_response:
-                raise Exception(f"Deployment failed: {deploy_response}")
-            
-            tx_hash = deploy_response['result']
-            
-            # Wait for deployment confirmation
-            max_attempts = 20
-            receipt = None
-            for i in range(max_attempts):
-                try:
-                    receipt_response = self.w3.provider.make_request('eth_getTransactionReceipt', [tx_hash])
-                    if receipt_response.get('result'):
-                        receipt = receipt_response['result']
-                        break
-                except:
-                    pass
-                time.sleep(0.5)
-            
-            if not receipt or not receipt.get('contractAddress'):
-                raise Exception("Contract deployment failed - no contract address")
-            
-            # Get deployed contract address
-            erc1155_address = receipt['contractAddress']
-            erc1155_address = to_checksum_address(erc1155_address)
-            
-            # Stop impersonate
-            self.w3.provider.make_request('anvil_stopImpersonatingAccount', [test_addr])
-            
-            # Store contract address for later use
-            self.erc1155_token_address = erc1155_address
-            
-            # Verify deployment - query balance of token ID 1
-            # balanceOf(address account, uint256 id)
-            balance_selector = bytes.fromhex('00fdd58e')  # balanceOf(address,uint256)
-            balance_data = '0x' + balance_selector.hex() + encode(['address', 'uint256'], [test_addr, 1]).hex()
-            
-            result = self.w3.eth.call({
-                'to': erc1155_address,
-                'data': balance_data
-            })
-            
-            balance = int(result.hex(), 16)
-            
-            print(f"  • ERC1155 Token deployed: {erc1155_address}")
-            print(f"  • Test account balance (Token ID 1): {balance} units ✅")
-            print(f"  • Test account balance (Token ID 2): 500 units ✅")
-            print(f"  • Test account balance (Token ID 3): 100 units ✅")
+            # Create opener that bypasses proxy (important for WSL with proxy settings)
+            # This ensures direct connection without going through system proxy
+            no_proxy_handler = urllib.request.ProxyHandler({})
+            opener = urllib.request.build_opener(no_proxy_handler)
             
+            with opener.open(req, timeout=timeout) as response:
+                result = json.loads(response.read().decode('utf-8'))
+                if 'result' in result:
+                    block_num = int(result['result'], 16)
+                    print(f"   ✓ Fork URL connected successfully (Block: {block_num})")
+                    return True
+                else:
+                    print(f"   ⚠️  Fork URL response abnormal: {result}")
+                    return False
+        except urllib.error.URLError as e:
+            print(f"   ⚠️  Network error: {e.reason}")
+            return False
         except Exception as e:
-            print(f"  • ERC1155 Token: ❌ Deployment failed - {e}")
-            import traceback
-            traceback.print_exc()
-            # Set to None indicating not deployed
-            self.erc1155_token_address = None
-        
-        print()
+            print(f"   ⚠️  Connection test failed: {e}")
+            return False
     
-    def _deploy_flashloan_receiver(self):
+    def _preheat_contracts(self):
         """
-        Deploy Flashloan Receiver Contract
+        Preheat common contract addresses
         
-        This is a simple flashloan provider+receiver contract for testing flashloan functionality
+        Triggers Anvil to pull contract data from remote node by accessing contract code and balance
+        This ensures contracts are correctly detected in subsequent tests and reduces
+        the number of fork requests during actual test execution.
         """
-        from eth_utils import to_checksum_address
-        from eth_abi import encode
-        
-        print("✓ Deploying Flashloan contract...")
-        
-        try:
-            test_addr = self.test_address
-            
-            # Simple flashloan contract source code
-            # This contract acts as both provider and receiver, simplifying test flow
-            contract_source = """
-// SPDX-License-Identifier: MIT
-pragma solidity ^0.8.0;
-
-interface IERC20 {
-    function transfer(address to, uint256 amount) external returns (bool);
-    function transferFrom(address from, address to, uint256 amount) external returns (bool);
-    function balanceOf(address account) external view returns (uint256);
-    function approve(address spender, uint256 amount) external returns (bool);
-}
-
-contract FlashLoanReceiver {
-    address public owner;
-    
-    event FlashLoanExecuted(address indexed token, uint256 amount, uint256 fee);
-    
-    constructor() {
-        owner = msg.sender;
-    }
-    
-    // Execute Flash Loan
-    // 1. Borrow tokens from contract
-    // 2. Caller can use these tokens
-    // 3. Repay tokens + fee in same transaction
-    function executeFlashLoan(
-        address token,
-        uint256 amount
-    ) external returns (bool) {
-        // Calculate fee (0.3%)
-        uint256 fee = (amount * 3) / 1000;
-        uint256 amountToRepay = amount + fee;
-        
-        // Check if contract has enough tokens to lend
-        uint256 balanceBefore = IERC20(token).balanceOf(address(this));
-        require(balanceBefore >= amount, "Insufficient balance in pool");
-        
-        // 1. Transfer tokens to caller (borrow)
-        require(IERC20(token).transfer(msg.sender, amount), "Loan transfer failed");
-        
-        // 2. Caller now owns tokens, can perform any operation
-        // In real flashloan, this would call borrower contract's callback
-        // But for simplified testing, we assume caller repays in same transaction
-        
-        // 3. Check if caller repaid tokens + fee
-        // Caller needs to approve this contract first
-        require(
-            IERC20(token).transferFrom(msg.sender, address(this), amountToRepay),
-            "Repayment failed"
-        );
-        
-        // Verify balance increased by fee
-        uint256 balanceAfter = IERC20(token).balanceOf(address(this));
-        require(balanceAfter >= balanceBefore + fee, "Fee not paid");
+        # BSC Mainnet common contract addresses - expanded list to reduce runtime fork requests
+        contract_addresses = [
+            # Core Infrastructure
+            ("0xbb4CdB9CBd36B01bD1cBaEBF2De08d9173bc095c", "WBNB"),
+            ("0xcA143Ce32Fe78f1f7019d7d551a6402fC5350c73", "PancakeFactory V2"),
+            ("0x10ED43C718714eb63d5aA57B78B54704E256024E", "PancakeRouter V2"),
+            # Common Tokens
+            ("0x55d398326f99059fF775485246999027B3197955", "USDT"),
+            ("0xe9e7CEA3DedcA5984780Bafc599bD69ADd087D56", "BUSD"),
+            ("0x0E09FaBB73Bd3Ade0a17ECC321fD13a19e81cE82", "CAKE"),
+            # Common Liquidity Pairs (for swap operations)
+            ("0x16b9a82891338f9bA80E2D6970FddA79D1eb0daE", "USDT-BUSD LP"),
+            ("0x0eD7e52944161450477ee417DE9Cd3a859b14fD0", "CAKE-WBNB LP"),
+            ("0x58F876857a02D6762E0101bb5C46A8c1ED44Dc16", "BUSD-WBNB LP"),
+            ("0x7EFaEf62fDdCCa950418312c6C91Aef321375A00", "USDT-WBNB LP"),
+        ]
         
-        emit FlashLoanExecuted(token, amount, fee);
-        return true;
-    }
-    
-    // Allow owner to deposit tokens to liquidity pool
-    function depositToPool(address token, uint256 amount) external {
-        require(msg.sender == owner, "Only owner can deposit");
-        require(
-            IERC20(token).transferFrom(msg.sender, address(this), amount),
-            "Deposit failed"
-        );
-    }
-    
-    // Query token balance in pool
-    function poolBalance(address token) external view returns (uint256) {
-        return IERC20(token).balanceOf(address(this));
-    }
-    
-    // Allow owner to withdraw tokens
-    function withdraw(address token, uint256 amount) external {
-        require(msg.sender == owner, "Only owner can withdraw");
-        require(IERC20(token).transfer(msg.sender, amount), "Withdraw failed");
-    }
-}
-"""
+        print(f"✓ Preheating contract addresses (Anvil pulling data from remote)...")
+        for addr_info in contract_addresses:
+            addr = addr_info[0] if isinstance(addr_info, tuple) else addr_info
+            name = addr_info[1] if isinstance(addr_info, tuple) and len(addr_info) > 1 else "Unknown"
             
-            # Compile contract using solcx
             try:
-                from solcx import compile_source, install_solc, set_solc_version
-                
-                # Try to use installed solc, install if not available
-                try:
-                    set_solc_version('0.8.20')
-                except:
-                    print("  • Installing Solidity compiler v0.8.20...")
-                    install_solc('0.8.20')
-                    set_solc_version('0.8.20')
+                # Use checksum address
+                addr_checksum = to_checksum_address(addr)
+                print(f"  • {name}: {addr_checksum[:10]}...")
                 
-                # Compile contract
-                compiled_sol = compile_source(contract_source, output_values=['abi', 'bin'])
-                contract_interface = compiled_sol['<stdin>:FlashLoanReceiver']
+                # Access contract code (trigger Anvil pull)
+                code = self.w3.eth.get_code(addr_checksum)
                 
-                bytecode = contract_interface['bin']
-                abi = contract_interface['abi']
+                # Get balance
+                balance = self.w3.eth.get_balance(addr_checksum)
                 
-            except Exception as e:
-                print(f"  • ⚠️  Solc compilation error: {e}")
-                raise Exception("Cannot compile FlashLoan contract")
-            
-            # Deploy contract
-            # Impersonate test account to deploy contract
-            self.w3.provider.make_request('anvil_impersonateAccount', [test_addr])
-            
-            # Send deployment transaction
-            deploy_response = self.w3.provider.make_request(
-                'eth_sendTransaction',
-                [{
-                    'from': test_addr,
-                    'data': '0x' + bytecode if not bytecode.startswith('0x') else bytecode,
-                    'gas': hex(3000000),  # 3M gas for deployment
-                    'gasPrice': hex(3000000000)
-                }]
-            )
-            
-            if 'result' not in deploy_response:
-                raise Exception(f"Deployment failed: {deploy_response}")
-            
-            tx_hash = deploy_response['result']
-            
-            # Wait for deployment confirmation
-            max_attempts = 20
-            receipt = None
-            for i in range(max_attempts):
+                # Extra: Try reading storage to ensure data is pulled
                 try:
-                    receipt_response = self.w3.provider.make_request('eth_getTransactionReceipt', [tx_hash])
-                    if receipt_response.get('result'):
-                        receipt = receipt_response['result']
-                        break
-                except:
-                    pass
-                time.sleep(0.5)
-            
-            if not receipt or not receipt.get('contractAddress'):
-                raise Exception("Contract deployment failed - no contract address")
-            
-            # Get deployed contract address
-            flashloan_address = receipt['contractAddress']
-            flashloan_address = to_checksum_address(flashloan_address)
-            
-            # Store contract address for later use
-            self.flashloan_receiver_address = flashloan_address
-            
-            # Set USDT balance for flashloan pool (using anvil_setStorageAt)
-            usdt_address = '0x55d398326f99059fF775485246999027B3197955'
-            pool_deposit_amount = 10000 * 10**18  # 10000 USDT (BSC USDT uses 18 decimals)
-            
-            # Directly set USDT balance for flashloan contract
-            self._set_erc20_balance_direct(usdt_address, flashloan_address, pool_deposit_amount, balance_slot=1)
-            
-            # Verify deployment - directly query USDT balance of flashloan contract
-            # Use ERC20 balanceOf instead of contract's poolBalance, more reliable
-            # balanceOf(address) returns (uint256)
-            balance_selector = bytes.fromhex('70a08231')  # balanceOf(address)
-            balance_data = '0x' + balance_selector.hex() + encode(['address'], [flashloan_address]).hex()
-            
+                    storage = self.w3.eth.get_storage_at(addr_checksum, 0)
+                except Exception:
+                    pass  # Silently ignore storage read errors
+                
+                is_contract = code and len(code) > 2
+                if is_contract:
+                    print(f"    ✅ OK ({len(code)} bytes)")
+                else:
+                    print(f"    ⚠️  No contract code found")
+            except Exception as e:
+                print(f"  • {name}: ❌ Error - {str(e)[:50]}")
+        
+        # Preheat liquidity pool reserves by calling getReserves()
+        print(f"  Preheating LP reserves...")
+        lp_pairs = [
+            "0x16b9a82891338f9bA80E2D6970FddA79D1eb0daE",  # USDT-BUSD
+            "0x0eD7e52944161450477ee417DE9Cd3a859b14fD0",  # CAKE-WBNB
+            "0x58F876857a02D6762E0101bb5C46A8c1ED44Dc16",  # BUSD-WBNB
+            "0x7EFaEf62fDdCCa950418312c6C91Aef321375A00",  # USDT-WBNB
+        ]
+        for pair_addr in lp_pairs:
             try:
+                pair_checksum = to_checksum_address(pair_addr)
+                # Call getReserves()
                 result = self.w3.eth.call({
-                    'to': usdt_address,
-                    'data': balance_data
+                    'to': pair_checksum,
+                    'data': '0x' + SEL_GET_RESERVES.hex()
                 })
-                
-                pool_balance = int(result.hex(), 16)
-                pool_balance_formatted = pool_balance / 10**18  # BSC USDT has 18 decimals
-                
-                print(f"  • FlashLoan Contract deployed: {flashloan_address}")
-                print(f"  • Pool balance (USDT): {pool_balance_formatted:.2f} USDT ✅")
-            except Exception as e:
-                print(f"  • FlashLoan Contract deployed: {flashloan_address}")
-                print(f"  • Warning: Could not verify pool balance: {e}")
-                print(f"  • Pool initialization may have failed, but continuing...")
-            
-            # Pre-approve flashloan contract so test account can directly call executeFlashLoan
-            # Impersonate test account
-            self.w3.provider.make_request('anvil_impersonateAccount', [test_addr])
-            
-            # Approve max amount for flashloan contract (2^256-1)
-            max_approval = 2**256 - 1
-            # ERC20 approve function selector: 0x095ea7b3
-            # approve(address spender, uint256 amount)
-            approve_data = '0x095ea7b3' + encode(['address', 'uint256'], [flashloan_address, max_approval]).hex()
-            
-            approve_response = self.w3.provider.make_request(
-                'eth_sendTransaction',
-                [{
-                    'from': test_addr,
-                    'to': usdt_address,
-                    'data': approve_data,
-                    'gas': hex(100000),
-                    'gasPrice': hex(3000000000)
-                }]
-            )
-            
-            if 'result' in approve_response:
-                tx_hash = approve_response['result']
-                # Wait for confirmation
-                for i in range(10):
-                    try:
-                        receipt_response = self.w3.provider.make_request('eth_getTransactionReceipt', [tx_hash])
-                        if receipt_response.get('result'):
-                            break
-                    except:
-                        pass
-                    time.sleep(0.3)
-                print(f"  • Test account approved flash loan contract ✅")
-            
-            # Stop impersonate
-            self.w3.provider.make_request('anvil_stopImpersonatingAccount', [test_addr])
-            
-        except Exception as e:
-            print(f"  • FlashLoan Contract: ❌ Deployment failed - {e}")
-            import traceback
-            traceback.print_exc()
-            # Set to None indicating not deployed
-            self.flashloan_receiver_address = None
+            except Exception:
+                pass  # Silently ignore - pair may not exist
         
         print()
     
-    def _deploy_simple_counter(self):
+    def _erc20_balance_write(self, token_address: str, holder_address: str, amount: int, balance_slot: int = 1) -> Tuple[str, list]:
         """
-        Deploy SimpleCounter test contract
+        Build the anvil_setStorageAt call that writes an ERC20 balance
         
-        This is a simple counter contract for testing basic contract function calls
+        Args:
+            token_address: Token contract address (checksummed)
+            holder_address: Holder address (checksummed)
+            amount: Balance amount (smallest unit)
+            balance_slot: storage slot for balances mapping (mostly 1, WBNB is 3)
+            
+        Returns:
+            (method, params) for make_request / _rpc_batch
         """
-        print("✓ Deploy SimpleCounter test contract...")
+        # Calculate storage slot: keccak256(address + slot)
+        address_padded = _pad_addr(holder_address)
+        slot_padded = hex(balance_slot)[2:].rjust(64, '0')
+        storage_key = '0x' + _keccak(bytes.fromhex(address_padded + slot_padded)).hex()
         
-        try:
-            import solcx
-            from solcx import compile_source
-            from eth_utils import to_checksum_address
-            from eth_abi import encode
-            
-            # Simple counter contract source code
-            contract_source = """
-// SPDX-License-Identifier: MIT
-pragma solidity ^0.8.0;
-
-contract SimpleCounter {
-    uint256 public counter;
-    address public owner;
-    
-    event CounterIncremented(uint256 newValue);
-    event CounterReset(uint256 newValue);
-    
-    constructor() {
-        owner = msg.sender;
-        counter = 0;
-    }
-    
-    // Increment counter
-    function increment() external {
-        counter += 1;
-        emit CounterIncremented(counter);
-    }
+        # Balance padded to 32 bytes (64 hex chars)
+        balance_hex = '0x' + hex(amount)[2:].rjust(64, '0')
+        
+        return 'anvil_setStorageAt', [token_address, storage_key, balance_hex]
     
-    // Get current counter value
-    function getCounter() external view returns (uint256) {
-        return counter;
-    }
+    def flush_setup(self) -> List[Dict[str, Any]]:
+        """
+        Send all queued Anvil cheatcodes (setBalance / setStorageAt / ...) in one JSON-RPC batch
+        
+        Returns:
+            Raw RPC responses, in queue order
+        """
+        calls, self._pending_cheats = self._pending_cheats, []
+        if not calls:
+            return []
+        return self._rpc_batch(calls)
     
-    // Reset counter (owner only)
-    function reset() external {
-        require(msg.sender == owner, "Only owner can reset");
-        counter = 0;
-        emit CounterReset(counter);
-    }
-}
-"""
-            
-            # Try to compile contract
-            try:
-                # Try to use installed solc
-                compiled = compile_source(
-                    contract_source,
-                    output_values=['abi', 'bin'],
-                    solc_version='0.8.20'
-                )
-                contract_interface = compiled['<stdin>:SimpleCounter']
-                bytecode = contract_interface['bin']
-                abi = contract_interface['abi']
-            except Exception as compile_error:
-                print(f"  • Solc compilation failed: {compile_error}")
-                print(f"  • Trying to install solc 0.8.20...")
-                solcx.install_solc('0.8.20')
-                compiled = compile_source(
-                    contract_source,
-                    output_values=['abi', 'bin'],
-                    solc_version='0.8.20'
-                )
-                contract_interface = compiled['<stdin>:SimpleCounter']
-                bytecode = contract_interface['bin']
-                abi = contract_interface['abi']
-            
-            # Deploy contract
-            deployer = self.test_account
-            deployer_address = deployer.address
-            
-            # Construct deployment transaction
-            deploy_tx = {
-                'from': deployer_address,
-                'data': '0x' + bytecode,
-                'gas': 500000,
-                'gasPrice': self.w3.eth.gas_price,
-                'nonce': self.w3.eth.get_transaction_count(deployer_address),
-            }
-            
-            # Sign and send transaction
-            signed_tx = self.w3.eth.account.sign_transaction(deploy_tx, deployer.key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+    def _set_erc20_balance_direct(self, token_address: str, holder_address: str, amount: int, balance_slot: int = 1) -> bool:
+        """
+        Directly set ERC20 token balance (using anvil_setStorageAt)
+        
+        Args:
+            token_address: Token contract address
+            holder_address: Holder address
+            amount: Balance amount (smallest unit)
+            balance_slot: storage slot for balances mapping (mostly 1, WBNB is 3)
             
-            # Wait for transaction confirmation
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=30)
+        Returns:
+            Whether setting was successful
+        """
+        try:
+            token_addr = to_checksum_address(token_address)
+            holder_addr = to_checksum_address(holder_address)
             
-            if receipt['status'] != 1:
-                raise Exception(f"Contract deployment failed with status: {receipt['status']}")
+            self.w3.provider.make_request(*self._erc20_balance_write(token_addr, holder_addr, amount, balance_slot))
             
-            contract_address = receipt['contractAddress']
-            self.simple_counter_address = contract_address
+            # Verify balance
+            balance_data = _calldata(SEL_BALANCE_OF, ['address'], [holder_addr])
+            result = self.w3.eth.call({
+                'to': token_addr,
+                'data': balance_data
+            })
             
-            # Verify contract deployment
-            counter_contract = self.w3.eth.contract(address=contract_address, abi=abi)
-            initial_counter = counter_contract.functions.getCounter().call()
+            actual_balance = int(result.hex(), 16)
+            # Allow 1% error, but use integer comparison
+            min_expected = int(amount * 0.99)
             
-            print(f"  • SimpleCounter Contract deployed: {contract_address}")
-            print(f"  • Initial counter value: {initial_counter} ✅")
+            if actual_balance >= min_expected:
+                return True
+            else:
+                print(f"    ⚠️  Balance verification failed: expected {amount}, got {actual_balance}")
+                return False
             
         except Exception as e:
-            print(f"  • SimpleCounter Contract: ❌ Deployment failed - {e}")
-            import traceback
-            traceback.print_exc()
-            self.simple_counter_address = None
-        
-        print()
+            # Only print concise error message, not full traceback
+            error_msg = str(e)
+            if len(error_msg) > 100:
+                error_msg = error_msg[:100] + "..."
+            print(f"    ⚠️  Error setting balance via storage: {error_msg}")
+            return False
     
-    def _deploy_donation_box(self):
+    def _rpc_batch(self, calls: List[Tuple[str, list]]) -> List[Dict[str, Any]]:
         """
-        Deploy DonationBox test contract
+        Send several JSON-RPC calls to Anvil in one HTTP round trip
         
-        This is a simple donation box contract for testing contract function calls with value
-        """
-        print("✓ Deploy DonationBox test contract...")
+        Anvil processes batch entries in order, so an impersonate/send/stop sequence can be
+        submitted at once. Falls back to sequential make_request on providers without batch support.
         
-        try:
-            import solcx
-            from solcx import compile_source
-            from eth_utils import to_checksum_address
+        Args:
+            calls: List of (method, params) tuples
             
-            # DonationBox contract source code
-            contract_source = """
-// SPDX-License-Identifier: MIT
-pragma solidity ^0.8.0;
-
-contract DonationBox {
-    address public owner;
-    uint256 public totalDonations;
-    mapping(address => uint256) public donations;
-    
-    event DonationReceived(address indexed donor, uint256 amount);
-    
-    constructor() {
-        owner = msg.sender;
-    }
+        Returns:
+            Raw RPC responses, in the same order as calls
+        """
+        provider = self.w3.provider
+        if hasattr(provider, 'make_batch_request'):
+            return list(provider.make_batch_request(calls))
+        return [provider.make_request(method, params) for method, params in calls]
     
-    // Payable function to receive donations
-    function donate() external payable {
-        require(msg.value > 0, "Donation must be greater than 0");
+    def _wait_for_receipt(self, tx_hash: str, max_attempts: int = 20, interval: float = 0.5) -> Optional[Dict[str, Any]]:
+        """
+        Poll Anvil for a mined transaction receipt
         
-        donations[msg.sender] += msg.value;
-        totalDonations += msg.value;
+        Only transport-level failures are treated as transient; anything else
+        (bad params, programming errors, KeyboardInterrupt) propagates to the caller.
         
-        emit DonationReceived(msg.sender, msg.value);
-    }
-    
-    // View function to get contract balance
-    function getBalance() external view returns (uint256) {
-        return address(this).balance;
-    }
-    
-    // View function to get donor's total donations
-    function getDonation(address donor) external view returns (uint256) {
-        return donations[donor];
-    }
-    
-    // Owner can withdraw (for testing cleanup)
-    function withdraw() external {
-        require(msg.sender == owner, "Only owner can withdraw");
-        payable(owner).transfer(address(this).balance);
-    }
-    
-    // Fallback function to accept BNB
-    receive() external payable {
-        donations[msg.sender] += msg.value;
-        totalDonations += msg.value;
-        emit DonationReceived(msg.sender, msg.value);
-    }
-}
-"""
+        Args:
+            tx_hash: Transaction hash
+            max_attempts: Number of receipt lookups before giving up
+            interval: Seconds between lookups
             
-            # Try to compile contract
+        Returns:
+            Raw receipt dict, or None if not mined within max_attempts
+        """
+        import requests
+        
+        for attempt in range(max_attempts):
             try:
-                # Try to use installed solc
-                compiled = compile_source(
-                    contract_source,
-                    output_values=['abi', 'bin'],
-                    solc_version='0.8.20'
-                )
-                contract_interface = compiled['<stdin>:DonationBox']
-                bytecode = contract_interface['bin']
-                abi = contract_interface['abi']
-            except Exception as compile_error:
-                print(f"  • Solc compilation failed: {compile_error}")
-                print(f"  • Trying to install solc 0.8.20...")
-                solcx.install_solc('0.8.20')
-                compiled = compile_source(
-                    contract_source,
-                    output_values=['abi', 'bin'],
-                    solc_version='0.8.20'
-                )
-                contract_interface = compiled['<stdin>:DonationBox']
-                bytecode = contract_interface['bin']
-                abi = contract_interface['abi']
-            
-            # Deploy contract
-            deployer = self.test_account
-            deployer_address = deployer.address
-            
-            # Construct deployment transaction
-            deploy_tx = {
-                'from': deployer_address,
-                'data': '0x' + bytecode,
-                'gas': 500000,
-                'gasPrice': self.w3.eth.gas_price,
-                'nonce': self.w3.eth.get_transaction_count(deployer_address),
-            }
-            
-            # Sign and send transaction
-            signed_tx = self.w3.eth.account.sign_transaction(deploy_tx, deployer.key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-            
-            # Wait for transaction confirmation
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=30)
-            
-            if receipt['status'] != 1:
-                raise Exception(f"Contract deployment failed with status: {receipt['status']}")
-            
-            contract_address = receipt['contractAddress']
-            self.donation_box_address = contract_address
-            
-            # Verify contract deployment
-            donation_contract = self.w3.eth.contract(address=contract_address, abi=abi)
-            initial_balance = donation_contract.functions.getBalance().call()
-            
-            print(f"  • DonationBox Contract deployed: {contract_address}")
-            print(f"  • Initial contract balance: {initial_balance / 10**18:.6f} BNB ✅")
-            
-        except Exception as e:
-            print(f"  • DonationBox Contract: ❌ Deployment failed - {e}")
-            import traceback
-            traceback.print_exc()
-            self.donation_box_address = None
+                response = self.w3.provider.make_request('eth_getTransactionReceipt', [tx_hash])
+            except (ConnectionError, TimeoutError, requests.exceptions.RequestException) as e:
+                print(f"    ⚠️  Receipt lookup failed ({attempt + 1}/{max_attempts}): {e}")
+                response = {}
+            receipt = response.get('result')
+            if receipt and receipt.get('blockNumber'):
+                return receipt
+            if attempt == 0 and self._mine_if_manual():
+                continue  # Re-check right away, the block just mined includes the tx
+            if attempt < max_attempts - 1:
+                time.sleep(interval)
+        return None
+    
+    def _send_impersonated(self, from_address: str, tx: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """
+        Send a transaction from an impersonated account in two pipelined batches
+        
+        JSON-RPC batches cannot feed one call's result into the next, so the sequence is
+        split at the tx hash: [impersonate, eth_sendTransaction] go out as one POST, then
+        [eth_getTransactionReceipt, stopImpersonating] as a second. With automine on, the
+        receipt is already available in the second batch and no polling is needed.
         
-        print()
-    
-    def _deploy_message_board(self):
+        Args:
+            from_address: Account to impersonate (checksummed)
+            tx: Transaction fields without 'from'
+            
+        Returns:
+            (send response, receipt or None if the send failed / never confirmed)
         """
-        Deploy MessageBoard test contract
+        _, response = self._rpc_batch([
+            ('anvil_impersonateAccount', [from_address]),
+            ('eth_sendTransaction', [{'from': from_address, **tx}]),
+        ])
         
-        This is a simple message board contract for testing contract function calls with parameters
-        """
-        print("✓ Deploy MessageBoard test contract...")
+        if 'result' not in response:
+            self.w3.provider.make_request('anvil_stopImpersonatingAccount', [from_address])
+            return response, None
         
-        try:
-            import solcx
-            from solcx import compile_source
-            from eth_utils import to_checksum_address
-            
-            # MessageBoard contract source code
-            contract_source = """
-// SPDX-License-Identifier: MIT
-pragma solidity ^0.8.0;
-
-contract MessageBoard {
-    string public message;
-    address public lastSender;
-    uint256 public updateCount;
-    
-    event MessageUpdated(address indexed sender, string newMessage);
-    
-    constructor() {
-        message = "Initial message";
-        lastSender = msg.sender;
-        updateCount = 0;
-    }
-    
-    // Set message with string parameter
-    function setMessage(string memory newMessage) external {
-        message = newMessage;
-        lastSender = msg.sender;
-        updateCount += 1;
+        receipt_response, _ = self._rpc_batch([
+            ('eth_getTransactionReceipt', [response['result']]),
+            ('anvil_stopImpersonatingAccount', [from_address]),
+        ])
         
-        emit MessageUpdated(msg.sender, newMessage);
-    }
+        receipt = receipt_response.get('result')
+        if not (receipt and receipt.get('blockNumber')):
+            receipt = self._wait_for_receipt(response['result'])
+        
+        return response, receipt
     
-    // Get current message
-    function getMessage() external view returns (string memory) {
-        return message;
-    }
+    def _gas_price(self) -> int:
+        """
+        Gas price for self-signed setup txs, fetched once per Anvil session
+        
+        Returns:
+            Gas price in wei
+        """
+        if self._cached_gas_price is None:
+            self._cached_gas_price = self.w3.eth.gas_price
+        return self._cached_gas_price
     
-    // Get message info
-    function getMessageInfo() external view returns (
-        string memory currentMessage,
-        address sender,
-        uint256 count
-    ) {
-        return (message, lastSender, updateCount);
-    }
-}
-"""
-            
-            # Try to compile contract
+    def _mine_if_manual(self) -> bool:
+        """
+        Mine one block if Anvil auto-mining is off
+        
+        Anvil auto-mines every submitted tx by default, so receipts are available on the
+        first lookup and no polling sleep is needed. Only when auto-mining was disabled
+        does a pending tx need an explicit anvil_mine.
+        
+        Returns:
+            True if a block was mined
+        """
+        if self._automine is None:
             try:
-                # Try to use installed solc
-                compiled = compile_source(
-                    contract_source,
-                    output_values=['abi', 'bin'],
-                    solc_version='0.8.20'
-                )
-                contract_interface = compiled['<stdin>:MessageBoard']
-                bytecode = contract_interface['bin']
-                abi = contract_interface['abi']
-            except Exception as compile_error:
-                print(f"  • Solc compilation failed: {compile_error}")
-                print(f"  • Trying to install solc 0.8.20...")
-                solcx.install_solc('0.8.20')
-                compiled = compile_source(
-                    contract_source,
-                    output_values=['abi', 'bin'],
-                    solc_version='0.8.20'
-                )
-                contract_interface = compiled['<stdin>:MessageBoard']
-                bytecode = contract_interface['bin']
-                abi = contract_interface['abi']
-            
-            # Deploy contract
-            deployer = self.test_account
-            deployer_address = deployer.address
-            
-            # Construct deployment transaction
-            deploy_tx = {
-                'from': deployer_address,
-                'data': '0x' + bytecode,
-                'gas': 1000000,  # Increase gas limit, MessageBoard has string initialization
-                'gasPrice': self.w3.eth.gas_price,
-                'nonce': self.w3.eth.get_transaction_count(deployer_address),
-            }
-            
-            # Sign and send transaction
-            signed_tx = self.w3.eth.account.sign_transaction(deploy_tx, deployer.key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-            
-            # Wait for transaction confirmation
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=30)
-            
-            # Debug info
-            print(f"  • Deployment tx: {tx_hash.hex()}")
-            print(f"  • Gas used: {receipt['gasUsed']} / {deploy_tx['gas']}")
-            print(f"  • Status: {receipt['status']}")
-            
-            if receipt['status'] != 1:
-                # Try to get revert reason
-                print(f"  • Trying to get revert reason...")
-                try:
-                    self.w3.eth.call(deploy_tx, receipt['blockNumber'])
-                except Exception as call_error:
-                    print(f"  • Revert reason: {call_error}")
-                raise Exception(f"MessageBoard deployment failed: status={receipt['status']}, gasUsed={receipt['gasUsed']}")
-            
-            contract_address = receipt['contractAddress']
-            self.message_board_address = contract_address
-            
-            # Verify contract deployment
-            message_contract = self.w3.eth.contract(address=contract_address, abi=abi)
-            initial_message = message_contract.functions.getMessage().call()
-            
-            print(f"  • MessageBoard Contract deployed: {contract_address}")
-            print(f"  • Initial message: \"{initial_message}\" ✅")
-            
-        except Exception as e:
-            print(f"  • MessageBoard Contract: ❌ Deployment failed - {e}")
-            import traceback
-            traceback.print_exc()
-            self.message_board_address = None
+                self._automine = bool(self.w3.provider.make_request('anvil_getAutomine', []).get('result', True))
+            except Exception:
+                self._automine = True  # Assume Anvil default
         
-        print()
+        if self._automine:
+            return False
+        
+        self.w3.provider.make_request('anvil_mine', [1])
+        return True
     
-    def _deploy_delegate_call_contracts(self):
+    def _set_token_balances(self):
         """
-        Deploy DelegateCall related contracts:
-        1. Implementation contract - contains actual logic
-        2. Proxy contract - uses delegatecall to forward calls
+        Set ERC20 token balances for test account
+        
+        Uses anvil_setStorageAt to directly manipulate storage, fast and reliable
         """
-        from eth_utils import to_checksum_address
-        import solcx
+        usdt_address = '0x55d398326f99059fF775485246999027B3197955'
+        wbnb_address = '0xbb4CdB9CBd36B01bD1cBaEBF2De08d9173bc095c'
+        cake_address = '0x0E09FaBB73Bd3Ade0a17ECC321fD13a19e81cE82'
+        busd_address = '0xe9e7CEA3DedcA5984780Bafc599bD69ADd087D56'
+        
+        print(f"✓ Setting ERC20 token balances...")
         
-        print(f"✓ Deploying DelegateCall contracts...")
+        test_addr = to_checksum_address(self.test_address)
+        # (label, token, balances mapping slot, amount)
+        balances = [
+            ('USDT', usdt_address, 1, 1000 * 10**18),
+            # WETH9 standard
+            ('WBNB', wbnb_address, 3, 100 * 10**18),
+            # OpenZeppelin standard. SimpleRewardPool's 100 CAKE reward balance is written
+            # directly into storage during deployment, so the test account keeps its full balance
+            ('CAKE', cake_address, 1, 100 * 10**18),
+            ('BUSD', busd_address, 1, 1000 * 10**18),
+            # PancakeSwap LP tokens use slot 1 (OpenZeppelin ERC20 standard);
+            # used for harvest_rewards, unstake_lp_tokens, remove_liquidity tests
+            ('USDT/BUSD LP', '0x7EFaEf62fDdCCa950418312c6C91Aef321375A00', 1, 5 * 10**18),
+            # Used for remove_liquidity_bnb_token test
+            ('WBNB/USDT LP', '0x16b9a82891338f9bA80E2D6970FddA79D1eb0daE', 1, 3 * 10**18),
+        ]
         
+        # All storage writes (plus any queued BNB balance) go out in one batch, then every
+        # balance is read back with one batched eth_call
+        for label, token, slot, amount in balances:
+            self._pending_cheats.append(self._erc20_balance_write(to_checksum_address(token), test_addr, amount, slot))
         try:
-            # Implementation contract source
-            implementation_source = """
-// SPDX-License-Identifier: MIT
-pragma solidity ^0.8.0;
-
-contract Implementation {
-    uint256 public value;
-    
-    event ValueSet(uint256 newValue);
-    
-    // Set value function
-    function setValue(uint256 _value) external {
-        value = _value;
-        emit ValueSet(_value);
-    }
-    
-    // Get value function
-    function getValue() external view returns (uint256) {
-        return value;
-    }
-}
-"""
-            
-            # Proxy contract source
-            proxy_source = """
-// SPDX-License-Identifier: MIT
-pragma solidity ^0.8.0;
-
-contract DelegateCallProxy {
-    uint256 public value;  // Storage slot 0 - matches Implementation
-    address public implementation;  // Storage slot 1
-    
-    event ValueSet(uint256 newValue);
-    
-    constructor(address _implementation) {
-        implementation = _implementation;
-    }
-    
-    // Fallback function that delegates all calls to implementation
-    fallback() external payable {
-        address impl = implementation;
-        require(impl != address(0), "No implementation");
+            self.flush_setup()
+            balance_calldata = _calldata(SEL_BALANCE_OF, ['address'], [test_addr])
+            responses = self._rpc_batch([
+                ('eth_call', [{'to': to_checksum_address(token), 'data': balance_calldata}, 'latest'])
+                for _, token, _, _ in balances
+            ])
+        except Exception as e:
+            print(f"  • ERC20 balances: ❌ Error - {e}")
+            logger.exception("ERC20 balances setup failed")
+            responses = [{}] * len(balances)
         
-        assembly {
-            // Copy calldata to memory
-            calldatacopy(0, 0, calldatasize())
-            
-            // Delegate call to implementation
-            let result := delegatecall(gas(), impl, 0, calldatasize(), 0, 0)
-            
-            // Copy return data to memory
-            returndatacopy(0, 0, returndatasize())
-            
-            // Return or revert based on result
-            switch result
-            case 0 { revert(0, returndatasize()) }
-            default { return(0, returndatasize()) }
-        }
-    }
-    
-    // Allow contract to receive BNB
-    receive() external payable {}
-}
-"""
-            
-            deployer = self.test_account
-            deployer_address = deployer.address
-            
-            # Install solc 0.8.20
-            solc_version = '0.8.20'
-            if solc_version not in solcx.get_installed_solc_versions():
-                print(f"  • Installing solc {solc_version}...")
-                solcx.install_solc(solc_version)
-            solcx.set_solc_version(solc_version)
-            
-            # Compile Implementation contract
-            print(f"  • Compiling Implementation contract...")
-            impl_compiled = solcx.compile_source(
-                implementation_source,
-                output_values=['abi', 'bin'],
-                solc_version=solc_version
-            )
-            impl_contract_id = None
-            for contract_id in impl_compiled.keys():
-                if 'Implementation' in contract_id:
-                    impl_contract_id = contract_id
-                    break
+        for (label, token, slot, amount), response in zip(balances, responses):
+            if 'result' not in response:
+                print(f"  • {label}: Failed to set balance {response.get('error', '')}")
+                continue
+            # Allow 1% error, but use integer comparison
+            if int(response['result'], 16) >= amount * 99 // 100:
+                print(f"  • {label}: {amount / 10**18:.2f} tokens ✅")
+            else:
+                print(f"  • {label}: Failed to set balance")
+        
+        # Set initial allowances (for revoke approval tests)
+        print(f"✓ Setting initial allowances...")
+        try:
+            usdt_addr = to_checksum_address(usdt_address)
+            test_addr = to_checksum_address(self.test_address)
             
-            if not impl_contract_id:
-                raise Exception("Implementation contract not found in compiled output")
-            
-            impl_abi = impl_compiled[impl_contract_id]['abi']
-            impl_bytecode = impl_compiled[impl_contract_id]['bin']
-            
-            # Deploy Implementation contract
-            print(f"  • Deploying Implementation contract...")
-            impl_deploy_tx = {
-                'from': deployer_address,
-                'data': '0x' + impl_bytecode,
-                'gas': 500000,
-                'gasPrice': self.w3.eth.gas_price,
-                'nonce': self.w3.eth.get_transaction_count(deployer_address),
-            }
-            
-            impl_signed_tx = self.w3.eth.account.sign_transaction(impl_deploy_tx, deployer.key)
-            impl_tx_hash = self.w3.eth.send_raw_transaction(impl_signed_tx.raw_transaction)
-            impl_receipt = self.w3.eth.wait_for_transaction_receipt(impl_tx_hash, timeout=30)
-            
-            if impl_receipt['status'] != 1:
-                raise Exception(f"Implementation deployment failed: status={impl_receipt['status']}")
-            
-            impl_address = impl_receipt['contractAddress']
-            print(f"  • Implementation deployed: {impl_address}")
-            
-            # Compile Proxy contract
-            print(f"  • Compiling Proxy contract...")
-            proxy_compiled = solcx.compile_source(
-                proxy_source,
-                output_values=['abi', 'bin'],
-                solc_version=solc_version
-            )
-            proxy_contract_id = None
-            for contract_id in proxy_compiled.keys():
-                if 'DelegateCallProxy' in contract_id:
-                    proxy_contract_id = contract_id
-                    break
+            # Contract addresses requiring approval (PancakeSwap Router, Venus Protocol, etc)
+            spenders = [
+                '0x10ED43C718714eb63d5aA57B78B54704E256024E',  # PancakeSwap Router
+                '0x13f4EA83D0bd40E75C8222255bc855a974568Dd4',  # Venus Protocol
+                '0x1B81D678ffb9C0263b24A97847620C99d213eB14'   # PancakeSwap V3 Router
+            ]
             
-            if not proxy_contract_id:
-                raise Exception("Proxy contract not found in compiled output")
+            # Impersonate test account
+            self.w3.provider.make_request('anvil_impersonateAccount', [test_addr])
             
-            proxy_abi = proxy_compiled[proxy_contract_id]['abi']
-            proxy_bytecode = proxy_compiled[proxy_contract_id]['bin']
+            for spender in spenders:
+                spender_addr = to_checksum_address(spender)
+                
+                # Encode: approve(address spender, uint256 amount)
+                # Approve a large amount (1000 USDT)
+                approve_amount = 1000 * 10**18
+                approve_data = _calldata(SEL_ERC20_APPROVE, ['address', 'uint256'], [spender_addr, approve_amount])
             
-            # Encode constructor parameters (implementation address)
-            from eth_abi import encode
-            constructor_params = encode(['address'], [to_checksum_address(impl_address)])
+                # Send approve transaction
+                response = self.w3.provider.make_request(
+                'eth_sendTransaction',
+                [{
+                        'from': test_addr,
+                        'to': usdt_addr,
+                        'data': approve_data,
+                    'gas': hex(100000),
+                        'gasPrice': hex(3000000000)
+                }]
+                )
+                
+                # Check response
+                if 'result' not in response:
+                    print(f"  • Allowance for {spender[:10]}...: ❌ Failed - {response.get('error', 'Unknown error')}")
+                    continue
+                
+                tx_hash = response['result']
             
-            # Deploy Proxy contract
-            print(f"  • Deploying Proxy contract...")
-            proxy_deploy_tx = {
-                'from': deployer_address,
-                'data': '0x' + proxy_bytecode + constructor_params.hex(),
-                'gas': 500000,
-                'gasPrice': self.w3.eth.gas_price,
-                'nonce': self.w3.eth.get_transaction_count(deployer_address),
-            }
+                # Wait for confirmation
+            receipt = self._wait_for_receipt(tx_hash)
             
-            proxy_signed_tx = self.w3.eth.account.sign_transaction(proxy_deploy_tx, deployer.key)
-            proxy_tx_hash = self.w3.eth.send_raw_transaction(proxy_signed_tx.raw_transaction)
-            proxy_receipt = self.w3.eth.wait_for_transaction_receipt(proxy_tx_hash, timeout=30)
+            # Stop impersonate
+            self.w3.provider.make_request('anvil_stopImpersonatingAccount', [test_addr])
             
-            if proxy_receipt['status'] != 1:
-                raise Exception(f"Proxy deployment failed: status={proxy_receipt['status']}")
+            print(f"  • USDT allowances set for {len(spenders)} spenders ✅")
+                
+        except Exception as e:
+            print(f"  • Allowances: ❌ Error - {e}")
+            logger.exception("Allowances setup failed")
+        
+        # Set CAKE token allowances (for multi-hop swap tests)
+        try:
+            cake_address = '0x0E09FaBB73Bd3Ade0a17ECC321fD13a19e81cE82'  # CAKE token on BSC
+            cake_addr = to_checksum_address(cake_address)
+            test_addr = to_checksum_address(self.test_address)
             
-            proxy_address = proxy_receipt['contractAddress']
+            # PancakeSwap Router needs CAKE allowance
+            router_address = '0x10ED43C718714eb63d5aA57B78B54704E256024E'
+            router_addr = to_checksum_address(router_address)
             
-            # Save addresses
-            self.delegate_call_implementation_address = impl_address
-            self.delegate_call_proxy_address = proxy_address
+            # Approve a large amount (200 CAKE, above the 100 CAKE balance)
+            approve_amount = 200 * 10**18
+            approve_data = _calldata(SEL_ERC20_APPROVE, ['address', 'uint256'], [router_addr, approve_amount])
+            
+            # Send approve transaction (impersonated)
+            response, receipt = self._send_impersonated(test_addr, {
+                'to': cake_addr,
+                'data': approve_data,
+                'gas': hex(100000),
+                'gasPrice': hex(3000000000)
+            })
             
-            # Verify contract deployment
-            # Read initial value of implementation contract
-            impl_contract = self.w3.eth.contract(address=impl_address, abi=impl_abi)
-            impl_initial_value = impl_contract.functions.getValue().call()
+            print(f"  • CAKE allowances set for Router ✅")
+                
+        except Exception as e:
+            print(f"  • CAKE allowances: ❌ Error - {e}")
+            logger.exception("CAKE allowances setup failed")
+        
+        # CAKE allowances for SimpleStaking will be set after deployment in _setup_simple_staking()
+        
+        # Set WBNB token allowances (for wrap-swap tests like composite_wrap_swap_wbnb)
+        try:
+            wbnb_address = '0xbb4CdB9CBd36B01bD1cBaEBF2De08d9173bc095c'  # WBNB token on BSC
+            wbnb_addr = to_checksum_address(wbnb_address)
+            test_addr = to_checksum_address(self.test_address)
             
-            # Read initial value of proxy contract (via delegatecall)
-            proxy_contract = self.w3.eth.contract(address=proxy_address, abi=impl_abi)
-            proxy_initial_value = proxy_contract.functions.getValue().call()
+            # PancakeSwap Router needs WBNB allowance
+            router_address = '0x10ED43C718714eb63d5aA57B78B54704E256024E'
+            router_addr = to_checksum_address(router_address)
             
-            print(f"  • Proxy Contract deployed: {proxy_address}")
-            print(f"  • Implementation Contract: {impl_address}")
-            print(f"  • Implementation initial value: {impl_initial_value}")
-            print(f"  • Proxy initial value: {proxy_initial_value} ✅")
+            # Approve a large amount (100 WBNB to match balance)
+            approve_amount = 100 * 10**18
+            approve_data = _calldata(SEL_ERC20_APPROVE, ['address', 'uint256'], [router_addr, approve_amount])
+            
+            # Send approve transaction (impersonated)
+            response, receipt = self._send_impersonated(test_addr, {
+                'to': wbnb_addr,
+                'data': approve_data,
+                'gas': hex(100000),
+                'gasPrice': hex(3000000000)
+            })
             
+            print(f"  • WBNB allowances set for Router ✅")
+                
         except Exception as e:
-            print(f"  • DelegateCall Contracts: ❌ Deployment failed - {e}")
-            import traceback
-            traceback.print_exc()
-            self.delegate_call_implementation_address = None
-            self.delegate_call_proxy_address = None
-        
-        print()
-    
-    def _deploy_fallback_receiver(self):
-        """
-        Deploy FallbackReceiver test contract
-        
-        This is a simple contract with receive() function to accept BNB
-        """
-        print("✓ Deploy FallbackReceiver test contract...")
+            print(f"  • WBNB allowances: ❌ Error - {e}")
+            logger.exception("WBNB allowances setup failed")
         
+        # Set LP token allowances (for remove_liquidity and staking tests)
         try:
-            import solcx
-            from solcx import compile_source
-            from eth_utils import to_checksum_address
+            # USDT/BUSD LP token
+            usdt_busd_lp_address = '0x7EFaEf62fDdCCa950418312c6C91Aef321375A00'
+            usdt_busd_lp_addr = to_checksum_address(usdt_busd_lp_address)
             
-            # FallbackReceiver contract source code
-            contract_source = """
-// SPDX-License-Identifier: MIT
-pragma solidity ^0.8.0;
-
-contract FallbackReceiver {
-    uint256 public receivedCount;
-    uint256 public totalReceived;
-    address public owner;
-    
-    event BNBReceived(address indexed sender, uint256 amount);
-    
-    constructor() {
-        owner = msg.sender;
-        receivedCount = 0;
-        totalReceived = 0;
-    }
-    
-    // Receive function - called when BNB is sent with empty calldata
-    receive() external payable {
-        receivedCount += 1;
-        totalReceived += msg.value;
-        emit BNBReceived(msg.sender, msg.value);
-    }
-    
-    // Fallback function - called when function doesn't exist
-    fallback() external payable {
-        receivedCount += 1;
-        totalReceived += msg.value;
-        emit BNBReceived(msg.sender, msg.value);
-    }
-    
-    // Get contract balance
-    function getBalance() external view returns (uint256) {
-        return address(this).balance;
-    }
-    
-    // Get received count
-    function getReceivedCount() external view returns (uint256) {
-        return receivedCount;
-    }
-    
-    // Owner can withdraw (for cleanup)
-    function withdraw() external {
-        require(msg.sender == owner, "Only owner can withdraw");
-        payable(owner).transfer(address(this).balance);
-    }
-}
-"""
+            # WBNB/USDT LP token
+            wbnb_usdt_lp_address = '0x16b9a82891338f9bA80E2D6970FddA79D1eb0daE'
+            wbnb_usdt_lp_addr = to_checksum_address(wbnb_usdt_lp_address)
             
-            # Try to compile contract
-            try:
-                # Try to use installed solc
-                compiled = compile_source(
-                    contract_source,
-                    output_values=['abi', 'bin'],
-                    solc_version='0.8.20'
-                )
-                contract_interface = compiled['<stdin>:FallbackReceiver']
-                bytecode = contract_interface['bin']
-                abi = contract_interface['abi']
-            except Exception as compile_error:
-                print(f"  • Solc compilation failed: {compile_error}")
-                print(f"  • Trying to install solc 0.8.20...")
-                solcx.install_solc('0.8.20')
-                compiled = compile_source(
-                    contract_source,
-                    output_values=['abi', 'bin'],
-                    solc_version='0.8.20'
+            # PancakeSwap Router needs LP token allowances
+            router_address = '0x10ED43C718714eb63d5aA57B78B54704E256024E'
+            router_addr = to_checksum_address(router_address)
+            
+            # Impersonate test account
+            self.w3.provider.make_request('anvil_impersonateAccount', [test_addr])
+            
+            # Approve both LP tokens for Router
+            approve_amount = 1000 * 10**18  # Large allowance
+            
+            for lp_name, lp_addr in [('USDT/BUSD LP', usdt_busd_lp_addr), ('WBNB/USDT LP', wbnb_usdt_lp_addr)]:
+                approve_data = _calldata(SEL_ERC20_APPROVE, ['address', 'uint256'], [router_addr, approve_amount])
+                
+                response = self.w3.provider.make_request(
+                    'eth_sendTransaction',
+                    [{
+                        'from': test_addr,
+                        'to': lp_addr,
+                        'data': approve_data,
+                        'gas': hex(100000),
+                        'gasPrice': hex(3000000000)
+                    }]
                 )
-                contract_interface = compiled['<stdin>:FallbackReceiver']
-                bytecode = contract_interface['bin']
-                abi = contract_interface['abi']
-            
-            # Deploy contract
-            deployer = self.test_account
-            deployer_address = deployer.address
-            
-            # Construct deployment transaction
-            deploy_tx = {
-                'from': deployer_address,
-                'data': '0x' + bytecode,
-                'gas': 500000,
-                'gasPrice': self.w3.eth.gas_price,
-                'nonce': self.w3.eth.get_transaction_count(deployer_address),
-            }
-            
-            # Sign and send transaction
-            signed_tx = self.w3.eth.account.sign_transaction(deploy_tx, deployer.key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-            
-            # Wait for transaction confirmation
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=30)
+                
+                if 'result' in response:
+                    tx_hash = response['result']
+                    receipt = self._wait_for_receipt(tx_hash, max_attempts=10, interval=0.3)
             
-            if receipt['status'] != 1:
-                raise Exception(f"Contract deployment failed with status: {receipt['status']}")
+            # Stop impersonate
+            self.w3.provider.make_request('anvil_stopImpersonatingAccount', [test_addr])
             
-            contract_address = receipt['contractAddress']
-            self.fallback_receiver_address = contract_address
+            print(f"  • LP token allowances set for Router ✅")
+        except Exception as e:
+            print(f"  • LP token allowances: ❌ Error - {e}")
+            logger.exception("LP token allowances setup failed")
+        
+        # Set BUSD token allowances (for liquidity operations)
+        try:
+            busd_address = '0xe9e7CEA3DedcA5984780Bafc599bD69ADd087D56'  # BUSD token on BSC
+            busd_addr = to_checksum_address(busd_address)
+            test_addr = to_checksum_address(self.test_address)
             
-            # Verify contract deployment
-            fallback_contract = self.w3.eth.contract(address=contract_address, abi=abi)
-            initial_balance = fallback_contract.functions.getBalance().call()
-            initial_count = fallback_contract.functions.getReceivedCount().call()
+            # PancakeSwap Router needs BUSD allowance
+            router_address = '0x10ED43C718714eb63d5aA57B78B54704E256024E'
+            router_addr = to_checksum_address(router_address)
             
-            print(f"  • FallbackReceiver Contract deployed: {contract_address}")
-            print(f"  • Initial balance: {initial_balance / 10**18:.6f} BNB")
-            print(f"  • Initial received count: {initial_count} ✅")
+            # Approve a large amount (1000 BUSD)
+            approve_amount = 1000 * 10**18
+            approve_data = _calldata(SEL_ERC20_APPROVE, ['address', 'uint256'], [router_addr, approve_amount])
+            
+            # Send approve transaction (impersonated)
+            response, receipt = self._send_impersonated(test_addr, {
+                'to': busd_addr,
+                'data': approve_data,
+                'gas': hex(100000),
+                'gasPrice': hex(3000000000)
+            })
             
+            print(f"  • BUSD allowances set for Router ✅")
+                
         except Exception as e:
-            print(f"  • FallbackReceiver Contract: ❌ Deployment failed - {e}")
-            import traceback
-            traceback.print_exc()
-            self.fallback_receiver_address = None
+            print(f"  • BUSD allowances: ❌ Error - {e}")
+            logger.exception("BUSD allowances setup failed")
         
-        print()
-    
-    def _deploy_simple_staking(self):
-        """
-        Deploy SimpleStaking contract for staking tests
-        """
-        print("✓ Deploying SimpleStaking test contract...")
+        # Set LP tokens (for remove_liquidity tests)
+        print(f"✓ Setting LP tokens...")
         try:
-            import json
-            from solcx import compile_source, install_solc
+            factory_address = '0xcA143Ce32Fe78f1f7019d7d551a6402fC5350c73'  # PancakeSwap Factory
+            router_address = '0x10ED43C718714eb63d5aA57B78B54704E256024E'  # PancakeSwap Router
+            usdt_address = '0x55d398326f99059fF775485246999027B3197955'
+            busd_address = '0xe9e7CEA3DedcA5984780Bafc599bD69ADd087D56'
             
-            # CAKE token address
-            cake_address = '0x0E09FaBB73Bd3Ade0a17ECC321fD13a19e81cE82'
+            test_addr = to_checksum_address(self.test_address)
             
-            # Read contract source code
-            contract_path = os.path.join(os.path.dirname(__file__), 'contracts', 'SimpleStaking.sol')
-            with open(contract_path, 'r') as f:
-                contract_source = f.read()
+            # Get LP token address using Factory.getPair()
+            # getPair(address tokenA, address tokenB) returns (address pair)
+            get_pair_data = _calldata(SEL_GET_PAIR, ['address', 'address'], [usdt_address, busd_address])
             
-            # Install and compile contract
-            try:
-                install_solc('0.8.20')
-            except:
-                pass  # Might be already installed
+            result = self.w3.eth.call({
+                'to': factory_address,
+                'data': get_pair_data
+            })
             
-            compiled_sol = compile_source(
-                contract_source,
-                output_values=['abi', 'bin', 'bin-runtime'],
-                solc_version='0.8.20'
-            )
+            lp_token_address = '0x' + result.hex()[-40:]  # Last 20 bytes
+            lp_token_addr = to_checksum_address(lp_token_address)
             
-            # Find SimpleStaking contract (skip interfaces)
-            contract_interface = None
-            contract_id = None
-            
-            print(f"  • Found {len(compiled_sol)} compiled contracts/interfaces")
-            for cid, cinterface in compiled_sol.items():
-                print(f"    - {cid}: bytecode length = {len(cinterface.get('bin', ''))}")
-                # Find contract with bytecode (skip empty interfaces)
-                if cinterface.get('bin') and len(cinterface.get('bin', '')) > 10:
-                    if 'SimpleStaking' in cid:
-                        contract_id = cid
-                        contract_interface = cinterface
-                        print(f"  • ✅ Found SimpleStaking contract: {cid}")
-                        break
+            print(f"  • LP Token (USDT/BUSD): {lp_token_addr}")
+            
+            # Set LP token balance (2.0 LP tokens) using direct storage manipulation
+            # Uniswap V2 LP tokens use OpenZeppelin ERC20, balances at slot 1
+            lp_amount = 2 * 10**18  # 2.0 LP tokens
+            if self._set_erc20_balance_direct(lp_token_addr, test_addr, lp_amount, balance_slot=1):
+                print(f"  • LP Token balance: {lp_amount / 10**18:.2f} LP tokens ✅")
+            else:
+                print(f"  • LP Token balance: Failed to set")
+                
+            # Approve LP tokens for Router (for remove liquidity)
+            approve_amount = 1000 * 10**18  # Large approval
+            approve_data = _calldata(SEL_ERC20_APPROVE, ['address', 'uint256'], [router_address, approve_amount])
             
-            if not contract_interface:
-                print(f"  • ERROR: SimpleStaking contract not found!")
-                print(f"  • Available contracts: {list(compiled_sol.keys())}")
-                raise Exception("SimpleStaking contract not found in compilation output")
+            response, receipt = self._send_impersonated(test_addr, {
+                'to': lp_token_addr,
+                'data': approve_data,
+                'gas': hex(100000),
+                'gasPrice': hex(3000000000)
+            })
             
-            # Get bytecode and ABI
-            bytecode = contract_interface.get('bin', '')
-            abi = contract_interface.get('abi', [])
+            if 'result' in response:
+                print(f"  • LP Token approved for Router ✅")
             
-            # Ensure bytecode format is correct
-            if not bytecode.startswith('0x'):
-                bytecode = '0x' + bytecode
+            # Also set up WBNB/USDT LP token (for remove_liquidity_bnb_token)
+            wbnb_address = '0xbb4CdB9CBd36B01bD1cBaEBF2De08d9173bc095c'
             
-            # Construct deployment transaction (including constructor args)
-            from eth_abi import encode
-            from eth_utils import to_checksum_address
-            constructor_args = encode(['address'], [to_checksum_address(cake_address)])
+            # Get WBNB/USDT LP token address
+            get_pair_data_wbnb_usdt = _calldata(SEL_GET_PAIR, ['address', 'address'], [wbnb_address, usdt_address])
             
-            # Combine bytecode and constructor args
-            deployment_data = bytecode + constructor_args.hex()
+            result_wbnb_usdt = self.w3.eth.call({
+                'to': factory_address,
+                'data': get_pair_data_wbnb_usdt
+            })
             
-            deployer = self.test_account
-            deployer_address = deployer.address
+            lp_token_wbnb_usdt = '0x' + result_wbnb_usdt.hex()[-40:]
+            lp_token_wbnb_usdt_addr = to_checksum_address(lp_token_wbnb_usdt)
             
-            print(f"  • Bytecode length: {len(bytecode)} characters")
-            print(f"  • Deploying contract...")
+            print(f"  • LP Token (WBNB/USDT): {lp_token_wbnb_usdt_addr}")
             
-            deploy_tx = {
-                'from': deployer_address,
-                'data': deployment_data,
-                'gas': 2000000,  # Increase gas limit
-                'gasPrice': self.w3.eth.gas_price,
-                'nonce': self.w3.eth.get_transaction_count(deployer_address),
-            }
+            # Set WBNB/USDT LP token balance (2.0 LP tokens)
+            if self._set_erc20_balance_direct(lp_token_wbnb_usdt_addr, test_addr, lp_amount, balance_slot=1):
+                print(f"  • LP Token (WBNB/USDT) balance: {lp_amount / 10**18:.2f} LP tokens ✅")
+            else:
+                print(f"  • LP Token (WBNB/USDT) balance: Failed to set")
             
-            # Sign and send transaction
-            signed_tx = self.w3.eth.account.sign_transaction(deploy_tx, deployer.key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            # Approve WBNB/USDT LP tokens for Router
+            approve_data_wbnb_usdt = _calldata(SEL_ERC20_APPROVE, ['address', 'uint256'], [router_address, approve_amount])
             
-            # Wait for transaction confirmation
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=30)
+            response_wbnb_usdt, receipt_wbnb_usdt = self._send_impersonated(test_addr, {
+                'to': lp_token_wbnb_usdt_addr,
+                'data': approve_data_wbnb_usdt,
+                'gas': hex(100000),
+                'gasPrice': hex(3000000000)
+            })
             
-            if receipt['status'] != 1:
-                raise Exception(f"Contract deployment failed with status: {receipt['status']}")
+            if 'result' in response_wbnb_usdt:
+                print(f"  • LP Token (WBNB/USDT) approved for Router ✅")
+                
+        except Exception as e:
+            print(f"  • LP tokens: ❌ Error - {e}")
+            logger.exception("LP tokens setup failed")
+        
+        # Setup NFT (for ERC721 tests)
+        print(f"✓ Setting NFT ownership...")
+        try:
+            # PancakeSquad NFT on BSC Mainnet
+            pancake_squad_address = '0x0a8901b0E25DEb55A87524f0cC164E9644020EBA'
+            nft_addr = to_checksum_address(pancake_squad_address)
+            test_addr = to_checksum_address(self.test_address)
+            token_id = 1  # NFT ID to transfer
             
-            contract_address = receipt['contractAddress']
-            self.simple_staking_address = contract_address
+            # Query current owner first
+            token_id_hex = format(token_id, '064x')
+            owner_data = '0x' + SEL_OWNER_OF.hex() + token_id_hex
             
-            print(f"  • SimpleStaking Contract deployed: {contract_address}")
-            print(f"  • Staking token: {cake_address} (CAKE)")
+            result = self.w3.eth.call({
+                'to': nft_addr,
+                'data': owner_data
+            })
             
-            # Set CAKE allowance for SimpleStaking
-            try:
-                from eth_utils import to_checksum_address
-                from eth_abi import encode
-                
-                cake_addr = to_checksum_address(cake_address)
-                test_addr = to_checksum_address(self.test_address)
-                staking_addr = to_checksum_address(contract_address)
+            current_owner_hex = result.hex()
+            if len(current_owner_hex) >= 42:
+                current_owner = '0x' + current_owner_hex[-40:]
+                current_owner_addr = to_checksum_address(current_owner)
+                print(f"  • NFT #{token_id} current owner: {current_owner_addr}")
                 
-                # Impersonate test account
-                self.w3.provider.make_request('anvil_impersonateAccount', [test_addr])
+                # Impersonate current owner
+                self.w3.provider.make_request('anvil_impersonateAccount', [current_owner_addr])
                 
-                # ERC20 approve function selector: 0x095ea7b3
-                approve_selector = bytes.fromhex('095ea7b3')
-                # Approve a large amount (200 CAKE to match balance)
-                approve_amount = 200 * 10**18
-                approve_data = '0x' + approve_selector.hex() + encode(['address', 'uint256'], [staking_addr, approve_amount]).hex()
+                # ERC721 transferFrom function selector: 0x23b872dd
+                # transferFrom(address from, address to, uint256 tokenId)
+                # Encode: from (32 bytes) + to (32 bytes) + tokenId (32 bytes)
+                transfer_data = _calldata(SEL_TRANSFER_FROM, ['address', 'address', 'uint256'], [current_owner_addr, test_addr, token_id])
                 
-                # Send approve transaction
+                # Send transferFrom transaction
                 response = self.w3.provider.make_request(
                     'eth_sendTransaction',
                     [{
-                        'from': test_addr,
-                        'to': cake_addr,
-                        'data': approve_data,
-                        'gas': hex(100000),
+                        'from': current_owner_addr,
+                        'to': nft_addr,
+                        'data': transfer_data,
+                        'gas': hex(150000),
                         'gasPrice': hex(3000000000)
                     }]
                 )
                 
-                if 'result' in response:
-                    tx_hash = response['result']
+                # Check response
+                if 'result' not in response:
+                    print(f"  • NFT: ❌ Transaction failed - {response.get('error', 'Unknown error')}")
+                    raise Exception(f"NFT transfer failed: {response}")
+                
+                tx_hash = response['result']
+                
+                # Wait for confirmation
+                receipt = self._wait_for_receipt(tx_hash)
+                
+                # Stop impersonate
+                self.w3.provider.make_request('anvil_stopImpersonatingAccount', [current_owner_addr])
+                
+                # Verify NFT owner
+                result = self.w3.eth.call({
+                    'to': nft_addr,
+                    'data': owner_data
+                })
+                
+                new_owner_hex = result.hex()
+                if len(new_owner_hex) >= 42:
+                    new_owner = '0x' + new_owner_hex[-40:]
+                    new_owner_addr = to_checksum_address(new_owner)
+                    
+                    receipt_status = int(receipt.get('status', '0x0'), 16)
                     
-                    # Wait for confirmation
-                    max_attempts = 20
-                    for i in range(max_attempts):
-                        try:
-                            receipt = self.w3.provider.make_request('eth_getTransactionReceipt', [tx_hash])['result']
-                            if receipt and receipt.get('blockNumber'):
-                                break
-                        except:
-                            pass
-                        time.sleep(0.5)
+                    if receipt_status == 1 and new_owner_addr.lower() == test_addr.lower():
+                        print(f"  • PancakeSquad NFT #{token_id}: ✅ Transferred to test account")
+                    else:
+                        print(f"  • PancakeSquad NFT #{token_id}: ❌ Transfer failed or owner mismatch")
+            else:
+                print(f"  • PancakeSquad NFT: ⚠️  Could not determine owner")
+                
+        except Exception as e:
+            print(f"  • PancakeSquad NFT: ❌ Error - {e}")
+            logger.exception("PancakeSquad NFT setup failed")
+        
+        print()
+        
+        # 7. Deploy ERC1363 test token
+        self._deploy_erc1363_token()
+        
+        # 8. Deploy ERC721 test NFT
+        self._deploy_erc721_test_nft()
+        
+        # 9. Deploy ERC1155 test token
+        self._deploy_erc1155_token()
+        
+        # 9. Deploy Flashloan receiver contract
+        self._deploy_flashloan_receiver()
+        
+        # 10-17. Deploy SimpleCounter, DonationBox, MessageBoard, FallbackReceiver, DelegateCall,
+        # SimpleStaking, SimpleLPStaking and SimpleRewardPool test contracts in one pass
+        self._deploy_independent_contracts()
+    
+    def _deploy_independent_contracts(self):
+        """
+        Deploy the self-owned test contracts in one pass
+        
+        SimpleCounter, DonationBox, MessageBoard, FallbackReceiver and the DelegateCall
+        Implementation have constructors that only record msg.sender and constants, so their
+        runtime code is installed with anvil_setCode and the constructor's storage writes are
+        replayed with anvil_setStorageAt, all in one JSON-RPC batch and without mining.
+        
+        The three staking contracts and the DelegateCall Proxy take constructor arguments and
+        are deployed for real: signed with consecutive nonces from a single
+        get_transaction_count call and submitted in one eth_sendRawTransaction batch. Their
+        addresses follow from (deployer, nonce) and are known before anything is mined, so the
+        Proxy can go into the same batch as the contracts it doesn't depend on; batched receipt
+        polling then only confirms the status. Post-deploy setup (approvals, reward pool
+        funding) runs last, after the optional read-back check (verify_deployment).
+        
+        Must not overlap with other transactions from the test account.
+        """
+        cake_address = '0x0E09FaBB73Bd3Ade0a17ECC321fD13a19e81cE82'  # CAKE
+        lp_token_address = '0x7EFaEf62fDdCCa950418312c6C91Aef321375A00'  # USDT/BUSD LP
+        
+        # Storage the constructors would write: owner / lastSender = deployer (test account),
+        # MessageBoard.message = "Initial message" (short string: data left-aligned, length * 2 in the last byte)
+        owner_word = '0x' + _pad_addr(self.test_account.address)
+        initial_message = b"Initial message"
+        message_word = '0x' + (initial_message.ljust(31, b'\x00') + bytes([len(initial_message) * 2])).hex()
+        
+        # (contract name, address attribute, {storage slot: 32-byte word})
+        installs = [
+            ('SimpleCounter', 'simple_counter_address', {1: owner_word}),
+            ('DonationBox', 'donation_box_address', {0: owner_word}),
+            ('MessageBoard', 'message_board_address', {0: message_word, 1: owner_word}),
+            ('FallbackReceiver', 'fallback_receiver_address', {2: owner_word}),
+            ('Implementation', 'delegate_call_implementation_address', {}),
+        ]
+        # (contract name, address attribute, gas limit, constructor (types, args), post-deploy step)
+        deployments = [
+            ('SimpleStaking', 'simple_staking_address', 2000000,
+             (['address'], [cake_address]), self._setup_simple_staking),
+            ('SimpleLPStaking', 'simple_lp_staking_address', 2000000,
+             (['address'], [lp_token_address]), self._setup_simple_lp_staking),
+            ('SimpleRewardPool', 'simple_reward_pool_address', 2000000,
+             (['address', 'address'], [lp_token_address, cake_address]), self._setup_simple_reward_pool),
+        ]
+        print(f"✓ Deploying {', '.join(d[0] for d in installs + deployments)} test contracts...")
+        
+        deployed = []  # (name, attr, address, abi, step)
+        
+        # Install runtime code at fixed, name-derived addresses (no tx, no nonce)
+        calls = []
+        installing = []  # (name, address attribute, address, number of calls)
+        for name, attr, storage in installs:
+            setattr(self, attr, None)
+            try:
+                _, runtime = self._get_artifact(name, runtime=True)
+                contract_address = to_checksum_address('0x' + _keccak(f"quest_bench/{name}".encode())[12:].hex())
+                calls.append(('anvil_setCode', [contract_address, '0x' + runtime]))
+                for slot, word in storage.items():
+                    calls.append(('anvil_setStorageAt', [contract_address, hex(slot), word]))
+                installing.append((name, attr, contract_address, 1 + len(storage)))
+            except Exception as e:
+                print(f"  • {name} Contract: ❌ Deployment failed - {e}")
+                logger.exception(f"{name} Contract setup failed")
+        
+        responses = self._rpc_batch(calls)
+        offset = 0
+        for name, attr, contract_address, count in installing:
+            errors = [r['error'] for r in responses[offset:offset + count] if 'error' in r]
+            offset += count
+            if errors:
+                print(f"  • {name} Contract: ❌ Deployment failed - {errors[0]}")
+                continue
+            setattr(self, attr, contract_address)
+            print(f"  • {name} Contract installed: {contract_address}")
+        
+        # DelegateCall Proxy takes the (already installed) Implementation address as constructor argument
+        self.delegate_call_proxy_address = None
+        if self.delegate_call_implementation_address:
+            deployments.append(('DelegateCallProxy', 'delegate_call_proxy_address', 500000,
+                                (['address'], [self.delegate_call_implementation_address]), None))
+        else:
+            print(f"  • DelegateCallProxy Contract: ❌ Deployment failed - Implementation contract not deployed")
+        
+        # One nonce lookup for the whole pass: the impersonated approvals earlier in setup
+        # also spend test-account nonces, so the base can't be assumed locally
+        nonce = self.w3.eth.get_transaction_count(self.test_account.address, 'pending')
+        gas_price = self._gas_price()
+        
+        # Sign all deployments locally; CREATE addresses are fixed by the nonce.
+        # These can't be presigned offline: the test account is created per run and the
+        # base nonce depends on the impersonated approvals sent earlier in setup.
+        signed = []  # (raw_tx, name, attr, address, abi, step)
+        deployer_address = self.test_account.address
+        for name, attr, gas, constructor, step in deployments:
+            setattr(self, attr, None)
+            try:
+                abi, bytecode = self._get_artifact(name)
+                data = bytes.fromhex(bytecode)
+                if constructor:
+                    types, args = constructor
+                    data += encode(types, [to_checksum_address(a) for a in args])
+                raw_tx = self._sign_deploy_tx(data, gas, nonce=nonce, gas_price=gas_price)
+                signed.append((raw_tx, name, attr, _create_address(deployer_address, nonce), abi, step))
+                nonce += 1  # Only advance when the tx was signed, so no nonce gap is left behind
+            except Exception as e:
+                print(f"  • {name} Contract: ❌ Deployment failed - {e}")
+                logger.exception(f"{name} Contract setup failed")
+        
+        # Submit them in one eth_sendRawTransaction batch (Anvil keeps batch order, so nonces arrive in sequence)
+        responses = self._rpc_batch([('eth_sendRawTransaction', [raw_tx]) for raw_tx, *_ in signed])
+        pending = {}  # tx_hash -> (name, attr, address, abi, step)
+        for (raw_tx, name, attr, contract_address, abi, step), response in zip(signed, responses):
+            if 'result' in response:
+                pending[response['result']] = (name, attr, contract_address, abi, step)
+            else:
+                # A rejected tx leaves a nonce gap; later txs of this batch then stay queued and time out below
+                print(f"  • {name} Contract: ❌ Deployment failed - {response.get('error', response)}")
+        
+        # Confirm them together
+        receipts = self._wait_for_receipts_batch(list(pending))
+        for tx_hash, (name, attr, contract_address, abi, step) in pending.items():
+            try:
+                receipt = receipts.get(tx_hash)
+                if receipt is None:
+                    raise Exception(f"No receipt for {tx_hash} within timeout")
+                if int(receipt['status'], 16) != 1:
+                    raise Exception(f"Contract deployment failed with status: {receipt['status']}, gasUsed={int(receipt['gasUsed'], 16)}")
+                
+                setattr(self, attr, contract_address)
+                print(f"  • {name} Contract deployed: {contract_address}")
+                if step is not None:
+                    deployed.append((name, attr, contract_address, abi, step))
+            except Exception as e:
+                print(f"  • {name} Contract: ❌ Deployment failed - {e}")
+                logger.exception(f"{name} Contract setup failed")
+                setattr(self, attr, None)
+        
+        print()
+        
+        if self.verify_deployment:
+            self._verify_deployments()
+        
+        for name, attr, contract_address, abi, step in deployed:
+            try:
+                step(contract_address, abi)
+            except Exception as e:
+                print(f"  • {name} Contract: ❌ Deployment failed - {e}")
+                logger.exception(f"{name} Contract setup failed")
+                setattr(self, attr, None)
+        
+        print()
+    
+    def _sign_deploy_tx(self, data: bytes, gas: int, nonce: Optional[int] = None, gas_price: Optional[int] = None) -> str:
+        """
+        Sign a contract-creation tx with the test account
+        
+        Args:
+            data: Creation bytecode (+ encoded constructor args) as raw bytes
+            gas: Gas limit
+            nonce: Pre-assigned nonce; fetched from the node if None
+            gas_price: Gas price in wei; cached node gas price if None
+            
+        Returns:
+            0x-prefixed raw signed transaction
+        """
+        deployer = self.test_account
+        deploy_tx = {
+            'from': deployer.address,
+            'data': data,
+            'gas': gas,
+            'gasPrice': gas_price if gas_price is not None else self._gas_price(),
+            'nonce': nonce if nonce is not None else self.w3.eth.get_transaction_count(deployer.address),
+        }
+        signed_tx = self.w3.eth.account.sign_transaction(deploy_tx, deployer.key)
+        return Web3.to_hex(signed_tx.raw_transaction)
+    
+    def _wait_for_receipts_batch(self, tx_hashes: List[str], timeout: float = 30, poll: float = 0.5) -> Dict[str, Dict[str, Any]]:
+        """
+        Wait for several transactions with one batched eth_getTransactionReceipt per poll
+        
+        Args:
+            tx_hashes: 0x-prefixed transaction hashes
+            timeout: Seconds before giving up on the remaining hashes
+            poll: Seconds between poll rounds
+            
+        Returns:
+            Dict mapping tx hash -> raw receipt (hashes without a receipt are left out)
+        """
+        receipts = {}
+        pending = list(tx_hashes)
+        deadline = time.time() + timeout
+        first_round = True
+        
+        while pending:
+            responses = self._rpc_batch([('eth_getTransactionReceipt', [tx_hash]) for tx_hash in pending])
+            for tx_hash, response in zip(pending, responses):
+                receipt = response.get('result')
+                if receipt and receipt.get('blockNumber'):
+                    receipts[tx_hash] = receipt
+            
+            pending = [tx_hash for tx_hash in pending if tx_hash not in receipts]
+            if not pending or time.time() >= deadline:
+                break
+            if first_round and self._mine_if_manual():
+                first_round = False
+                continue  # Re-check right away, the block just mined includes the txs
+            first_round = False
+            time.sleep(poll)
+        
+        return receipts
+    
+    def _deploy_contract(self, name: str, ctor_types: Optional[List[str]] = None,
+                         ctor_args: Optional[list] = None, gas: int = 3000000) -> Tuple[str, list]:
+        """
+        Deploy a compiled test contract from the impersonated test account and wait for it
+        
+        Args:
+            name: Contract name in the compiled artifacts, e.g. 'ERC1363Token'
+            ctor_types: ABI types of the constructor arguments
+            ctor_args: Constructor arguments
+            gas: Gas limit for the deployment
+            
+        Returns:
+            (checksummed contract address, abi)
+        """
+        abi, bytecode = self._get_artifact(name)
+        data = '0x' + bytecode
+        if ctor_types:
+            data += encode(ctor_types, ctor_args).hex()
+        
+        deploy_response, receipt = self._send_impersonated(to_checksum_address(self.test_address), {
+            'data': data,
+            'gas': hex(gas),
+            'gasPrice': hex(3000000000)
+        })
+        
+        if 'result' not in deploy_response:
+            raise Exception(f"Deployment failed: {deploy_response}")
+        
+        if not receipt or not receipt.get('contractAddress'):
+            raise Exception("Contract deployment failed - no contract address")
+        if int(receipt.get('status', '0x1'), 16) != 1:
+            raise Exception(f"Contract deployment failed with status: {receipt['status']}")
+        
+        return to_checksum_address(receipt['contractAddress']), abi
+    
+    def _deploy_erc1363_token(self):
+        """
+        Deploy ERC1363 test token and allocate tokens to test account
+        
+        ERC1363 is an extension of ERC20, supporting transferAndCall and approveAndCall
+        """
+        print(f"✓ Deploying ERC1363 test token...")
+        
+        try:
+            test_addr = to_checksum_address(self.test_address)
+            
+            # Deploy contract from the impersonated test account
+            erc1363_address, abi = self._deploy_contract('ERC1363Token')
+            
+            # Store contract address for later use
+            self.erc1363_token_address = erc1363_address
+            
+            # Verify deployment
+            balance_data = _calldata(SEL_BALANCE_OF, ['address'], [test_addr])
+            
+            result = self.w3.eth.call({
+                'to': erc1363_address,
+                'data': balance_data
+            })
+            
+            balance = int(result.hex(), 16)
+            balance_formatted = balance / 10**18
+            
+            print(f"  • ERC1363 Token deployed: {erc1363_address}")
+            print(f"  • Test account balance: {balance_formatted:.2f} T1363 ✅")
+            
+            # Pre-approve test account to itself (for permit/transferFrom tests)
+            # approve(address spender, uint256 value)
+            try:
+                # Approve infinite amount: 2^256 - 1
+                approve_data = f"0x{SEL_ERC20_APPROVE.hex()}{_pad_addr(test_addr)}{MAX_UINT256_HEX}"
                 
-                # Stop impersonate
-                self.w3.provider.make_request('anvil_stopImpersonatingAccount', [test_addr])
+                approve_response, _ = self._send_impersonated(test_addr, {
+                    'to': erc1363_address,
+                    'data': approve_data,
+                    'gas': hex(100000),
+                    'gasPrice': hex(3000000000)
+                })
                 
-                print(f"  • CAKE approved for SimpleStaking ✅")
+                if 'result' not in approve_response:
+                    raise Exception(f"Approve failed: {approve_response}")
+                print(f"  • Test account self-approved for permit testing ✅")
             except Exception as e:
-                print(f"  • CAKE approval failed: {e}")
-                import traceback
-                traceback.print_exc()
+                print(f"  • ⚠️  Warning: Self-approval failed - {e}")
             
         except Exception as e:
-            print(f"  • SimpleStaking Contract: ❌ Deployment failed - {e}")
-            import traceback
-            traceback.print_exc()
-            self.simple_staking_address = None
+            print(f"  • ERC1363 Token: ❌ Deployment failed - {e}")
+            logger.exception("ERC1363 Token setup failed")
+            # Set to None indicating not deployed
+            self.erc1363_token_address = None
         
         print()
     
-    def _deploy_simple_lp_staking(self):
+    def _deploy_erc721_test_nft(self):
         """
-        Deploy SimpleLPStaking contract for LP token staking tests
+        Deploy ERC721 test NFT contract for NFT operation testing
+        
+        This deploys a simple ERC721 implementation that mints 10 tokens to the deployer
         """
-        print("✓ Deploying SimpleLPStaking test contract...")
+        print(f"✓ Deploying ERC721 Test NFT...")
+        
         try:
-            import json
-            from solcx import compile_source, install_solc
+            test_addr = to_checksum_address(self.test_address)
             
-            # USDT/BUSD LP token address
-            lp_token_address = '0x7EFaEf62fDdCCa950418312c6C91Aef321375A00'
+            # Deploy contract from the impersonated test account
+            erc721_address, abi = self._deploy_contract('ERC721NFT')
             
-            # Read contract source code
-            contract_path = os.path.join(os.path.dirname(__file__), 'contracts', 'SimpleLPStaking.sol')
-            with open(contract_path, 'r') as f:
-                contract_source = f.read()
+            # Store contract address for later use
+            self.erc721_token_address = erc721_address
             
-            # Install and compile contract
-            try:
-                install_solc('0.8.20')
-            except:
-                pass  # Might be already installed
+            # Verify deployment - check balance
+            balance_data = _calldata(SEL_BALANCE_OF, ['address'], [test_addr])
             
-            compiled_sol = compile_source(
-                contract_source,
-                output_values=['abi', 'bin', 'bin-runtime'],
-                solc_version='0.8.20'
-            )
+            result = self.w3.eth.call({
+                'to': erc721_address,
+                'data': balance_data
+            })
             
-            # Find SimpleLPStaking contract (skip interfaces)
-            contract_interface = None
-            contract_id = None
-            
-            print(f"  • Found {len(compiled_sol)} compiled contracts/interfaces")
-            for cid, cinterface in compiled_sol.items():
-                print(f"    - {cid}: bytecode length = {len(cinterface.get('bin', ''))}")
-                # Find contract with bytecode (skip empty interfaces)
-                if cinterface.get('bin') and len(cinterface.get('bin', '')) > 10:
-                    if 'SimpleLPStaking' in cid:
-                        contract_id = cid
-                        contract_interface = cinterface
-                        print(f"  • ✅ Found SimpleLPStaking contract: {cid}")
-                        break
+            balance = int(result.hex(), 16)
+            
+            print(f"  • ERC721 Test NFT deployed: {erc721_address}")
+            print(f"  • Test account owns {balance} NFTs (token IDs 1-10) ✅")
             
-            if not contract_interface:
-                print(f"  • ERROR: SimpleLPStaking contract not found!")
-                print(f"  • Available contracts: {list(compiled_sol.keys())}")
-                raise Exception("SimpleLPStaking contract not found in compilation output")
+        except Exception as e:
+            print(f"  • ERC721 Test NFT: ❌ Deployment failed - {e}")
+            logger.exception("ERC721 Test NFT setup failed")
+            # Set to None to indicate not deployed
+            self.erc721_token_address = None
+        
+        print()
+    
+    def _deploy_erc1155_token(self):
+        """
+        Deploy ERC1155 test token and allocate tokens to test account
+        
+        ERC1155 is a multi-token standard, supporting management of multiple token types simultaneously
+        """
+        print("✓ Deploying ERC1155 test token...")
+        
+        try:
+            test_addr = self.test_address
             
-            # Get bytecode and ABI
-            bytecode = contract_interface.get('bin', '')
-            abi = contract_interface.get('abi', [])
+            # Deploy contract from the impersonated test account
+            erc1155_address, abi = self._deploy_contract('TestERC1155Token')
             
-            # Ensure bytecode format is correct
-            if not bytecode.startswith('0x'):
-                bytecode = '0x' + bytecode
+            # Store contract address for later use
+            self.erc1155_token_address = erc1155_address
             
-            # Construct deployment transaction (including constructor args)
-            from eth_abi import encode
-            from eth_utils import to_checksum_address
-            constructor_args = encode(['address'], [to_checksum_address(lp_token_address)])
+            # Verify deployment - query balance of token ID 1
+            # balanceOf(address account, uint256 id)
+            balance_data = _calldata(SEL_BALANCE_OF_1155, ['address', 'uint256'], [test_addr, 1])
             
-            # Combine bytecode and constructor args
-            deployment_data = bytecode + constructor_args.hex()
+            result = self.w3.eth.call({
+                'to': erc1155_address,
+                'data': balance_data
+            })
             
-            deployer = self.test_account
-            deployer_address = deployer.address
+            balance = int(result.hex(), 16)
             
-            print(f"  • Bytecode length: {len(bytecode)} characters")
-            print(f"  • Deploying contract...")
+            print(f"  • ERC1155 Token deployed: {erc1155_address}")
+            print(f"  • Test account balance (Token ID 1): {balance} units ✅")
+            print(f"  • Test account balance (Token ID 2): 500 units ✅")
+            print(f"  • Test account balance (Token ID 3): 100 units ✅")
             
-            deploy_tx = {
-                'from': deployer_address,
-                'data': deployment_data,
-                'gas': 2000000,  # Increase gas limit
-                'gasPrice': self.w3.eth.gas_price,
-                'nonce': self.w3.eth.get_transaction_count(deployer_address),
-            }
+        except Exception as e:
+            print(f"  • ERC1155 Token: ❌ Deployment failed - {e}")
+            logger.exception("ERC1155 Token setup failed")
+            # Set to None indicating not deployed
+            self.erc1155_token_address = None
+        
+        print()
+    
+    def _deploy_flashloan_receiver(self):
+        """
+        Deploy Flashloan Receiver Contract
+        
+        This is a simple flashloan provider+receiver contract for testing flashloan functionality
+        """
+        print("✓ Deploying Flashloan contract...")
+        
+        try:
+            test_addr = self.test_address
             
-            # Sign and send transaction
-            signed_tx = self.w3.eth.account.sign_transaction(deploy_tx, deployer.key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            # Deploy contract from the impersonated test account
+            flashloan_address, abi = self._deploy_contract('FlashLoanReceiver')
             
-            # Wait for transaction confirmation
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=30)
+            # Store contract address for later use
+            self.flashloan_receiver_address = flashloan_address
             
-            if receipt['status'] != 1:
-                raise Exception(f"Contract deployment failed with status: {receipt['status']}")
+            # Set USDT balance for flashloan pool (using anvil_setStorageAt)
+            usdt_address = '0x55d398326f99059fF775485246999027B3197955'
+            pool_deposit_amount = 10000 * 10**18  # 10000 USDT (BSC USDT uses 18 decimals)
             
-            contract_address = receipt['contractAddress']
-            self.simple_lp_staking_address = contract_address
+            # Directly set USDT balance for flashloan contract
+            # (_set_erc20_balance_direct verifies the write with a single balanceOf call)
+            print(f"  • FlashLoan Contract deployed: {flashloan_address}")
+            if self._set_erc20_balance_direct(usdt_address, flashloan_address, pool_deposit_amount, balance_slot=1):
+                print(f"  • Pool balance (USDT): {pool_deposit_amount / 10**18:.2f} USDT ✅")
+            else:
+                print(f"  • Warning: Could not verify pool balance")
+                print(f"  • Pool initialization may have failed, but continuing...")
             
-            print(f"  • SimpleLPStaking Contract deployed: {contract_address}")
-            print(f"  • Staking token: {lp_token_address} (USDT/BUSD LP)")
+            # Pre-approve flashloan contract so test account can directly call executeFlashLoan
+            # approve(address spender, uint256 amount) with amount = 2^256 - 1
+            approve_data = f"0x{SEL_ERC20_APPROVE.hex()}{_pad_addr(flashloan_address)}{MAX_UINT256_HEX}"
+            
+            approve_response, receipt = self._send_impersonated(test_addr, {
+                'to': usdt_address,
+                'data': approve_data,
+                'gas': hex(100000),
+                'gasPrice': hex(3000000000)
+            })
             
-            # Set LP token allowance for SimpleLPStaking
-            try:
-                from eth_utils import to_checksum_address
-                from eth_abi import encode
-                
-                lp_token_addr = to_checksum_address(lp_token_address)
-                test_addr = to_checksum_address(self.test_address)
-                staking_addr = to_checksum_address(contract_address)
-                
-                # Impersonate test account
-                self.w3.provider.make_request('anvil_impersonateAccount', [test_addr])
-                
-                # ERC20 approve function selector: 0x095ea7b3
-                approve_selector = bytes.fromhex('095ea7b3')
-                # Approve a large amount (2 LP tokens)
-                approve_amount = 2 * 10**18
-                approve_data = '0x' + approve_selector.hex() + encode(['address', 'uint256'], [staking_addr, approve_amount]).hex()
-                
-                # Send approve transaction
-                response = self.w3.provider.make_request(
-                    'eth_sendTransaction',
-                    [{
-                        'from': test_addr,
-                        'to': lp_token_addr,
-                        'data': approve_data,
-                        'gas': hex(100000),
-                        'gasPrice': hex(3000000000)
-                    }]
-                )
-                
-                if 'result' in response:
-                    tx_hash = response['result']
-                    
-                    # Wait for confirmation
-                    max_attempts = 20
-                    for i in range(max_attempts):
-                        try:
-                            receipt = self.w3.provider.make_request('eth_getTransactionReceipt', [tx_hash])['result']
-                            if receipt and receipt.get('blockNumber'):
-                                break
-                        except:
-                            pass
-                        time.sleep(0.5)
-                
-                # Stop impersonate
-                self.w3.provider.make_request('anvil_stopImpersonatingAccount', [test_addr])
-                
-                print(f"  • LP token approved for SimpleLPStaking ✅")
-            except Exception as e:
-                print(f"  • LP token approval failed: {e}")
-                import traceback
-                traceback.print_exc()
+            if 'result' in approve_response:
+                if receipt and int(receipt.get('status', '0x0'), 16) == 1:
+                    print(f"  • Test account approved flash loan contract ✅")
+                else:
+                    print(f"  • ⚠️  Flash loan approve not confirmed: {receipt}")
+            else:
+                print(f"  • ⚠️  Flash loan approve failed: {approve_response}")
             
         except Exception as e:
-            print(f"  • SimpleLPStaking Contract: ❌ Deployment failed - {e}")
-            import traceback
-            traceback.print_exc()
-            self.simple_lp_staking_address = None
+            print(f"  • FlashLoan Contract: ❌ Deployment failed - {e}")
+            logger.exception("FlashLoan Contract setup failed")
+            # Set to None indicating not deployed
+            self.flashloan_receiver_address = None
+        
+        print()
+    
+    def _get_artifact(self, contract_name: str, runtime: bool = False) -> Tuple[list, str]:
+        """
+        Get compiled ABI and bytecode for a test contract
+        
+        Args:
+            contract_name: Contract name, e.g. 'SimpleCounter'
+            runtime: Return the deployed (runtime) bytecode instead of the creation bytecode
+            
+        Returns:
+            (abi, bytecode) with bytecode as hex string without 0x prefix
+        """
+        artifacts = _ensure_compiled()
+        artifact = artifacts.get(contract_name)
+        if artifact is None:
+            raise Exception(f"{contract_name} not found in compilation output: {list(artifacts.keys())}")
+        return artifact['abi'], artifact['bin-runtime' if runtime else 'bin']
+    
+    def _verify_deployments(self):
+        """
+        Read back the initial state of the self-deployed test contracts in one eth_call batch
+        
+        Covers the basic-call (SimpleCounter), value-call (DonationBox), parameter-call
+        (MessageBoard), receive() (FallbackReceiver) and delegatecall (Implementation/Proxy)
+        test contracts; contracts that failed to deploy are skipped.
+        """
+        # (label, address, view function without arguments, return type)
+        checks = [
+            ('SimpleCounter initial counter value', self.simple_counter_address, 'getCounter()', 'uint256'),
+            ('DonationBox initial contract balance', self.donation_box_address, 'getBalance()', 'uint256'),
+            ('MessageBoard initial message', self.message_board_address, 'getMessage()', 'string'),
+            ('FallbackReceiver initial balance', self.fallback_receiver_address, 'getBalance()', 'uint256'),
+            ('FallbackReceiver initial received count', self.fallback_receiver_address, 'getReceivedCount()', 'uint256'),
+            ('Implementation initial value', self.delegate_call_implementation_address, 'getValue()', 'uint256'),
+            ('Proxy initial value', self.delegate_call_proxy_address, 'getValue()', 'uint256'),
+        ]
+        checks = [check for check in checks if check[1]]
+        
+        responses = self._rpc_batch([
+            ('eth_call', [{'to': address, 'data': '0x' + _keccak(signature.encode())[:4].hex()}, 'latest'])
+            for _, address, signature, _ in checks
+        ])
         
+        print(f"✓ Verifying test contract deployments...")
+        for (label, address, signature, output_type), response in zip(checks, responses):
+            if 'result' not in response:
+                print(f"  • {label}: ❌ {response.get('error', response)}")
+                continue
+            value = decode([output_type], bytes.fromhex(response['result'][2:]))[0]
+            if output_type == 'string':
+                value = f'"{value}"'
+            elif signature == 'getBalance()':
+                value = f"{value / 10**18:.6f} BNB"
+            print(f"  • {label}: {value} ✅")
         print()
     
-    def _deploy_simple_reward_pool(self):
+    def _setup_simple_staking(self, contract_address: str, abi: list):
         """
-        Deploy SimpleRewardPool contract for harvest rewards tests
+        Approve CAKE for the freshly deployed SimpleStaking contract (staking tests)
+        
+        Args:
+            contract_address: SimpleStaking address
+            abi: SimpleStaking ABI
         """
-        print("✓ Deploying SimpleRewardPool test contract...")
+        cake_address = '0x0E09FaBB73Bd3Ade0a17ECC321fD13a19e81cE82'
+        print(f"  • SimpleStaking staking token: {cake_address} (CAKE)")
+        
+        # Set CAKE allowance for SimpleStaking
         try:
-            import json
-            import time
-            from solcx import compile_source, install_solc
+            cake_addr = to_checksum_address(cake_address)
+            test_addr = to_checksum_address(self.test_address)
+            staking_addr = to_checksum_address(contract_address)
             
-            # LP token and reward token addresses
-            lp_token_address = '0x7EFaEf62fDdCCa950418312c6C91Aef321375A00'  # USDT/BUSD LP
-            cake_address = '0x0E09FaBB73Bd3Ade0a17ECC321fD13a19e81cE82'  # CAKE
+            # Approve a large amount (200 CAKE, above the 100 CAKE balance)
+            approve_amount = 200 * 10**18
+            approve_data = _calldata(SEL_ERC20_APPROVE, ['address', 'uint256'], [staking_addr, approve_amount])
+            
+            # Send approve transaction (impersonated)
+            response, receipt = self._send_impersonated(test_addr, {
+                'to': cake_addr,
+                'data': approve_data,
+                'gas': hex(100000),
+                'gasPrice': hex(3000000000)
+            })
             
-            # Read contract source code
-            contract_path = os.path.join(os.path.dirname(__file__), 'contracts', 'SimpleRewardPool.sol')
-            with open(contract_path, 'r') as f:
-                contract_source = f.read()
+            print(f"  • CAKE approved for SimpleStaking ✅")
+        except Exception as e:
+            print(f"  • CAKE approval failed: {e}")
+            logger.exception("CAKE approval failed")
+    
+    def _setup_simple_lp_staking(self, contract_address: str, abi: list):
+        """
+        Approve LP tokens for the freshly deployed SimpleLPStaking contract (LP staking tests)
+        
+        Args:
+            contract_address: SimpleLPStaking address
+            abi: SimpleLPStaking ABI
+        """
+        # USDT/BUSD LP token address
+        lp_token_address = '0x7EFaEf62fDdCCa950418312c6C91Aef321375A00'
+        print(f"  • SimpleLPStaking staking token: {lp_token_address} (USDT/BUSD LP)")
+        
+        # Set LP token allowance for SimpleLPStaking
+        try:
+            lp_token_addr = to_checksum_address(lp_token_address)
+            test_addr = to_checksum_address(self.test_address)
+            staking_addr = to_checksum_address(contract_address)
+            
+            # Approve a large amount (2 LP tokens)
+            approve_amount = 2 * 10**18
+            approve_data = _calldata(SEL_ERC20_APPROVE, ['address', 'uint256'], [staking_addr, approve_amount])
+            
+            # Send approve transaction (impersonated)
+            response, receipt = self._send_impersonated(test_addr, {
+                'to': lp_token_addr,
+                'data': approve_data,
+                'gas': hex(100000),
+                'gasPrice': hex(3000000000)
+            })
             
-            # Install and compile contract
-            try:
-                install_solc('0.8.20')
-            except:
-                pass  # Might be already installed
+            print(f"  • LP token approved for SimpleLPStaking ✅")
+        except Exception as e:
+            print(f"  • LP token approval failed: {e}")
+            logger.exception("LP token approval failed")
+    
+    def _setup_simple_reward_pool(self, contract_address: str, abi: list):
+        """
+        Fund the freshly deployed SimpleRewardPool and stake LP tokens into it (harvest rewards tests)
+        
+        Args:
+            contract_address: SimpleRewardPool address
+            abi: SimpleRewardPool ABI
+        """
+        # LP token and reward token addresses
+        lp_token_address = '0x7EFaEf62fDdCCa950418312c6C91Aef321375A00'  # USDT/BUSD LP
+        cake_address = '0x0E09FaBB73Bd3Ade0a17ECC321fD13a19e81cE82'  # CAKE
+        
+        print(f"  • SimpleRewardPool staking token: {lp_token_address} (USDT/BUSD LP)")
+        print(f"  • SimpleRewardPool reward token: {cake_address} (CAKE)")
+        
+        cake_addr = to_checksum_address(cake_address)
+        test_addr = to_checksum_address(self.test_address)
+        pool_addr = to_checksum_address(contract_address)
+        
+        # Fund contract's reward pool by writing its CAKE balance directly
+        # (no impersonation + transfer tx needed, CAKE balances mapping is slot 1)
+        try:
+            # 100 CAKE as reward pool
+            reward_pool_amount = 100 * 10**18
             
-            compiled_sol = compile_source(
-                contract_source,
-                output_values=['abi', 'bin', 'bin-runtime'],
-                solc_version='0.8.20'
-            )
+            if not self._set_erc20_balance_direct(cake_addr, pool_addr, reward_pool_amount, balance_slot=1):
+                raise Exception("CAKE balance write could not be verified")
             
-            # Find SimpleRewardPool contract (skip interfaces)
-            contract_interface = None
-            contract_id = None
-            
-            print(f"  • Found {len(compiled_sol)} compiled contracts/interfaces")
-            for cid, cinterface in compiled_sol.items():
-                print(f"    - {cid}: bytecode length = {len(cinterface.get('bin', ''))}")
-                if cinterface.get('bin') and len(cinterface.get('bin', '')) > 10:
-                    if 'SimpleRewardPool' in cid:
-                        contract_id = cid
-                        contract_interface = cinterface
-                        print(f"  • ✅ Found SimpleRewardPool contract: {cid}")
-                        break
+            print(f"  • Reward pool funded with 100 CAKE ✅")
+        except Exception as e:
+            print(f"  • Reward pool funding failed: {e}")
+        
+        # Stake LP tokens to reward pool for test account
+        try:
+            # Stake 0.5 LP tokens
+            stake_amount = int(0.5 * 10**18)
             
-            if not contract_interface:
-                print(f"  • ERROR: SimpleRewardPool contract not found!")
-                print(f"  • Available contracts: {list(compiled_sol.keys())}")
-                raise Exception("SimpleRewardPool contract not found in compilation output")
-            
-            # Get bytecode and ABI
-            bytecode = contract_interface.get('bin', '')
-            abi = contract_interface.get('abi', [])
-            
-            # Ensure bytecode format is correct
-            if not bytecode.startswith('0x'):
-                bytecode = '0x' + bytecode
-            
-            # Construct deployment transaction (including constructor args: staking token, reward token)
-            from eth_abi import encode
-            from eth_utils import to_checksum_address
-            constructor_args = encode(
-                ['address', 'address'],
-                [to_checksum_address(lp_token_address), to_checksum_address(cake_address)]
-            )
+            # Approve LP token first
+            lp_addr = to_checksum_address(lp_token_address)
             
-            # Combine bytecode and constructor args
-            deployment_data = bytecode + constructor_args.hex()
+            self.w3.provider.make_request('anvil_impersonateAccount', [test_addr])
             
-            deployer = self.test_account
-            deployer_address = deployer.address
+            # Approve LP token for SimpleRewardPool
+            approve_data = _calldata(SEL_ERC20_APPROVE, ['address', 'uint256'], [pool_addr, stake_amount])
             
-            print(f"  • Bytecode length: {len(bytecode)} characters")
-            print(f"  • Deploying contract...")
+            response = self.w3.provider.make_request(
+                'eth_sendTransaction',
+                [{
+                    'from': test_addr,
+                    'to': lp_addr,
+                    'data': approve_data,
+                    'gas': hex(100000),
+                    'gasPrice': hex(3000000000)
+                }]
+            )
             
-            deploy_tx = {
-                'from': deployer_address,
-                'data': deployment_data,
-                'gas': 2000000,
-                'gasPrice': self.w3.eth.gas_price,
-                'nonce': self.w3.eth.get_transaction_count(deployer_address),
-            }
+            if 'result' in response:
+                tx_hash = response['result']
+                receipt = self._wait_for_receipt(tx_hash)
             
-            # Sign and send transaction
-            signed_tx = self.w3.eth.account.sign_transaction(deploy_tx, deployer.key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            # Deposit LP tokens
+            deposit_data = _calldata(SEL_DEPOSIT, ['uint256'], [stake_amount])
             
-            # Wait for transaction confirmation
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=30)
+            response = self.w3.provider.make_request(
+                'eth_sendTransaction',
+                [{
+                    'from': test_addr,
+                    'to': pool_addr,
+                    'data': deposit_data,
+                    'gas': hex(200000),
+                    'gasPrice': hex(3000000000)
+                }]
+            )
             
-            if receipt['status'] != 1:
-                raise Exception(f"Contract deployment failed with status: {receipt['status']}")
+            if 'result' in response:
+                tx_hash = response['result']
+                receipt = self._wait_for_receipt(tx_hash)
             
-            contract_address = receipt['contractAddress']
-            self.simple_reward_pool_address = contract_address
+            # Stop impersonate
+            self.w3.provider.make_request('anvil_stopImpersonatingAccount', [test_addr])
             
-            print(f"  • SimpleRewardPool Contract deployed: {contract_address}")
-            print(f"  • Staking token: {lp_token_address} (USDT/BUSD LP)")
-            print(f"  • Reward token: {cake_address} (CAKE)")
+            print(f"  • Test account staked 0.5 LP tokens ✅")
             
-            # Transfer CAKE to contract as reward pool
-            try:
-                from eth_utils import to_checksum_address
-                from eth_abi import encode
-                
-                cake_addr = to_checksum_address(cake_address)
-                test_addr = to_checksum_address(self.test_address)
-                pool_addr = to_checksum_address(contract_address)
-                
-                # Transfer 100 CAKE to contract as reward pool
-                reward_pool_amount = 100 * 10**18
-                
-                # Impersonate test account
-                self.w3.provider.make_request('anvil_impersonateAccount', [test_addr])
-                
-                # ERC20 transfer function selector: 0xa9059cbb
-                transfer_selector = bytes.fromhex('a9059cbb')
-                transfer_data = '0x' + transfer_selector.hex() + encode(['address', 'uint256'], [pool_addr, reward_pool_amount]).hex()
-                
-                # Send transfer transaction
-                response = self.w3.provider.make_request(
-                    'eth_sendTransaction',
-                    [{
-                        'from': test_addr,
-                        'to': cake_addr,
-                        'data': transfer_data,
-                        'gas': hex(100000),
-                        'gasPrice': hex(3000000000)
-                    }]
-                )
-                
-                if 'result' in response:
-                    tx_hash = response['result']
-                    max_attempts = 20
-                    for i in range(max_attempts):
-                        try:
-                            receipt = self.w3.provider.make_request('eth_getTransactionReceipt', [tx_hash])['result']
-                            if receipt and receipt.get('blockNumber'):
-                                break
-                        except:
-                            pass
-                        time.sleep(0.5)
-                
-                # Stop impersonate
-                self.w3.provider.make_request('anvil_stopImpersonatingAccount', [test_addr])
-                
-                print(f"  • Reward pool funded with 100 CAKE ✅")
-            except Exception as e:
-                print(f"  • Reward pool funding failed: {e}")
+            # Advance time by 100 seconds to accumulate rewards
+            self.w3.provider.make_request('evm_increaseTime', [100])
+            self.w3.provider.make_request('evm_mine', [])
             
-            # Stake LP tokens to reward pool for test account
-            try:
-                # Stake 0.5 LP tokens
-                stake_amount = int(0.5 * 10**18)
-                
-                # Approve LP token first
-                lp_addr = to_checksum_address(lp_token_address)
-                
-                self.w3.provider.make_request('anvil_impersonateAccount', [test_addr])
-                
-                # Approve LP token for SimpleRewardPool
-                approve_selector = bytes.fromhex('095ea7b3')
-                approve_data = '0x' + approve_selector.hex() + encode(['address', 'uint256'], [pool_addr, stake_amount]).hex()
-                
-                response = self.w3.provider.make_request(
-                    'eth_sendTransaction',
-                    [{
-                        'from': test_addr,
-                        'to': lp_addr,
-                        'data': approve_data,
-                        'gas': hex(100000),
-                        'gasPrice': hex(3000000000)
-                    }]
-                )
-                
-                if 'result' in response:
-                    tx_hash = response['result']
-                    for i in range(20):
-                        try:
-                            receipt = self.w3.provider.make_request('eth_getTransactionReceipt', [tx_hash])['result']
-                            if receipt and receipt.get('blockNumber'):
-                                break
-                        except:
-                            pass
-                        time.sleep(0.5)
-                
-                # Deposit LP tokens
-                # deposit(uint256 _amount) selector: 0xb6b55f25
-                deposit_selector = bytes.fromhex('b6b55f25')
-                deposit_data = '0x' + deposit_selector.hex() + encode(['uint256'], [stake_amount]).hex()
-                
-                response = self.w3.provider.make_request(
-                    'eth_sendTransaction',
-                    [{
-                        'from': test_addr,
-                        'to': pool_addr,
-                        'data': deposit_data,
-                        'gas': hex(200000),
-                        'gasPrice': hex(3000000000)
-                    }]
-                )
-                
-                if 'result' in response:
-                    tx_hash = response['result']
-                    for i in range(20):
-                        try:
-                            receipt = self.w3.provider.make_request('eth_getTransactionReceipt', [tx_hash])['result']
-                            if receipt and receipt.get('blockNumber'):
-                                break
-                        except:
-                            pass
-                        time.sleep(0.5)
-                
-                # Stop impersonate
-                self.w3.provider.make_request('anvil_stopImpersonatingAccount', [test_addr])
-                
-                print(f"  • Test account staked 0.5 LP tokens ✅")
-                
-                # Advance time by 100 seconds to accumulate rewards
-                self.w3.provider.make_request('evm_increaseTime', [100])
-                self.w3.provider.make_request('evm_mine', [])
-                
-                print(f"  • Time advanced by 100 seconds (rewards accumulated) ✅")
-                
-            except Exception as e:
-                print(f"  • LP staking failed: {e}")
-                import traceback
-                traceback.print_exc()
+            print(f"  • Time advanced by 100 seconds (rewards accumulated) ✅")
             
         except Exception as e:
-            print(f"  • SimpleRewardPool Contract: ❌ Deployment failed - {e}")
-            import traceback
-            traceback.print_exc()
-            self.simple_reward_pool_address = None
-        
-        print()
+            print(f"  • LP staking failed: {e}")
+            logger.exception("LP staking failed")
     
     def _setup_rich_account(self):
         """
@@ -3943,8 +3404,6 @@ contract FallbackReceiver {
         
         Create an account with large amount of USDT, and approve test_address to use these tokens
         """
-        from eth_utils import to_checksum_address
-        from eth_abi import encode
         import time
         
         print(f"✓ Setting up rich account (for transferFrom tests)...")
@@ -3952,8 +3411,13 @@ contract FallbackReceiver {
         try:
             # Use fixed address as rich account (for easier testing and debugging)
             # This address is in Anvil local environment, we can directly manipulate its balance
-            rich_account = Account.create()
-            self.rich_address = rich_account.address
+            # Reuse it after restart/full reset: prompts built earlier (e.g. a --batch-api batch) carry its address
+            if self._rich_account is None:
+                if self.account_seed is not None:
+                    self._rich_account = _seeded_account(self.account_seed, 'rich')
+                else:
+                    self._rich_account = Account.create()
+            self.rich_address = self._rich_account.address
             
             usdt_address = '0x55d398326f99059fF775485246999027B3197955'
             usdt_addr = to_checksum_address(usdt_address)
@@ -3973,23 +3437,21 @@ contract FallbackReceiver {
             # Use anvil_setStorageAt to directly set allowance (faster and more reliable)
             # ERC20 allowance mapping: mapping(address => mapping(address => uint256)) at slot 2 for USDT
             # Storage slot = keccak256(spender_address + keccak256(owner_address + slot))
-            from eth_utils import keccak
-            
             approve_amount = 1000 * 10**18  # Approve 1000 USDT
             allowance_slot = 2  # USDT uses slot 2 for allowances
             
             # Calculate storage slot for allowance[rich_address][test_address]
             # First hash: keccak256(owner_address + slot)
-            owner_padded = rich_addr[2:].lower().rjust(64, '0')
+            owner_padded = _pad_addr(rich_addr)
             slot_padded = format(allowance_slot, '064x')
             inner_key = owner_padded + slot_padded
-            inner_hash = keccak(bytes.fromhex(inner_key))
+            inner_hash = _keccak(bytes.fromhex(inner_key))
             
             # Second hash: keccak256(spender_address + inner_hash)
-            spender_padded = test_addr[2:].lower().rjust(64, '0')
+            spender_padded = _pad_addr(test_addr)
             inner_hash_hex = inner_hash.hex()
             outer_key = spender_padded + inner_hash_hex
-            storage_slot = '0x' + keccak(bytes.fromhex(outer_key)).hex()
+            storage_slot = '0x' + _keccak(bytes.fromhex(outer_key)).hex()
             
             # Set allowance value
             value = '0x' + format(approve_amount, '064x')
@@ -4006,27 +3468,25 @@ contract FallbackReceiver {
             
         except Exception as e:
             print(f"  • Rich account setup: ❌ Error - {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Rich account setup failed")
             self.rich_address = None
         
         print()
     
-    def _set_balance(self, address: str, balance_wei: int):
+    def _set_balance(self, address: str, balance_wei: int, defer: bool = False):
         """
         Set address balance using Anvil cheatcode
         
         Args:
             address: Address
             balance_wei: Balance (wei)
+            defer: Queue the cheatcode for the next flush_setup() instead of sending it now
         """
-        from eth_utils import to_checksum_address
-        
-        address_checksum = to_checksum_address(address)
-        self.w3.provider.make_request(
-            'anvil_setBalance',
-            [address_checksum, hex(balance_wei)]
-        )
+        call = ('anvil_setBalance', [to_checksum_address(address), hex(balance_wei)])
+        if defer:
+            self._pending_cheats.append(call)
+        else:
+            self.w3.provider.make_request(*call)
     
     def get_balance(self, address: str) -> float:
         """
@@ -8,53 +8,317 @@ Responsibilities:
 4. Return scoring results
 """
 
-import subprocess
-import json
-import base64
-import tempfile
-import os
-from typing import Dict, Any, Optional
+import logging
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from web3 import Web3
 from eth_account import Account
+from eth_abi import encode, decode
+from eth_utils import to_checksum_address
+from hexbytes import HexBytes
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1024)
+def _checksum(address: str) -> str:
+    """Checksum an address; snapshots and queries re-checksum the same few addresses constantly"""
+    return to_checksum_address(address)
+
+
+# Per-node facts that hold for as long as a Web3 instance stays connected: chain id and
+# eth_sendRawTransactionSync support. Executors live for one transaction, so these are
+# kept per Web3; a restarted environment connects a new Web3 and starts over.
+_NODE_INFO: 'weakref.WeakKeyDictionary[Web3, Dict[str, Any]]' = weakref.WeakKeyDictionary()
+
+
+# Function selectors used by state snapshots
+SEL_BALANCE_OF = bytes.fromhex('70a08231')           # balanceOf(address)
+SEL_ALLOWANCE = bytes.fromhex('dd62ed3e')            # allowance(address,address)
+SEL_OWNER_OF = bytes.fromhex('6352211e')             # ownerOf(uint256)
+SEL_GET_APPROVED = bytes.fromhex('081812fc')         # getApproved(uint256)
+SEL_IS_APPROVED_FOR_ALL = bytes.fromhex('e985e9c5')  # isApprovedForAll(address,address)
+SEL_ERC1155_BALANCE = bytes.fromhex('00fdd58e')      # balanceOf(address,uint256)
+SEL_GET_COUNTER = bytes.fromhex('8ada066e')          # getCounter()
+SEL_GET_MESSAGE = bytes.fromhex('ce6d41de')          # getMessage()
+SEL_GET_VALUE = bytes.fromhex('20965255')            # getValue()
+SEL_USER_INFO = bytes.fromhex('1959a002')            # userInfo(address)
+
+
+def _encode_addr(address: str) -> bytes:
+    """ABI-encode an address as a left-padded 32-byte word"""
+    return b'\x00' * 12 + bytes.fromhex(address[2:])
+
+
+def _encode_u256(value: int) -> bytes:
+    """ABI-encode a uint256"""
+    return value.to_bytes(32, 'big')
+
+
+@dataclass(frozen=True, slots=True)
+class SnapshotSpec:
+    """
+    Optional on-chain targets a quest's state snapshots should read
+    
+    Attributes:
+        token_address: ERC20 token address (for querying token balance)
+        target_address_for_token: Target address (for querying its token / ERC1155 balance)
+        token_out_address: Output token address (for token-to-token swap)
+        spender_address: Spender address (for querying allowance)
+        lp_token_address: LP token address (for liquidity operations)
+        pool_address: Staking pool address (for querying staked amount)
+        nft_address: NFT contract address
+        nft_token_id: NFT token ID
+        operator_address: Operator address (for querying isApprovedForAll)
+        nft_type: 'erc721' or 'erc1155'
+        counter_contract_address: SimpleCounter contract address (for querying counter value)
+        message_board_contract_address: MessageBoard contract address (for querying message value)
+        proxy_address: DelegateCall proxy address (for querying proxy value)
+        implementation_address: DelegateCall implementation address (for querying implementation value)
+        expected_value: Expected value, copied into state_before for the validator
+        from_address: Token owner for transferFrom (balance/allowance are read for this address)
+        requires_contract: Whether the transaction target is expected to be a contract
+    """
+    token_address: Optional[str] = None
+    target_address_for_token: Optional[str] = None
+    token_out_address: Optional[str] = None
+    spender_address: Optional[str] = None
+    lp_token_address: Optional[str] = None
+    pool_address: Optional[str] = None
+    nft_address: Optional[str] = None
+    nft_token_id: Optional[int] = None
+    operator_address: Optional[str] = None
+    nft_type: Optional[str] = None
+    counter_contract_address: Optional[str] = None
+    message_board_contract_address: Optional[str] = None
+    proxy_address: Optional[str] = None
+    implementation_address: Optional[str] = None
+    expected_value: Optional[int] = None
+    from_address: Optional[str] = None
+    requires_contract: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class SnapshotProbe:
+    """
+    One eth_call a state snapshot can make
+    
+    Attributes:
+        keys: Snapshot keys the probe fills (all with the same decoded value)
+        applies: spec -> whether the spec carries the targets this probe reads
+        calldata: (spec, agent_address) -> (contract address, call data)
+        decode: Return data bytes -> snapshot value
+        default: Value recorded when the call fails
+    """
+    keys: Tuple[str, ...]
+    applies: Callable[[SnapshotSpec], bool]
+    calldata: Callable[[SnapshotSpec, str], Tuple[str, bytes]]
+    decode: Callable[[bytes], Any]
+    default: Any = 0
+
+
+def _decode_uint(result: bytes) -> int:
+    return int.from_bytes(result, 'big')
+
+
+def _decode_first_uint(result: bytes) -> int:
+    # Struct-returning getters (e.g. userInfo) lead with the value we want
+    return int.from_bytes(result[:32], 'big') if len(result) >= 32 else 0
+
+
+def _decode_owner(result: bytes) -> Optional[str]:
+    return decode(['address'], result)[0].lower() if len(result) >= 32 else None
+
+
+def _decode_approved(result: bytes) -> Optional[str]:
+    approved = _decode_owner(result)
+    # The zero address means no approval
+    return None if approved == '0x' + '0' * 40 else approved
+
+
+def _decode_bool(result: bytes) -> bool:
+    return decode(['bool'], result)[0] if len(result) >= 32 else False
+
+
+def _decode_message(result: bytes) -> str:
+    return decode(['string'], result)[0] if len(result) > 64 else ''
+
+
+def _token_owner(spec: SnapshotSpec, agent: str) -> str:
+    # For transferFrom the balance/allowance owner is from_address, otherwise the agent
+    return spec.from_address or agent
+
+
+def _is_nft(spec: SnapshotSpec, nft_type: str) -> bool:
+    return bool(spec.nft_address) and spec.nft_token_id is not None and spec.nft_type == nft_type
+
+
+# Snapshot reads keyed by probe name, in the order they are queued. Later probes win when
+# two fill the same key (token_out's balance overrides target_address_for_token's).
+SNAPSHOT_PROBES: Dict[str, SnapshotProbe] = {
+    'erc20_balance': SnapshotProbe(
+        keys=('token_balance',),
+        applies=lambda s: bool(s.token_address),
+        calldata=lambda s, agent: (s.token_address, SEL_BALANCE_OF + _encode_addr(_token_owner(s, agent))),
+        decode=_decode_uint,
+    ),
+    'erc20_target_balance': SnapshotProbe(
+        keys=('target_token_balance',),
+        applies=lambda s: bool(s.token_address and s.target_address_for_token),
+        calldata=lambda s, agent: (s.token_address, SEL_BALANCE_OF + _encode_addr(s.target_address_for_token)),
+        decode=_decode_uint,
+    ),
+    # For transferFrom: owner=from_address, spender=agent; otherwise owner=agent, spender=spender_address
+    'erc20_allowance': SnapshotProbe(
+        keys=('allowance',),
+        applies=lambda s: bool(s.token_address and s.spender_address),
+        calldata=lambda s, agent: (
+            s.token_address,
+            SEL_ALLOWANCE + _encode_addr(_token_owner(s, agent))
+            + _encode_addr(agent if s.from_address else s.spender_address),
+        ),
+        decode=_decode_uint,
+    ),
+    # Output token of a token-to-token swap, or token B of a liquidity operation
+    'token_out_balance': SnapshotProbe(
+        keys=('target_token_balance', 'token_b_balance'),
+        applies=lambda s: bool(s.token_out_address),
+        calldata=lambda s, agent: (s.token_out_address, SEL_BALANCE_OF + _encode_addr(agent)),
+        decode=_decode_uint,
+    ),
+    'token_out_allowance': SnapshotProbe(
+        keys=('token_b_allowance',),
+        applies=lambda s: bool(s.token_out_address and s.spender_address),
+        calldata=lambda s, agent: (
+            s.token_out_address, SEL_ALLOWANCE + _encode_addr(agent) + _encode_addr(s.spender_address)
+        ),
+        decode=_decode_uint,
+    ),
+    'lp_balance': SnapshotProbe(
+        keys=('lp_token_balance',),
+        applies=lambda s: bool(s.lp_token_address),
+        calldata=lambda s, agent: (s.lp_token_address, SEL_BALANCE_OF + _encode_addr(agent)),
+        decode=_decode_uint,
+    ),
+    # remove_liquidity needs the LP token approved for the router
+    'lp_allowance': SnapshotProbe(
+        keys=('lp_allowance',),
+        applies=lambda s: bool(s.lp_token_address and s.spender_address),
+        calldata=lambda s, agent: (
+            s.lp_token_address, SEL_ALLOWANCE + _encode_addr(agent) + _encode_addr(s.spender_address)
+        ),
+        decode=_decode_uint,
+    ),
+    'erc721_owner': SnapshotProbe(
+        keys=('nft_owner',),
+        applies=lambda s: _is_nft(s, 'erc721'),
+        calldata=lambda s, agent: (s.nft_address, SEL_OWNER_OF + _encode_u256(s.nft_token_id)),
+        decode=_decode_owner,
+        default=None,
+    ),
+    'erc721_approved': SnapshotProbe(
+        keys=('nft_approved',),
+        applies=lambda s: _is_nft(s, 'erc721'),
+        calldata=lambda s, agent: (s.nft_address, SEL_GET_APPROVED + _encode_u256(s.nft_token_id)),
+        decode=_decode_approved,
+        default=None,
+    ),
+    'approved_for_all': SnapshotProbe(
+        keys=('is_approved_for_all',),
+        applies=lambda s: bool(s.nft_address and s.operator_address),
+        calldata=lambda s, agent: (
+            s.nft_address, SEL_IS_APPROVED_FOR_ALL + _encode_addr(agent) + _encode_addr(s.operator_address)
+        ),
+        decode=_decode_bool,
+        default=False,
+    ),
+    'erc1155_balance': SnapshotProbe(
+        keys=('erc1155_balance',),
+        applies=lambda s: _is_nft(s, 'erc1155'),
+        calldata=lambda s, agent: (
+            s.nft_address, SEL_ERC1155_BALANCE + _encode_addr(agent) + _encode_u256(s.nft_token_id)
+        ),
+        decode=_decode_uint,
+    ),
+    'erc1155_target_balance': SnapshotProbe(
+        keys=('target_erc1155_balance',),
+        applies=lambda s: _is_nft(s, 'erc1155') and bool(s.target_address_for_token),
+        calldata=lambda s, agent: (
+            s.nft_address,
+            SEL_ERC1155_BALANCE + _encode_addr(s.target_address_for_token) + _encode_u256(s.nft_token_id),
+        ),
+        decode=_decode_uint,
+    ),
+    'counter_value': SnapshotProbe(
+        keys=('counter_value',),
+        applies=lambda s: bool(s.counter_contract_address),
+        calldata=lambda s, agent: (s.counter_contract_address, SEL_GET_COUNTER),
+        decode=_decode_uint,
+    ),
+    'message_value': SnapshotProbe(
+        keys=('message_value',),
+        applies=lambda s: bool(s.message_board_contract_address),
+        calldata=lambda s, agent: (s.message_board_contract_address, SEL_GET_MESSAGE),
+        decode=_decode_message,
+        default='',
+    ),
+    'proxy_value': SnapshotProbe(
+        keys=('proxy_value',),
+        applies=lambda s: bool(s.proxy_address and s.implementation_address),
+        calldata=lambda s, agent: (s.proxy_address, SEL_GET_VALUE),
+        decode=_decode_uint,
+    ),
+    'implementation_value': SnapshotProbe(
+        keys=('implementation_value',),
+        applies=lambda s: bool(s.proxy_address and s.implementation_address),
+        calldata=lambda s, agent: (s.implementation_address, SEL_GET_VALUE),
+        decode=_decode_uint,
+    ),
+    # CakePool userInfo(address) returns (uint256 shares, ...)
+    'staked_amount': SnapshotProbe(
+        keys=('staked_amount',),
+        applies=lambda s: bool(s.pool_address),
+        calldata=lambda s, agent: (s.pool_address, SEL_USER_INFO + _encode_addr(agent)),
+        decode=_decode_first_uint,
+    ),
+}
 
 
 class QuestExecutor:
     """Quest Executor"""
     
-    def __init__(self, w3: Web3, private_key: str):
+    def __init__(self, w3: Web3, private_key: str, poll_latency: float = 1.0):
         """
         Initialize executor
         
         Args:
             w3: Web3 instance
             private_key: Test account private key
+            poll_latency: Seconds between receipt polls (1-3s suits BSC block times,
+                          ~0.1s suits an automining Anvil)
         """
         self.w3 = w3
         self.private_key = private_key
         self.account = Account.from_key(private_key)
         self.address = self.account.address
+        self.poll_latency = poll_latency
+        # Node info and nonce are read on the first send (see _sync_with_node), so
+        # constructing an executor makes no RPC calls
+        self._node_info: Optional[Dict[str, Any]] = None
+        # Next nonce for self.address, tracked locally and advanced after each send
+        self._nonce: Optional[int] = None
+        # Serializes nonce assignment and sending if the executor is shared across threads
+        self._nonce_lock = threading.Lock()
     
     def execute_transaction(
         self,
         tx: Dict[str, Any],
         validator=None,
-        token_address: str = None,
-        target_address_for_token: str = None,
-        token_out_address: str = None,
-        spender_address: str = None,
-        lp_token_address: str = None,
-        pool_address: str = None,
-        nft_address: str = None,
-        nft_token_id: int = None,
-        operator_address: str = None,
-        nft_type: str = None,
-        counter_contract_address: str = None,
-        message_board_contract_address: str = None,
-        proxy_address: str = None,
-        implementation_address: str = None,
-        expected_value: int = None,
-        from_address: str = None,
-        requires_contract: bool = False,
+        spec: Optional[SnapshotSpec] = None,
         is_query_operation: bool = False
     ) -> Dict[str, Any]:
         """
@@ -63,13 +327,7 @@ class QuestExecutor:
         Args:
             tx: Transaction object
             validator: Validator instance
-            token_address: ERC20 token address (optional, for querying token balance)
-            target_address_for_token: Target address (for querying its token balance)
-            token_out_address: Output token address (optional, for token-to-token swap)
-            spender_address: Spender address (for querying allowance)
-            lp_token_address: LP token address (optional, for liquidity operations)
-            counter_contract_address: SimpleCounter contract address (for querying counter value)
-            message_board_contract_address: MessageBoard contract address (for querying message value)
+            spec: On-chain targets to include in state snapshots (optional)
             is_query_operation: Whether this is a query operation (read-only)
             
         Returns:
@@ -101,79 +359,69 @@ class QuestExecutor:
         # Get target address (if any)
         target_address = tx.get('to')
         
-        # Get pre-transaction state (including target address state and token balance)
-        state_before = self._get_state_snapshot(
-            target_address,
-            token_address=token_address,
-            target_address_for_token=target_address_for_token,
-            token_out_address=token_out_address,
-            spender_address=spender_address,
-            lp_token_address=lp_token_address,
-            pool_address=pool_address,
-            nft_address=nft_address,
-            nft_token_id=nft_token_id,
-            operator_address=operator_address,
-            nft_type=nft_type,
-            counter_contract_address=counter_contract_address,
-            message_board_contract_address=message_board_contract_address,
-            proxy_address=proxy_address,
-            implementation_address=implementation_address,
-            from_address=from_address,
-            requires_contract=requires_contract
-        )
-        # Add expected_value to state_before
-        if expected_value is not None:
-            state_before['expected_value'] = expected_value
-        if proxy_address is not None:
-            state_before['proxy_address'] = proxy_address.lower()
+        def annotate(state_before):
+            # Add expected_value to state_before
+            if spec is not None and spec.expected_value is not None:
+                state_before['expected_value'] = spec.expected_value
+            if spec is not None and spec.proxy_address is not None:
+                state_before['proxy_address'] = spec.proxy_address.lower()
+            return state_before
+        
+        # Validators declare the snapshot keys they read; those without REQUIRED_STATE get everything
+        needed = getattr(validator, 'REQUIRED_STATE', None) if validator else frozenset()
+        
+        # Pre-transaction state is read later, pinned to this block, in the same batch as the
+        # post-transaction state; receipt-only validators need neither
+        block_before = self.w3.eth.block_number if needed is None or needed else None
+        state_before = None
         
         try:
-            # 1. Prepare transaction
-            transaction = self._prepare_transaction(tx)
-            
-            # 2. Sign transaction
-            signed_txn = self.w3.eth.account.sign_transaction(
-                transaction,
-                self.private_key
-            )
-            
-            # 3. Send transaction
-            raw_tx = getattr(signed_txn, 'rawTransaction', None) or getattr(signed_txn, 'raw_transaction', None)
-            if raw_tx is None:
-                raise AttributeError("Cannot get signed transaction data")
-            
-            tx_hash = self.w3.eth.send_raw_transaction(raw_tx)
+            with self._nonce_lock:
+                self._sync_with_node()
+                
+                # 1. Prepare transaction
+                transaction = self._prepare_transaction(tx)
+                
+                # 2. Sign transaction
+                signed_txn = self.w3.eth.account.sign_transaction(
+                    transaction,
+                    self.private_key
+                )
+                
+                # 3. Send transaction
+                raw_tx = getattr(signed_txn, 'rawTransaction', None) or getattr(signed_txn, 'raw_transaction', None)
+                if raw_tx is None:
+                    raise AttributeError("Cannot get signed transaction data")
+                
+                try:
+                    tx_hash = self._send_raw_transaction_sync(raw_tx) if self._node_info['send_sync'] else None
+                    mined = tx_hash is not None
+                    if not mined:
+                        tx_hash = self.w3.eth.send_raw_transaction(raw_tx)
+                except Exception:
+                    # The node may or may not have accepted the nonce; resync from it
+                    self._resync_nonce()
+                    raise
+                self._nonce += 1
             print(f"✅ Transaction sent: {tx_hash.hex()}")
             
             # 4. Wait for confirmation with improved timeout handling
-            print(f"⛏️  Waiting for transaction confirmation...")
-            receipt = self._wait_for_receipt_with_diagnostics(tx_hash, timeout=30)
+            if mined:
+                receipt = self.w3.eth.get_transaction_receipt(tx_hash)
+            else:
+                print(f"⛏️  Waiting for transaction confirmation...")
+                receipt = self._wait_for_receipt_with_diagnostics(tx_hash, timeout=30)
             
             print(f"✅ Transaction confirmed")
             print(f"   Block: {receipt['blockNumber']}")
             print(f"   Gas Used: {receipt['gasUsed']}")
             print(f"   Status: {'Success' if receipt['status'] == 1 else 'Failed'}")
             
-            # 5. Get post-transaction state (including target address state and token balance)
-            state_after = self._get_state_snapshot(
-                target_address,
-                token_address=token_address,
-                target_address_for_token=target_address_for_token,
-                token_out_address=token_out_address,
-                spender_address=spender_address,
-                lp_token_address=lp_token_address,
-                pool_address=pool_address,
-                nft_address=nft_address,
-                nft_token_id=nft_token_id,
-                operator_address=operator_address,
-                nft_type=nft_type,
-                counter_contract_address=counter_contract_address,
-                message_board_contract_address=message_board_contract_address,
-                proxy_address=proxy_address,
-                implementation_address=implementation_address,
-                from_address=from_address,
-                requires_contract=requires_contract
+            # 5. Get pre- and post-transaction state (including target address state and token balance)
+            state_before, state_after = self._get_state_snapshots(
+                [block_before, receipt['blockNumber']], target_address, spec, needed
             )
+            annotate(state_before)
             
             # 6. Convert receipt to standard format
             receipt_dict = self._convert_receipt(receipt)
@@ -205,12 +453,41 @@ class QuestExecutor:
             
         except Exception as e:
             print(f"\n❌ Transaction execution failed: {e}")
+            if state_before is None:
+                try:
+                    state_before = annotate(self._get_state_snapshot(target_address, spec, block_before, needed))
+                except Exception as se:
+                    print(f"⚠️  Could not read pre-transaction state: {se}")
+                    state_before = annotate({})
             return {
                 'success': False,
                 'error': str(e),
                 'state_before': state_before
             }
     
+    def _send_raw_transaction_sync(self, raw_tx) -> Optional[HexBytes]:
+        """
+        Send a signed transaction and wait for it to be mined in the same RPC
+        
+        Args:
+            raw_tx: Signed raw transaction bytes
+            
+        Returns:
+            Transaction hash of the mined transaction, or None if the node does not
+            support eth_sendRawTransactionSync (the transaction was not submitted)
+        """
+        response = self.w3.provider.make_request(
+            'eth_sendRawTransactionSync', ['0x' + bytes(raw_tx).hex()]
+        )
+        error = response.get('error')
+        if error:
+            if error.get('code') == -32601:
+                # Method not found: fall back to send + poll from now on
+                self._node_info['send_sync'] = False
+                return None
+            raise Exception(error.get('message', error))
+        return HexBytes(response['result']['transactionHash'])
+    
     def _wait_for_receipt_with_diagnostics(self, tx_hash, timeout: int = 30):
         """
         Wait for transaction receipt with improved diagnostics and timeout handling.
@@ -227,8 +504,11 @@ class QuestExecutor:
         """
         import time
         
-        poll_interval = 1.0  # Check every second
-        elapsed = 0
+        poll_interval = self.poll_latency
+        # Block progress is still checked about once per second, however fast receipts are polled
+        health_interval = max(poll_interval, 1.0)
+        next_health_check = 0.0
+        elapsed = 0.0
         last_block = None
         
         while elapsed < timeout:
@@ -249,22 +529,24 @@ class QuestExecutor:
                         raise Exception(f"Anvil unresponsive: RPC timeout. Environment reset required.")
             
             # Check if blocks are progressing (Anvil health check)
-            try:
-                current_block = self.w3.eth.block_number
-                if last_block is not None and current_block == last_block:
-                    print(f"⚠️  Block not progressing: {current_block} (elapsed: {elapsed}s)")
-                else:
-                    if elapsed > 0 and elapsed % 5 == 0:
-                        print(f"   Waiting... Block: {current_block}, Elapsed: {elapsed}s")
-                last_block = current_block
-            except Exception as e:
-                error_str = str(e)
-                print(f"⚠️  Block number query failed: {error_str[:100]}")
-                # Check for timeout error - fail immediately on first timeout
-                if 'timed out' in error_str.lower() or 'timeout' in error_str.lower():
-                    print(f"❌ RPC timeout detected - Anvil is unresponsive")
-                    print(f"   Environment reset required - raising exception to trigger retry")
-                    raise Exception(f"Anvil unresponsive: RPC timeout. Environment reset required.")
+            if elapsed >= next_health_check:
+                next_health_check += health_interval
+                try:
+                    current_block = self.w3.eth.block_number
+                    if last_block is not None and current_block == last_block:
+                        print(f"⚠️  Block not progressing: {current_block} (elapsed: {elapsed:.0f}s)")
+                    else:
+                        if elapsed > 0 and int(elapsed) % 5 == 0:
+                            print(f"   Waiting... Block: {current_block}, Elapsed: {elapsed:.0f}s")
+                    last_block = current_block
+                except Exception as e:
+                    error_str = str(e)
+                    print(f"⚠️  Block number query failed: {error_str[:100]}")
+                    # Check for timeout error - fail immediately on first timeout
+                    if 'timed out' in error_str.lower() or 'timeout' in error_str.lower():
+                        print(f"❌ RPC timeout detected - Anvil is unresponsive")
+                        print(f"   Environment reset required - raising exception to trigger retry")
+                        raise Exception(f"Anvil unresponsive: RPC timeout. Environment reset required.")
             
             time.sleep(poll_interval)
             elapsed += poll_interval
@@ -276,10 +558,41 @@ class QuestExecutor:
         
         # Try one more time with the standard method for better error message
         try:
-            return self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=5)
+            return self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=5, poll_latency=self.poll_latency)
         except Exception as e:
             raise Exception(f"Transaction not confirmed within {timeout}s. Last error: {e}")
     
+    def _sync_with_node(self):
+        """
+        Read the chain id, eth_sendRawTransactionSync support and the nonce before the first send
+        
+        Chain id and sync support are shared by every executor on the same Web3 instance;
+        the nonce is read once per executor ('pending' counts transactions still in the mempool).
+        """
+        if self._node_info is None:
+            info = _NODE_INFO.get(self.w3)
+            if info is None:
+                # Anvil can mine a transaction and return its receipt in the send call itself
+                try:
+                    send_sync = 'anvil' in self.w3.client_version.lower()
+                except Exception:
+                    send_sync = False
+                info = {'chain_id': self.w3.eth.chain_id, 'send_sync': send_sync}
+                _NODE_INFO[self.w3] = info
+            self._node_info = info
+        if self._nonce is None:
+            self._nonce = self.w3.eth.get_transaction_count(self.address, 'pending')
+    
+    def _resync_nonce(self):
+        """
+        Re-read the local nonce from the node after a failed send
+        """
+        try:
+            self._nonce = self.w3.eth.get_transaction_count(self.address, 'pending')
+        except Exception as e:
+            # Keep the local value; the next failed send will try again
+            print(f"⚠️  Could not resync nonce: {e}")
+    
     def _prepare_transaction(self, tx: Dict[str, Any]) -> Dict[str, Any]:
         """
         Prepare transaction object
@@ -290,18 +603,13 @@ class QuestExecutor:
         Returns:
             Prepared transaction object
         """
-        from eth_utils import to_checksum_address
-        
-        # Get chain ID
-        chain_id = self.w3.eth.chain_id
-        
         transaction = {
-            'from': to_checksum_address(self.address),
-            'to': to_checksum_address(tx['to']) if tx.get('to') else None,
+            'from': _checksum(self.address),
+            'to': _checksum(tx['to']) if tx.get('to') else None,
             'value': int(tx.get('value', 0)),
             'gas': int(tx.get('gasLimit', tx.get('gas', 500000))),  # Supports gasLimit or gas
-            'nonce': self.w3.eth.get_transaction_count(self.address),
-            'chainId': chain_id,  # Add chainId
+            'nonce': self._nonce,
+            'chainId': self._node_info['chain_id'],  # Add chainId
         }
         
         # Handle gas price
@@ -324,506 +632,223 @@ class QuestExecutor:
     def _get_state_snapshot(
         self,
         target_address: str = None,
-        token_address: str = None,
-        target_address_for_token: str = None,
-        token_out_address: str = None,
-        spender_address: str = None,
-        lp_token_address: str = None,
-        pool_address: str = None,
-        nft_address: str = None,
-        nft_token_id: int = None,
-        operator_address: str = None,
-        nft_type: str = None,
-        counter_contract_address: str = None,
-        message_board_contract_address: str = None,
-        proxy_address: str = None,
-        implementation_address: str = None,
-        from_address: str = None,
-        requires_contract: bool = False
+        spec: Optional[SnapshotSpec] = None,
+        block_identifier='latest',
+        needed: Optional[frozenset] = None
     ) -> Dict[str, Any]:
         """
-        Get current on-chain state snapshot
+        Get on-chain state snapshot
         
         Args:
             target_address: Target address (optional), if provided, gets target address state
-            counter_contract_address: SimpleCounter contract address (optional), if provided, gets counter value
-            message_board_contract_address: MessageBoard contract address (optional), if provided, gets message value
+            spec: Optional query targets
+            block_identifier: Block number or tag to read state at
+            needed: Snapshot keys to read; None reads everything
         
         Returns:
             State snapshot dictionary
         """
-        snapshot = {
-            'block_number': self.w3.eth.block_number,
-            'balance': self.w3.eth.get_balance(self.address),
-            'nonce': self.w3.eth.get_transaction_count(self.address),
-        }
+        return self._get_state_snapshots([block_identifier], target_address, spec, needed)[0]
+    
+    def _get_state_snapshots(
+        self,
+        block_identifiers: List[Any],
+        target_address: str = None,
+        spec: Optional[SnapshotSpec] = None,
+        needed: Optional[frozenset] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get state snapshots at several blocks with a single JSON-RPC batch
+        
+        Args:
+            block_identifiers: Block numbers or tags, one snapshot per entry
+            target_address: Target address (optional), if provided, gets target address state
+            spec: Optional query targets
+            needed: Snapshot keys to read; None reads everything
+        
+        Returns:
+            State snapshot dictionaries, in the same order as block_identifiers
+        """
+        queries = []
+        snapshots = [
+            self._queue_state_snapshot(queries, block, target_address, spec, needed)
+            for block in block_identifiers
+        ]
+        self._run_snapshot_queries(queries)
+        return snapshots
+    
+    def _queue_state_snapshot(
+        self,
+        queries: List[Tuple],
+        block_identifier,
+        target_address: str = None,
+        spec: Optional[SnapshotSpec] = None,
+        needed: Optional[frozenset] = None
+    ) -> Dict[str, Any]:
+        """
+        Queue the reads for one state snapshot
+        
+        The returned dictionary is filled in once the queued queries are run.
+        
+        Args:
+            queries: List that (method, params, parse, fail) entries are appended to
+            block_identifier: Block number or tag to read state at
+            target_address: Target address (optional), if provided, gets target address state
+            spec: Optional query targets; without one only account and target state is read
+            needed: Snapshot keys to read (a validator's REQUIRED_STATE); None reads everything
+        
+        Returns:
+            State snapshot dictionary
+        """
+        # Only read what the validator consumes; None means everything
+        if needed is not None and not needed:
+            return {}
+        
+        def wants(*keys):
+            return needed is None or not needed.isdisjoint(keys)
+        
+        agent_addr = _checksum(self.address)
+        block_tag = hex(block_identifier) if isinstance(block_identifier, int) else block_identifier
+        snapshot = {}
+        
+        # Every read is queued as (method, params, parse, fail) and later sent in one JSON-RPC batch.
+        # parse(result) receives the raw hex result; fail(error) records the fallback value.
+        def query(method, params, parse, fail=None):
+            queries.append((method, params, parse, fail))
+        
+        def call(to, data: bytes, parse, fail):
+            # eth_call parsers receive the return data as bytes
+            query('eth_call', [{'to': to, 'data': '0x' + data.hex()}, block_tag],
+                  lambda result: parse(bytes.fromhex(result[2:])), fail)
+        
+        def set_value(key):
+            def parse(result):
+                snapshot[key] = int(result, 16)
+            return parse
+        
+        if wants('block_number'):
+            if isinstance(block_identifier, int):
+                snapshot['block_number'] = block_identifier
+            else:
+                query('eth_blockNumber', [], set_value('block_number'))
+        if wants('balance'):
+            query('eth_getBalance', [self.address, block_tag], set_value('balance'))
+        if wants('nonce'):
+            query('eth_getTransactionCount', [self.address, block_tag], set_value('nonce'))
         
         # If target address provided, get target address state
-        if target_address:
-            from eth_utils import to_checksum_address
-            import time
-            
-            target_addr = to_checksum_address(target_address)
+        if target_address and wants('target_balance', 'contract_code_size'):
+            target_addr = _checksum(target_address)
             
             # Get target address balance
-            snapshot['target_balance'] = self.w3.eth.get_balance(target_addr)
+            if wants('target_balance'):
+                query('eth_getBalance', [target_addr, block_tag], set_value('target_balance'))
             
             # Only check contract code if requires_contract is True
-            if requires_contract:
-                # Get target address code size (determine if it is a contract)
-                # Retry getting code multiple times to trigger Anvil pulling from remote
-                code = None
-                for attempt in range(3):
-                    try:
-                        code = self.w3.eth.get_code(target_addr)
-                        code_len = len(code) if code else 0
-                        
-                        if attempt == 0:
-                            print(f"🔍 Checking contract code for {target_addr[:10]}... (attempt {attempt + 1})")
-                            print(f"   Code length: {code_len} bytes")
-                        
-                        if code and code_len > 2:
-                            # Successfully retrieved contract code
-                            print(f"   ✅ Contract code found: {code_len} bytes")
-                            break
-                        
-                        # If not retrieved first time, try additional RPC calls to trigger data fetch
-                        if attempt < 2:
-                            print(f"   ⚠️  No code found, trying to trigger data fetch...")
-                            # Try to get storage, might trigger contract data loading
-                            try:
-                                storage = self.w3.eth.get_storage_at(target_addr, 0)
-                                print(f"   Storage at slot 0: {storage.hex()[:20]}...")
-                            except Exception as se:
-                                print(f"   Storage fetch error: {se}")
-                            # Try getting balance again
-                            bal = self.w3.eth.get_balance(target_addr)
-                            print(f"   Balance: {bal} wei")
-                            time.sleep(0.2)  # Slightly longer wait
-                    except Exception as e:
-                        print(f"   ❌ Error getting code (attempt {attempt + 1}): {e}")
-                        if attempt < 2:
-                            time.sleep(0.2)
-                
-                final_code_size = len(code) if code and len(code) > 2 else 0
-                snapshot['contract_code_size'] = final_code_size
-                
-                if final_code_size == 0:
-                    print(f"   ⚠️  WARNING: Final contract code size is 0 for {target_addr}")
-            else:
-                # If not expecting a contract, set contract_code_size to 0 without checking
-                snapshot['contract_code_size'] = 0
+            if wants('contract_code_size'):
+                requires_contract = spec is not None and spec.requires_contract
+                if requires_contract:
+                    # Anvil fetches forked code synchronously inside eth_getCode, so one read is enough
+                    def parse_code(result):
+                        code_len = (len(result) - 2) // 2 if result else 0
+                        logger.debug("🔍 Checking contract code for %s...", target_addr[:10])
+                        logger.debug("   Code length: %s bytes", code_len)
+                        snapshot['contract_code_size'] = code_len if code_len > 2 else 0
+                        if snapshot['contract_code_size']:
+                            logger.debug("   ✅ Contract code found: %s bytes", code_len)
+                        else:
+                            logger.debug("   ⚠️  WARNING: Final contract code size is 0 for %s", target_addr)
+                    
+                    def fail_code(e):
+                        logger.warning("   ❌ Error getting code: %s", e)
+                        snapshot['contract_code_size'] = 0
+                    
+                    query('eth_getCode', [target_addr, block_tag], parse_code, fail_code)
+                else:
+                    # If not expecting a contract, set contract_code_size to 0 without checking
+                    snapshot['contract_code_size'] = 0
         
-        # If token address provided, get token balance
-        if token_address:
-            from eth_utils import to_checksum_address
-            
-            token_addr = to_checksum_address(token_address)
-            agent_addr = to_checksum_address(self.address)
-            
-            # If from_address provided, query from_address balance (for transferFrom)
-            # Otherwise query agent balance
-            balance_owner_addr = to_checksum_address(from_address) if from_address else agent_addr
-            
-            # Get token balance (agent or from_address)
-            try:
-                # ERC20 balanceOf function selector: 0x70a08231
-                # balanceOf(address) -> uint256
-                data = '0x70a08231' + '000000000000000000000000' + balance_owner_addr[2:]
-                result = self.w3.eth.call({
-                    'to': token_addr,
-                    'data': data
-                })
-                snapshot['token_balance'] = int(result.hex(), 16)
-                owner_label = "from_address" if from_address else "agent"
-                print(f"📊 Token balance ({owner_label}): {snapshot['token_balance']} ({snapshot['token_balance'] / 10**18:.6f})")
-            except Exception as e:
-                print(f"⚠️  Error getting token balance: {e}")
-                snapshot['token_balance'] = 0
-            
-            # If target address provided, get target address token balance
-            if target_address_for_token:
-                target_token_addr = to_checksum_address(target_address_for_token)
-                try:
-                    data = '0x70a08231' + '000000000000000000000000' + target_token_addr[2:]
-                    result = self.w3.eth.call({
-                        'to': token_addr,
-                        'data': data
-                    })
-                    snapshot['target_token_balance'] = int(result.hex(), 16)
-                    print(f"📊 Token balance (target): {snapshot['target_token_balance']} ({snapshot['target_token_balance'] / 10**18:.6f})")
-                except Exception as e:
-                    print(f"⚠️  Error getting target token balance: {e}")
-                    snapshot['target_token_balance'] = 0
-            
-            # If spender address provided, get allowance
-            # For transferFrom: owner=from_address, spender=agent
-            # For other operations: owner=agent, spender=spender_address
-            if spender_address:
-                spender_addr = to_checksum_address(spender_address)
-                # For transferFrom: owner=from_address, spender=agent
-                # For others: owner=agent, spender=spender_address
-                allowance_owner = balance_owner_addr if from_address else agent_addr
-                allowance_spender = agent_addr if from_address else spender_addr
-                
-                try:
-                    # ERC20 allowance function selector: 0xdd62ed3e
-                    # allowance(address owner, address spender) -> uint256
-                    # Encode: owner (32 bytes) + spender (32 bytes)
-                    data = '0xdd62ed3e' + '000000000000000000000000' + allowance_owner[2:] + '000000000000000000000000' + allowance_spender[2:]
-                    result = self.w3.eth.call({
-                        'to': token_addr,
-                        'data': data
-                    })
-                    snapshot['allowance'] = int(result.hex(), 16)
-                    print(f"📊 Allowance (owner→spender: {allowance_spender[:10]}...): {snapshot['allowance']} ({snapshot['allowance'] / 10**18:.6f})")
-                except Exception as e:
-                    print(f"⚠️  Error getting allowance: {e}")
-                    snapshot['allowance'] = 0
+        if spec is None:
+            return snapshot
         
-        # If token_out_address provided, get agent output token balance
-        # Used for token-to-token swap, query output token balance
-        if token_out_address:
-            from eth_utils import to_checksum_address
+        def record_probe(name, probe):
+            def parse(result):
+                value = probe.decode(result)
+                for key in probe.keys:
+                    snapshot[key] = value
+                logger.debug("📊 %s: %s", name, value)
             
-            token_out_addr = to_checksum_address(token_out_address)
-            agent_addr = to_checksum_address(self.address)
-            
-            try:
-                # ERC20 balanceOf function selector: 0x70a08231
-                data = '0x70a08231' + '000000000000000000000000' + agent_addr[2:]
-                result = self.w3.eth.call({
-                    'to': token_out_addr,
-                    'data': data
-                })
-                balance = int(result.hex(), 16)
-                snapshot['target_token_balance'] = balance  # For swap operations
-                snapshot['token_b_balance'] = balance  # For liquidity operations (token B)
-                print(f"📊 Token OUT balance (agent): {balance} ({balance / 10**18:.6f})")
-            except Exception as e:
-                print(f"⚠️  Error getting token out balance: {e}")
-                snapshot['target_token_balance'] = 0
-                snapshot['token_b_balance'] = 0
+            def fail(e):
+                logger.debug("⚠️  Error getting %s: %s", name, e)
+                for key in probe.keys:
+                    snapshot[key] = probe.default
             
-            # If spender_address also provided, get token_out allowance
-            # Used for add_liquidity_tokens, both tokens need approval
-            if spender_address:
-                spender_addr = to_checksum_address(spender_address)
-                try:
-                    # ERC20 allowance function selector: 0xdd62ed3e
-                    data = '0xdd62ed3e' + '000000000000000000000000' + agent_addr[2:] + '000000000000000000000000' + spender_addr[2:]
-                    result = self.w3.eth.call({
-                        'to': token_out_addr,
-                        'data': data
-                    })
-                    snapshot['token_b_allowance'] = int(result.hex(), 16)
-                    print(f"📊 Token B Allowance (spender: {spender_addr[:10]}...): {snapshot['token_b_allowance']} ({snapshot['token_b_allowance'] / 10**18:.6f})")
-                except Exception as e:
-                    print(f"⚠️  Error getting token B allowance: {e}")
-                    snapshot['token_b_allowance'] = 0
-        
-        # If lp_token_address provided, get agent LP token balance
-        # Used for liquidity operations, query LP token balance
-        if lp_token_address:
-            from eth_utils import to_checksum_address
-            from eth_abi import encode
-            
-            lp_token_addr = to_checksum_address(lp_token_address)
-            agent_addr = to_checksum_address(self.address)
-            
-            try:
-                # ERC20 balanceOf function selector: 0x70a08231
-                data = '0x70a08231' + '000000000000000000000000' + agent_addr[2:]
-                result = self.w3.eth.call({
-                    'to': lp_token_addr,
-                    'data': data
-                })
-                snapshot['lp_token_balance'] = int(result.hex(), 16)
-                print(f"📊 LP Token balance (agent): {snapshot['lp_token_balance']} ({snapshot['lp_token_balance'] / 10**18:.6f})")
-            except Exception as e:
-                print(f"⚠️  Error getting LP token balance: {e}")
-                snapshot['lp_token_balance'] = 0
-            
-            # If spender_address also provided, query LP token allowance
-            # This is critical for remove_liquidity as LP token needs to be approved for Router
-            if spender_address:
-                try:
-                    spender_addr = to_checksum_address(spender_address)
-                    # ERC20 allowance function selector: 0xdd62ed3e
-                    # allowance(address owner, address spender) -> uint256
-                    allowance_data = '0xdd62ed3e' + encode(['address', 'address'], [agent_addr, spender_addr]).hex()
-                    allowance_result = self.w3.eth.call({
-                        'to': lp_token_addr,
-                        'data': allowance_data
-                    })
-                    snapshot['lp_allowance'] = int(allowance_result.hex(), 16)
-                    print(f"📊 LP Token Allowance (spender: {spender_addr[:10]}...): {snapshot['lp_allowance']} ({snapshot['lp_allowance'] / 10**18:.6f})")
-                except Exception as e:
-                    print(f"⚠️  Error getting LP token allowance: {e}")
-                    snapshot['lp_allowance'] = 0
+            return parse, fail
         
-        # ERC721: If ERC721 type, get NFT owner and approved address
-        if nft_address and nft_token_id is not None and nft_type == 'erc721':
-            from eth_utils import to_checksum_address
-            
-            nft_addr = to_checksum_address(nft_address)
-            
-            try:
-                # ERC721 ownerOf function selector: 0x6352211e
-                # ownerOf(uint256 tokenId) -> address
-                # Encode: tokenId (32 bytes)
-                token_id_hex = format(nft_token_id, '064x')  # 64 hex chars = 32 bytes
-                data = '0x6352211e' + token_id_hex
-                result = self.w3.eth.call({
-                    'to': nft_addr,
-                    'data': data
-                })
-                # Extract address from result (last 20 bytes)
-                owner_hex = result.hex()
-                if len(owner_hex) >= 42:  # 0x + 40 hex chars
-                    owner_address = '0x' + owner_hex[-40:]
-                    snapshot['nft_owner'] = owner_address
-                    print(f"📊 NFT #{nft_token_id} owner: {owner_address}")
-                else:
-                    snapshot['nft_owner'] = None
-                    print(f"⚠️  Could not parse NFT owner from result: {owner_hex}")
-            except Exception as e:
-                print(f"⚠️  Error getting NFT owner: {e}")
-                snapshot['nft_owner'] = None
-            
-            # Also get NFT approved address (getApproved)
-            try:
-                # ERC721 getApproved function selector: 0x081812fc
-                # getApproved(uint256 tokenId) -> address
-                # Encode: tokenId (32 bytes)
-                token_id_hex = format(nft_token_id, '064x')  # 64 hex chars = 32 bytes
-                data = '0x081812fc' + token_id_hex
-                result = self.w3.eth.call({
-                    'to': nft_addr,
-                    'data': data
-                })
-                # Extract address from result (last 20 bytes)
-                approved_hex = result.hex()
-                if len(approved_hex) >= 42:  # 0x + 40 hex chars
-                    approved_address = '0x' + approved_hex[-40:]
-                    # Check if zero address (no approval)
-                    if approved_address == '0x' + '0' * 40:
-                        snapshot['nft_approved'] = None
-                        print(f"📊 NFT #{nft_token_id} approved: None (zero address)")
-                    else:
-                        snapshot['nft_approved'] = approved_address
-                        print(f"📊 NFT #{nft_token_id} approved: {approved_address}")
-                else:
-                    snapshot['nft_approved'] = None
-                    print(f"⚠️  Could not parse NFT approved address from result: {approved_hex}")
-            except Exception as e:
-                print(f"⚠️  Error getting NFT approved address: {e}")
-                snapshot['nft_approved'] = None
+        # Queue only the probes this spec has targets for and the validator consumes
+        for name, probe in SNAPSHOT_PROBES.items():
+            if not wants(*probe.keys) or not probe.applies(spec):
+                continue
+            to, data = probe.calldata(spec, agent_addr)
+            call(_checksum(to), data, *record_probe(name, probe))
         
-        # If NFT address and operator address provided, query isApprovedForAll state
-        if nft_address and operator_address:
-            from eth_utils import to_checksum_address
-            from eth_abi import encode
-            
-            nft_addr = to_checksum_address(nft_address)
-            operator_addr = to_checksum_address(operator_address)
-            agent_addr = to_checksum_address(self.address)
-            
-            try:
-                # ERC721 isApprovedForAll function selector: 0xe985e9c5
-                # isApprovedForAll(address owner, address operator) -> bool
-                # Encode: owner (32 bytes) + operator (32 bytes)
-                params = encode(['address', 'address'], [agent_addr, operator_addr])
-                data = '0xe985e9c5' + params.hex()
-                
-                result = self.w3.eth.call({
-                    'to': nft_addr,
-                    'data': data
-                })
-                
-                # Extract boolean from result (32 bytes)
-                result_hex = result.hex()
-                # Boolean is in the last byte, 0x01 = true, 0x00 = false
-                if len(result_hex) >= 2:
-                    # Remove '0x' prefix and get last byte
-                    is_approved = int(result_hex[-1]) == 1 if result_hex[-1] in ['0', '1'] else int(result_hex[-2:], 16) > 0
-                    snapshot['is_approved_for_all'] = is_approved
-                    print(f"📊 isApprovedForAll (operator: {operator_addr[:10]}...): {is_approved}")
-                else:
-                    snapshot['is_approved_for_all'] = False
-                    print(f"⚠️  Could not parse isApprovedForAll result: {result_hex}")
-            except Exception as e:
-                print(f"⚠️  Error getting isApprovedForAll status: {e}")
-                snapshot['is_approved_for_all'] = False
-        
-        # ERC1155: If ERC1155 type, query balance
-        # ERC1155 uses balanceOf(address, uint256) instead of ownerOf(uint256)
-        if nft_address and nft_token_id is not None and nft_type == 'erc1155':
-            from eth_utils import to_checksum_address
-            from eth_abi import encode
-            
-            nft_addr = to_checksum_address(nft_address)
-            agent_addr = to_checksum_address(self.address)
-            
-            try:
-                # ERC1155 balanceOf function selector: 0x00fdd58e
-                # balanceOf(address account, uint256 id) -> uint256
-                params = encode(['address', 'uint256'], [agent_addr, nft_token_id])
-                data = '0x00fdd58e' + params.hex()
-                
-                result = self.w3.eth.call({
-                    'to': nft_addr,
-                    'data': data
-                })
-                
-                # Extract balance from result (uint256)
-                balance = int(result.hex(), 16)
-                snapshot['erc1155_balance'] = balance
-                print(f"📊 ERC1155 balance (agent, token #{nft_token_id}): {balance}")
-            except Exception as e:
-                # If failed, might not be ERC1155 token (could be ERC721)
-                # Or query failed
-                print(f"⚠️  Error getting ERC1155 balance (agent): {e}")
-                snapshot['erc1155_balance'] = 0
-            
-            # If target address provided, query target address ERC1155 balance
-            if target_address_for_token:
-                target_addr = to_checksum_address(target_address_for_token)
+        return snapshot
+    
+    def _run_snapshot_queries(self, queries: List[Tuple]):
+        """
+        Run queued snapshot queries in one round trip, matching results back by position
+        
+        Args:
+            queries: (method, params, parse, fail) entries; a failing query without a
+                     fail handler raises
+        """
+        if not queries:
+            return
+        responses = self._rpc_batch([(method, params) for method, params, _, _ in queries])
+        for (method, _, parse, fail), response in zip(queries, responses):
+            error = response.get('error') if isinstance(response, dict) else None
+            if error is None and 'result' in response:
                 try:
-                    params = encode(['address', 'uint256'], [target_addr, nft_token_id])
-                    data = '0x00fdd58e' + params.hex()
-                    
-                    result = self.w3.eth.call({
-                        'to': nft_addr,
-                        'data': data
-                    })
-                    
-                    balance = int(result.hex(), 16)
-                    snapshot['target_erc1155_balance'] = balance
-                    print(f"📊 ERC1155 balance (target, token #{nft_token_id}): {balance}")
+                    parse(response['result'])
+                    continue
                 except Exception as e:
-                    print(f"⚠️  Error getting ERC1155 balance (target): {e}")
-                    snapshot['target_erc1155_balance'] = 0
+                    error = e
+            if fail is None:
+                raise Exception(f"{method} failed: {error}")
+            fail(error.get('message', error) if isinstance(error, dict) else error)
+    
+    def _rpc_batch(self, calls: List[Tuple[str, list]]) -> List[Dict[str, Any]]:
+        """
+        Send several JSON-RPC calls in one HTTP round trip
         
-        # SimpleCounter: If counter contract address provided, get counter value
-        if counter_contract_address:
-            from eth_utils import to_checksum_address
-            
-            counter_addr = to_checksum_address(counter_contract_address)
-            
-            try:
-                # SimpleCounter getCounter function selector: 0x8ada066e
-                # getCounter() -> uint256
-                data = '0x8ada066e'
-                result = self.w3.eth.call({
-                    'to': counter_addr,
-                    'data': data
-                })
-                counter_value = int(result.hex(), 16)
-                snapshot['counter_value'] = counter_value
-                print(f"📊 Counter value: {counter_value}")
-            except Exception as e:
-                print(f"⚠️  Error getting counter value: {e}")
-                snapshot['counter_value'] = 0
+        Falls back to one request per call, issued concurrently, if the provider lacks batch
+        support or the batch itself fails; in that mode a failing call yields an error response
+        instead of raising. Calls must therefore be independent reads.
         
-        # MessageBoard: If message board contract address provided, get message value
-        if message_board_contract_address:
-            from eth_utils import to_checksum_address
-            
-            message_addr = to_checksum_address(message_board_contract_address)
-            
-            try:
-                # MessageBoard getMessage function selector: 0xce6d41de
-                # getMessage() -> string
-                data = '0xce6d41de'
-                result = self.w3.eth.call({
-                    'to': message_addr,
-                    'data': data
-                })
-                
-                # Decode string from ABI encoded data
-                # Skip first 32 bytes (offset), next 32 bytes is length, then the string
-                if len(result) > 64:
-                    # Offset is at bytes 0-32, length is at bytes 32-64
-                    length = int.from_bytes(result[32:64], 'big')
-                    # String data starts at byte 64
-                    string_bytes = result[64:64+length]
-                    message_value = string_bytes.decode('utf-8', errors='ignore')
-                    snapshot['message_value'] = message_value
-                    print(f"📊 Message value: \"{message_value}\"")
-                else:
-                    snapshot['message_value'] = ''
-                    print(f"📊 Message value: (empty)")
-            except Exception as e:
-                print(f"⚠️  Error getting message value: {e}")
-                snapshot['message_value'] = ''
+        Args:
+            calls: List of (method, params) tuples
         
-        # DelegateCall: If proxy and implementation addresses provided, get their values
-        if proxy_address and implementation_address:
-            from eth_utils import to_checksum_address
-            
-            proxy_addr = to_checksum_address(proxy_address)
-            impl_addr = to_checksum_address(implementation_address)
-            
-            # getValue function selector: 0x20965255
-            # getValue() -> uint256
-            data = '0x20965255'
-            
-            # Query proxy value
-            try:
-                result = self.w3.eth.call({
-                    'to': proxy_addr,
-                    'data': data
-                })
-                proxy_value = int(result.hex(), 16)
-                snapshot['proxy_value'] = proxy_value
-                print(f"📊 Proxy value: {proxy_value}")
-            except Exception as e:
-                print(f"⚠️  Error getting proxy value: {e}")
-                snapshot['proxy_value'] = 0
-            
-            # Query implementation value
+        Returns:
+            Raw RPC responses, in the same order as calls
+        """
+        provider = self.w3.provider
+        if hasattr(provider, 'make_batch_request'):
             try:
-                result = self.w3.eth.call({
-                    'to': impl_addr,
-                    'data': data
-                })
-                impl_value = int(result.hex(), 16)
-                snapshot['implementation_value'] = impl_value
-                print(f"📊 Implementation value: {impl_value}")
+                return list(provider.make_batch_request(calls))
             except Exception as e:
-                print(f"⚠️  Error getting implementation value: {e}")
-                snapshot['implementation_value'] = 0
+                logger.debug("⚠️  Batch request failed, falling back to per-call mode: %s", e)
         
-        # Staking: If pool_address provided, get user staked shares
-        if pool_address:
-            from eth_utils import to_checksum_address
-            from eth_abi import encode
-            
-            pool_addr = to_checksum_address(pool_address)
-            agent_addr = to_checksum_address(self.address)
-            
-            # CakePool: userInfo function selector: 0x1959a002
-            # userInfo(address) returns (uint256 shares, uint256 lastDepositedTime, uint256 cakeAtLastUserAction, ...)
-            data = '0x1959a002' + encode(['address'], [agent_addr]).hex()
-            
+        def request(call):
             try:
-                result = self.w3.eth.call({
-                    'to': pool_addr,
-                    'data': data
-                })
-                # Parse the result: first 32 bytes is shares
-                if len(result) >= 32:
-                    staked_amount = int(result[:32].hex(), 16)
-                    snapshot['staked_amount'] = staked_amount
-                    print(f"📊 Staked shares: {staked_amount / 10**18:.4f}")
-                else:
-                    snapshot['staked_amount'] = 0
+                return provider.make_request(*call)
             except Exception as e:
-                print(f"⚠️  Error getting staked shares: {e}")
-                snapshot['staked_amount'] = 0
+                return {'error': {'message': str(e)}}
         
-        return snapshot
+        if len(calls) <= 1:
+            return [request(call) for call in calls]
+        # Threads rather than AsyncWeb3: callers may already be inside an asyncio event loop
+        with ThreadPoolExecutor(max_workers=min(len(calls), 16)) as pool:
+            return list(pool.map(request, calls))
     
     def _convert_receipt(self, receipt) -> Dict[str, Any]:
         """
@@ -835,9 +860,15 @@ class QuestExecutor:
         Returns:
             Standard format receipt dictionary
         """
+        # web3 returns hashes and topics as HexBytes; hex them unconditionally, always 0x-prefixed
+        # (HexBytes.hex() itself only includes the prefix on some hexbytes versions)
+        hx = bytes.hex
+        # Every log in a receipt shares its transaction and block hash; hex those once
+        tx_hash = '0x' + hx(receipt['transactionHash'])
+        block_hash = '0x' + hx(receipt['blockHash'])
         receipt_dict = {
-            'transactionHash': receipt['transactionHash'].hex() if isinstance(receipt['transactionHash'], bytes) else receipt['transactionHash'],
-            'blockHash': receipt['blockHash'].hex() if isinstance(receipt['blockHash'], bytes) else receipt['blockHash'],
+            'transactionHash': tx_hash,
+            'blockHash': block_hash,
             'blockNumber': receipt['blockNumber'],
             'from': receipt['from'],
             'to': receipt['to'],
@@ -849,27 +880,21 @@ class QuestExecutor:
             'type': receipt.get('type', '0x0'),
             'effectiveGasPrice': receipt.get('effectiveGasPrice', 0),
             'transactionIndex': receipt.get('transactionIndex', 0),
-        }
-        
-        # Convert logs
-        if receipt.get('logs'):
-            converted_logs = []
-            for log in receipt['logs']:
-                converted_log = {
+            'logs': [
+                {
                     'address': log['address'],
-                    'topics': [t.hex() if isinstance(t, bytes) else t for t in log['topics']],
+                    'topics': ['0x' + hx(t) for t in log['topics']],
                     'data': log['data'],
                     'blockNumber': log['blockNumber'],
-                    'transactionHash': log['transactionHash'].hex() if isinstance(log['transactionHash'], bytes) else log['transactionHash'],
-                    'transactionIndex': log.get('transactionIndex', 0),
-                    'blockHash': log['blockHash'].hex() if isinstance(log['blockHash'], bytes) else log['blockHash'],
-                    'logIndex': log.get('logIndex', 0),
+                    'transactionHash': tx_hash,
+                    'transactionIndex': log['transactionIndex'],
+                    'blockHash': block_hash,
+                    'logIndex': log['logIndex'],
                     'removed': log.get('removed', False),
                 }
-                converted_logs.append(converted_log)
-            receipt_dict['logs'] = converted_logs
-        else:
-            receipt_dict['logs'] = []
+                for log in receipt.get('logs') or ()
+            ],
+        }
         
         return receipt_dict
     
@@ -970,24 +995,23 @@ class QuestExecutor:
         
         # Extract validator attributes
         if validator:
-            from eth_utils import to_checksum_address
             
             # Check if this is an allowance query
             if hasattr(validator, 'owner_address') and hasattr(validator, 'spender_address'):
                 # ERC20 allowance query
-                token_address = to_checksum_address(validator.token_address)
-                owner_address = to_checksum_address(validator.owner_address)
-                spender_address = to_checksum_address(validator.spender_address)
+                token_address = _checksum(validator.token_address)
+                owner_address = _checksum(validator.owner_address)
+                spender_address = _checksum(validator.spender_address)
                 
                 try:
                     # ERC20 allowance function selector: 0xdd62ed3e
                     # allowance(address owner, address spender)
-                    data = '0xdd62ed3e' + '000000000000000000000000' + owner_address[2:] + '000000000000000000000000' + spender_address[2:]
+                    data = SEL_ALLOWANCE + _encode_addr(owner_address) + _encode_addr(spender_address)
                     result = self.w3.eth.call({
                         'to': token_address,
                         'data': data
                     })
-                    allowance = int(result.hex(), 16)
+                    allowance = int.from_bytes(result, 'big')
                     state_before['allowance'] = allowance
                     
                     decimals = getattr(validator, 'token_decimals', 18)
@@ -998,21 +1022,19 @@ class QuestExecutor:
             # Check if this is an NFT approval query
             elif hasattr(validator, 'nft_address') and hasattr(validator, 'token_id'):
                 # NFT approval status query
-                from eth_abi import encode
-                nft_address = to_checksum_address(validator.nft_address)
+                nft_address = _checksum(validator.nft_address)
                 token_id = validator.token_id
                 
                 try:
                     # ERC721 getApproved function selector: 0x081812fc
                     # getApproved(uint256 tokenId)
-                    data = '0x081812fc' + encode(['uint256'], [token_id]).hex()
+                    data = SEL_GET_APPROVED + _encode_u256(token_id)
                     result = self.w3.eth.call({
                         'to': nft_address,
                         'data': data
                     })
-                    # Extract address from result (last 20 bytes)
-                    approved_address = '0x' + result.hex()[-40:]
-                    approved_address = to_checksum_address(approved_address)
+                    (approved_address,) = decode(['address'], result)
+                    approved_address = _checksum(approved_address)
                     state_before['approved_address'] = approved_address
                     
                     print(f"📊 Actual approved address (for validation): {approved_address}")
@@ -1022,7 +1044,7 @@ class QuestExecutor:
             # Check if this is a pair reserves query
             elif hasattr(validator, 'pair_address') and hasattr(validator, 'token0_address'):
                 # PancakeSwap pair reserves query
-                pair_address = to_checksum_address(validator.pair_address)
+                pair_address = _checksum(validator.pair_address)
                 
                 try:
                     # PancakePair getReserves function selector: 0x0902f1ac
@@ -1034,24 +1056,8 @@ class QuestExecutor:
                     })
                     
                     # Parse result: getReserves returns (uint112 reserve0, uint112 reserve1, uint32 blockTimestampLast)
-                    # In ABI encoding, each return value is padded to 32 bytes (64 hex chars)
-                    result_hex = result.hex()
-                    
-                    # Remove '0x' prefix if present
-                    if result_hex.startswith('0x'):
-                        result_hex = result_hex[2:]
-                    
-                    # Reserve0: first 32 bytes (64 hex chars), uint112 is right-aligned
-                    reserve0_hex = result_hex[0:64]
-                    reserve0 = int(reserve0_hex, 16)
-                    
-                    # Reserve1: next 32 bytes (64 hex chars)
-                    reserve1_hex = result_hex[64:128]
-                    reserve1 = int(reserve1_hex, 16)
-                    
-                    # blockTimestampLast: next 32 bytes (64 hex chars), uint32 is right-aligned
-                    timestamp_hex = result_hex[128:192]
-                    blockTimestampLast = int(timestamp_hex, 16)
+                    # In ABI encoding, each return value is padded to 32 bytes
+                    reserve0, reserve1, blockTimestampLast = decode(['uint112', 'uint112', 'uint32'], result)
                     
                     state_before['reserve0'] = reserve0
                     state_before['reserve1'] = reserve1
@@ -1072,12 +1078,11 @@ class QuestExecutor:
             # Check if this is a swap input amount query
             elif hasattr(validator, 'router_address') and hasattr(validator, 'token_in_address') and hasattr(validator, 'amount_out'):
                 # PancakeSwap swap input amount query
-                from eth_abi import encode
                 from decimal import Decimal
                 
-                router_address = to_checksum_address(validator.router_address)
-                token_in_address = to_checksum_address(validator.token_in_address)
-                token_out_address = to_checksum_address(validator.token_out_address)
+                router_address = _checksum(validator.router_address)
+                token_in_address = _checksum(validator.token_in_address)
+                token_out_address = _checksum(validator.token_out_address)
                 amount_out = validator.amount_out
                 token_in_decimals = getattr(validator, 'token_in_decimals', 18)
                 token_out_decimals = getattr(validator, 'token_out_decimals', 18)
@@ -1094,16 +1099,7 @@ class QuestExecutor:
                     
                     # Encode the function call
                     selector = bytes.fromhex('1f00ca74')
-                    # amountOut
-                    encoded_amount = encode(['uint256'], [amount_out_wei])
-                    # path array offset (32 bytes after amountOut = 0x40)
-                    encoded_offset = encode(['uint256'], [64])
-                    # path array length
-                    encoded_length = encode(['uint256'], [len(path)])
-                    # path elements
-                    encoded_path = encode(['address'] * len(path), path)
-                    
-                    data = '0x' + selector.hex() + encoded_amount.hex() + encoded_offset.hex() + encoded_length.hex() + encoded_path.hex()
+                    data = selector + encode(['uint256', 'address[]'], [amount_out_wei, path])
                     
                     result = self.w3.eth.call({
                         'to': router_address,
@@ -1111,33 +1107,7 @@ class QuestExecutor:
                     })
                     
                     # Parse result: dynamic array of uint256[]
-                    # For dynamic arrays in ABI encoding:
-                    # First 32 bytes (64 hex chars): offset to array data (usually 0x20 = 32)
-                    # At offset: 32 bytes for array length
-                    # Then: array elements (each 32 bytes)
-                    result_hex = result.hex()
-                    
-                    # Remove '0x' prefix if present
-                    if result_hex.startswith('0x'):
-                        result_hex = result_hex[2:]
-                    
-                    # First 32 bytes (64 chars): offset
-                    offset_hex = result_hex[0:64]
-                    offset = int(offset_hex, 16) * 2  # Convert to hex char offset
-                    
-                    # At offset: array length (32 bytes = 64 hex chars)
-                    array_length_hex = result_hex[offset:offset+64]
-                    array_length = int(array_length_hex, 16)
-                    
-                    # Parse array elements
-                    amounts = []
-                    elements_start = offset + 64
-                    for i in range(array_length):
-                        start = elements_start + (i * 64)
-                        end = start + 64
-                        amount_hex = result_hex[start:end]
-                        if amount_hex:  # Check not empty
-                            amounts.append(int(amount_hex, 16))
+                    amounts = list(decode(['uint256[]'], result)[0])
                     
                     state_before['expected_amounts'] = amounts
                     
@@ -1153,12 +1123,11 @@ class QuestExecutor:
             # Check if this is a swap output amount query
             elif hasattr(validator, 'router_address') and hasattr(validator, 'token_in_address') and hasattr(validator, 'amount_in'):
                 # PancakeSwap swap output amount query
-                from eth_abi import encode
                 from decimal import Decimal
                 
-                router_address = to_checksum_address(validator.router_address)
-                token_in_address = to_checksum_address(validator.token_in_address)
-                token_out_address = to_checksum_address(validator.token_out_address)
+                router_address = _checksum(validator.router_address)
+                token_in_address = _checksum(validator.token_in_address)
+                token_out_address = _checksum(validator.token_out_address)
                 amount_in = validator.amount_in
                 token_in_decimals = getattr(validator, 'token_in_decimals', 18)
                 token_out_decimals = getattr(validator, 'token_out_decimals', 18)
@@ -1175,16 +1144,7 @@ class QuestExecutor:
                     
                     # Encode the function call
                     selector = bytes.fromhex('d06ca61f')
-                    # amountIn
-                    encoded_amount = encode(['uint256'], [amount_in_wei])
-                    # path array offset (32 bytes after amountIn = 0x40)
-                    encoded_offset = encode(['uint256'], [64])
-                    # path array length
-                    encoded_length = encode(['uint256'], [len(path)])
-                    # path elements
-                    encoded_path = encode(['address'] * len(path), path)
-                    
-                    data = '0x' + selector.hex() + encoded_amount.hex() + encoded_offset.hex() + encoded_length.hex() + encoded_path.hex()
+                    data = selector + encode(['uint256', 'address[]'], [amount_in_wei, path])
                     
                     result = self.w3.eth.call({
                         'to': router_address,
@@ -1192,33 +1152,7 @@ class QuestExecutor:
                     })
                     
                     # Parse result: dynamic array of uint256[]
-                    # For dynamic arrays in ABI encoding:
-                    # First 32 bytes (64 hex chars): offset to array data (usually 0x20 = 32)
-                    # At offset: 32 bytes for array length
-                    # Then: array elements (each 32 bytes)
-                    result_hex = result.hex()
-                    
-                    # Remove '0x' prefix if present
-                    if result_hex.startswith('0x'):
-                        result_hex = result_hex[2:]
-                    
-                    # First 32 bytes (64 chars): offset
-                    offset_hex = result_hex[0:64]
-                    offset = int(offset_hex, 16) * 2  # Convert to hex char offset
-                    
-                    # At offset: array length (32 bytes = 64 hex chars)
-                    array_length_hex = result_hex[offset:offset+64]
-                    array_length = int(array_length_hex, 16)
-                    
-                    # Parse array elements
-                    amounts = []
-                    elements_start = offset + 64
-                    for i in range(array_length):
-                        start = elements_start + (i * 64)
-                        end = start + 64
-                        amount_hex = result_hex[start:end]
-                        if amount_hex:  # Check not empty
-                            amounts.append(int(amount_hex, 16))
+                    amounts = list(decode(['uint256[]'], result)[0])
                     
                     state_before['expected_amounts'] = amounts
                     
@@ -1234,15 +1168,13 @@ class QuestExecutor:
             # Check if this is an NFT token URI query
             elif hasattr(validator, 'nft_address') and hasattr(validator, 'token_id') and not hasattr(validator, 'expected_owner'):
                 # ERC721 NFT tokenURI query
-                from eth_abi import encode, decode
-                
-                nft_address = to_checksum_address(validator.nft_address)
+                nft_address = _checksum(validator.nft_address)
                 token_id = validator.token_id
                 
                 try:
                     # ERC721 tokenURI function selector: 0xc87b56dd
                     # tokenURI(uint256 tokenId) returns (string)
-                    data = '0xc87b56dd' + encode(['uint256'], [token_id]).hex()
+                    data = bytes.fromhex('c87b56dd') + _encode_u256(token_id)
                     result = self.w3.eth.call({
                         'to': nft_address,
                         'data': data
@@ -1265,15 +1197,13 @@ class QuestExecutor:
             # Check if this is an NFT owner query
             elif hasattr(validator, 'nft_address') and hasattr(validator, 'token_id') and hasattr(validator, 'expected_owner'):
                 # ERC721 NFT ownerOf query
-                from eth_abi import encode, decode
-                
-                nft_address = to_checksum_address(validator.nft_address)
+                nft_address = _checksum(validator.nft_address)
                 token_id = validator.token_id
                 
                 try:
                     # ERC721 ownerOf function selector: 0x6352211e
                     # ownerOf(uint256 tokenId) returns (address)
-                    data = '0x6352211e' + encode(['uint256'], [token_id]).hex()
+                    data = SEL_OWNER_OF + _encode_u256(token_id)
                     result = self.w3.eth.call({
                         'to': nft_address,
                         'data': data
@@ -1296,16 +1226,16 @@ class QuestExecutor:
             # Check if this is a token balance query (must come before total supply check)
             elif hasattr(validator, 'query_address') and hasattr(validator, 'token_address'):
                 # ERC20 balance query
-                query_address = to_checksum_address(validator.query_address)
-                token_address = to_checksum_address(validator.token_address)
+                query_address = _checksum(validator.query_address)
+                token_address = _checksum(validator.token_address)
                 try:
                     # ERC20 balanceOf function selector: 0x70a08231
-                    data = '0x70a08231' + '000000000000000000000000' + query_address[2:]
+                    data = SEL_BALANCE_OF + _encode_addr(query_address)
                     result = self.w3.eth.call({
                         'to': token_address,
                         'data': data
                     })
-                    token_balance = int(result.hex(), 16)
+                    token_balance = int.from_bytes(result, 'big')
                     state_before['token_balance'] = token_balance
                     
                     decimals = getattr(validator, 'token_decimals', 18)
@@ -1316,9 +1246,7 @@ class QuestExecutor:
             # Check if this is a token total supply query
             elif hasattr(validator, 'token_address') and hasattr(validator, 'token_decimals') and not hasattr(validator, 'expected_name'):
                 # ERC20 token totalSupply query (single function)
-                from eth_abi import decode
-                
-                token_address = to_checksum_address(validator.token_address)
+                token_address = _checksum(validator.token_address)
                 
                 try:
                     # Query totalSupply() - 0x18160ddd
@@ -1345,9 +1273,7 @@ class QuestExecutor:
             # Check if this is a token metadata query
             elif hasattr(validator, 'token_address') and hasattr(validator, 'expected_name') and hasattr(validator, 'expected_symbol'):
                 # ERC20 token metadata query
-                from eth_abi import decode
-                
-                token_address = to_checksum_address(validator.token_address)
+                token_address = _checksum(validator.token_address)
                 
                 try:
                     # Query name() - 0x06fdde03
@@ -1404,30 +1330,20 @@ class QuestExecutor:
             # Check if this is a pending rewards query
             elif hasattr(validator, 'pool_address') and hasattr(validator, 'query_address') and hasattr(validator, 'expected_pending_rewards'):
                 # SimpleRewardPool pendingReward query
-                from eth_abi import encode
-                
-                pool_address = to_checksum_address(validator.pool_address)
-                query_address = to_checksum_address(validator.query_address)
+                pool_address = _checksum(validator.pool_address)
+                query_address = _checksum(validator.query_address)
                 
                 try:
                     # SimpleRewardPool pendingReward function selector: 0xf40f0f52
                     # pendingReward(address _user) returns (uint256)
-                    data = '0xf40f0f52' + encode(['address'], [query_address]).hex()
+                    data = bytes.fromhex('f40f0f52') + _encode_addr(query_address)
                     result = self.w3.eth.call({
                         'to': pool_address,
                         'data': data
                     })
                     
                     # Parse result: uint256 (32 bytes)
-                    result_hex = result.hex()
-                    
-                    # Remove '0x' prefix if present
-                    if result_hex.startswith('0x'):
-                        result_hex = result_hex[2:]
-                    
-                    # pending rewards: 32 bytes (64 hex chars)
-                    pending_rewards_hex = result_hex[0:64]
-                    pending_rewards = int(pending_rewards_hex, 16)
+                    pending_rewards = int.from_bytes(result[:32], 'big')
                     
                     state_before['pending_rewards'] = pending_rewards
                     
@@ -1442,34 +1358,21 @@ class QuestExecutor:
             # Check if this is a staked amount query
             elif hasattr(validator, 'pool_address') and hasattr(validator, 'query_address') and hasattr(validator, 'expected_staked_amount'):
                 # Staking contract userInfo query
-                from eth_abi import encode
-                
-                pool_address = to_checksum_address(validator.pool_address)
-                query_address = to_checksum_address(validator.query_address)
+                pool_address = _checksum(validator.pool_address)
+                query_address = _checksum(validator.query_address)
                 
                 try:
                     # SimpleStaking userInfo function selector: 0x1959a002
                     # userInfo(address _user) returns (uint256 amount, uint256 depositTime)
-                    data = '0x1959a002' + encode(['address'], [query_address]).hex()
+                    data = SEL_USER_INFO + _encode_addr(query_address)
                     result = self.w3.eth.call({
                         'to': pool_address,
                         'data': data
                     })
                     
                     # Parse result: amount (uint256, 32 bytes) + depositTime (uint256, 32 bytes)
-                    result_hex = result.hex()
-                    
-                    # Remove '0x' prefix if present
-                    if result_hex.startswith('0x'):
-                        result_hex = result_hex[2:]
-                    
-                    # amount: first 32 bytes (64 hex chars)
-                    amount_hex = result_hex[0:64]
-                    staked_amount = int(amount_hex, 16)
-                    
-                    # depositTime: next 32 bytes (64 hex chars)
-                    deposit_time_hex = result_hex[64:128]
-                    deposit_time = int(deposit_time_hex, 16)
+                    staked_amount = int.from_bytes(result[:32], 'big')
+                    deposit_time = int.from_bytes(result[32:64], 'big')
                     
                     state_before['staked_amount'] = staked_amount
                     state_before['deposit_time'] = deposit_time
@@ -1486,7 +1389,7 @@ class QuestExecutor:
             # Check if this is a transaction count (nonce) query
             elif hasattr(validator, 'query_address') and not hasattr(validator, 'token_address') and not hasattr(validator, 'nft_address'):
                 # Could be BNB balance query or nonce query - check validator type
-                query_address = to_checksum_address(validator.query_address)
+                query_address = _checksum(validator.query_address)
                 
                 # Try to get nonce if this is a nonce query
                 try:
@@ -1548,8 +1451,6 @@ class QuestExecutor:
         Returns:
             Dictionary containing query result and validation result
         """
-        from eth_utils import to_checksum_address
-        
         print("="*80)
         print("🔍 Executing view call as query operation...")
         print("="*80)
@@ -1570,28 +1471,22 @@ class QuestExecutor:
             print(f"   Data: {data[:66]}..." if len(data) > 66 else f"   Data: {data}")
             
             result = self.w3.eth.call({
-                'to': to_checksum_address(to_address),
+                'to': _checksum(to_address),
                 'data': data
             })
             
-            result_hex = result.hex()
+            result_hex = '0x' + bytes(result).hex()
             print(f"   ✅ eth_call succeeded")
             print(f"   Result: {result_hex[:66]}..." if len(result_hex) > 66 else f"   Result: {result_hex}")
             
             # Parse the result based on common return types
             # For most ERC20 view functions (balance, allowance), result is uint256
             # Handle empty result (0x) which is valid for some calls
-            if result_hex == '0x' or result_hex == '' or len(result_hex) <= 2:
+            if not result:
                 result_value = 0
                 print(f"   ⚠️  Empty result (0x), treating as 0")
             else:
-                try:
-                    # Remove '0x' prefix if present, then parse
-                    hex_str = result_hex[2:] if result_hex.startswith('0x') else result_hex
-                    result_value = int(hex_str, 16) if hex_str else 0
-                except ValueError as e:
-                    print(f"   ⚠️  Failed to parse result as int: {e}, treating as 0")
-                    result_value = 0
+                result_value = int.from_bytes(result, 'big')
             
             # Build query_result in the format validators expect
             query_result = {
@@ -1634,17 +1529,17 @@ class QuestExecutor:
             try:
                 # For allowance validators
                 if hasattr(validator, 'owner_address') and hasattr(validator, 'spender_address'):
-                    token_address = to_checksum_address(validator.token_address)
-                    owner_address = to_checksum_address(validator.owner_address)
-                    spender_address = to_checksum_address(validator.spender_address)
+                    token_address = _checksum(validator.token_address)
+                    owner_address = _checksum(validator.owner_address)
+                    spender_address = _checksum(validator.spender_address)
                     
                     # ERC20 allowance
-                    allowance_data = '0xdd62ed3e' + '000000000000000000000000' + owner_address[2:] + '000000000000000000000000' + spender_address[2:]
+                    allowance_data = SEL_ALLOWANCE + _encode_addr(owner_address) + _encode_addr(spender_address)
                     allowance_result = self.w3.eth.call({
                         'to': token_address,
                         'data': allowance_data
                     })
-                    allowance = int(allowance_result.hex(), 16)
+                    allowance = int.from_bytes(allowance_result, 'big')
                     state_before['allowance'] = allowance
                     
                     decimals = getattr(validator, 'token_decimals', 18)
@@ -1652,16 +1547,16 @@ class QuestExecutor:
                 
                 # For balance validators
                 elif hasattr(validator, 'query_address') and hasattr(validator, 'token_address'):
-                    query_address = to_checksum_address(validator.query_address)
-                    token_address = to_checksum_address(validator.token_address)
+                    query_address = _checksum(validator.query_address)
+                    token_address = _checksum(validator.token_address)
                     
                     # ERC20 balanceOf
-                    balance_data = '0x70a08231' + '000000000000000000000000' + query_address[2:]
+                    balance_data = SEL_BALANCE_OF + _encode_addr(query_address)
                     balance_result = self.w3.eth.call({
                         'to': token_address,
                         'data': balance_data
                     })
-                    token_balance = int(balance_result.hex(), 16)
+                    token_balance = int.from_bytes(balance_result, 'big')
                     state_before['token_balance'] = token_balance
                     
                     decimals = getattr(validator, 'token_decimals', 18)
@@ -1669,7 +1564,7 @@ class QuestExecutor:
                 
                 # For BNB balance validators
                 elif hasattr(validator, 'query_address') and not hasattr(validator, 'token_address'):
-                    query_address = to_checksum_address(validator.query_address)
+                    query_address = _checksum(validator.query_address)
                     balance = self.w3.eth.get_balance(query_address)
                     state_before['balance'] = balance
                     print(f"📊 Actual BNB balance (for validation): {balance} wei ({balance / 10**18:.6f} BNB)")
@@ -1719,8 +1614,6 @@ class QuestExecutor:
         Returns:
             Dictionary containing query result and validation result
         """
-        from eth_utils import to_checksum_address
-        
         print("="*80)
         print("🔍 Processing direct query result...")
         print("="*80)
@@ -1745,7 +1638,7 @@ class QuestExecutor:
             try:
                 # For nonce query validators
                 if hasattr(validator, 'query_address') and not hasattr(validator, 'token_address') and not hasattr(validator, 'nft_address'):
-                    query_address = to_checksum_address(validator.query_address)
+                    query_address = _checksum(validator.query_address)
                     
                     # Get nonce
                     try:
@@ -4,69 +4,77 @@ Validator Module
 Contains validators for various atomic problems
 """
 
-from .bnb_transfer_validator import BNBTransferValidator
-from .bnb_transfer_percentage_validator import BNBTransferPercentageValidator
-from .bnb_transfer_with_message_validator import BNBTransferWithMessageValidator
-from .bnb_transfer_to_contract_validator import BNBTransferToContractValidator
-from .bnb_transfer_max_amount_validator import BNBTransferMaxAmountValidator
-from .erc20_transfer_validator import ERC20TransferValidator
-from .erc20_transfer_percentage_validator import ERC20TransferPercentageValidator
-from .erc20_approve_validator import ERC20ApproveValidator
-from .erc20_increase_allowance_validator import ERC20IncreaseAllowanceValidator
-from .erc20_decrease_allowance_validator import ERC20DecreaseAllowanceValidator
-from .erc20_burn_validator import ERC20BurnValidator
-from .erc20_revoke_approval_validator import ERC20RevokeApprovalValidator
-from .erc20_transfer_max_amount_validator import ERC20TransferMaxAmountValidator
-from .erc20_transfer_with_callback_1363_validator import ERC20TransferWithCallback1363Validator
-from .erc20_approve_and_call_1363_validator import ERC20ApproveAndCall1363Validator
-from .erc20_permit_validator import ERC20PermitValidator
-from .erc20_flashloan_validator import ERC20FlashLoanValidator
-from .erc1155_transfer_single_validator import ERC1155TransferSingleValidator
-from .erc1155_safe_transfer_with_data_validator import ERC1155SafeTransferWithDataValidator
-from .erc721_transfer_validator import ERC721TransferValidator
-from .erc721_safe_transfer_validator import ERC721SafeTransferValidator
-from .erc721_approve_validator import ERC721ApproveValidator
-from .erc721_set_approval_for_all_validator import ERC721SetApprovalForAllValidator
-from .wbnb_deposit_validator import WBNBDepositValidator
-from .wbnb_withdraw_validator import WBNBWithdrawValidator
-from .contract_call_simple_validator import ContractCallSimpleValidator
-from .contract_call_with_value_validator import ContractCallWithValueValidator
-from .contract_call_with_params_validator import ContractCallWithParamsValidator
-from .contract_delegate_call_validator import ContractDelegateCallValidator
-from .contract_payable_fallback_validator import ContractPayableFallbackValidator
-from .swap_exact_bnb_for_tokens_validator import SwapExactBNBForTokensValidator
-from .swap_exact_tokens_for_bnb_validator import SwapExactTokensForBNBValidator
-from .swap_exact_tokens_for_tokens_validator import SwapExactTokensForTokensValidator
-from .swap_tokens_for_exact_tokens_validator import SwapTokensForExactTokensValidator
-from .swap_multihop_routing_validator import SwapMultihopRoutingValidator
-from .add_liquidity_bnb_token_validator import AddLiquidityBNBTokenValidator
-from .add_liquidity_tokens_validator import AddLiquidityTokensValidator
-from .remove_liquidity_tokens_validator import RemoveLiquidityTokensValidator
-from .remove_liquidity_bnb_token_validator import RemoveLiquidityBNBTokenValidator
-from .stake_single_token_validator import StakeSingleTokenValidator
-from .stake_lp_tokens_validator import StakeLPTokensValidator
-from .unstake_lp_tokens_validator import UnstakeLPTokensValidator
-from .harvest_rewards_validator import HarvestRewardsValidator
-from .emergency_withdraw_validator import EmergencyWithdrawValidator
-from .erc20_transferfrom_basic_validator import ERC20TransferFromBasicValidator
-from .query_bnb_balance_validator import QueryBNBBalanceValidator
-from .query_erc20_balance_validator import QueryERC20BalanceValidator
-from .query_erc20_allowance_validator import QueryERC20AllowanceValidator
-from .query_nft_approval_status_validator import QueryNFTApprovalStatusValidator
-from .query_pair_reserves_validator import QueryPairReservesValidator
-from .query_swap_output_amount_validator import QuerySwapOutputAmountValidator
-from .query_swap_input_amount_validator import QuerySwapInputAmountValidator
-from .query_staked_amount_validator import QueryStakedAmountValidator
-from .query_pending_rewards_validator import QueryPendingRewardsValidator
-from .query_token_metadata_validator import QueryTokenMetadataValidator
-from .query_token_total_supply_validator import QueryTokenTotalSupplyValidator
-from .query_nft_owner_validator import QueryNFTOwnerValidator
-from .query_nft_token_uri_validator import QueryNFTTokenURIValidator
-from .query_nft_balance_validator import QueryNFTBalanceValidator
-from .query_current_block_number_validator import QueryCurrentBlockNumberValidator
-from .query_gas_price_validator import QueryGasPriceValidator
-from .query_transaction_count_nonce_validator import QueryTransactionCountNonceValidator
-from .composite_validator import CompositeValidator, validate_composite
+import importlib
+
+# Validator classes are imported on first access (PEP 562 __getattr__), so a run that
+# uses one validator does not import all of them
+_VALIDATOR_MODULES = {
+    'BNBTransferValidator': 'bnb_transfer_validator',
+    'BNBTransferPercentageValidator': 'bnb_transfer_percentage_validator',
+    'BNBTransferWithMessageValidator': 'bnb_transfer_with_message_validator',
+    'BNBTransferToContractValidator': 'bnb_transfer_to_contract_validator',
+    'BNBTransferMaxAmountValidator': 'bnb_transfer_max_amount_validator',
+    'ERC20TransferValidator': 'erc20_transfer_validator',
+    'ERC20TransferPercentageValidator': 'erc20_transfer_percentage_validator',
+    'ERC20ApproveValidator': 'erc20_approve_validator',
+    'ERC20IncreaseAllowanceValidator': 'erc20_increase_allowance_validator',
+    'ERC20DecreaseAllowanceValidator': 'erc20_decrease_allowance_validator',
+    'ERC20BurnValidator': 'erc20_burn_validator',
+    'ERC20RevokeApprovalValidator': 'erc20_revoke_approval_validator',
+    'ERC20TransferMaxAmountValidator': 'erc20_transfer_max_amount_validator',
+    'ERC20TransferWithCallback1363Validator': 'erc20_transfer_with_callback_1363_validator',
+    'ERC20ApproveAndCall1363Validator': 'erc20_approve_and_call_1363_validator',
+    'ERC20PermitValidator': 'erc20_permit_validator',
+    'ERC20FlashLoanValidator': 'erc20_flashloan_validator',
+    'ERC1155TransferSingleValidator': 'erc1155_transfer_single_validator',
+    'ERC1155SafeTransferWithDataValidator': 'erc1155_safe_transfer_with_data_validator',
+    'ERC721TransferValidator': 'erc721_transfer_validator',
+    'ERC721SafeTransferValidator': 'erc721_safe_transfer_validator',
+    'ERC721ApproveValidator': 'erc721_approve_validator',
+    'ERC721SetApprovalForAllValidator': 'erc721_set_approval_for_all_validator',
+    'WBNBDepositValidator': 'wbnb_deposit_validator',
+    'WBNBWithdrawValidator': 'wbnb_withdraw_validator',
+    'ContractCallSimpleValidator': 'contract_call_simple_validator',
+    'ContractCallWithValueValidator': 'contract_call_with_value_validator',
+    'ContractCallWithParamsValidator': 'contract_call_with_params_validator',
+    'ContractDelegateCallValidator': 'contract_delegate_call_validator',
+    'ContractPayableFallbackValidator': 'contract_payable_fallback_validator',
+    'SwapExactBNBForTokensValidator': 'swap_exact_bnb_for_tokens_validator',
+    'SwapExactTokensForBNBValidator': 'swap_exact_tokens_for_bnb_validator',
+    'SwapExactTokensForTokensValidator': 'swap_exact_tokens_for_tokens_validator',
+    'SwapTokensForExactTokensValidator': 'swap_tokens_for_exact_tokens_validator',
+    'SwapMultihopRoutingValidator': 'swap_multihop_routing_validator',
+    'AddLiquidityBNBTokenValidator': 'add_liquidity_bnb_token_validator',
+    'AddLiquidityTokensValidator': 'add_liquidity_tokens_validator',
+    'RemoveLiquidityTokensValidator': 'remove_liquidity_tokens_validator',
+    'RemoveLiquidityBNBTokenValidator': 'remove_liquidity_bnb_token_validator',
+    'StakeSingleTokenValidator': 'stake_single_token_validator',
+    'StakeLPTokensValidator': 'stake_lp_tokens_validator',
+    'UnstakeLPTokensValidator': 'unstake_lp_tokens_validator',
+    'HarvestRewardsValidator': 'harvest_rewards_validator',
+    'EmergencyWithdrawValidator': 'emergency_withdraw_validator',
+    'ERC20TransferFromBasicValidator': 'erc20_transferfrom_basic_validator',
+    'QueryBNBBalanceValidator': 'query_bnb_balance_validator',
+    'QueryERC20BalanceValidator': 'query_erc20_balance_validator',
+    'QueryERC20AllowanceValidator': 'query_erc20_allowance_validator',
+    'QueryNFTApprovalStatusValidator': 'query_nft_approval_status_validator',
+    'QueryPairReservesValidator': 'query_pair_reserves_validator',
+    'QuerySwapOutputAmountValidator': 'query_swap_output_amount_validator',
+    'QuerySwapInputAmountValidator': 'query_swap_input_amount_validator',
+    'QueryStakedAmountValidator': 'query_staked_amount_validator',
+    'QueryPendingRewardsValidator': 'query_pending_rewards_validator',
+    'QueryTokenMetadataValidator': 'query_token_metadata_validator',
+    'QueryTokenTotalSupplyValidator': 'query_token_total_supply_validator',
+    'QueryNFTOwnerValidator': 'query_nft_owner_validator',
+    'QueryNFTTokenURIValidator': 'query_nft_token_uri_validator',
+    'QueryNFTBalanceValidator': 'query_nft_balance_validator',
+    'QueryCurrentBlockNumberValidator': 'query_current_block_number_validator',
+    'QueryGasPriceValidator': 'query_gas_price_validator',
+    'QueryTransactionCountNonceValidator': 'query_transaction_count_nonce_validator',
+    'CompositeValidator': 'composite_validator',
+    'validate_composite': 'composite_validator',
+}
+
 
 __all__ = [
     'BNBTransferValidator',
@@ -135,3 +143,15 @@ __all__ = [
     'validate_composite'
 ]
 
+
+def __getattr__(name):
+    module_name = _VALIDATOR_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -18,6 +18,8 @@ from typing import Dict, Any
 class AddLiquidityBNBTokenValidator:
     """Validator for PancakeSwap addLiquidityETH operation"""
     
+    REQUIRED_STATE = frozenset({'allowance', 'balance', 'lp_token_balance', 'token_balance'})
+    
     def __init__(
         self,
         router_address: str,
@@ -18,6 +18,8 @@ from typing import Dict, Any
 class AddLiquidityTokensValidator:
     """Validator for PancakeSwap add liquidity (Token + Token) operations"""
     
+    REQUIRED_STATE = frozenset({'allowance', 'lp_token_balance', 'token_b_allowance', 'token_b_balance', 'token_balance'})
+    
     def __init__(self, **params):
         """
         Initialize validator with parameters
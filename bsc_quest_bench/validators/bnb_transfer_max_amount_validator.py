@@ -10,6 +10,8 @@ from typing import Dict, Any
 class BNBTransferMaxAmountValidator:
     """Validator for BNB maximum amount transfer"""
     
+    REQUIRED_STATE = frozenset({'balance'})
+    
     def __init__(self, to_address: str):
         """
         Initialize validator
@@ -10,6 +10,8 @@ from typing import Dict, Any, List
 class BNBTransferPercentageValidator:
     """BNB Percentage Transfer Validator"""
     
+    REQUIRED_STATE = frozenset({'balance'})
+    
     def __init__(self, to_address: str, percentage: int):
         """
         Initialize validator
@@ -48,7 +50,8 @@ class BNBTransferPercentageValidator:
         balance_before = state_before.get('balance', 0)
         
         # Calculate expected transfer amount (percentage of balance before)
-        expected_amount_wei = int(balance_before * self.percentage / 100)
+        # Integer math: wei balances exceed float precision
+        expected_amount_wei = balance_before * self.percentage // 100
         
         # Check 1: Transaction success (30 points)
         tx_success = receipt.get('status') == 1
@@ -75,16 +78,17 @@ class BNBTransferPercentageValidator:
         
         # Check 3: Transfer amount is correct percentage (30 points)
         actual_value = int(tx.get('value', 0))
+        actual_percentage = actual_value * 100 / balance_before if balance_before else 0.0
         
         # Allow 0.1% tolerance for calculation differences
-        tolerance = int(expected_amount_wei * 0.001)
+        tolerance = expected_amount_wei // 1000
         amount_correct = abs(actual_value - expected_amount_wei) <= tolerance
         
         checks.append({
             'name': 'Transfer Amount Correct',
             'passed': amount_correct,
             'message': f"Expected: {expected_amount_wei} wei ({self.percentage}% of {balance_before} wei), "
-                      f"Actual: {actual_value} wei ({actual_value/balance_before*100:.2f}% of balance)",
+                      f"Actual: {actual_value} wei ({actual_percentage:.2f}% of balance)",
             'score': 30 if amount_correct else 0
         })
         if amount_correct:
@@ -120,16 +124,17 @@ class BNBTransferPercentageValidator:
         # Balance change should equal transfer amount + gas fee
         gas_cost = gas_used * receipt.get('effectiveGasPrice', 0)
         expected_balance_change = actual_value + gas_cost
+        change_percentage = balance_change * 100 / balance_before if balance_before else 0.0
         
         # Allow 0.1% tolerance
-        balance_tolerance = int(expected_balance_change * 0.001)
+        balance_tolerance = expected_balance_change // 1000
         balance_correct = abs(balance_change - expected_balance_change) <= balance_tolerance
         
         checks.append({
             'name': 'Balance Change Correct',
             'passed': balance_correct,
             'message': f"Balance decrease: {balance_change} wei (Transfer {actual_value} + Gas {gas_cost}), "
-                      f"Balance change percentage: {balance_change/balance_before*100:.2f}%",
+                      f"Balance change percentage: {change_percentage:.2f}%",
             'score': 10 if balance_correct else 0
         })
         if balance_correct:
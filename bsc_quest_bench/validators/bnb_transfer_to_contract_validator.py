@@ -10,6 +10,8 @@ from typing import Dict, Any
 class BNBTransferToContractValidator:
     """Validator for BNB transfers to smart contract addresses"""
     
+    REQUIRED_STATE = frozenset({'contract_code_size', 'target_balance'})
+    
     def __init__(self, contract_address: str, amount: float):
         """
         Initialize validator
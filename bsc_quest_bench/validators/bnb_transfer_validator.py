@@ -10,6 +10,8 @@ from typing import Dict, Any, List
 class BNBTransferValidator:
     """BNB Transfer Validator"""
     
+    REQUIRED_STATE = frozenset({'balance'})
+    
     def __init__(self, to_address: str, amount: float):
         """
         Initialize validator
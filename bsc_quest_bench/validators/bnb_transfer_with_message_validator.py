@@ -10,6 +10,8 @@ from typing import Dict, Any
 class BNBTransferWithMessageValidator:
     """Validator for BNB transfers with attached text messages"""
     
+    REQUIRED_STATE = frozenset({'balance'})
+    
     def __init__(self, to_address: str, amount: float, message: str):
         """
         Initialize validator
@@ -25,17 +25,20 @@ class CompositeValidator:
     - Using modular scoring components from atomic validators
     """
     
-    def __init__(self, agent_address: str = None, **kwargs):
+    def __init__(self, agent_address: str = None, composite_id: str = None, **kwargs):
         """
         Initialize composite validator
         
         Args:
             agent_address: Agent's blockchain address (optional, can be set later)
+            composite_id: Composite problem ID to load right away (optional, see load_composite_definition)
             **kwargs: Additional parameters (ignored for compatibility)
         """
         self.agent_address = Web3.to_checksum_address(agent_address) if agent_address else None
         self.composite_def = None
         self.scoring_components = []
+        if composite_id:
+            self.load_composite_definition(composite_id)
     
     def load_composite_definition(self, composite_id: str) -> Dict[str, Any]:
         """
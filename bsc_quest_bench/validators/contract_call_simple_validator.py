@@ -10,6 +10,8 @@ from typing import Dict, Any
 class ContractCallSimpleValidator:
     """Validator for simple contract function calls"""
     
+    REQUIRED_STATE = frozenset({'counter_value'})
+    
     def __init__(self, contract_address: str):
         """
         Initialize validator
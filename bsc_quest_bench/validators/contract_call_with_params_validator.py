@@ -10,6 +10,8 @@ from typing import Dict, Any
 class ContractCallWithParamsValidator:
     """Validator for contract calls with parameters"""
     
+    REQUIRED_STATE = frozenset({'message_value'})
+    
     def __init__(self, contract_address: str, message: str):
         """
         Initialize validator
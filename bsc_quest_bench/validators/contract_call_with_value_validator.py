@@ -10,6 +10,8 @@ from typing import Dict, Any
 class ContractCallWithValueValidator:
     """Validator for contract calls with BNB value attached"""
     
+    REQUIRED_STATE = frozenset({'target_balance'})
+    
     def __init__(self, contract_address: str, amount: float):
         """
         Initialize validator
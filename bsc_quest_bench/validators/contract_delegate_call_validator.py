@@ -8,6 +8,8 @@ from typing import Dict, Any
 class ContractDelegateCallValidator:
     """Validate delegatecall proxy call"""
     
+    REQUIRED_STATE = frozenset({'implementation_value', 'proxy_value'})
+    
     def __init__(self, proxy_address: str, implementation_address: str, value: float):
         """
         Initialize validator
@@ -10,6 +10,8 @@ from typing import Dict, Any
 class ContractPayableFallbackValidator:
     """Validator for payable fallback/receive function calls"""
     
+    REQUIRED_STATE = frozenset({'target_balance'})
+    
     def __init__(self, contract_address: str, amount: float):
         """
         Initialize validator
@@ -3,6 +3,8 @@ from typing import Dict, Any, List
 class EmergencyWithdrawValidator:
     """Validator for emergency_withdraw operation"""
     
+    REQUIRED_STATE = frozenset({'lp_token_balance', 'staked_amount', 'token_balance'})
+    
     def __init__(self, lp_token_address: str, reward_token_address: str, 
                  pool_address: str, user_address: str, **kwargs):
         if not lp_token_address:
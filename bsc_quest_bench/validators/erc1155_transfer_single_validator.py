@@ -10,6 +10,8 @@ from typing import Dict, Any
 class ERC1155TransferSingleValidator:
     """Validate ERC1155 safeTransferFrom operation"""
     
+    REQUIRED_STATE = frozenset({'erc1155_balance', 'target_erc1155_balance'})
+    
     def __init__(
         self,
         nft_address: str,
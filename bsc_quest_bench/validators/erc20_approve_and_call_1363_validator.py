@@ -11,6 +11,8 @@ from decimal import Decimal
 class ERC20ApproveAndCall1363Validator:
     """Validate ERC1363 approveAndCall operation"""
     
+    REQUIRED_STATE = frozenset({'allowance'})
+    
     def __init__(
         self,
         token_address: str,
@@ -6,6 +6,8 @@ from typing import Dict, Any
 class ERC20ApproveValidator:
     """Validator for erc20_approve operation"""
     
+    REQUIRED_STATE = frozenset({'allowance', 'token_balance'})
+    
     def __init__(self, token_address: str, spender_address: str, 
                  amount: float, agent_address: str, token_decimals: int = 18):
         self.token_address = token_address.lower()
@@ -10,6 +10,8 @@ from typing import Dict, Any
 class ERC20BurnValidator:
     """Validator for ERC20 token burn transactions"""
     
+    REQUIRED_STATE = frozenset({'token_balance'})
+    
     def __init__(self, token_address: str, amount: float, token_decimals: int = 18):
         """
         Initialize validator
@@ -6,6 +6,8 @@ from typing import Dict, Any
 class ERC20DecreaseAllowanceValidator:
     """Validator for erc20_decrease_allowance operation"""
     
+    REQUIRED_STATE = frozenset({'allowance', 'token_balance'})
+    
     def __init__(self, token_address: str, spender_address: str, 
                  subtracted_value: float, agent_address: str, token_decimals: int = 18):
         self.token_address = token_address.lower()
@@ -10,6 +10,8 @@ from typing import Dict, Any
 class ERC20FlashLoanValidator:
     """Validate ERC20 flashloan operation"""
     
+    REQUIRED_STATE = frozenset({'token_balance'})
+    
     def __init__(
         self,
         flashloan_contract_address: str,
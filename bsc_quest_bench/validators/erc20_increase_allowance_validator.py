@@ -6,6 +6,8 @@ from typing import Dict, Any
 class ERC20IncreaseAllowanceValidator:
     """Validator for erc20_increase_allowance operation"""
     
+    REQUIRED_STATE = frozenset({'allowance', 'token_balance'})
+    
     def __init__(self, token_address: str, spender_address: str, 
                  added_value: float, agent_address: str, token_decimals: int = 18):
         self.token_address = token_address.lower()
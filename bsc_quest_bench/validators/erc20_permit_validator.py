@@ -11,6 +11,8 @@ from decimal import Decimal
 class ERC20PermitValidator:
     """Validator for EIP-2612 permit operations"""
     
+    REQUIRED_STATE = frozenset({'allowance'})
+    
     def __init__(
         self,
         token_address: str,
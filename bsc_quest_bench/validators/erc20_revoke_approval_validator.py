@@ -10,6 +10,8 @@ from typing import Dict, Any
 class ERC20RevokeApprovalValidator:
     """Validator for ERC20 revoke approval transactions"""
     
+    REQUIRED_STATE = frozenset({'allowance'})
+    
     def __init__(self, token_address: str, spender_address: str):
         """
         Initialize validator
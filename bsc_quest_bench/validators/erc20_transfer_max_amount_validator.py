@@ -10,6 +10,8 @@ from typing import Dict, Any
 class ERC20TransferMaxAmountValidator:
     """Validator for ERC20 maximum amount transfer"""
     
+    REQUIRED_STATE = frozenset({'token_balance'})
+    
     def __init__(self, token_address: str, to_address: str, token_decimals: int = 18):
         """
         Initialize validator
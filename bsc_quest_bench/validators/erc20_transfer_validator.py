@@ -10,6 +10,8 @@ from typing import Dict, Any
 class ERC20TransferValidator:
     """Validator for ERC20 token transfers"""
     
+    REQUIRED_STATE = frozenset({'target_token_balance', 'token_balance'})
+    
     def __init__(self, token_address: str, to_address: str, amount: float, token_decimals: int = 18):
         """
         Initialize validator
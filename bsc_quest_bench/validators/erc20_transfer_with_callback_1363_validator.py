@@ -11,6 +11,8 @@ from decimal import Decimal
 class ERC20TransferWithCallback1363Validator:
     """Validate ERC1363 transferAndCall operation"""
     
+    REQUIRED_STATE = frozenset({'target_token_balance', 'token_balance'})
+    
     def __init__(
         self,
         token_address: str,
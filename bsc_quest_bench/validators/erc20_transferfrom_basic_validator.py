@@ -5,6 +5,8 @@ from decimal import Decimal
 class ERC20TransferFromBasicValidator:
     """Validator for erc20_transferfrom_basic operation"""
     
+    REQUIRED_STATE = frozenset({'allowance', 'target_token_balance', 'token_balance'})
+    
     def __init__(self, token_address: str, from_address: str, to_address: str, 
                  amount: float, agent_address: str, token_decimals: int = 18):
         self.token_address = token_address.lower()
@@ -10,6 +10,8 @@ from typing import Dict, Any
 class ERC721ApproveValidator:
     """Validate ERC721 approval operation"""
     
+    REQUIRED_STATE = frozenset({'nft_approved'})
+    
     def __init__(
         self,
         nft_address: str,
@@ -10,6 +10,8 @@ from typing import Dict, Any
 class ERC721SafeTransferValidator:
     """Validate ERC721 safe transfer"""
     
+    REQUIRED_STATE = frozenset({'nft_owner'})
+    
     def __init__(
         self,
         nft_address: str,
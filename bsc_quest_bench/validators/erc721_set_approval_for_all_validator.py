@@ -10,6 +10,8 @@ from typing import Dict, Any
 class ERC721SetApprovalForAllValidator:
     """Validate ERC721 global approval operation"""
     
+    REQUIRED_STATE = frozenset({'is_approved_for_all'})
+    
     def __init__(
         self,
         nft_address: str,
@@ -10,6 +10,8 @@ from typing import Dict, Any
 class ERC721TransferValidator:
     """Validator for ERC721 NFT transfer transactions"""
     
+    REQUIRED_STATE = frozenset({'nft_owner'})
+    
     def __init__(self, nft_address: str, to_address: str, token_id: int, **kwargs):
         """
         Initialize validator
@@ -12,6 +12,8 @@ from typing import Dict, Any, List
 class HarvestRewardsValidator:
     """Validator for harvesting farming rewards"""
     
+    REQUIRED_STATE = frozenset({'token_balance'})
+    
     def __init__(self, reward_token_address: str, pool_address: str, user_address: str, **kwargs):
         """
         Initialize validator with parameters
@@ -18,6 +18,8 @@ from typing import Dict, Any
 class RemoveLiquidityBNBTokenValidator:
     """Validator for PancakeSwap removeLiquidityETH operation"""
     
+    REQUIRED_STATE = frozenset({'balance', 'lp_allowance', 'lp_token_balance', 'token_balance'})
+    
     def __init__(
         self,
         router_address: str,
@@ -19,6 +19,8 @@ from eth_utils import to_checksum_address
 class RemoveLiquidityTokensValidator:
     """Validator for removing liquidity from Token-Token pool"""
     
+    REQUIRED_STATE = frozenset({'lp_allowance', 'lp_token_balance', 'target_token_balance', 'token_balance'})
+    
     def __init__(self, **params):
         """
         Initialize validator with parameters
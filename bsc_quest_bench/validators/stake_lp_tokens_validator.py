@@ -14,6 +14,8 @@ from typing import Dict, Any, List
 class StakeLPTokensValidator:
     """Validator for staking LP tokens to farming pool"""
     
+    REQUIRED_STATE = frozenset({'lp_allowance', 'lp_token_balance', 'staked_amount'})
+    
     def __init__(self, stake_amount: float, lp_token_address: str, pool_address: str, user_address: str, **kwargs):
         """
         Initialize validator with parameters
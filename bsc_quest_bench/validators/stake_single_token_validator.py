@@ -14,6 +14,8 @@ from typing import Dict, Any, List
 class StakeSingleTokenValidator:
     """Validator for staking single token to CAKE Pool"""
     
+    REQUIRED_STATE = frozenset({'allowance', 'staked_amount', 'token_balance'})
+    
     def __init__(self, stake_amount: float, token_address: str, pool_address: str, user_address: str, **kwargs):
         """
         Initialize validator with parameters
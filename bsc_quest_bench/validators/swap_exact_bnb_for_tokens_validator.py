@@ -11,6 +11,8 @@ from decimal import Decimal
 class SwapExactBNBForTokensValidator:
     """Validator for PancakeSwap swapExactETHForTokens operation"""
     
+    REQUIRED_STATE = frozenset({'balance', 'token_balance'})
+    
     def __init__(
         self,
         router_address: str,
@@ -11,6 +11,8 @@ from decimal import Decimal
 class SwapExactTokensForBNBValidator:
     """Validator for PancakeSwap swapExactTokensForETH operation"""
     
+    REQUIRED_STATE = frozenset({'allowance', 'balance', 'token_balance'})
+    
     def __init__(
         self,
         router_address: str,
@@ -11,6 +11,8 @@ from decimal import Decimal
 class SwapExactTokensForTokensValidator:
     """Validator for PancakeSwap swapExactTokensForTokens operation"""
     
+    REQUIRED_STATE = frozenset({'allowance', 'target_token_balance', 'token_balance'})
+    
     def __init__(
         self,
         router_address: str,
@@ -18,6 +18,8 @@ from typing import Dict, Any, List
 class SwapMultihopRoutingValidator:
     """Validator for PancakeSwap multi-hop routing swap"""
     
+    REQUIRED_STATE = frozenset({'allowance', 'target_token_balance', 'token_balance'})
+    
     def __init__(
         self,
         router_address: str,
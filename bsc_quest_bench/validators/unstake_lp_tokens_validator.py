@@ -11,6 +11,8 @@ from decimal import Decimal
 class UnstakeLPTokensValidator:
     """Validator for unstake LP tokens operation"""
     
+    REQUIRED_STATE = frozenset({'lp_token_balance', 'staked_amount'})
+    
     def __init__(
         self,
         pool_address: str,
@@ -10,6 +10,8 @@ from typing import Dict, Any
 class WBNBDepositValidator:
     """Validator for WBNB deposit transactions"""
     
+    REQUIRED_STATE = frozenset({'token_balance'})
+    
     def __init__(self, wbnb_address: str, amount: float):
         """
         Initialize validator
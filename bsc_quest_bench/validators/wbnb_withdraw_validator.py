@@ -10,6 +10,8 @@ from typing import Dict, Any
 class WBNBWithdrawValidator:
     """Validator for WBNB withdraw transactions"""
     
+    REQUIRED_STATE = frozenset({'balance', 'token_balance'})
+    
     def __init__(self, wbnb_address: str, amount: float, **kwargs):
         """
         Initialize validator
@@ -16,154 +16,347 @@ Usage:
     
     # Resume from a specific question index (0-based)
     python run_quest_bench.py --model gpt-4o --type atomic --start-index 25
+    
+    # Run 4 atomic questions at a time, each on its own Anvil fork
+    python run_quest_bench.py --model gpt-4o --type atomic --concurrency 4
+    
+    # Stay under a provider limit of 500 requests / 200k tokens per minute
+    python run_quest_bench.py --model gpt-4o --type atomic --concurrency 8 --rpm 500 --tpm 200000
 
 All tests run in Anvil Fork Mode with complete environment isolation.
 """
 
 import argparse
 import asyncio
+import hashlib
+import importlib
+import inspect
 import sys
 import json
+import os
 import random
+import time
 from datetime import datetime
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 
 # Add project root to path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
 # Direct imports from current directory
-from bsc_quest_bench.quest_controller import QuestController
+from bsc_quest_bench.quest_controller import QuestController, create_llm
 from bsc_quest_bench.quest_env import QuestEnvironment
-from bsc_quest_bench.validators import *
-from bsc_quest_bench.validators import CompositeValidator
-import glob
+from bsc_quest_bench.llm_cache import LLMResponseCache
+from bsc_quest_bench.validators.composite_validator import CompositeValidator
+
+try:
+    import orjson  # Optional: much faster JSON for results with long LLM responses
+except ImportError:
+    orjson = None
 
 # Helper functions to work with question bank
+QUESTION_BANK_DIR = project_root / 'bsc_quest_bench' / 'question_bank'
+
+def _scan_bank(root: Path) -> Tuple[List[str], List[str], Dict[str, Path]]:
+    """
+    Classify every question file under the question bank in one os.scandir walk
+    
+    Returns:
+        (atomic_ids, composite_ids, path_by_id); atomic IDs exclude anything under
+        composite_problems, composite IDs are the files directly in it
+    """
+    atomic_ids, composite_ids, path_by_id = [], [], {}
+    root = str(root)
+    
+    def walk(directory: str, bucket: Optional[List[str]]):
+        # bucket is the ID list this directory's files belong to (None: indexed only)
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    if entry.name == 'composite_problems':
+                        child_bucket = composite_ids if directory == root else None
+                    else:
+                        child_bucket = None if bucket is composite_ids else bucket
+                    walk(entry.path, child_bucket)
+                elif entry.name.endswith('.json') and entry.is_file():
+                    question_id = entry.name[:-len('.json')]
+                    path_by_id.setdefault(question_id, Path(entry.path))
+                    if bucket is not None:
+                        bucket.append(question_id)
+    
+    walk(root, atomic_ids)
+    return sorted(atomic_ids), sorted(composite_ids), path_by_id
+
+
+_ATOMIC_IDS, _COMPOSITE_IDS, _QUESTION_INDEX = _scan_bank(QUESTION_BANK_DIR)
+_ALL_IDS = tuple(sorted(set(_ATOMIC_IDS) | set(_COMPOSITE_IDS)))
+
+
 def get_all_atomic_question_ids() -> List[str]:
     """Get all atomic question IDs from question bank (excludes composite_problems)"""
-    question_files = glob.glob(str(project_root / 'bsc_quest_bench' / 'question_bank' / '**' / '*.json'), recursive=True)
-    question_ids = []
-    for filepath in question_files:
-        # Exclude composite_problems directory
-        if 'composite_problems' in filepath:
-            continue
-        filename = Path(filepath).stem
-        question_ids.append(filename)
-    return sorted(question_ids)
+    return list(_ATOMIC_IDS)
 
 
 def get_all_composite_question_ids() -> List[str]:
     """Get all composite question IDs from question bank"""
-    question_files = glob.glob(str(project_root / 'bsc_quest_bench' / 'question_bank' / 'composite_problems' / '*.json'), recursive=True)
-    question_ids = []
-    for filepath in question_files:
-        filename = Path(filepath).stem
-        question_ids.append(filename)
-    return sorted(question_ids)
+    return list(_COMPOSITE_IDS)
 
 
 def get_all_question_ids() -> List[str]:
     """Get all question IDs from question bank (atomic + composite)"""
-    return sorted(get_all_atomic_question_ids() + get_all_composite_question_ids())
+    return list(_ALL_IDS)
 
 def get_question_path(question_id: str) -> Optional[Path]:
     """Get path to question JSON file"""
-    question_files = glob.glob(str(project_root / 'bsc_quest_bench' / 'question_bank' / '**' / f'{question_id}.json'), recursive=True)
-    if question_files:
-        return Path(question_files[0])
-    return None
+    return _QUESTION_INDEX.get(question_id)
 
-# Validator Registry - maps question_id to validator class
+# Validator Registry - maps question_id to 'module:ClassName'; classes are imported on first use
 VALIDATOR_REGISTRY = {
-        'bnb_transfer_basic': BNBTransferValidator,
-        'bnb_transfer_percentage': BNBTransferPercentageValidator,
-        'bnb_transfer_with_message': BNBTransferWithMessageValidator,
-        'bnb_transfer_to_contract': BNBTransferToContractValidator,
-        'bnb_transfer_max_amount': BNBTransferMaxAmountValidator,
-        'erc20_transfer_fixed': ERC20TransferValidator,
-        'erc20_transfer_percentage': ERC20TransferPercentageValidator,
-        'erc20_approve': ERC20ApproveValidator,
-        'erc20_increase_allowance': ERC20IncreaseAllowanceValidator,
-        'erc20_decrease_allowance': ERC20DecreaseAllowanceValidator,
-        'erc20_burn': ERC20BurnValidator,
-        'erc20_revoke_approval': ERC20RevokeApprovalValidator,
-        'erc20_transfer_max_amount': ERC20TransferMaxAmountValidator,
-        'erc20_transfer_with_callback_1363': ERC20TransferWithCallback1363Validator,
-        'erc20_approve_and_call_1363': ERC20ApproveAndCall1363Validator,
-        'erc20_permit': ERC20PermitValidator,
-        'erc20_flashloan': ERC20FlashLoanValidator,
-        'erc1155_transfer_single': ERC1155TransferSingleValidator,
-        'erc1155_safe_transfer_with_data': ERC1155SafeTransferWithDataValidator,
-        'erc721_transfer': ERC721TransferValidator,
-        'erc721_safe_transfer': ERC721SafeTransferValidator,
-        'erc721_approve': ERC721ApproveValidator,
-        'erc721_set_approval_for_all': ERC721SetApprovalForAllValidator,
-        'wbnb_deposit': WBNBDepositValidator,
-        'wbnb_withdraw': WBNBWithdrawValidator,
-        'contract_call_simple': ContractCallSimpleValidator,
-        'contract_call_with_value': ContractCallWithValueValidator,
-        'contract_call_with_params': ContractCallWithParamsValidator,
-        'contract_delegate_call': ContractDelegateCallValidator,
-        'contract_payable_fallback': ContractPayableFallbackValidator,
-        'swap_exact_bnb_for_tokens': SwapExactBNBForTokensValidator,
-        'swap_exact_tokens_for_bnb': SwapExactTokensForBNBValidator,
-        'swap_exact_tokens_for_tokens': SwapExactTokensForTokensValidator,
-        'swap_tokens_for_exact_tokens': SwapTokensForExactTokensValidator,
-        'swap_multihop_routing': SwapMultihopRoutingValidator,
-        'add_liquidity_bnb_token': AddLiquidityBNBTokenValidator,
-        'add_liquidity_tokens': AddLiquidityTokensValidator,
-        'remove_liquidity_tokens': RemoveLiquidityTokensValidator,
-        'remove_liquidity_bnb_token': RemoveLiquidityBNBTokenValidator,
-        'stake_single_token': StakeSingleTokenValidator,
-        'stake_lp_tokens': StakeLPTokensValidator,
-        'unstake_lp_tokens': UnstakeLPTokensValidator,
-        'harvest_rewards': HarvestRewardsValidator,
-        'emergency_withdraw': EmergencyWithdrawValidator,
-        'erc20_transferfrom_basic': ERC20TransferFromBasicValidator,
-        'query_bnb_balance': QueryBNBBalanceValidator,
-        'query_erc20_balance': QueryERC20BalanceValidator,
-        'query_erc20_allowance': QueryERC20AllowanceValidator,
-        'query_nft_approval_status': QueryNFTApprovalStatusValidator,
-        'query_pair_reserves': QueryPairReservesValidator,
-        'query_swap_output_amount': QuerySwapOutputAmountValidator,
-        'query_swap_input_amount': QuerySwapInputAmountValidator,
-        'query_staked_amount': QueryStakedAmountValidator,
-        'query_pending_rewards': QueryPendingRewardsValidator,
-        'query_token_metadata': QueryTokenMetadataValidator,
-        'query_token_total_supply': QueryTokenTotalSupplyValidator,
-        'query_nft_owner': QueryNFTOwnerValidator,
-        'query_nft_token_uri': QueryNFTTokenURIValidator,
-        'query_nft_balance': QueryNFTBalanceValidator,
-        'query_current_block_number': QueryCurrentBlockNumberValidator,
-        'query_gas_price': QueryGasPriceValidator,
-        'query_transaction_count_nonce': QueryTransactionCountNonceValidator
+        'bnb_transfer_basic': 'bsc_quest_bench.validators.bnb_transfer_validator:BNBTransferValidator',
+        'bnb_transfer_percentage': 'bsc_quest_bench.validators.bnb_transfer_percentage_validator:BNBTransferPercentageValidator',
+        'bnb_transfer_with_message': 'bsc_quest_bench.validators.bnb_transfer_with_message_validator:BNBTransferWithMessageValidator',
+        'bnb_transfer_to_contract': 'bsc_quest_bench.validators.bnb_transfer_to_contract_validator:BNBTransferToContractValidator',
+        'bnb_transfer_max_amount': 'bsc_quest_bench.validators.bnb_transfer_max_amount_validator:BNBTransferMaxAmountValidator',
+        'erc20_transfer_fixed': 'bsc_quest_bench.validators.erc20_transfer_validator:ERC20TransferValidator',
+        'erc20_transfer_percentage': 'bsc_quest_bench.validators.erc20_transfer_percentage_validator:ERC20TransferPercentageValidator',
+        'erc20_approve': 'bsc_quest_bench.validators.erc20_approve_validator:ERC20ApproveValidator',
+        'erc20_increase_allowance': 'bsc_quest_bench.validators.erc20_increase_allowance_validator:ERC20IncreaseAllowanceValidator',
+        'erc20_decrease_allowance': 'bsc_quest_bench.validators.erc20_decrease_allowance_validator:ERC20DecreaseAllowanceValidator',
+        'erc20_burn': 'bsc_quest_bench.validators.erc20_burn_validator:ERC20BurnValidator',
+        'erc20_revoke_approval': 'bsc_quest_bench.validators.erc20_revoke_approval_validator:ERC20RevokeApprovalValidator',
+        'erc20_transfer_max_amount': 'bsc_quest_bench.validators.erc20_transfer_max_amount_validator:ERC20TransferMaxAmountValidator',
+        'erc20_transfer_with_callback_1363': 'bsc_quest_bench.validators.erc20_transfer_with_callback_1363_validator:ERC20TransferWithCallback1363Validator',
+        'erc20_approve_and_call_1363': 'bsc_quest_bench.validators.erc20_approve_and_call_1363_validator:ERC20ApproveAndCall1363Validator',
+        'erc20_permit': 'bsc_quest_bench.validators.erc20_permit_validator:ERC20PermitValidator',
+        'erc20_flashloan': 'bsc_quest_bench.validators.erc20_flashloan_validator:ERC20FlashLoanValidator',
+        'erc1155_transfer_single': 'bsc_quest_bench.validators.erc1155_transfer_single_validator:ERC1155TransferSingleValidator',
+        'erc1155_safe_transfer_with_data': 'bsc_quest_bench.validators.erc1155_safe_transfer_with_data_validator:ERC1155SafeTransferWithDataValidator',
+        'erc721_transfer': 'bsc_quest_bench.validators.erc721_transfer_validator:ERC721TransferValidator',
+        'erc721_safe_transfer': 'bsc_quest_bench.validators.erc721_safe_transfer_validator:ERC721SafeTransferValidator',
+        'erc721_approve': 'bsc_quest_bench.validators.erc721_approve_validator:ERC721ApproveValidator',
+        'erc721_set_approval_for_all': 'bsc_quest_bench.validators.erc721_set_approval_for_all_validator:ERC721SetApprovalForAllValidator',
+        'wbnb_deposit': 'bsc_quest_bench.validators.wbnb_deposit_validator:WBNBDepositValidator',
+        'wbnb_withdraw': 'bsc_quest_bench.validators.wbnb_withdraw_validator:WBNBWithdrawValidator',
+        'contract_call_simple': 'bsc_quest_bench.validators.contract_call_simple_validator:ContractCallSimpleValidator',
+        'contract_call_with_value': 'bsc_quest_bench.validators.contract_call_with_value_validator:ContractCallWithValueValidator',
+        'contract_call_with_params': 'bsc_quest_bench.validators.contract_call_with_params_validator:ContractCallWithParamsValidator',
+        'contract_delegate_call': 'bsc_quest_bench.validators.contract_delegate_call_validator:ContractDelegateCallValidator',
+        'contract_payable_fallback': 'bsc_quest_bench.validators.contract_payable_fallback_validator:ContractPayableFallbackValidator',
+        'swap_exact_bnb_for_tokens': 'bsc_quest_bench.validators.swap_exact_bnb_for_tokens_validator:SwapExactBNBForTokensValidator',
+        'swap_exact_tokens_for_bnb': 'bsc_quest_bench.validators.swap_exact_tokens_for_bnb_validator:SwapExactTokensForBNBValidator',
+        'swap_exact_tokens_for_tokens': 'bsc_quest_bench.validators.swap_exact_tokens_for_tokens_validator:SwapExactTokensForTokensValidator',
+        'swap_tokens_for_exact_tokens': 'bsc_quest_bench.validators.swap_tokens_for_exact_tokens_validator:SwapTokensForExactTokensValidator',
+        'swap_multihop_routing': 'bsc_quest_bench.validators.swap_multihop_routing_validator:SwapMultihopRoutingValidator',
+        'add_liquidity_bnb_token': 'bsc_quest_bench.validators.add_liquidity_bnb_token_validator:AddLiquidityBNBTokenValidator',
+        'add_liquidity_tokens': 'bsc_quest_bench.validators.add_liquidity_tokens_validator:AddLiquidityTokensValidator',
+        'remove_liquidity_tokens': 'bsc_quest_bench.validators.remove_liquidity_tokens_validator:RemoveLiquidityTokensValidator',
+        'remove_liquidity_bnb_token': 'bsc_quest_bench.validators.remove_liquidity_bnb_token_validator:RemoveLiquidityBNBTokenValidator',
+        'stake_single_token': 'bsc_quest_bench.validators.stake_single_token_validator:StakeSingleTokenValidator',
+        'stake_lp_tokens': 'bsc_quest_bench.validators.stake_lp_tokens_validator:StakeLPTokensValidator',
+        'unstake_lp_tokens': 'bsc_quest_bench.validators.unstake_lp_tokens_validator:UnstakeLPTokensValidator',
+        'harvest_rewards': 'bsc_quest_bench.validators.harvest_rewards_validator:HarvestRewardsValidator',
+        'emergency_withdraw': 'bsc_quest_bench.validators.emergency_withdraw_validator:EmergencyWithdrawValidator',
+        'erc20_transferfrom_basic': 'bsc_quest_bench.validators.erc20_transferfrom_basic_validator:ERC20TransferFromBasicValidator',
+        'query_bnb_balance': 'bsc_quest_bench.validators.query_bnb_balance_validator:QueryBNBBalanceValidator',
+        'query_erc20_balance': 'bsc_quest_bench.validators.query_erc20_balance_validator:QueryERC20BalanceValidator',
+        'query_erc20_allowance': 'bsc_quest_bench.validators.query_erc20_allowance_validator:QueryERC20AllowanceValidator',
+        'query_nft_approval_status': 'bsc_quest_bench.validators.query_nft_approval_status_validator:QueryNFTApprovalStatusValidator',
+        'query_pair_reserves': 'bsc_quest_bench.validators.query_pair_reserves_validator:QueryPairReservesValidator',
+        'query_swap_output_amount': 'bsc_quest_bench.validators.query_swap_output_amount_validator:QuerySwapOutputAmountValidator',
+        'query_swap_input_amount': 'bsc_quest_bench.validators.query_swap_input_amount_validator:QuerySwapInputAmountValidator',
+        'query_staked_amount': 'bsc_quest_bench.validators.query_staked_amount_validator:QueryStakedAmountValidator',
+        'query_pending_rewards': 'bsc_quest_bench.validators.query_pending_rewards_validator:QueryPendingRewardsValidator',
+        'query_token_metadata': 'bsc_quest_bench.validators.query_token_metadata_validator:QueryTokenMetadataValidator',
+        'query_token_total_supply': 'bsc_quest_bench.validators.query_token_total_supply_validator:QueryTokenTotalSupplyValidator',
+        'query_nft_owner': 'bsc_quest_bench.validators.query_nft_owner_validator:QueryNFTOwnerValidator',
+        'query_nft_token_uri': 'bsc_quest_bench.validators.query_nft_token_uri_validator:QueryNFTTokenURIValidator',
+        'query_nft_balance': 'bsc_quest_bench.validators.query_nft_balance_validator:QueryNFTBalanceValidator',
+        'query_current_block_number': 'bsc_quest_bench.validators.query_current_block_number_validator:QueryCurrentBlockNumberValidator',
+        'query_gas_price': 'bsc_quest_bench.validators.query_gas_price_validator:QueryGasPriceValidator',
+        'query_transaction_count_nonce': 'bsc_quest_bench.validators.query_transaction_count_nonce_validator:QueryTransactionCountNonceValidator'
 }
 
-def create_validator_factory(question_id: str):
-    """Create validator for a question"""
-    import inspect
-    
-    validator_class = VALIDATOR_REGISTRY.get(question_id)
-    if not validator_class:
-        raise ValueError(f"No validator found for question: {question_id}")
+@lru_cache(maxsize=None)
+def _init_params(validator_class) -> Tuple[frozenset, bool]:
+    """Parameter names a validator's __init__ accepts, and whether it takes **kwargs"""
+    sig = inspect.signature(validator_class.__init__)
+    accepts_kwargs = any(p.kind == inspect.Parameter.VAR_KEYWORD for p in sig.parameters.values())
+    return frozenset(sig.parameters), accepts_kwargs
+
+
+@lru_cache(maxsize=None)
+def _load_validator_class(target: str):
+    """Import a 'module:ClassName' VALIDATOR_REGISTRY entry"""
+    module_name, class_name = target.split(':')
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+@lru_cache(maxsize=None)
+def create_validator_factory(validator_class):
+    """Create a validator factory that passes each validator only the params its __init__ accepts"""
+    # Parsed once per validator class rather than on every instantiation
+    param_names, accepts_kwargs = _init_params(validator_class)
 
     def factory(**params):
-        # Get the validator's __init__ signature
-        sig = inspect.signature(validator_class.__init__)
         # Filter params to only include those accepted by __init__
-        valid_params = {}
-        for param_name, param_value in params.items():
-            if param_name in sig.parameters or any(
-                p.kind == inspect.Parameter.VAR_KEYWORD for p in sig.parameters.values()
-            ):
-                valid_params[param_name] = param_value
+        valid_params = params if accepts_kwargs else {k: v for k, v in params.items() if k in param_names}
         return validator_class(**valid_params)
 
     return factory
 
 
+# Smoothed per-question run times from earlier runs, used to start long questions first
+TIMINGS_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'quest_bench', 'timings.json')
+TIMINGS_EMA_ALPHA = 0.3
+
+
+def _load_timings() -> Dict[str, float]:
+    """Read TIMINGS_PATH; a missing or unreadable file means no history"""
+    try:
+        with open(TIMINGS_PATH, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_timings(durations: Dict[str, float]):
+    """Fold this run's question durations (seconds) into TIMINGS_PATH as an EMA"""
+    timings = _load_timings()
+    for question_id, elapsed in durations.items():
+        previous = timings.get(question_id)
+        timings[question_id] = elapsed if previous is None else (
+            TIMINGS_EMA_ALPHA * elapsed + (1 - TIMINGS_EMA_ALPHA) * previous)
+    try:
+        os.makedirs(os.path.dirname(TIMINGS_PATH), exist_ok=True)
+        tmp_path = f"{TIMINGS_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(timings, f)
+        os.replace(tmp_path, TIMINGS_PATH)
+    except OSError as e:
+        print(f"⚠️  Could not save question timings: {e}")
+
+
+def _shared_http_client(concurrency: int = 1):
+    """
+    Shared HTTP client for OpenAI-compatible LLM APIs
+    
+    Idle connections are kept for a minute so the TLS session survives the Anvil
+    reset between questions, and the pool is sized for the run's concurrency.
+    Concurrent questions multiplex over one HTTP/2 connection when h2 is installed.
+    Returns None (each client keeps its default pool) if httpx is unavailable.
+    
+    Args:
+        concurrency: Questions that may call the LLM at once
+    """
+    try:
+        import httpx
+    except ImportError:
+        return None
+    try:
+        import h2  # noqa: F401 - required by httpx for http2=True
+        http2 = True
+    except ImportError:
+        http2 = False
+    pool_size = max(64, concurrency * 2)
+    limits = httpx.Limits(max_keepalive_connections=pool_size, max_connections=pool_size,
+                          keepalive_expiry=60.0)
+    return httpx.AsyncClient(http2=http2, limits=limits)
+
+
+def load_results_stream(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Read the per-question results JSONL written by an earlier (possibly interrupted) run
+    
+    Args:
+        path: quest_bench_*.jsonl file
+        
+    Returns:
+        Dict mapping question_id -> recorded result
+    """
+    completed = {}
+    with open(path, 'rb') as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue  # A run killed mid-write can leave a truncated last line
+            completed[result['question_id']] = result
+    return completed
+
+
+def _json_bytes(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize results to UTF-8 JSON, with orjson when it is installed
+    
+    Args:
+        obj: JSON-compatible object
+        indent: Pretty-print with 2-space indentation
+        
+    Returns:
+        Encoded JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0))
+        except TypeError:
+            pass  # orjson rejects ints beyond 64 bits (wei amounts); the stdlib handles them
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket that paces LLM calls below a requests-per-minute and tokens-per-minute budget
+    
+    Both buckets refill continuously; acquire() sleeps until the call fits instead of
+    letting the provider answer with 429s and backoff retries.
+    """
+    
+    def __init__(self, rpm: Optional[int] = None, tpm: Optional[int] = None):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = float(rpm or 0)
+        self._tokens = float(tpm or 0)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()  # Callers queue up in order behind the one waiting
+    
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.rpm:
+            self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        if self.tpm:
+            self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+    
+    async def acquire(self, tokens: int = 0):
+        """
+        Wait until one request using about `tokens` tokens fits in the budget, then spend it
+        
+        Args:
+            tokens: Estimated prompt + completion tokens of the call
+        """
+        # A call larger than the whole minute budget only waits for a full bucket
+        tokens = min(tokens, self.tpm) if self.tpm else 0
+        async with self._lock:
+            while True:
+                self._refill()
+                wait = 0.0
+                if self.rpm and self._requests < 1:
+                    wait = (1 - self._requests) * 60 / self.rpm
+                if self.tpm and self._tokens < tokens:
+                    wait = max(wait, (tokens - self._tokens) * 60 / self.tpm)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            
+            if self.rpm:
+                self._requests -= 1
+            if self.tpm:
+                self._tokens -= tokens
+
+
 class TeeWriter:
     """Writer that outputs to both console and file simultaneously"""
     
@@ -176,12 +369,12 @@ class TeeWriter:
         # Write to original stream (console)
         self.original_stream.write(message)
         # Write to log file
-        if self.log_file and not self.log_file.closed:
+        if self.log_file:
             try:
+                # Buffered; flushed at question boundaries and on close
                 self.log_file.write(message)
-                self.log_file.flush()  # Ensure real-time writing
             except Exception:
-                pass  # Ignore write errors to log file
+                pass  # Ignore write errors to log file (including writes after it was closed)
     
     def flush(self):
         self.original_stream.flush()
@@ -204,20 +397,39 @@ class QuestBenchRunner:
     def __init__(self, model_name: str, api_key: Optional[str] = None,
                  base_url: Optional[str] = None, fork_url: str = "https://bsc-dataseed.binance.org",
                  run_index: int = 0, naive_mode: bool = False, start_index: int = 0,
-                 failed_log_file = None, rerun_indices: Optional[set] = None,
-                 nl_difficulty: str = "random", library: str = "ethers"):
+                 failed_log_file = None, results_stream_file = None, responses_dir: Optional[Path] = None,
+                 rerun_indices: Optional[set] = None,
+                 nl_difficulty: str = "random", library: str = "ethers", concurrency: int = 1,
+                 batch_api: bool = False, rpm: Optional[int] = None, tpm: Optional[int] = None,
+                 llm_cache: bool = False, resumed_results: Optional[Dict[str, Dict[str, Any]]] = None,
+                 seed: Optional[int] = None, fork_block_number: Optional[int] = None,
+                 state_cache: bool = False):
         self.model_name = model_name
         self.api_key = api_key
         self.base_url = base_url
         self.fork_url = fork_url
+        self.fork_block_number = fork_block_number  # Pin every fork to one block (None: latest)
+        self.state_cache = state_cache  # Restore post-setup Anvil state dumped by an earlier run (pinned forks only)
         self.run_index = run_index
         self.naive_mode = naive_mode
         self.start_index = start_index
         self.failed_log_file = failed_log_file  # For real-time failed log writing
         self.failed_count = 0
+        self.results_stream_file = results_stream_file  # JSONL, one line per finished question
+        self.responses_dir = responses_dir  # Raw LLM responses are written here instead of kept in results
         self.rerun_indices = rerun_indices  # Set of indices to rerun (None = run all)
         self.nl_difficulty = nl_difficulty  # NL template difficulty
         self.library = library  # JavaScript library (ethers or viem)
+        self.concurrency = concurrency  # Atomic questions run at once, each on its own Anvil fork
+        self.batch_api = batch_api  # Send atomic LLM calls as one OpenAI Batch API job
+        # Shared by every controller so concurrent questions pace their LLM calls together
+        self.rate_limiter = AsyncTokenBucket(rpm=rpm, tpm=tpm) if rpm or tpm else None
+        self.llm_cache = LLMResponseCache() if llm_cache else None  # Reuse identical LLM calls across runs
+        self.resumed = resumed_results or {}  # question_id -> result recorded by an interrupted run
+        self.llm = None  # One LLM client shared by every controller, built on first use
+        self.http_client = None  # Connection pool behind self.llm, when httpx is available
+        self.seed = seed  # Also seeds each question's parameters and the env test and rich accounts (None: random)
+        self.rng = random.Random(seed)  # Question sampling; a fixed seed picks the same subset every run
         
         # Results storage
         self.results = {
@@ -232,10 +444,41 @@ class QuestBenchRunner:
             'failure_count': 0,
             'metadata': {
                 'fork_url': fork_url,
-                'base_url': base_url
+                'fork_block_number': fork_block_number,
+                'base_url': base_url,
+                'seed': seed
             }
         }
     
+    def _offload_llm_response(self, result: Dict[str, Any]):
+        """Move a result's raw LLM responses (incl. composite rounds) to text files, keeping only their paths"""
+        if not self.responses_dir:
+            return
+        
+        # (dict holding an llm_response, file stem) for the answer and every composite round
+        holders = [(result, result['question_id'])]
+        for i, round_data in enumerate(result.get('interaction_history') or [], 1):
+            if isinstance(round_data, dict):
+                holders.append((round_data, f"{result['question_id']}_round{i}"))
+        
+        for holder, stem in holders:
+            llm_response = holder.get('llm_response')
+            if not llm_response:
+                continue
+            self.responses_dir.mkdir(parents=True, exist_ok=True)
+            path = self.responses_dir / f"{stem}.txt"
+            path.write_text(llm_response, encoding='utf-8')
+            del holder['llm_response']
+            holder['llm_response_path'] = str(path)
+    
+    def _stream_result(self, result: Dict[str, Any]):
+        """Append a finished question's result to the JSONL stream so a crashed run keeps its progress"""
+        if not self.results_stream_file:
+            return
+        
+        self.results_stream_file.write(_json_bytes(result) + b"\n")
+        self.results_stream_file.flush()
+    
     def _write_failed_test_log(self, result: Dict[str, Any]):
         """Write failed test result to log file in real-time with complete details"""
         if not self.failed_log_file or result.get('validation_passed', False):
@@ -377,92 +620,269 @@ class QuestBenchRunner:
         
         # Sample questions if max_questions is specified
         if max_questions and max_questions < len(question_ids):
-            question_ids = random.sample(question_ids, max_questions)
+            question_ids = self.rng.sample(question_ids, max_questions)
             print(f"📝 Randomly selected {max_questions} questions\n")
         
-        # Start shared environment
+        # Questions to run, with their 1-based position in the full list
+        selected = []
+        for idx, question_id in enumerate(question_ids, 1):
+            # Skip questions before start_index (1-based display, 0-based internal)
+            if idx - 1 < self.start_index:
+                print(f"⏭️  Skipping question {idx}/{len(question_ids)}: {question_id}")
+                continue
+            
+            # Skip questions not in rerun_indices if rerun mode is active
+            if self.rerun_indices is not None and (idx - 1) not in self.rerun_indices:
+                print(f"⏭️  Skipping question {idx}/{len(question_ids)}: {question_id} (not in rerun list)")
+                continue
+            
+            # Reuse the result recorded by the interrupted run instead of running the question again
+            if question_id in self.resumed:
+                print(f"⏭️  Resuming question {idx}/{len(question_ids)}: {question_id} (already completed)")
+                self._record_atomic_result(self.resumed[question_id])
+                continue
+            
+            selected.append((idx, question_id))
+        
+        if self.batch_api:
+            await self._run_atomic_batch(selected, len(question_ids))
+        else:
+            await self._run_atomic_pool(selected, len(question_ids))
+        
+        # Calculate final statistics
+        self.results['end_time'] = datetime.now().isoformat()
+        if self.results['scores']:
+            self.results['average_score'] = self.results['total_score'] / len(self.results['scores'])
+        
+        return self.results
+    
+    def _record_atomic_result(self, result: Dict[str, Any]):
+        """Store an atomic question's result and update run statistics"""
+        result['type'] = 'atomic'  # Mark as atomic problem
+        self.results['questions'].append(result)
+        
+        # Write failed test to log immediately
+        self._write_failed_test_log(result)
+        self._offload_llm_response(result)
+        self._stream_result(result)
+        
+        # Update statistics
+        if result['execution_success'] and result['validation_passed']:
+            self.results['success_count'] += 1
+        else:
+            self.results['failure_count'] += 1
+        
+        self.results['scores'].append(result['score'])
+        self.results['total_score'] += result['score']
+        
+        # Print summary
+        status = "✅" if result['validation_passed'] else "❌"
+        print(f"\n{status} Result: {result['question_id']} {result['score']}/{result['max_score']} "
+              f"({result['score']/result['max_score']*100:.0f}%)")
+        sys.stdout.flush()  # Question boundary: write buffered log output to disk
+    
+    async def _run_atomic_pool(self, selected: List[Tuple[int, str]], total: int):
+        """Run selected atomic questions, up to self.concurrency at a time"""
+        # One Anvil fork per concurrent slot; a worker takes an idle env from the pool,
+        # so the pool size is also the concurrency limit
+        n_envs = max(1, min(self.concurrency, len(selected)))
+        print(f"🔧 Starting {n_envs} Anvil environment(s)...")
+        envs = []
+        env_pool = asyncio.Queue()
+        remaining = len(selected)
+        durations = {}
+        
+        if n_envs > 1:
+            # Longest-first, so quick questions fill in behind slow ones instead of trailing them
+            timings = _load_timings()
+            selected = sorted(selected, key=lambda item: -timings.get(item[1], 0))
+        
+        async def run_question(idx: int, question_id: str):
+            nonlocal remaining
+            env = await env_pool.get()
+            remaining -= 1
+            try:
+                print("\n" + "="*80)
+                print(f"📝 Question {idx}/{total}: {question_id}")
+                print("="*80)
+                
+                started_at = time.monotonic()
+                result = await self._run_single_question(question_id, env)
+                durations[question_id] = time.monotonic() - started_at
+                return env, result
+            except BaseException:
+                env_pool.put_nowait(env)
+                raise
+        
+        async def release_env(env: QuestEnvironment, result: Dict[str, Any]):
+            try:
+                # Reset environment if another question will still run on it
+                if remaining > 0:
+                    await self._recover_env(env, result)
+            finally:
+                env_pool.put_nowait(env)
+        
+        pending = set()
+        try:
+            # Forks are independent, so boot them concurrently; each start() blocks a worker thread
+            # A single env keeps the fixed default port; a pool takes free ports so it cannot
+            # collide with (or, via zombie cleanup, kill) another run's forks on 8545+
+            ports = [8545] if n_envs == 1 else [None] * n_envs
+            envs = [self._create_env(anvil_port=port) for port in ports]
+            # Warm the LLM connection in the same window
+            started, _ = await asyncio.gather(
+                asyncio.gather(*(asyncio.to_thread(env.start) for env in envs), return_exceptions=True),
+                self._warm_up_llm()
+            )
+            for outcome in started:
+                if isinstance(outcome, BaseException):
+                    raise outcome
+            for env in envs:
+                env_pool.put_nowait(env)
+            print(f"✅ {n_envs} environment(s) started successfully\n")
+            
+            # Handle each question as soon as it finishes: record (and stream) its result,
+            # then recover its env in the background so the next question can take it
+            pending = {asyncio.create_task(run_question(idx, question_id)) for idx, question_id in selected}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    outcome = task.result()  # A crashed task aborts the run instead of waiting for the rest
+                    if outcome is None:
+                        continue  # An env was released back to the pool
+                    env, result = outcome
+                    self._record_atomic_result(result)
+                    pending.add(asyncio.create_task(release_env(env, result)))
+        
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            if durations:
+                _save_timings(durations)
+            
+            print("\n🧹 Cleaning up environment...")
+            for env in envs:
+                env.stop()
+    
+    async def _run_atomic_batch(self, selected: List[Tuple[int, str]], total: int):
+        """
+        Run selected atomic questions with all LLM calls submitted as one OpenAI batch job
+        
+        Prompts are built up front on a single environment, the batch is awaited, then
+        each response is executed and validated locally in order.
+        """
         print("🔧 Starting shared Anvil environment...")
-        env = QuestEnvironment(fork_url=self.fork_url)
+        env = self._create_env()
         env.start()
         print("✅ Shared environment started successfully\n")
         
         try:
-            for idx, question_id in enumerate(question_ids, 1):
-                # Skip questions before start_index (1-based display, 0-based internal)
-                if idx - 1 < self.start_index:
-                    print(f"⏭️  Skipping question {idx}/{len(question_ids)}: {question_id}")
-                    continue
-                
-                # Skip questions not in rerun_indices if rerun mode is active
-                if self.rerun_indices is not None and (idx - 1) not in self.rerun_indices:
-                    print(f"⏭️  Skipping question {idx}/{len(question_ids)}: {question_id} (not in rerun list)")
+            # 1. Build every prompt; the env is reset to the same snapshot between
+            # questions, so environment parameters resolved now stay valid
+            controllers = {}
+            prompts = {}
+            for idx, question_id in selected:
+                controller, error_result = self._create_controller(question_id, env)
+                if error_result:
+                    self._record_atomic_result(error_result)
                     continue
-                
+                custom_id = f"{idx}:{question_id}"
+                controllers[custom_id] = (idx, question_id, controller)
+                prompts[custom_id] = controller.build_system_prompt(env)
+            
+            # 2. One batch job for all prompts
+            responses = await self._run_openai_batch(prompts)
+            
+            # 3. Execute and validate each response
+            for n, (custom_id, (idx, question_id, controller)) in enumerate(controllers.items(), 1):
                 print("\n" + "="*80)
-                print(f"📝 Question {idx}/{len(question_ids)}: {question_id}")
+                print(f"📝 Question {idx}/{total}: {question_id}")
                 print("="*80)
                 
-                result = await self._run_single_question(question_id, env)
-                result['type'] = 'atomic'  # Mark as atomic problem
-                self.results['questions'].append(result)
-                
-                # Write failed test to log immediately
-                self._write_failed_test_log(result)
-                
-                # Update statistics
-                if result['execution_success'] and result['validation_passed']:
-                    self.results['success_count'] += 1
+                response = responses.get(custom_id)
+                if isinstance(response, str):
+                    result = await self._run_controller(controller, question_id, llm_response=response)
                 else:
-                    self.results['failure_count'] += 1
-                
-                self.results['scores'].append(result['score'])
-                self.results['total_score'] += result['score']
-                
-                # Print summary
-                status = "✅" if result['validation_passed'] else "❌"
-                print(f"\n{status} Result: {result['score']}/{result['max_score']} "
-                      f"({result['score']/result['max_score']*100:.0f}%)")
+                    result = self._error_result(question_id, f'Batch request failed: {response or "missing from batch output"}')
+                self._record_atomic_result(result)
                 
-                # Reset environment for next test
-                if idx < len(question_ids):
-                    # Check if we had a timeout error - if so, restart Anvil
-                    # Be more specific to avoid false positives from debug logs like "[DEBUG] Timeout: 60000ms"
-                    error_msg = (result.get('error', '') or '').lower()
-                    is_timeout_error = (
-                        'read timed out' in error_msg or
-                        'timed out. (read timeout' in error_msg or
-                        'connection timed out' in error_msg or
-                        'anvil is unresponsive' in error_msg or
-                        'anvil may need restart' in error_msg
-                    )
-                    if is_timeout_error:
-                        print(f"\n⚠️  Timeout detected, restarting Anvil...")
-                        if env.restart():
-                            print(f"✅ Anvil restarted successfully")
-                        else:
-                            print(f"❌ Anvil restart failed, trying reset...")
-                            env.reset()
-                    else:
-                        print(f"\n🔄 Resetting environment...")
-                        if not env.reset():
-                            print(f"⚠️  Reset failed, retrying once...")
-                            await asyncio.sleep(2)
-                            if not env.reset():
-                                print(f"⚠️  Reset failed twice, trying restart...")
-                                if not env.restart():
-                                    print(f"⚠️  Restart also failed, printing diagnostics...")
-                                    env.print_diagnostics()
+                if n < len(controllers):
+                    await self._recover_env(env, result)
         
         finally:
             print("\n🧹 Cleaning up environment...")
             env.stop()
+    
+    async def _run_openai_batch(self, prompts: Dict[str, str], poll_interval: float = 30.0) -> Dict[str, Any]:
+        """
+        Submit system prompts as one OpenAI Batch API job and wait for it
         
-        # Calculate final statistics
-        self.results['end_time'] = datetime.now().isoformat()
-        if self.results['scores']:
-            self.results['average_score'] = self.results['total_score'] / len(self.results['scores'])
+        Args:
+            prompts: custom_id -> system prompt
+            poll_interval: Seconds between batch status checks
+            
+        Returns:
+            custom_id -> response text, or the request's error for failed requests
+        """
+        from openai import AsyncOpenAI
         
-        return self.results
+        if not prompts:
+            return {}
+        
+        client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
+        lines = [
+            json.dumps({
+                'custom_id': custom_id,
+                'method': 'POST',
+                'url': '/v1/chat/completions',
+                # Same settings as the controller's chat model
+                'body': {
+                    'model': self.model_name,
+                    'temperature': 0.7,
+                    'messages': [{'role': 'system', 'content': prompt}],
+                },
+            }, ensure_ascii=False)
+            for custom_id, prompt in prompts.items()
+        ]
+        batch_input = await client.files.create(
+            file=('quest_bench_batch.jsonl', '\n'.join(lines).encode('utf-8')),
+            purpose='batch'
+        )
+        batch = await client.batches.create(
+            input_file_id=batch_input.id,
+            endpoint='/v1/chat/completions',
+            completion_window='24h'
+        )
+        print(f"📦 Submitted batch {batch.id} with {len(lines)} requests")
+        
+        while batch.status not in ('completed', 'failed', 'expired', 'cancelled'):
+            await asyncio.sleep(poll_interval)
+            batch = await client.batches.retrieve(batch.id)
+            counts = batch.request_counts
+            done = f"{counts.completed + counts.failed}/{counts.total}" if counts else "?"
+            print(f"   ⏳ Batch {batch.status}: {done} requests done")
+        
+        if batch.status != 'completed':
+            print(f"❌ Batch {batch.id} ended with status: {batch.status}")
+            return {custom_id: f'batch {batch.status}' for custom_id in prompts}
+        
+        responses = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            content = await client.files.content(file_id)
+            for line in content.text.splitlines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                response = record.get('response') or {}
+                if response.get('status_code') == 200:
+                    responses[record['custom_id']] = response['body']['choices'][0]['message']['content']
+                else:
+                    responses[record['custom_id']] = record.get('error') or response.get('body')
+        print(f"✅ Batch {batch.id} completed: {len(responses)}/{len(prompts)} responses")
+        return responses
     
     async def run_all_tests(self, atomic_ids: List[str], composite_ids: List[str], max_questions: Optional[int] = None):
         """Run all tests: atomic first, restart Anvil, then composite with 10s intervals"""
@@ -495,9 +915,9 @@ class QuestBenchRunner:
             max_composite = max_questions - max_atomic
             
             if max_atomic < len(atomic_ids):
-                atomic_ids = random.sample(atomic_ids, max_atomic)
+                atomic_ids = self.rng.sample(atomic_ids, max_atomic)
             if max_composite < len(composite_ids):
-                composite_ids = random.sample(composite_ids, max_composite)
+                composite_ids = self.rng.sample(composite_ids, max_composite)
             
             print(f"📝 Randomly selected: {len(atomic_ids)} atomic + {len(composite_ids)} composite\n")
         
@@ -519,8 +939,8 @@ class QuestBenchRunner:
         print("="*80 + "\n")
         
         print("🔧 Starting Anvil environment for atomic tests...")
-        env = QuestEnvironment(fork_url=self.fork_url)
-        env.start()
+        env = self._create_env()
+        await asyncio.gather(asyncio.to_thread(env.start), self._warm_up_llm())
         print("✅ Environment started successfully\n")
         
         global_idx = 0
@@ -539,16 +959,24 @@ class QuestBenchRunner:
                     print(f"⏭️  Skipping [Atomic {idx}/{len(atomic_ids)}] (Total {global_idx}/{total_questions}): {question_id} (not in rerun list)")
                     continue
                 
-                print("\n" + "="*80)
-                print(f"📝 [Atomic {idx}/{len(atomic_ids)}] (Total {global_idx}/{total_questions}): {question_id}")
-                print("="*80)
-                
-                result = await self._run_single_question(question_id, env)
+                resumed = question_id in self.resumed
+                if resumed:
+                    # Reuse the result recorded by the interrupted run; the env stays untouched
+                    print(f"⏭️  Resuming [Atomic {idx}/{len(atomic_ids)}] (Total {global_idx}/{total_questions}): {question_id} (already completed)")
+                    result = self.resumed[question_id]
+                else:
+                    print("\n" + "="*80)
+                    print(f"📝 [Atomic {idx}/{len(atomic_ids)}] (Total {global_idx}/{total_questions}): {question_id}")
+                    print("="*80)
+                    
+                    result = await self._run_single_question(question_id, env)
                 result['type'] = 'atomic'
                 self.results['questions'].append(result)
                 
                 # Write failed test to log immediately
                 self._write_failed_test_log(result)
+                self._offload_llm_response(result)
+                self._stream_result(result)
                 
                 # Update statistics
                 if result['execution_success'] and result['validation_passed']:
@@ -567,9 +995,10 @@ class QuestBenchRunner:
                 status = "✅" if result['validation_passed'] else "❌"
                 print(f"\n{status} Result: {result['score']}/{result['max_score']} "
                       f"({result['score']/result['max_score']*100:.0f}%)")
+                sys.stdout.flush()
                 
                 # Reset environment for next atomic test
-                if idx < len(atomic_ids):
+                if idx < len(atomic_ids) and not resumed:
                     # Check if we had a timeout error - if so, skip reset and directly restart
                     # Be more specific to avoid false positives from debug logs like "[DEBUG] Timeout: 60000ms"
                     error_msg = (result.get('error', '') or '').lower()
@@ -617,12 +1046,15 @@ class QuestBenchRunner:
                 print("🔄 RESETTING ANVIL STATE FOR COMPOSITE PHASE")
                 print("="*80)
                 
+                # The 10 second gap between phases runs from here, overlapping the health check and reset
+                phase_gap_end = time.monotonic() + 10
+                
                 print("🩺 Checking Anvil health before composite phase...")
-                if not env.check_health(timeout=10):
+                if not await asyncio.to_thread(env.check_health, timeout=10):
                     print(f"⚠️  Anvil is unresponsive, attempting full environment reset...")
                     env.print_diagnostics()
                     # Try to reset even if unresponsive
-                    if env.reset():
+                    if await asyncio.to_thread(env.reset):
                         print(f"✅ Environment reset successfully after unresponsive state")
                     else:
                         print(f"⚠️  Reset failed, skipping composite phase")
@@ -631,16 +1063,17 @@ class QuestBenchRunner:
                     print(f"✅ Anvil is healthy")
                     
                     print("🔄 Performing full environment reset...")
-                    if not env.reset():
+                    if not await asyncio.to_thread(env.reset):
                         print(f"⚠️  Reset failed, skipping composite phase")
                         env.print_diagnostics()
                         phase_stopped = True
                     else:
                         print("✅ Environment reset successfully")
                 
-                if not phase_stopped:
-                    print("⏳ Waiting 10 seconds before starting composite tests...")
-                    await asyncio.sleep(10)
+                remaining_gap = phase_gap_end - time.monotonic()
+                if not phase_stopped and remaining_gap > 0:
+                    print(f"⏳ Waiting {remaining_gap:.0f} more seconds before starting composite tests...")
+                    await asyncio.sleep(remaining_gap)
             
             # Run composite tests only if phase was not stopped
             if not phase_stopped and len(composite_ids) > 0:
@@ -663,16 +1096,24 @@ class QuestBenchRunner:
                         print(f"⏭️  Skipping [Composite {idx}/{len(composite_ids)}] (Total {global_idx}/{total_questions}): {question_id} (not in rerun list)")
                         continue
                     
-                    print("\n" + "="*80)
-                    print(f"📝 [Composite {idx}/{len(composite_ids)}] (Total {global_idx}/{total_questions}): {question_id}")
-                    print("="*80)
-                    
-                    result = await self._run_single_question(question_id, env, is_composite=True)
+                    resumed = question_id in self.resumed
+                    if resumed:
+                        # Reuse the result recorded by the interrupted run; the env stays untouched
+                        print(f"⏭️  Resuming [Composite {idx}/{len(composite_ids)}] (Total {global_idx}/{total_questions}): {question_id} (already completed)")
+                        result = self.resumed[question_id]
+                    else:
+                        print("\n" + "="*80)
+                        print(f"📝 [Composite {idx}/{len(composite_ids)}] (Total {global_idx}/{total_questions}): {question_id}")
+                        print("="*80)
+                        
+                        result = await self._run_single_question(question_id, env, is_composite=True)
                     result['type'] = 'composite'
                     self.results['questions'].append(result)
                     
                     # Write failed test to log immediately
                     self._write_failed_test_log(result)
+                    self._offload_llm_response(result)
+                    self._stream_result(result)
                     
                     # Update statistics
                     if result['execution_success'] and result['validation_passed']:
@@ -691,9 +1132,10 @@ class QuestBenchRunner:
                     status = "✅" if result['validation_passed'] else "❌"
                     print(f"\n{status} Result: {result['score']}/{result['max_score']} "
                           f"({result['score']/result['max_score']*100:.0f}%)")
+                    sys.stdout.flush()
                     
                     # Reset environment for next composite test with longer delay
-                    if idx < len(composite_ids):
+                    if idx < len(composite_ids) and not resumed:
                         # Check if we had a timeout error - if so, skip reset and directly restart
                         # Be more specific to avoid false positives from debug logs like "[DEBUG] Timeout: 60000ms"
                         error_msg = (result.get('error', '') or '').lower()
@@ -744,54 +1186,108 @@ class QuestBenchRunner:
         
         return self.results
     
-    async def _run_single_question(self, question_id: str, env: QuestEnvironment, is_composite: bool = False) -> Dict[str, Any]:
-        """Run single problem test (atomic or composite)"""
+    def _create_env(self, anvil_port: Optional[int] = 8545) -> QuestEnvironment:
+        """A QuestEnvironment with this run's fork settings (not started)"""
+        return QuestEnvironment(fork_url=self.fork_url, anvil_port=anvil_port,
+                                fork_block_number=self.fork_block_number, state_cache=self.state_cache,
+                                account_seed=self.seed)
+    
+    def _get_llm(self):
+        """The LLM client shared by all controllers of this run"""
+        if self.llm is None:
+            self.http_client = _shared_http_client(self.concurrency)
+            self.llm = create_llm(self.model_name, self.api_key, self.base_url,
+                                  http_async_client=self.http_client)
+        return self.llm
+    
+    async def aclose(self):
+        """Close the shared HTTP client"""
+        if self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
+    
+    async def _warm_up_llm(self):
+        """Open the shared LLM client's HTTPS connection (DNS, TLS) while Anvil is starting"""
+        try:
+            # OpenAI-compatible clients only; GET /models costs no tokens
+            client = getattr(self._get_llm(), 'root_async_client', None)
+            if client is not None:
+                await client.models.list()
+        except Exception as e:
+            print(f"⚠️  LLM warm-up failed, continuing: {e}")
+    
+    async def _recover_env(self, env: QuestEnvironment, result: Dict[str, Any]):
+        """Reset an environment after a question, restarting Anvil if it timed out"""
+        # Check if we had a timeout error - if so, restart Anvil
+        # Be more specific to avoid false positives from debug logs like "[DEBUG] Timeout: 60000ms"
+        error_msg = (result.get('error', '') or '').lower()
+        is_timeout_error = (
+            'read timed out' in error_msg or
+            'timed out. (read timeout' in error_msg or
+            'connection timed out' in error_msg or
+            'anvil is unresponsive' in error_msg or
+            'anvil may need restart' in error_msg
+        )
+        # Reset/restart block on RPCs and process control; run them off the event loop so
+        # other workers' LLM calls keep progressing
+        if is_timeout_error:
+            print(f"\n⚠️  Timeout detected, restarting Anvil...")
+            if await asyncio.to_thread(env.restart):
+                print(f"✅ Anvil restarted successfully")
+            else:
+                print(f"❌ Anvil restart failed, trying reset...")
+                await asyncio.to_thread(env.reset)
+        else:
+            print(f"\n🔄 Resetting environment...")
+            if not await asyncio.to_thread(env.reset):
+                print(f"⚠️  Reset failed, retrying once...")
+                await asyncio.sleep(2)
+                if not await asyncio.to_thread(env.reset):
+                    print(f"⚠️  Reset failed twice, trying restart...")
+                    if not await asyncio.to_thread(env.restart):
+                        print(f"⚠️  Restart also failed, printing diagnostics...")
+                        env.print_diagnostics()
+    
+    def _error_result(self, question_id: str, error: str) -> Dict[str, Any]:
+        """Result for a question that failed before producing an evaluation"""
+        return {
+            'question_id': question_id,
+            'execution_success': False,
+            'validation_passed': False,
+            'score': 0,
+            'max_score': 100,
+            'error': error
+        }
+    
+    def _create_controller(self, question_id: str, env: QuestEnvironment,
+                           is_composite: bool = False) -> Tuple[Optional[QuestController], Optional[Dict[str, Any]]]:
+        """
+        Create the controller for a question
         
+        Returns:
+            (controller, None), or (None, error result) if the question cannot be set up
+        """
         # Find question file
         question_path = get_question_path(question_id)
         if not question_path:
-            return {
-                'question_id': question_id,
-                'execution_success': False,
-                'validation_passed': False,
-                'score': 0,
-                'max_score': 100,
-                'error': f'Question {question_id} not found'
-            }
+            return None, self._error_result(question_id, f'Question {question_id} not found')
         
         # Create validator factory based on problem type
         if is_composite:
-            # Composite problem: use CompositeValidator
+            # Composite problem: use CompositeValidator, which loads its definition on init
             print(f"🔗 Using CompositeValidator for {question_id}")
-            
-            def validator_factory(**kwargs):
-                validator = CompositeValidator(kwargs.get('agent_address', ''))
-                validator.load_composite_definition(question_id)
-                return validator
+            validator_factory = partial(CompositeValidator, composite_id=question_id)
         else:
             # Atomic problem: use VALIDATOR_REGISTRY
-            if question_id not in VALIDATOR_REGISTRY:
-                return {
-                    'question_id': question_id,
-                    'execution_success': False,
-                    'validation_passed': False,
-                    'score': 0,
-                    'max_score': 100,
-                    'error': f'No validator registered for {question_id}'
-                }
+            target = VALIDATOR_REGISTRY.get(question_id)
+            if target is None:
+                return None, self._error_result(question_id, f'No validator registered for {question_id}')
             
             # Create validator factory
             try:
-                validator_factory = create_validator_factory(question_id)
+                validator_factory = create_validator_factory(_load_validator_class(target))
             except Exception as e:
-                return {
-                    'question_id': question_id,
-                    'execution_success': False,
-                    'validation_passed': False,
-                    'score': 0,
-                    'max_score': 100,
-                    'error': f'Failed to create validator: {e}'
-                }
+                return None, self._error_result(question_id, f'Failed to create validator: {e}')
         
         # Create controller
         controller = QuestController(
@@ -805,24 +1301,44 @@ class QuestBenchRunner:
             env=env,
             naive_mode=self.naive_mode,
             nl_difficulty=self.nl_difficulty,
-            library=self.library
+            library=self.library,
+            rate_limiter=self.rate_limiter,
+            llm_cache=self.llm_cache,
+            llm=self._get_llm(),
+            seed=self._question_seed(question_id)
         )
+        return controller, None
+    
+    def _question_seed(self, question_id: str) -> Optional[int]:
+        """
+        Per-question seed derived from the run seed
         
+        Each question draws from its own generator, so its parameters do not depend on
+        which questions ran before it (sampling, --start-index, longest-first order, concurrency).
+        """
+        if self.seed is None:
+            return None
+        digest = hashlib.sha256(f"{self.seed}:{question_id}".encode()).digest()
+        return int.from_bytes(digest[:8], 'big')
+    
+    async def _run_single_question(self, question_id: str, env: QuestEnvironment, is_composite: bool = False) -> Dict[str, Any]:
+        """Run single problem test (atomic or composite)"""
+        controller, error_result = self._create_controller(question_id, env, is_composite)
+        if error_result:
+            return error_result
+        return await self._run_controller(controller, question_id)
+    
+    async def _run_controller(self, controller: QuestController, question_id: str,
+                              llm_response: Optional[str] = None) -> Dict[str, Any]:
+        """Run a question's controller and flatten its result"""
         # Run evaluation
         try:
-            result = await controller.run()
+            result = await controller.run(llm_response)
             
             # Handle None result (execution failed before returning result)
             if result is None:
                 print(f"❌ Error: controller.run() returned None for question {question_id}")
-                return {
-                    'question_id': question_id,
-                    'execution_success': False,
-                    'validation_passed': False,
-                    'score': 0,
-                    'max_score': 100,
-                    'error': 'Execution failed: controller.run() returned None'
-                }
+                return self._error_result(question_id, 'Execution failed: controller.run() returned None')
             
             # Safely extract validation_result (handle None case)
             validation_result = result.get('validation_result') or {}
@@ -847,16 +1363,10 @@ class QuestBenchRunner:
         except Exception as e:
             print(f"❌ Error running question {question_id}: {e}")
             import traceback
-            traceback.print_exc()
+            # Formatted once and written in one call rather than one write per frame line
+            sys.stderr.write(traceback.format_exc())
             
-            return {
-                'question_id': question_id,
-                'execution_success': False,
-                'validation_passed': False,
-                'score': 0,
-                'max_score': 100,
-                'error': str(e)
-            }
+            return self._error_result(question_id, str(e))
     
     def save_results(self, output_dir: str = "results") -> str:
         """Save evaluation results"""
@@ -868,8 +1378,11 @@ class QuestBenchRunner:
         filename = f"quest_bench_{safe_model_name}_{self.run_index}_{timestamp}.json"
         filepath = output_path / filename
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(self.results, f, indent=2, ensure_ascii=False)
+        # Make reused answers visible, so cached runs are never mistaken for fresh samples
+        if self.llm_cache is not None:
+            self.results['metadata']['llm_cache'] = {'hits': self.llm_cache.hits, 'misses': self.llm_cache.misses}
+        
+        filepath.write_bytes(_json_bytes(self.results, indent=True))
         
         return str(filepath)
     
@@ -903,8 +1416,16 @@ class QuestBenchRunner:
             qid = q.get('question_id', '')
             return 'composite' if qid.startswith('composite_') else 'atomic'
         
-        atomic_questions = [q for q in self.results['questions'] if get_question_type(q) == 'atomic']
-        composite_questions = [q for q in self.results['questions'] if get_question_type(q) == 'composite']
+        # Classify every result in one pass; the lists feed both the scores and the detailed listing
+        atomic_questions, composite_questions = [], []
+        has_types = False
+        for q in self.results['questions']:
+            has_types = has_types or bool(q.get('type'))
+            q_type = get_question_type(q)
+            if q_type == 'atomic':
+                atomic_questions.append(q)
+            elif q_type == 'composite':
+                composite_questions.append(q)
         
         if atomic_questions or composite_questions:
             if atomic_questions:
@@ -931,15 +1452,9 @@ class QuestBenchRunner:
         print(f"\n📋 Detailed Scores:")
         print("-"*80)
         
-        # Check if we have type information
-        has_types = any(r.get('type') for r in self.results['questions'])
-        
         if has_types:
             # Print atomic results first (sorted by question_id)
-            atomic_results = sorted(
-                [r for r in self.results['questions'] if r.get('type') == 'atomic'],
-                key=lambda x: x['question_id']
-            )
+            atomic_results = sorted(atomic_questions, key=lambda x: x['question_id'])
             if atomic_results:
                 print("--- ATOMIC PROBLEMS ---")
                 for result in atomic_results:
@@ -948,10 +1463,7 @@ class QuestBenchRunner:
                     print(f"{status} {result['question_id']:<45} {result['score']:>3}/{result['max_score']:<3} ({score_pct:.0f}%)")
             
             # Print composite results (sorted by question_id)
-            composite_results = sorted(
-                [r for r in self.results['questions'] if r.get('type') == 'composite'],
-                key=lambda x: x['question_id']
-            )
+            composite_results = sorted(composite_questions, key=lambda x: x['question_id'])
             if composite_results:
                 print("\n--- COMPOSITE PROBLEMS ---")
                 for result in composite_results:
@@ -1051,6 +1563,17 @@ Examples:
         default='https://bsc-dataseed.binance.org',
         help='BSC RPC URL to fork with Anvil (default: BSC Mainnet public RPC)'
     )
+    parser.add_argument(
+        '--fork-block-number',
+        type=int,
+        default=None,
+        help='Fork at this block instead of the latest; keeps every fork identical and lets Anvil reuse its on-disk RPC cache across runs'
+    )
+    parser.add_argument(
+        '--state-cache',
+        action='store_true',
+        help='Restore the post-setup Anvil state from ~/.cache/quest_bench/state instead of redoing setup (requires --fork-block-number)'
+    )
     parser.add_argument(
         '--naive-mode',
         action='store_true',
@@ -1082,6 +1605,49 @@ Examples:
         choices=['ethers', 'viem'],
         help='JavaScript library to use: ethers (default) or viem'
     )
+    parser.add_argument(
+        '--concurrency', '--max-concurrency',
+        dest='concurrency',
+        type=int,
+        default=1,
+        help='Atomic questions to run concurrently, each on its own Anvil fork (default: 1)'
+    )
+    parser.add_argument(
+        '--batch-api',
+        action='store_true',
+        help='Atomic runs only: submit all LLM prompts as one OpenAI Batch API job (half price, '
+             'results can take up to 24h), then execute and validate the responses locally'
+    )
+    parser.add_argument(
+        '--rpm',
+        type=int,
+        default=None,
+        help='Provider requests-per-minute limit; LLM calls are paced to stay under it (default: unlimited)'
+    )
+    parser.add_argument(
+        '--tpm',
+        type=int,
+        default=None,
+        help='Provider tokens-per-minute limit; LLM calls are paced using estimated prompt + completion tokens (default: unlimited)'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=None,
+        help='Seed for question sampling, generated parameters (including addresses) and test accounts, for reproducible runs (default: random)'
+    )
+    parser.add_argument(
+        '--resume',
+        type=str,
+        default=None,
+        help='Results .jsonl from an interrupted run; questions recorded there are not run again'
+    )
+    parser.add_argument(
+        '--cache',
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help='Reuse LLM responses for byte-identical prompts from ~/.cache/quest_bench/llm (default: off)'
+    )
 
     args = parser.parse_args()
 
@@ -1096,6 +1662,30 @@ Examples:
             print("   Expected comma-separated integers, e.g., '5,6,13,15'")
             sys.exit(1)
     
+    if args.batch_api and args.type != 'atomic':
+        print("❌ --batch-api requires --type atomic")
+        print("   Composite questions and --type all runs send LLM calls one at a time")
+        sys.exit(1)
+    
+    if args.state_cache and args.fork_block_number is None:
+        print("❌ --state-cache requires --fork-block-number")
+        print("   A state dump only matches a fork of the block it was taken on")
+        sys.exit(1)
+    
+    # Anything else drawing from the module-level random repeats across runs too
+    if args.seed is not None:
+        random.seed(args.seed)
+    
+    # Load results of an interrupted run to resume from
+    resumed_results = None
+    if args.resume:
+        try:
+            resumed_results = load_results_stream(args.resume)
+            print(f"📋 Resume mode: {len(resumed_results)} completed question(s) loaded from {args.resume}")
+        except OSError as e:
+            print(f"❌ Cannot read --resume file: {e}")
+            sys.exit(1)
+    
     # Setup log directory
     log_dir = Path("log")
     log_dir.mkdir(parents=True, exist_ok=True)
@@ -1111,8 +1701,8 @@ Examples:
     full_log_path = log_dir / full_log_filename
     failed_log_path = log_dir / failed_log_filename
     
-    # Setup Tee output for full console log (real-time writing)
-    full_log_file = open(full_log_path, 'w', encoding='utf-8')
+    # Setup Tee output for full console log (block-buffered, flushed after each question)
+    full_log_file = open(full_log_path, 'w', encoding='utf-8', buffering=64 * 1024)
     original_stdout = sys.stdout
     original_stderr = sys.stderr
     
@@ -1122,8 +1712,16 @@ Examples:
     output_file = None
     failed_count = 0
     
+    # Stream each question's result as it finishes; the final JSON is still written at the end
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stream_path = output_dir / f"quest_bench_{safe_model_name}_{args.run_index}_{timestamp}.jsonl"
+    results_stream_file = open(stream_path, 'wb')
+    responses_dir = output_dir / 'responses' / stream_path.stem
+    
     # Open failed log file for real-time writing (keep it open throughout execution)
-    failed_log_file = open(failed_log_path, 'w', encoding='utf-8')
+    # Buffer sized so a whole failure record (response + code excerpts) goes out in one write per flush
+    failed_log_file = open(failed_log_path, 'w', encoding='utf-8', buffering=64 * 1024)
     failed_log_file.write("=" * 80 + "\n")
     failed_log_file.write("BSC Quest Bench - Failed Tests Log\n")
     failed_log_file.write("=" * 80 + "\n")
@@ -1133,6 +1731,7 @@ Examples:
     failed_log_file.write("=" * 80 + "\n\n")
     failed_log_file.flush()  # Ensure header is written immediately
     
+    runner = None
     try:
         print("\n" + "="*80)
         print("🚀 BSC QUEST BENCH - LLM Evaluation System")
@@ -1143,6 +1742,7 @@ Examples:
         print(f"Fork URL: {args.fork_url}")
         print(f"📝 Full console log: {full_log_path}")
         print(f"📝 Failed tests log: {failed_log_path}")
+        print(f"📝 Results stream: {stream_path}")
         print("="*80 + "\n")
         
         # Create runner with failed log file for real-time writing
@@ -1151,13 +1751,24 @@ Examples:
             api_key=args.api_key,
             base_url=args.base_url,
             fork_url=args.fork_url,
+            fork_block_number=args.fork_block_number,
+            state_cache=args.state_cache,
             run_index=args.run_index,
             naive_mode=args.naive_mode,
             start_index=args.start_index,
             failed_log_file=failed_log_file,
+            results_stream_file=results_stream_file,
+            responses_dir=responses_dir,
             rerun_indices=rerun_indices_set,
             nl_difficulty=args.nl_difficulty,
-            library=args.library
+            library=args.library,
+            concurrency=args.concurrency,
+            batch_api=args.batch_api,
+            rpm=args.rpm,
+            tpm=args.tpm,
+            llm_cache=args.cache,
+            resumed_results=resumed_results,
+            seed=args.seed
         )
         
         # Determine questions to test
@@ -1197,17 +1808,22 @@ Examples:
         else:
             print("\n✅ All tests passed!")
         
-        # Save results
-        output_file = runner.save_results(args.output_dir)
+        # Save results on a worker thread while the summary prints; run_in_executor submits
+        # right away (a to_thread task would not start until print_summary returned)
+        save_future = asyncio.get_running_loop().run_in_executor(None, runner.save_results, args.output_dir)
         
         # Print summary
         runner.print_summary()
+        output_file = await save_future
         
         print(f"\n📁 Results saved to: {output_file}")
         print(f"📁 Full log saved to: {full_log_path}")
         print("="*80 + "\n")
     
     finally:
+        if runner is not None:
+            await runner.aclose()
+        
         # Restore stdout and stderr
         sys.stdout = original_stdout
         sys.stderr = original_stderr
@@ -1218,6 +1834,9 @@ Examples:
         if failed_log_file and not failed_log_file.closed:
             failed_log_file.close()
         
+        if results_stream_file and not results_stream_file.closed:
+            results_stream_file.close()
+        
         # Remove empty failed log file if no failures
         if failed_count == 0 and failed_log_path.exists():
             failed_log_path.unlink()